@@ -0,0 +1,124 @@
+"""
+補助ファイル（商魂のCSV・個人名チェックのExcel）の読み込みキャッシュ
+
+補助ファイルは大きく読み込みに時間がかかるうえ、
+同じファイルを実行のたびに各シリーズで読み込み直しています。
+読み込んで必要な列に絞り込んだ結果を（パス, サイズ, 更新日時, 列）をキーとして
+メモリとディスク（pickle）に保存し、ファイルが変わっていなければ再利用します。
+
+必要な列が見つからない場合は、呼び出し側で従来どおりエラーを表示できるよう
+キャッシュせずに読み込んだ結果をそのまま返します。
+"""
+
+import hashlib
+import logging
+import os
+import threading
+from typing import Callable, Optional
+
+import pandas as pd
+
+from common import read_csv_columns
+from runtime_files import RUNTIME_ROOT
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DIRECTORY = str(RUNTIME_ROOT / "aux_cache")
+
+# キー -> 必要な列に絞り込んだDataFrame（同じプロセスの中ではディスクも読まない）
+_memory = {}
+_lock = threading.Lock()
+_key_locks = {}
+
+
+def _file_key(file_path: str, columns: list[str]) -> tuple:
+    stat = os.stat(file_path)
+    return (os.path.abspath(file_path), stat.st_size, stat.st_mtime_ns, tuple(columns))
+
+
+def _disk_path(key: tuple, directory: str) -> str:
+    return os.path.join(directory, hashlib.sha1(repr(key).encode("utf-8")).hexdigest() + ".pkl")
+
+
+def _load_from_disk(path: str) -> Optional[pd.DataFrame]:
+    if not os.path.exists(path):
+        return None
+    try:
+        return pd.read_pickle(path)
+    except Exception as e:
+        logger.info(f"補助ファイルキャッシュを読み込めないため読み込み直します: {e}")
+        return None
+
+
+def _save_to_disk(path: str, df: pd.DataFrame) -> None:
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        df.to_pickle(path + ".tmp")
+        os.replace(path + ".tmp", path)
+    except Exception as e:
+        logger.warning(f"補助ファイルキャッシュを保存できませんでした: {e}")
+
+
+def cached_read(
+    file_path: str,
+    columns: list[str],
+    read: Callable[[], pd.DataFrame],
+    directory: Optional[str] = None,
+) -> pd.DataFrame:
+    """
+    補助ファイルを読み込み、必要な列に絞り込んで返す（キャッシュがあればそれを返す）。
+
+    Args:
+        file_path: 補助ファイルのパス
+        columns: 必要な列
+        read: ファイルを読み込む関数（例外はそのまま呼び出し側に送出する）
+        directory: ディスクキャッシュの保存先（None の場合は DEFAULT_DIRECTORY）
+
+    Returns:
+        必要な列に絞り込んだDataFrame（列が不足している場合は読み込んだ結果そのまま）
+    """
+    key = _file_key(file_path, columns)
+    with _lock:
+        if key in _memory:
+            return _memory[key]
+        key_lock = _key_locks.setdefault(key, threading.Lock())
+
+    # 複数のシリーズが同じファイルを同時に要求した場合も読み込みは1回にする
+    with key_lock:
+        with _lock:
+            if key in _memory:
+                return _memory[key]
+        path = _disk_path(key, directory or DEFAULT_DIRECTORY)
+        df = _load_from_disk(path)
+        if df is None:
+            df = read()
+            if not all(column in df.columns for column in columns):
+                return df
+            df = df[list(columns)]
+            _save_to_disk(path, df)
+        with _lock:
+            _memory[key] = df
+        return df
+
+
+def read_aux_csv(file_path: str, columns: list[str]) -> pd.DataFrame:
+    """
+    補助ファイル（CSV）を読み込む。
+
+    エンコーディングを判定してから必要な列だけを1回で読み込みます（common.read_csv_columns）。
+    どのエンコーディングでも読み込めない場合は UnicodeDecodeError を送出します。
+    """
+    return cached_read(file_path, columns, lambda: read_csv_columns(file_path, columns))
+
+
+def read_aux_excel(file_path: str, columns: list[str]) -> pd.DataFrame:
+    """補助ファイル（Excel）を読み込む。"""
+    return cached_read(file_path, columns, lambda: pd.read_excel(file_path))
+
+
+def clear() -> None:
+    """メモリ上のキャッシュを削除する（テスト用）。"""
+    with _lock:
+        _memory.clear()
+        _key_locks.clear()
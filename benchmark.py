@@ -0,0 +1,276 @@
+"""
+各シリーズの validate_data のベンチマーク
+
+synthetic_data で作成した合成データ（DB・補助ファイルは使用しません）に対して、シリーズ・行数・
+評価方式（エンジン）ごとに validate_data の処理時間を計測し、結果を benchmark_results/ に JSON で保存します。
+保存した結果を --compare に指定すると、コミット間で処理時間を比較できます。
+
+評価方式:
+
+    row         行単位の評価（全シリーズ）
+    vectorized  列単位の評価（DEKISPART・CLOUD）
+    sharded     --workers を指定した場合、既定のエンジンを複数のプロセスで実行（sharding.validate_sharded）
+
+使用例:
+
+    python benchmark.py
+    python benchmark.py --sizes 10k 100k 1m --series DEKISPART CLOUD --repeat 3
+    python benchmark.py --compare benchmark_results/20250401-120000_1a2b3c4.json
+
+--compare を指定した場合、いずれかの処理時間が比較元の --threshold 倍を超えると終了コード 1 を返します。
+"""
+
+import argparse
+import gc
+import importlib
+import json
+import logging
+import os
+import platform
+import subprocess
+import sys
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+import date_columns
+import synthetic_data
+from check_results import RESULT_COLUMNS
+from common import configure_logging
+from rule_engine import ENGINE_ROW, ENGINE_VECTORIZED
+from series_registry import SERIES_RUNNERS
+
+
+RESULTS_DIRECTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmark_results")
+DEFAULT_SIZES = ("10k", "100k")
+DEFAULT_THRESHOLD = 1.2
+
+MODE_SHARDED = "sharded"
+# シリーズごとの評価方式（validate_data の engine に渡す値）。engine を受け取らないシリーズは行単位のみ
+SERIES_ENGINES = {
+    "DEKISPART": (ENGINE_ROW, ENGINE_VECTORIZED),
+    "INNOSITE": (ENGINE_ROW,),
+    "DEKISPART_SCHOOL": (ENGINE_ROW,),
+    "CLOUD": (ENGINE_ROW, ENGINE_VECTORIZED),
+}
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="benchmark.py",
+        description="合成データで各シリーズの validate_data の処理時間を計測します。",
+    )
+    parser.add_argument("--series", nargs="+", metavar="SERIES", type=str.upper,
+                        choices=list(SERIES_ENGINES), default=list(SERIES_ENGINES),
+                        help=f"計測するシリーズ（既定: 全シリーズ。{', '.join(SERIES_ENGINES)}）")
+    parser.add_argument("--sizes", nargs="+", choices=list(synthetic_data.SIZES),
+                        help=f"行数（既定: --rows を指定しない場合は {' '.join(DEFAULT_SIZES)}）")
+    parser.add_argument("--rows", nargs="+", type=int, default=[], help="--sizes 以外の行数（例: 5000）")
+    parser.add_argument("--modes", nargs="+", choices=[ENGINE_ROW, ENGINE_VECTORIZED, MODE_SHARDED],
+                        help="計測する評価方式（既定: シリーズが対応している全ての方式）")
+    parser.add_argument("--workers", type=int, help="sharded で使用するプロセス数（指定した場合だけ sharded を計測）")
+    parser.add_argument("--repeat", type=int, default=1, help="計測の回数（最も短い時間を結果とする。既定: 1）")
+    parser.add_argument("--seed", type=int, default=synthetic_data.DEFAULT_SEED, help="合成データの乱数のシード")
+    parser.add_argument("--output", "-o", help=f"結果の保存先（既定: {os.path.basename(RESULTS_DIRECTORY)}/<日時>_<コミット>.json）")
+    parser.add_argument("--compare", metavar="PATH", help="比較する以前の結果ファイル")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help=f"--compare で遅くなったと判定する比率（既定: {DEFAULT_THRESHOLD}）")
+    return parser
+
+
+def git_commit() -> str:
+    """現在のコミット（短縮形。変更がある場合は末尾に -dirty）。取得できない場合は unknown。"""
+    directory = os.path.dirname(os.path.abspath(__file__))
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=directory,
+                                capture_output=True, text=True, check=True).stdout.strip()
+        status = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=directory,
+                                capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+    return f"{commit}-dirty" if status else commit
+
+
+def _validate_function(series: str):
+    return importlib.import_module(SERIES_RUNNERS[series][0]).validate_data
+
+
+def benchmark_modes(series: str, modes=None, workers=None) -> list:
+    """シリーズで計測する評価方式（modes の指定が無い場合は対応している全ての方式）。"""
+    available = list(SERIES_ENGINES[series])
+    if workers:
+        available.append(MODE_SHARDED)
+    if modes is None:
+        return available
+    return [mode for mode in available if mode in modes]
+
+
+def _run(validate, data: synthetic_data.SeriesData, mode: str, workers=None) -> pd.DataFrame:
+    kwargs = dict(data.validate_kwargs)
+    if mode == MODE_SHARDED:
+        from sharding import validate_sharded
+
+        duplicate_errors = []
+        if data.series == "DEKISPART_SCHOOL":
+            # 本番（run_dekispart_school_check）と同じく、CHK_0003（ID重複）は全行で1回だけ実行して先頭に置く
+            from dekispart_school import check_dekispart_school_0003_duplicate
+
+            check_dekispart_school_0003_duplicate(data.frame, duplicate_errors)
+            kwargs["include_duplicate_check"] = False
+        result = validate_sharded(data.frame, validate, RESULT_COLUMNS, kwargs, workers=workers, min_rows=0,
+                                  progress_label=data.series)
+        if duplicate_errors:
+            return pd.concat([pd.DataFrame(duplicate_errors, columns=RESULT_COLUMNS), result], ignore_index=True)
+        return result
+    if len(SERIES_ENGINES[data.series]) > 1:
+        kwargs["engine"] = mode
+    return validate(data.frame, None, **kwargs)
+
+
+def time_validate(data: synthetic_data.SeriesData, mode: str, repeat: int = 1, workers=None) -> dict:
+    """
+    validate_data を repeat 回実行して処理時間を計測する。
+
+    Returns:
+        dict: 結果ファイルの1件（seconds は最も短い時間）
+    """
+    validate = _validate_function(data.series)
+    runs = []
+    errors = 0
+    for _ in range(max(1, repeat)):
+        # 前の計測で作成したオブジェクトの回収が計測中に起きないようにする
+        gc.collect()
+        started = time.perf_counter()
+        result = _run(validate, data, mode, workers)
+        runs.append(time.perf_counter() - started)
+        errors = len(result)
+        del result
+    seconds = min(runs)
+    rows = len(data.frame)
+    return {
+        "series": data.series,
+        "rows": rows,
+        "mode": mode,
+        "seconds": round(seconds, 6),
+        "runs": [round(run, 6) for run in runs],
+        "rows_per_second": round(rows / seconds) if seconds else None,
+        "errors": errors,
+    }
+
+
+def run_benchmarks(series_list, sizes, modes=None, repeat=1, seed=synthetic_data.DEFAULT_SEED,
+                   workers=None, report=print) -> list:
+    """
+    シリーズ・行数・評価方式ごとに計測し、結果のリストを返す。
+
+    日付のチェックは synthetic_data.AS_OF を基準にするため、実行日によって結果の件数は変わりません。
+    """
+    results = []
+    with date_columns.as_of_run(synthetic_data.AS_OF):
+        for rows in sizes:
+            # 参照データは同じ行数のシリーズで共有する
+            reference = synthetic_data.ReferenceTables(rows, seed)
+            for series in series_list:
+                started = time.perf_counter()
+                data = synthetic_data.series_data(series, rows, seed, reference)
+                prepare_seconds = time.perf_counter() - started
+                for mode in benchmark_modes(series, modes, workers):
+                    result = time_validate(data, mode, repeat, workers)
+                    result["prepare_seconds"] = round(prepare_seconds, 6)
+                    results.append(result)
+                    report(f"{series:<17} {rows:>9,}行 {mode:<10} {result['seconds']:>9.3f}秒 "
+                           f"({result['rows_per_second']:,}行/秒, エラー {result['errors']:,}件)")
+                del data
+            del reference
+    return results
+
+
+def build_report(results: list, seed: int, workers=None) -> dict:
+    return {
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "seed": seed,
+        "as_of": synthetic_data.AS_OF.isoformat(),
+        "workers": workers,
+        "results": results,
+    }
+
+
+def save_report(report: dict, path=None) -> str:
+    """結果を JSON で保存し、保存先のパスを返す。"""
+    if path is None:
+        os.makedirs(RESULTS_DIRECTORY, exist_ok=True)
+        started = datetime.fromisoformat(report["created_at"]).strftime("%Y%m%d-%H%M%S")
+        path = os.path.join(RESULTS_DIRECTORY, f"{started}_{report['commit']}.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    return path
+
+
+def load_report(path) -> dict:
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def compare_reports(previous: dict, current: dict, threshold: float = DEFAULT_THRESHOLD) -> list:
+    """
+    同じシリーズ・行数・評価方式の処理時間を比較する。
+
+    Returns:
+        list: (シリーズ, 行数, 評価方式, 比較元の秒数, 今回の秒数, 比率, 遅くなったか) のリスト。
+            比較元に無い組み合わせは含めない。
+    """
+    previous_seconds = {(item["series"], item["rows"], item["mode"]): item["seconds"] for item in previous["results"]}
+    rows = []
+    for item in current["results"]:
+        key = (item["series"], item["rows"], item["mode"])
+        if key not in previous_seconds:
+            continue
+        before = previous_seconds[key]
+        ratio = item["seconds"] / before if before else float("inf")
+        rows.append(key + (before, item["seconds"], ratio, ratio > threshold))
+    return rows
+
+
+def format_comparison(previous: dict, current: dict, comparison: list) -> str:
+    lines = [f"比較元: {previous.get('commit', 'unknown')} ({previous.get('created_at', '')}) -> "
+             f"今回: {current['commit']}"]
+    for series, rows, mode, before, after, ratio, slower in comparison:
+        mark = "  ← 遅くなりました" if slower else ""
+        lines.append(f"{series:<17} {rows:>9,}行 {mode:<10} {before:>9.3f}秒 -> {after:>9.3f}秒 ({ratio:.2f}倍){mark}")
+    if not comparison:
+        lines.append("比較できる計測結果がありません（シリーズ・行数・評価方式が一致するもの）")
+    return "\n".join(lines)
+
+
+def main(argv=None) -> int:
+    """ベンチマークのエントリポイント（終了コードを返す）。"""
+    args = build_parser().parse_args(argv)
+    configure_logging(console_level=logging.WARNING)
+
+    sizes = args.sizes if args.sizes is not None else ([] if args.rows else list(DEFAULT_SIZES))
+    sizes = [synthetic_data.SIZES[size] for size in sizes] + args.rows
+    results = run_benchmarks(list(dict.fromkeys(args.series)), list(dict.fromkeys(sizes)), args.modes,
+                             args.repeat, args.seed, args.workers)
+    report = build_report(results, args.seed, args.workers)
+    path = save_report(report, args.output)
+    print(f"結果を {path} に保存しました")
+
+    if args.compare:
+        previous = load_report(args.compare)
+        comparison = compare_reports(previous, report, args.threshold)
+        print(format_comparison(previous, report, comparison))
+        if any(slower for *_, slower in comparison):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
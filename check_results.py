@@ -0,0 +1,109 @@
+"""
+チェック結果の表示用メッセージと出力
+
+画面（data_check.py）とヘッドレス実行（headless.py）で、チェックIDからエラー内容への変換と
+結果ファイルの列構成を同じにするための関数です。tkinter は使用しません。
+
+出力形式:
+
+- csv: BOM付きUTF-8（Excelで開いても文字化けしない）
+- parquet: pyarrow が必要
+- ndjson: 1行に1件のJSON（UTF-8）
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Optional
+
+import pandas as pd
+
+
+RESULT_COLUMNS = ["シリーズ", "ユーザID", "保守整理番号", "チェックID"]
+OUTPUT_COLUMNS = RESULT_COLUMNS + ["エラー内容"]
+
+FORMAT_CSV = "csv"
+FORMAT_PARQUET = "parquet"
+FORMAT_NDJSON = "ndjson"
+OUTPUT_FORMATS = (FORMAT_CSV, FORMAT_PARQUET, FORMAT_NDJSON)
+_EXTENSION_FORMATS = {
+    ".csv": FORMAT_CSV,
+    ".parquet": FORMAT_PARQUET,
+    ".ndjson": FORMAT_NDJSON,
+    ".jsonl": FORMAT_NDJSON,
+}
+
+
+def load_check_definitions(path) -> dict:
+    """チェック定義ファイル（check_definitions.json）を読み込む（ファイルが無い場合は空の辞書）。"""
+    path = Path(path)
+    if not path.exists():
+        return {}
+    with path.open("r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def error_message_by_check_id(check_definitions: dict, check_id) -> str:
+    """チェックIDのエラー内容を返す（ユーザー定義メッセージがあればそれを使用し、なければデフォルトを使用する）。"""
+    definition = check_definitions.get(check_id)
+    if definition:
+        user_msg = definition.get("user_message")
+        if user_msg:
+            return user_msg
+        return definition.get("default_message", "エラー内容が定義されていません。")
+    return f"不明なチェックID: {check_id}"
+
+
+def with_error_messages(results_df: pd.DataFrame, check_definitions: dict) -> pd.DataFrame:
+    """結果にエラー内容の列を追加し、出力用の列順（OUTPUT_COLUMNS）にして返す。"""
+    df = results_df.copy()
+    if "保守整理番号" not in df.columns:
+        df["保守整理番号"] = ""
+    # 同じチェックIDのメッセージは1回だけ取得する
+    messages = {check_id: error_message_by_check_id(check_definitions, check_id) for check_id in df["チェックID"].unique()}
+    df["エラー内容"] = df["チェックID"].map(messages)
+    return df[OUTPUT_COLUMNS]
+
+
+def output_format(path, fmt: Optional[str] = None) -> str:
+    """
+    出力形式を返す（fmt を省略した場合はファイルの拡張子から判定する）。
+
+    Raises:
+        ValueError: 形式が不明な場合
+    """
+    if fmt:
+        fmt = fmt.lower()
+        if fmt not in OUTPUT_FORMATS:
+            raise ValueError(f"出力形式 '{fmt}' には対応していません（{', '.join(OUTPUT_FORMATS)}）")
+        return fmt
+    extension = os.path.splitext(str(path))[1].lower()
+    if extension not in _EXTENSION_FORMATS:
+        raise ValueError(f"出力ファイル '{path}' の形式を拡張子から判定できません（--format を指定してください）")
+    return _EXTENSION_FORMATS[extension]
+
+
+def write_results(df: pd.DataFrame, path, fmt: Optional[str] = None) -> str:
+    """
+    結果を path に書き出し、使用した出力形式を返す。
+
+    書き込み中に失敗しても前回のファイルが壊れないよう、一時ファイルに書き出してから置き換えます。
+    """
+    fmt = output_format(path, fmt)
+    path = str(path)
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    tmp_path = path + ".tmp"
+    try:
+        if fmt == FORMAT_CSV:
+            df.to_csv(tmp_path, index=False, encoding="utf-8-sig")
+        elif fmt == FORMAT_PARQUET:
+            # 値の型が混在する列（ユーザIDなど）は文字列にしてから保存する
+            df.astype({column: "string" for column in df.columns if df[column].dtype == object}).to_parquet(tmp_path, index=False)
+        else:
+            df.to_json(tmp_path, orient="records", lines=True, force_ascii=False)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return fmt
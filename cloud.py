@@ -1,21 +1,14 @@
-import pyodbc
-import pymysql
 import pandas as pd
 from datetime import datetime
-import tkinter as tk
-from tkinter import filedialog, messagebox
+# メッセージボックス（ヘッドレス実行時は tkinter を使用しない）
+from dialogs import messagebox
 import re
 import os
 import traceback # Import traceback for detailed error logging
 import configparser
-
-# 共通モジュールからDB接続ヘルパー関数をインポート
-from common import (
-    _normalize_odbc_driver,
-    _enable_deprecated_tls_if_requested,
-    _build_sqlserver_conn_str,
-    get_config,
-)
+from functools import cached_property
+from itertools import product
+import numpy as np
 
 # 定数モジュールをインポート
 from constants import (
@@ -23,6 +16,47 @@ from constants import (
     BikoKeyword,
 )
 
+# 列指向ルールエンジン
+from rule_engine import (
+    ENGINE_ROW,
+    ENGINE_VECTORIZED,
+    Rule,
+    evaluate_rules,
+)
+
+# 実行するチェックが参照する列だけを取得する
+from column_projection import MYSQL, SQLSERVER, required_columns, select_list
+
+# 分割取得（ストリーミング）
+from data_stream import iter_cursor_frames, streaming_chunk_size, validate_in_chunks
+
+# 実行単位のDB接続プール
+from connection_pool import connect
+
+# 取得したテーブルのディスクキャッシュ
+from table_cache import fetch_frame
+
+# 差分チェック
+from incremental import incremental_enabled, select_checks, validate_incrementally
+
+# 照合用の参照データの索引
+from reference_index import column_index
+
+# 複数キーワードの一括照合
+from keyword_matcher import KeywordMatcher
+
+# 備考欄の正規化とキーワード判定
+from remarks import contains_any_keyword, contains_keyword
+
+# 実行時点（as-of）
+from date_columns import as_of_datetime64, now, today, with_as_of
+
+# 大きなテーブルのプロセス並列チェック
+from sharding import validate_sharded
+
+# チェックごとの処理時間の計測
+from profiling import PHASE_FETCH, PHASE_REFERENCE, PHASE_VALIDATE, PhaseTimer, profiled_check
+
 
 # グローバル変数として定義
 # t_kscmainテーブル + JOINで取得する契約フィールド
@@ -68,19 +102,91 @@ contract_start_fields = {
     'KDB_ContractInactive': 'KDB_ContractStart'
 }
 
-# DBからデータを取得（別テーブルをJOINして取得）
-def fetch_data():
-    config = get_config()
-    db_config = config['KSCLOUDDB']
+# 退会フラグと処理中フラグの対応（CHK_0011）
+# ※ t_KentemConnectContractテーブルにKC_UpdateInprogressカラムが存在しないため KENTEM-CONNECT は対象外
+contract_inprogress_fields = {
+    'DB_ContractInactive': 'DB_UpdateInprogress',
+    'SB_ContractInactive': 'SB_UpdateInprogress',
+    'FN_ContractInactive': 'FN_UpdateInprogress',
+    'SBT_ContractInactive': 'SBT_UpdateInprogress',
+    'DBP_ContractInactive': 'DBP_UpdateInprogress',
+    'SBR_ContractInactive': 'SBR_UpdateInprogress',
+    'DQC_ContractInactive': 'DQC_UpdateInprogress',
+    'KSSCAN_ContractInactive': 'KSSCAN_UpdateInprogress',
+    'PMC_ContractInactive': 'PMC_UpdateInprogress',
+    'CQC_ContractInactive': 'CQC_UpdateInprogress',
+    'WLC_ContractInactive': 'WLC_UpdateInprogress',
+    'KTD_ContractInactive': 'KTD_UpdateInprogress'
+}
+
+# CHK_0006 の対象となる販売店名の項目と禁止文字
+store_name_fields = ["CloudStoreName", "CloudStoreName2", "KsNaviStoreName", "KsNaviStoreName2", "KSARStoreName", "KSARStoreName2"]
+store_name_invalid_characters = ["▲", "×", "■"]
+
+# CHK_0007/0008 の対象シリーズ（更新案内状態, 支払方法, 販売店コード）
+update_guidance_lines = [
+    ("SendUpdateGuidanceState", "PaymentType", "CloudStoreCode"),                  # CLOUDシリーズ
+    ("KsNaviSendUpdateGuidanceState", "KsNaviPaymentType", "KsNaviStoreCode"),     # 快測ナビシリーズ
+    ("KDCSendUpdateGuidanceState", "KDCPaymentType", "KDCStoreCode"),              # 工事実績DBクラウドシリーズ
+    ("KSARSendUpdateGuidanceState", "KSARPaymentType", "KSARStoreCode"),           # 快測ARシリーズ
+]
+
+# CHK_0022 の対象となる複数年備考の項目（KDBは備考の項目が無いため対象外）
+notes_for_multiple_years_fields = [
+    'DB_NotesForMultipleYears', 'SB_NotesForMultipleYears', 'FN_NotesForMultipleYears', 
+    'SBT_NotesForMultipleYears', 'DBP_NotesForMultipleYears', 'SBR_NotesForMultipleYears', 
+    'KC_NotesForMultipleYears', 'DQC_NotesForMultipleYears', 'KSSCAN_NotesForMultipleYears', 
+    'PMC_NotesForMultipleYears', 'CQC_NotesForMultipleYears', 'WLC_NotesForMultipleYears', 
+    'KTD_NotesForMultipleYears'
+]
+
+# t_kscmain の取得列（チェックに関係なく取得する列と、チェックIDごとに参照する列）
+# チェックを追加・変更した場合は、参照する列をここにも登録してください。
+BASE_COLUMNS = ("ManagementCode", "HoshuId")
+_contract_end_columns = tuple(contract_fields) + tuple(contract_end_fields.values())
+_contract_start_columns = tuple(contract_fields) + tuple(contract_start_fields.values())
+CHECK_COLUMNS = {
+    "CLOUD_CHK_0001": ("CloudStoreCode",),
+    "CLOUD_CHK_0002": ("CloudStoreCode",),
+    "CLOUD_CHK_0003": ("CloudStoreCode", "CloudStoreCode2"),
+    "CLOUD_CHK_0004": ("CloudStoreCode", "CloudStoreCode2"),
+    "CLOUD_CHK_0005": ("CloudStoreCode", "CloudStoreCode2"),
+    # CHK_0006 のルールで CHK_0007・0008 も判定する
+    "CLOUD_CHK_0006": (
+        tuple(store_name_fields)
+        + tuple(column for line in update_guidance_lines for column in line)
+        + ("NotesForUpdate", "NotesForETC")
+        + tuple(contract_fields)
+    ),
+    "CLOUD_CHK_0010": ("NotesForRTC",),
+    "CLOUD_CHK_0011": tuple(contract_inprogress_fields) + tuple(contract_inprogress_fields.values()),
+    "CLOUD_CHK_0012": tuple(contract_fields) + ("SalesRepresentativeCode",),
+    "CLOUD_CHK_0013": _contract_end_columns,
+    "CLOUD_CHK_0014": _contract_end_columns,
+    "CLOUD_CHK_0016": _contract_start_columns,
+    "CLOUD_CHK_0019": _contract_end_columns,
+    "CLOUD_CHK_0020": _contract_start_columns,
+    "CLOUD_CHK_0021": ("NotesForUpdate", "NotesForETC"),
+    "CLOUD_CHK_0022": tuple(notes_for_multiple_years_fields),
+    "CLOUD_CHK_0023": _contract_start_columns + tuple(contract_end_fields.values()),
+}
+
+# 当日と比較するチェック（差分チェックでは前回のエラーを再利用せず、毎回全行でチェックする）
+DATE_DEPENDENT_CHECKS = frozenset({"CLOUD_CHK_0010", "CLOUD_CHK_0013", "CLOUD_CHK_0014", "CLOUD_CHK_0016"})
+
+# t_stdmain_h の取得列（販売店マスタの辞書で参照する列）
+SHOP_DB_COLUMNS = ("maiCode", "maiCloudUpdateLimit")
+
+def _data_query(cursor, check_ids=None):
+    """t_kscmain と t_KentemConnectContract を結合して取得するクエリを作成する。"""
+    # KENTEM-CONNECT の列は結合先から明示的に取得するため、t_kscmain の列だけを絞り込む
+    columns = required_columns(CHECK_COLUMNS, BASE_COLUMNS, check_ids)
+    main_columns = select_list(cursor, [("t_kscmain", "m")], columns, SQLSERVER)
 
-    conn_str = _build_sqlserver_conn_str(db_config)
-    conn = pyodbc.connect(conn_str)
-    cursor = conn.cursor()
-    
     # t_kscmainと別テーブルをLEFT JOINで結合
-    query = """
+    return f"""
     SELECT 
-        m.*,
+        {main_columns},
         kc.KC_ContractInactive,
         kc.KC_ContractStart,
         kc.KC_ContractEnd,
@@ -89,81 +195,337 @@ def fetch_data():
     LEFT JOIN t_KentemConnectContract kc ON m.ManagementCode = kc.KC_ManagementCode
     ORDER BY m.ID ASC
     """
-    cursor.execute(query)
-    columns = [column[0] for column in cursor.description]  # カラム名を取得
-    data = cursor.fetchall()
-    conn.close()
 
-    # データが1列の場合、各行をリストに変換
-    data = [list(row) for row in data]  # 必要に応じて形状を修正
+# DBからデータを取得（別テーブルをJOINして取得）
+def fetch_data(check_ids=None):
+    """
+    t_kscmain と t_KentemConnectContract を結合して取得する。
 
-    # DataFrameに変換
-    df = pd.DataFrame(data, columns=columns)
+    Args:
+        check_ids: 実行するチェックIDの一覧（None の場合は全てのチェック）。
+            t_kscmain から取得する列は、これらのチェックが参照する列に絞り込みます。
+    """
+    with connect('KSCLOUDDB') as conn:
+        cursor = conn.cursor()
+        query = _data_query(cursor, check_ids)
+        # DataFrameに変換（テーブルキャッシュが有効な場合はキャッシュから読み込む）
+        df = fetch_frame('KSCLOUDDB', cursor, query)
     # データフレームのカラムを確認
 
     return df
 
+def iter_data(chunk_size, check_ids=None):
+    """
+    fetch_data と同じデータを chunk_size 行ずつ取得し、DataFrameとして順に返す（ストリーミング）。
+    """
+    with connect('KSCLOUDDB') as conn:
+        cursor = conn.cursor()
+        cursor.execute(_data_query(cursor, check_ids))
+        yield from iter_cursor_frames(cursor, chunk_size)
+
 # 営業データを取得
 def fetch_excluded_sales_data():
     # MySQLへの接続
-    config = get_config()
-    db_config = config['KSMAIN_MYSQL']
-
-    conn = pymysql.connect(
-        host=db_config['host'],
-        database=db_config['database'],
-        user=db_config['user'],
-        password=db_config['password'],
-        charset=db_config['charset'],
-    )
-    cursor = conn.cursor()
-    cursor.execute("SELECT salCode, salKName FROM t_salmst_k WHERE salKName LIKE '%×%' OR salKName LIKE '%・%';")
-    
-    # カラム名を取得
-    columns = [desc[0] for desc in cursor.description]
-    data = cursor.fetchall()
-    conn.close()
-
-    # DataFrameに変換
-    df = pd.DataFrame(data, columns=columns)
+    with connect('KSMAIN_MYSQL') as conn:
+        cursor = conn.cursor()
+        # DataFrameに変換（テーブルキャッシュが有効な場合はキャッシュから読み込む）
+        df = fetch_frame('KSMAIN_MYSQL', cursor, "SELECT salCode, salKName FROM t_salmst_k WHERE salKName LIKE '%×%' OR salKName LIKE '%・%';")
 
     return df
 
 # ショップDBデータを取得
 def get_shop_db_data():
     # MySQLへの接続
-    config = get_config()
-    db_config = config['KSMAIN_MYSQL']
-
-    conn = pymysql.connect(
-        host=db_config['host'],
-        database=db_config['database'],
-        user=db_config['user'],
-        password=db_config['password'],
-        charset=db_config['charset'],
-    )
-    cursor = conn.cursor()
-    cursor.execute("SELECT * FROM t_stdmain_h")
-    
-    # カラム名を取得
-    columns = [desc[0] for desc in cursor.description]
-    data = cursor.fetchall()
-    conn.close()
-
-    # DataFrameに変換
-    df = pd.DataFrame(data, columns=columns)
+    with connect('KSMAIN_MYSQL') as conn:
+        cursor = conn.cursor()
+        select_columns = select_list(cursor, [("t_stdmain_h", None)], SHOP_DB_COLUMNS, MYSQL)
+        # DataFrameに変換（テーブルキャッシュが有効な場合はキャッシュから読み込む）
+        df = fetch_frame('KSMAIN_MYSQL', cursor, f"SELECT {select_columns} FROM t_stdmain_h")
 
     return df
 
+def _add_error_message(error_messages, user_id, check_id, maintenance_id=None):
+    """共通のエラーメッセージを追加するヘルパー関数（保守整理番号を含む）"""
+    error_messages.append({
+        "シリーズ": "CLOUD",
+        "ユーザID": user_id,
+        "保守整理番号": maintenance_id,
+        "チェックID": check_id
+    })
+
+# --- validate_data から呼び出す各チェック（行単位） ---
+
+# CHK_0001: CloudStoreCode(販店1マスタ)のバリデーション
+def check_store_code_format(row, error_messages):
+    maintenance_id = row.get("HoshuId", "")
+    if pd.notna(row["CloudStoreCode"]) and str(row["CloudStoreCode"]).strip() != "":
+        if not (str(row["CloudStoreCode"]).isdigit() and len(str(row["CloudStoreCode"])) == 6) and \
+        not (str(row["CloudStoreCode"]).startswith("kshh") and len(str(row["CloudStoreCode"])) == 4) and \
+        not str(row["CloudStoreCode"]).startswith("A"):
+            error_messages.append({
+                "シリーズ": "CLOUD",
+                "ユーザID": row["ManagementCode"],
+                "保守整理番号": maintenance_id,  # 保守整理番号を追加
+                "チェックID": "CLOUD_CHK_0001"
+            })
+
+# CHK_0002:CloudStoreCodeが"ksALL"を含んでいる場合はNG
+def check_store_code_ksall(row, error_messages):
+    if "ksALL" in str(row["CloudStoreCode"]):
+        error_messages.append({
+            "シリーズ": "CLOUD",
+            "ユーザID": row["ManagementCode"],
+            "保守整理番号": row.get("HoshuId", ""),  # 保守整理番号を追加
+            "チェックID": "CLOUD_CHK_0002"
+        })
+
+# CHK_0003: CloudStoreCodeが004359(リコー)の場合、CloudStoreCode2が空白だとNG
+def check_ricoh_store_code2(row, error_messages):
+    if row.get("CloudStoreCode") == "004359" and not str(row.get("CloudStoreCode2", "")).strip():
+        error_messages.append({
+            "シリーズ": "CLOUD",
+            "ユーザID": row["ManagementCode"],
+            "保守整理番号": row.get("HoshuId", ""),  # 保守整理番号を追加
+            "チェックID": "CLOUD_CHK_0003"
+        })
+
+# CHK_0004: CloudStoreCodeが000286(建築資料)の場合、CloudStoreCode2が空白だとNG
+def check_kenchiku_store_code2(row, error_messages):
+    if row["CloudStoreCode"] == "000286" and not row["CloudStoreCode2"]:
+        error_messages.append({
+            "シリーズ": "CLOUD",
+            "ユーザID": row["ManagementCode"],
+            "保守整理番号": row.get("HoshuId", ""),  # 保守整理番号を追加
+            "チェックID": "CLOUD_CHK_0004"
+        })
+
+# CHK_0005: CloudStoreCodeが001275(キヤノン(新潟のみ）)の場合、CloudStoreCode2が空白だとNG
+def check_canon_store_code2(row, error_messages):
+    if row["CloudStoreCode"] == "001275" and not row["CloudStoreCode2"]:
+        error_messages.append({
+            "シリーズ": "CLOUD",
+            "ユーザID": row["ManagementCode"],
+            "保守整理番号": row.get("HoshuId", ""),  # 保守整理番号を追加
+            "チェックID": "CLOUD_CHK_0005"
+        })
+
+# CHK_0006: CloudStoreName, CloudStoreName2, KsNaviStoreName, KsNaviStoreName2, KSARStoreName, KSARStoreName2に▲、×、■を含む場合NG
+# ※ CHK_0007/CHK_0008 の呼び出しは従来どおり店舗名フィールドのループ内で行う
+def check_store_names_and_update_guidance(row, shop_db_dict, error_messages):
+    for field in store_name_fields:
+        if any(char in (row.get(field) or "") for char in store_name_invalid_characters):
+            error_messages.append({
+            "シリーズ": "CLOUD",
+            "ユーザID": row["ManagementCode"],
+            "保守整理番号": row.get("HoshuId", ""),  # 保守整理番号を追加
+            "チェックID": "CLOUD_CHK_0006"
+        })
+
+    # CHK_0007:更新案内送る新進(1)でCloudStoreCode　が　更新案内不要リストに存在する場合NG
+        # CLOUDシリーズ
+        check_0007(
+            row, shop_db_dict, error_messages,
+            "SendUpdateGuidanceState", "PaymentType", "ManagementCode",
+            "CloudStoreCode", "CLOUD_CHK_0007"
+        )
+        # 快測ナビシリーズ
+        check_0007(
+            row, shop_db_dict, error_messages,
+            "KsNaviSendUpdateGuidanceState", "KsNaviPaymentType", "ManagementCode", # 例: ユーザーIDのキーも変わる可能性
+            "KsNaviStoreCode", "CLOUD_CHK_0007" # CHK_IDもシリーズごとに変わる可能性
+        )
+        # 工事実績DBクラウドシリーズ
+        check_0007(
+            row, shop_db_dict, error_messages,
+            "KDCSendUpdateGuidanceState", "KDCPaymentType", "ManagementCode",
+            "KDCStoreCode", "CLOUD_CHK_0007"
+        )
+        # 快測ARシリーズ
+        check_0007(
+            row, shop_db_dict, error_messages,
+            "KSARSendUpdateGuidanceState", "KSARPaymentType", "ManagementCode",
+            "KSARStoreCode", "CLOUD_CHK_0007"
+        )
+
+    # CHK_0008: SendUpdateGuidanceStateが1以外の場合、NotesForUpdate、NotesForETCに特別発送、更新案内の記載がない場合NG
+        # CLOUDシリーズ
+        check_0008(
+            row, shop_db_dict, error_messages,
+            "SendUpdateGuidanceState", "PaymentType", "ManagementCode",
+            "CloudStoreCode", "CLOUD_CHK_0008"
+        )
+        # 快測ナビシリーズ
+        check_0008(
+            row, shop_db_dict, error_messages,
+            "KsNaviSendUpdateGuidanceState", "KsNaviPaymentType", "ManagementCode", # 例: ユーザーIDのキーも変わる可能性
+            "KsNaviStoreCode", "CLOUD_CHK_0008" # CHK_IDもシリーズごとに変わる可能性
+        )
+        # 工事実績DBクラウドシリーズ
+        check_0008(
+            row, shop_db_dict, error_messages,
+            "KDCSendUpdateGuidanceState", "KDCPaymentType", "ManagementCode",
+            "KDCStoreCode", "CLOUD_CHK_0008"
+        )
+        # 快測ARシリーズ
+        check_0008(
+            row, shop_db_dict, error_messages,
+            "KSARSendUpdateGuidanceState", "KSARPaymentType", "ManagementCode",
+            "KSARStoreCode", "CLOUD_CHK_0008"
+        )
+
+# CHK_0011: 各シリーズで退会(***_ContractInactive)がTrueで処理中(***_UpdateInprogress)がtrueの場合NG
+def check_all_inactive_and_inprogress(row, error_messages):
+    for inactive_field, inprogress_field in contract_inprogress_fields.items():
+        check_inactive_and_inprogress(row, inactive_field, inprogress_field, error_messages, "CLOUD_CHK_0011")
+
+# CHK_0021 備考が空白でないものをチェック
+def check_notes_not_empty(row, error_messages):
+    if row['NotesForUpdate'] or row['NotesForETC']:
+        error_messages.append({
+            "シリーズ": "CLOUD",
+            "ユーザID": row["ManagementCode"],
+            "保守整理番号": row.get("HoshuId", ""),  # 保守整理番号を追加
+            "チェックID": "CLOUD_CHK_0021"
+        })
+
+# --- 契約行列（14シリーズ分の契約項目をまとめて判定する） ---
+
+def _datetime_matrix(view, columns):
+    """
+    日付列を datetime64 の N×len(columns) 行列にする。
+
+    日付型でない列（None のみの列や文字列など）は行単位の比較と結果が一致しないため
+    TypeError を送出し、呼び出し元のチェックを行単位の評価に切り替える。
+    """
+    arrays = []
+    for column in columns:
+        source = view.source(column)
+        if not (isinstance(source.dtype, np.dtype) and source.dtype.kind == "M"):
+            raise TypeError(f"{column} は日付型ではありません")
+        arrays.append(source.to_numpy(dtype="datetime64[us]"))
+    return np.column_stack(arrays) if arrays else np.empty((len(view), 0), dtype="datetime64[us]")
+
+class ContractMatrix:
+    """
+    14シリーズの契約項目を N×14 の行列として保持するクラス。
+
+    列の並びは contract_fields と同じです。退会フラグ・開始日・満了日をそれぞれ一度だけ
+    行列化し、各チェックは行方向の any / sum で判定します。
+    行列は必要になった時点で作成します。
+    """
+
+    def __init__(self, view):
+        self._view = view
+        self.now = as_of_datetime64()
+
+    def _truthy_matrix(self, columns):
+        return np.column_stack([self._view.truthy(column).to_numpy() for column in columns])
+
+    @cached_property
+    def inactive(self):
+        """退会フラグ (bool(row[***_ContractInactive]))"""
+        return self._truthy_matrix(contract_fields)
+
+    @cached_property
+    def any_active(self):
+        """いずれかの契約が加入中か (is_any_contract_active と同じ判定)"""
+        return (~self.inactive).any(axis=1)
+
+    @cached_property
+    def start_filled(self):
+        """開始日が空白でないか (bool(row[***_ContractStart]))"""
+        return self._truthy_matrix([contract_start_fields[field] for field in contract_fields])
+
+    @cached_property
+    def end_filled(self):
+        """満了日が空白でないか (bool(row[***_ContractEnd]))"""
+        return self._truthy_matrix([contract_end_fields[field] for field in contract_fields])
+
+    @cached_property
+    def start(self):
+        """開始日 (datetime64)"""
+        return _datetime_matrix(self._view, [contract_start_fields[field] for field in contract_fields])
+
+    @cached_property
+    def end(self):
+        """満了日 (datetime64)"""
+        return _datetime_matrix(self._view, [contract_end_fields[field] for field in contract_fields])
+
+def _contract_matrix(view):
+    return view.cached("contract_matrix", lambda: ContractMatrix(view))
+
+# --- 列指向（ベクトル化）評価用のマスク関数群 ---
+
+def _mask_0011(view):
+    inactive = np.column_stack([view.truthy(field).to_numpy() for field in contract_inprogress_fields])
+    inprogress = np.column_stack([view.truthy(field).to_numpy() for field in contract_inprogress_fields.values()])
+    return pd.Series((inactive & inprogress).sum(axis=1))
+
+def _mask_0012(view, excluded_sales_list):
+    matrix = _contract_matrix(view)
+    return pd.Series(matrix.any_active) & excluded_sales_list.isin(view.raw("SalesRepresentativeCode"))
+
+def _mask_0013(view):
+    matrix = _contract_matrix(view)
+    return pd.Series((~matrix.inactive & (matrix.end < matrix.now)).any(axis=1))
+
+def _mask_0014(view):
+    matrix = _contract_matrix(view)
+    return pd.Series((matrix.inactive & (matrix.end > matrix.now)).any(axis=1))
+
+def _mask_0016(view):
+    matrix = _contract_matrix(view)
+    return pd.Series((matrix.inactive & (matrix.start > matrix.now)).any(axis=1))
+
+def _mask_0019(view):
+    matrix = _contract_matrix(view)
+    return pd.Series((~matrix.inactive & ~matrix.end_filled).any(axis=1))
+
+def _mask_0020(view):
+    matrix = _contract_matrix(view)
+    return pd.Series((~matrix.inactive & ~matrix.start_filled).any(axis=1))
+
+# CHK_0022: 複数年備考に残っていてはいけないキーワード
+_reduce_and_renew_matcher = KeywordMatcher([BikoKeyword.REDUCE_AND_RENEW])
+
+def _mask_0022(view):
+    # 備考の項目ごとにエラーを1件（各列は同じ値を1回だけ走査する）
+    counts = np.zeros(len(view), dtype=int)
+    for field in notes_for_multiple_years_fields:
+        counts += _reduce_and_renew_matcher.contains(view.raw(field)).to_numpy()
+    return pd.Series(counts)
+
+def _mask_0023(view):
+    matrix = _contract_matrix(view)
+    has_databank = (view.truthy("DB_ContractStart") & view.truthy("DB_ContractEnd")).to_numpy()
+    others = [index for index, field in enumerate(contract_fields) if field != 'DB_ContractInactive']
+    db_start = view.source("DB_ContractStart").to_numpy(dtype="datetime64[us]")[:, None]
+    db_end = view.source("DB_ContractEnd").to_numpy(dtype="datetime64[us]")[:, None]
+    start = matrix.start[:, others]
+    end = matrix.end[:, others]
+    filled = matrix.start_filled[:, others] & matrix.end_filled[:, others]
+    # check_contract_period_within_databank の対象判定は、ループ変数の都合で退会フラグではなく
+    # 開始日の列を参照している（開始日が空白の契約のみ対象）。出力を変えないよう同じ条件にする。
+    target = ~matrix.start_filled[:, others]
+    within = (db_start <= start) & (start <= db_end) & (db_start <= end) & (end <= db_end)
+    return pd.Series((has_databank[:, None] & target & filled & ~within).sum(axis=1))
+
+def _run_check_function(check_func, row, row_errors, current_id, maintenance_id):
+    """行単位のチェック関数を1件実行する（例外は従来どおり呼び出し元へ送出する）"""
+    check_func(row, row_errors)
+
 # データチェック関数
-def validate_data(df, progress_callback):
-    errors = []  # 🔹 エラーリストを初期化
-    total_ids = len(df)
+def prepare_reference_data():
+    """
+    チェックで使用するマスタデータ（対象外営業リスト・販売店マスタ）をまとめて取得する。
 
+    Returns:
+        dict: validate_data の reference_data に渡す辞書
+    """
     # 不要販売店リストは削除されました（要望#005対応）
 
-    # 対象外営業リストの取得
-    excluded_sales_list = fetch_excluded_sales_data()["salCode"].tolist()
+    # 対象外営業リストの取得（行ごとに照合するため索引にしておく）
+    excluded_sales_list = column_index(fetch_excluded_sales_data(), "salCode")
 
     # 販売店マスタの取得
     shop_db_df = get_shop_db_data() # まずDataFrameとして取得
@@ -175,201 +537,95 @@ def validate_data(df, progress_callback):
         }
         for item in shop_db_list
     }
+    return {"excluded_sales_list": excluded_sales_list, "shop_db_dict": shop_db_dict}
 
-    for index, row in df.iterrows():
-        error_messages = []
-        current_id = row.get("ManagementCode") # 適切なIDカラム名に置き換える
-        maintenance_id = row.get("HoshuId", "")  # 保守整理番号を取得（要望に基づく）
-        # 進捗更新
-        if progress_callback and (index % 10 == 0 or index == total_ids - 1): # 10件ごとに更新、または最後
-            progress_callback(f"CLOUD: {current_id} をチェック中 ({index+1}/{total_ids})")
-
-        # CHK_0001: CloudStoreCode(販店1マスタ)のバリデーション
-        if pd.notna(row["CloudStoreCode"]) and str(row["CloudStoreCode"]).strip() != "":
-            if not (str(row["CloudStoreCode"]).isdigit() and len(str(row["CloudStoreCode"])) == 6) and \
-            not (str(row["CloudStoreCode"]).startswith("kshh") and len(str(row["CloudStoreCode"])) == 4) and \
-            not str(row["CloudStoreCode"]).startswith("A"):
-                error_messages.append({
-                    "シリーズ": "CLOUD",
-                    "ユーザID": row["ManagementCode"],
-                    "保守整理番号": maintenance_id,  # 保守整理番号を追加
-                    "チェックID": "CLOUD_CHK_0001"
-                })
-
-        # CHK_0002:CloudStoreCodeが"ksALL"を含んでいる場合はNG
-        if "ksALL" in str(row["CloudStoreCode"]):
-            error_messages.append({
-                "シリーズ": "CLOUD",
-                "ユーザID": row["ManagementCode"],
-                "保守整理番号": maintenance_id,  # 保守整理番号を追加
-                "チェックID": "CLOUD_CHK_0002"
-            })
-
-        # CHK_0003: CloudStoreCodeが004359(リコー)の場合、CloudStoreCode2が空白だとNG
-        if row.get("CloudStoreCode") == "004359" and not str(row.get("CloudStoreCode2", "")).strip():
-            error_messages.append({
-                "シリーズ": "CLOUD",
-                "ユーザID": row["ManagementCode"],
-                "保守整理番号": maintenance_id,  # 保守整理番号を追加
-                "チェックID": "CLOUD_CHK_0003"
-            })
-
-        # CHK_0004: CloudStoreCodeが000286(建築資料)の場合、CloudStoreCode2が空白だとNG
-        if row["CloudStoreCode"] == "000286" and not row["CloudStoreCode2"]:
-            error_messages.append({
-                "シリーズ": "CLOUD",
-                "ユーザID": row["ManagementCode"],
-                "保守整理番号": maintenance_id,  # 保守整理番号を追加
-                "チェックID": "CLOUD_CHK_0004"
-            })
-
-        # CHK_0005: CloudStoreCodeが001275(キヤノン(新潟のみ）)の場合、CloudStoreCode2が空白だとNG
-        if row["CloudStoreCode"] == "001275" and not row["CloudStoreCode2"]:
-            error_messages.append({
-                "シリーズ": "CLOUD",
-                "ユーザID": row["ManagementCode"],
-                "保守整理番号": maintenance_id,  # 保守整理番号を追加
-                "チェックID": "CLOUD_CHK_0005"
-            })
-
-        # CHK_0006: CloudStoreName, CloudStoreName2, KsNaviStoreName, KsNaviStoreName2, KSARStoreName, KSARStoreName2に▲、×、■を含む場合NG
-        invalid_characters = ["▲", "×", "■"]
-        fields_to_check = ["CloudStoreName", "CloudStoreName2", "KsNaviStoreName", "KsNaviStoreName2", "KSARStoreName", "KSARStoreName2"]
-
-        for field in fields_to_check:
-            if any(char in (row.get(field) or "") for char in invalid_characters):
-                error_messages.append({
-                "シリーズ": "CLOUD",
-                "ユーザID": row["ManagementCode"],
-                "保守整理番号": maintenance_id,  # 保守整理番号を追加
-                "チェックID": "CLOUD_CHK_0006"
-            })
+@with_as_of
+def validate_data(df, progress_callback, engine=ENGINE_VECTORIZED, reference_data=None, date_dependent=None):
+    """
+    CLOUDの全チェックを実行し、エラー一覧のDataFrameを返す。
 
-        # CHK_0007:更新案内送る新進(1)でCloudStoreCode　が　更新案内不要リストに存在する場合NG
-            # CLOUDシリーズ
-            check_0007(
-                row, shop_db_dict, error_messages,
-                "SendUpdateGuidanceState", "PaymentType", "ManagementCode",
-                "CloudStoreCode", "CLOUD_CHK_0007"
-            )
-            # 快測ナビシリーズ
-            check_0007(
-                row, shop_db_dict, error_messages,
-                "KsNaviSendUpdateGuidanceState", "KsNaviPaymentType", "ManagementCode", # 例: ユーザーIDのキーも変わる可能性
-                "KsNaviStoreCode", "CLOUD_CHK_0007" # CHK_IDもシリーズごとに変わる可能性
-            )
-            # 工事実績DBクラウドシリーズ
-            check_0007(
-                row, shop_db_dict, error_messages,
-                "KDCSendUpdateGuidanceState", "KDCPaymentType", "ManagementCode",
-                "KDCStoreCode", "CLOUD_CHK_0007"
-            )
-            # 快測ARシリーズ
-            check_0007(
-                row, shop_db_dict, error_messages,
-                "KSARSendUpdateGuidanceState", "KSARPaymentType", "ManagementCode",
-                "KSARStoreCode", "CLOUD_CHK_0007"
-            )   
-
-        # CHK_0008: SendUpdateGuidanceStateが1以外の場合、NotesForUpdate、NotesForETCに特別発送、更新案内の記載がない場合NG
-            # CLOUDシリーズ
-            check_0008(
-                row, shop_db_dict, error_messages,
-                "SendUpdateGuidanceState", "PaymentType", "ManagementCode",
-                "CloudStoreCode", "CLOUD_CHK_0008"
-            )
-            # 快測ナビシリーズ
-            check_0008(
-                row, shop_db_dict, error_messages,
-                "KsNaviSendUpdateGuidanceState", "KsNaviPaymentType", "ManagementCode", # 例: ユーザーIDのキーも変わる可能性
-                "KsNaviStoreCode", "CLOUD_CHK_0008" # CHK_IDもシリーズごとに変わる可能性
-            )
-            # 工事実績DBクラウドシリーズ
-            check_0008(
-                row, shop_db_dict, error_messages,
-                "KDCSendUpdateGuidanceState", "KDCPaymentType", "ManagementCode",
-                "KDCStoreCode", "CLOUD_CHK_0008"
-            )
-            # 快測ARシリーズ
-            check_0008(
-                row, shop_db_dict, error_messages,
-                "KSARSendUpdateGuidanceState", "KSARPaymentType", "ManagementCode",
-                "KSARStoreCode", "CLOUD_CHK_0008"
-            )
+    engine に ENGINE_VECTORIZED（既定）を指定すると、マスク関数を持つチェックを列単位で評価する。
+    ENGINE_ROW を指定すると従来どおり iterrows で1行ずつ評価する。どちらのエンジンでも出力は同一。
+    分割取得したチャンクごとに呼び出す場合は、prepare_reference_data の結果を reference_data に渡す。
+    date_dependent に True を指定すると当日と比較するチェック（DATE_DEPENDENT_CHECKS）だけ、
+    False を指定するとそれ以外のチェックだけを実行する（差分チェック用）。
+    """
+    errors = []  # 🔹 エラーリストを初期化
+    total_ids = len(df)
 
+    if reference_data is None:
+        reference_data = prepare_reference_data()
+    excluded_sales_list = reference_data["excluded_sales_list"]
+    shop_db_dict = reference_data["shop_db_dict"]
+
+    # 各チェックは (チェックID, 列単位のマスク関数, 行単位のチェック関数) の組で登録します。
+    # マスク関数が None のチェックは常に行単位で評価します。
+    check_rules = [
+        Rule("CLOUD_CHK_0001", None, check_store_code_format),
+        Rule("CLOUD_CHK_0002", None, check_store_code_ksall),
+        Rule("CLOUD_CHK_0003", None, check_ricoh_store_code2),
+        Rule("CLOUD_CHK_0004", None, check_kenchiku_store_code2),
+        Rule("CLOUD_CHK_0005", None, check_canon_store_code2),
+        # CHK_0006 販売店名の禁止文字 / CHK_0007・0008 更新案内の組み合わせ
+        Rule("CLOUD_CHK_0006", lambda view: _mask_0006_0008(view, shop_db_dict),
+             lambda row, errors: check_store_names_and_update_guidance(row, shop_db_dict, errors)),
         # CHK_0009:工事実績DBクラウド
-
         # CHK_0010 備考(NotesForRTC)に補助金の記載がある場合に日付が過去になっているとNG
-        check_subsidy_date(row, error_messages)
-
-        # CHK_0011: データバンク 退会(DB_ContractInactive)がTrueで処理中（DB_UpdateInprogress）がtrueの場合NG
-        check_inactive_and_inprogress(row, "DB_ContractInactive", "DB_UpdateInprogress", error_messages, "CLOUD_CHK_0011")
-        # CHK_0011: サイトボックスで複数年の場合に記載がない場合はNG
-        check_inactive_and_inprogress(row, "SB_ContractInactive", "SB_UpdateInprogress", error_messages, "CLOUD_CHK_0011")
-        # CHK_0011: フィールドネットで複数年の場合に記載がない場合はNG
-        check_inactive_and_inprogress(row, "FN_ContractInactive", "FN_UpdateInprogress", error_messages, "CLOUD_CHK_0011")
-        # CHK_0011: サイトボックストンネルで複数年の場合に記載がない場合はNG
-        check_inactive_and_inprogress(row, "SBT_ContractInactive", "SBT_UpdateInprogress", error_messages, "CLOUD_CHK_0011")
-        # CHK_0011: 写管屋クラウドで複数年の場合に記載がない場合はNG
-        check_inactive_and_inprogress(row, "DBP_ContractInactive", "DBP_UpdateInprogress", error_messages, "CLOUD_CHK_0011")
-        # CHK_0011: 配筋検査で複数年の場合に記載がない場合はNG
-        check_inactive_and_inprogress(row, "SBR_ContractInactive", "SBR_UpdateInprogress", error_messages, "CLOUD_CHK_0011")
-        # CHK_0011: KENTEM-CONNECTで複数年の場合に記載がない場合はNG
-        # ※ t_KentemConnectContractテーブルにKC_UpdateInprogressカラムが存在しないため無効化
-        # check_inactive_and_inprogress(row, "KC_ContractInactive", "KC_UpdateInprogress", error_messages, "CLOUD_CHK_0011")
-        # CHK_0011: 出来形管理クラウドで複数年の場合に記載がない場合はNG
-        check_inactive_and_inprogress(row, "DQC_ContractInactive", "DQC_UpdateInprogress", error_messages, "CLOUD_CHK_0011")
-        # CHK_0011: 快測Scanで複数年の場合に記載がない場合はNG
-        check_inactive_and_inprogress(row, "KSSCAN_ContractInactive", "KSSCAN_UpdateInprogress", error_messages, "CLOUD_CHK_0011")
-        # CHK_0011: 日報管理クラウドで複数年の場合に記載がない場合はNG
-        check_inactive_and_inprogress(row, "PMC_ContractInactive", "PMC_UpdateInprogress", error_messages, "CLOUD_CHK_0011")
-        # CHK_0011: 品質管理クラウドで複数年の場合に記載がない場合はNG
-        check_inactive_and_inprogress(row, "CQC_ContractInactive", "CQC_UpdateInprogress", error_messages, "CLOUD_CHK_0011")
-        # CHK_0011: 施工体制クラウドで複数年の場合に記載がない場合はNG
-        check_inactive_and_inprogress(row, "WLC_ContractInactive", "WLC_UpdateInprogress", error_messages, "CLOUD_CHK_0011")
-        # CHK_0011: KENTEM-ToDoで複数年の場合に記載がない場合はNG
-        check_inactive_and_inprogress(row, "KTD_ContractInactive", "KTD_UpdateInprogress", error_messages, "CLOUD_CHK_0011")
-        # CHK_0011:快測AR
-        # CHK_0011:工事実績DBクラウド
-
+        Rule("CLOUD_CHK_0010", None, check_subsidy_date),
+        # CHK_0011: 退会で処理中の場合NG（KENTEM-CONNECTはKC_UpdateInprogressカラムが無いため対象外）
+        Rule("CLOUD_CHK_0011", _mask_0011, check_all_inactive_and_inprogress),
         # CHK_0012: 加入中で担当営業が売上あがらない営業担当になっている場合NG
-        check_series_and_sales_rep(row, excluded_sales_list, error_messages, "CLOUD_CHK_0012")
-
+        Rule("CLOUD_CHK_0012", lambda view: _mask_0012(view, excluded_sales_list),
+             lambda row, errors: check_series_and_sales_rep(row, excluded_sales_list, errors, "CLOUD_CHK_0012")),
         # CHK_0013: 加入中で満了日が過去になっている場合NG
-        check_active_and_expired(row, error_messages, "CLOUD_CHK_0013")
-
+        Rule("CLOUD_CHK_0013", _mask_0013, lambda row, errors: check_active_and_expired(row, errors, "CLOUD_CHK_0013")),
         # CHK_0014: 退会中で満了日が未来になっている場合NG
-        check_inactive_and_not_expired(row, error_messages, "CLOUD_CHK_0014")
-
+        Rule("CLOUD_CHK_0014", _mask_0014, lambda row, errors: check_inactive_and_not_expired(row, errors, "CLOUD_CHK_0014")),
         # CHK_0015: 加入中で加入日が過去になっている場合はNG
-
         # CHK_0016: 退会中で加入日が未来の日付になっている場合NG
-        check_inactive_and_future_start(row, error_messages, "CLOUD_CHK_0016")
-
+        Rule("CLOUD_CHK_0016", _mask_0016, lambda row, errors: check_inactive_and_future_start(row, errors, "CLOUD_CHK_0016")),
         # CHK_0017: 加入中＝更新月　空白
         # CHK_0018: 加入中＝加入年数　空白
-
         # CHK_0019 加入中で満了日が空白になっている場合NG
-        check_active_and_empty_expiration(row, error_messages, "CLOUD_CHK_0019")
-
+        Rule("CLOUD_CHK_0019", _mask_0019, lambda row, errors: check_active_and_empty_expiration(row, errors, "CLOUD_CHK_0019")),
         # CHK_0020 加入中で開始日が空白になっている場合NG
-        check_active_and_empty_start(row, error_messages, "CLOUD_CHK_0020")
-
+        Rule("CLOUD_CHK_0020", _mask_0020, lambda row, errors: check_active_and_empty_start(row, errors, "CLOUD_CHK_0020")),
         # CHK_0021 備考が空白でないものをチェック
-        if row['NotesForUpdate'] or row['NotesForETC']:
-            error_messages.append({
-                "シリーズ": "CLOUD",
-                "ユーザID": row["ManagementCode"],
-                "保守整理番号": maintenance_id,  # 保守整理番号を追加
-                "チェックID": "CLOUD_CHK_0021"
-            })
-
+        Rule("CLOUD_CHK_0021", None, check_notes_not_empty),
         # CHK_0022 減らして更新のキーワードが残っている場合NG
-        check_notes_for_keywords(row, error_messages, "CLOUD_CHK_0022")
-
+        Rule("CLOUD_CHK_0022", _mask_0022, lambda row, errors: check_notes_for_keywords(row, errors, "CLOUD_CHK_0022")),
         #CHK_0023 データバンクの契約期間内に収まっていない場合はNG
-        check_contract_period_within_databank(row, error_messages, "CLOUD_CHK_0023")
-    
+        Rule("CLOUD_CHK_0023", _mask_0023,
+             lambda row, errors: check_contract_period_within_databank(row, errors, "CLOUD_CHK_0023")),
+    ]
+    check_rules = select_checks(check_rules, DATE_DEPENDENT_CHECKS, date_dependent, key=lambda rule: rule.check_id)
+
+    if engine == ENGINE_VECTORIZED:
+        hits = evaluate_rules(
+            df, check_rules, _add_error_message, _run_check_function,
+            user_id_column="ManagementCode", maintenance_id_column="HoshuId",
+            progress_callback=progress_callback, progress_label="CLOUD",
+        )
+        maintenance_ids = df["HoshuId"].tolist() if "HoshuId" in df.columns else [""] * total_ids
+        for position, error in hits:
+            # 保守整理番号を追加
+            if "保守整理番号" not in error or not error["保守整理番号"]:
+                error["保守整理番号"] = maintenance_ids[position]
+            errors.append(error)
+        return pd.DataFrame(errors, columns=["シリーズ", "ユーザID", "保守整理番号", "チェックID"])
+
+    row_checks = [profiled_check("CLOUD", rule.check_id, rule.row_check) for rule in check_rules]
+    for index, row in df.iterrows():
+        error_messages = []
+        current_id = row.get("ManagementCode") # 適切なIDカラム名に置き換える
+        maintenance_id = row.get("HoshuId", "")  # 保守整理番号を取得（要望に基づく）
+        # 進捗更新
+        if progress_callback and (index % 10 == 0 or index == total_ids - 1): # 10件ごとに更新、または最後
+            progress_callback(f"CLOUD: {current_id} をチェック中 ({index+1}/{total_ids})")
+
+        for check_func in row_checks:
+            _run_check_function(check_func, row, error_messages, current_id, maintenance_id)
+
         # 保守整理番号を追加
         for error in error_messages:
             if "保守整理番号" not in error or not error["保守整理番号"]:
@@ -392,6 +648,85 @@ def save_to_excel(errors_df):
 # 不要販売店リストを読み込む関数は削除されました（要望#005対応）
 # 不要販売店リストファイル選択関数は削除されました（要望#005対応）
 
+# -- CHK_0007 / CHK_0008 のNGパターン定義 --
+# 組み合わせはいずれも (maiCloudUpdateLimit, PaymentType, SendUpdateGuidanceState)
+
+# CHK_0007 パターンA: NotesForUpdateに「更新案内不要」の文字列を含まない
+CHK0007_NG_COMBINATIONS_A = frozenset({
+    (2, 122, 1), (2, 122, 2),
+    (2, 211, 1), (2, 211, 2),
+    (3, 122, 1), (3, 122, 2),
+    (3, 211, 1), (3, 211, 2),
+    (4, 122, 1), (4, 122, 2),
+    (4, 211, 1), (4, 211, 2),
+    (5, 122, 1), (5, 122, 2),
+    (5, 211, 0)
+})
+
+# CHK_0007 パターンB: NotesForUpdateに「NP不可」または「ＮＰ不可」の文字列を含む (パターン⑯〜㉑)
+CHK0007_NG_COMBINATIONS_B = frozenset({
+    (2, 211, 1), (2, 211, 2),
+    (3, 122, 1), (3, 122, 2),
+    (3, 211, 1), (3, 211, 2)
+})
+
+# CHK_0007 パターンC: NotesForUpdateに「NP不可」または「ＮＰ不可」の文字列を含まない (パターン㉒〜㊱)
+# これはパターンAとNotesForUpdateの条件が異なるだけで、組み合わせ自体は同じものも含まれるが、
+# 別の条件セットとして定義する。
+CHK0007_NG_COMBINATIONS_C = frozenset({
+    (2, 122, 1), (2, 122, 2),
+    (2, 211, 1), (2, 211, 2),
+    (3, 122, 1), (3, 122, 2),
+    (3, 211, 1), (3, 211, 2),
+    (4, 122, 1), (4, 122, 2),
+    (4, 211, 1), (4, 211, 2),
+    (5, 122, 1), (5, 122, 2),
+    (5, 211, 0) # ㊱のみ SendUpdateGuidanceState=0
+})
+
+# CHK_0008 グループA: NotesForUpdateに「更新案内不要」の文字列を含む (パターン①〜⑳)
+CHK0008_NG_COMBINATIONS_A = frozenset({
+    (1, 122, 1), (1, 122, 2), (1, 211, 1), (1, 211, 2),
+    (2, 122, 1), (2, 122, 2), (2, 211, 1), (2, 211, 2),
+    (3, 122, 1), (3, 122, 2), (3, 211, 1), (3, 211, 2),
+    (4, 122, 1), (4, 122, 2), (4, 211, 1), (4, 211, 2),
+    (5, 122, 1), (5, 122, 2), (5, 211, 1), (5, 211, 2)
+})
+
+# CHK_0008 グループB: NotesForUpdateに「NP不可」または「ＮＰ不可」の文字列を含む (パターン㉑〜㉘)
+CHK0008_NG_COMBINATIONS_B = frozenset({
+    (1, 122, 1), (1, 122, 2),
+    (2, 122, 1), (2, 122, 2),
+    (4, 122, 1), (4, 122, 2), # maiCloudUpdateLimit=3 は含まれない
+    (5, 122, 1), (5, 122, 2)
+})
+
+# NotesForUpdate の判定に使うキーワード（remarks.normalize_remarks で正規化して比較するため「ＮＰ不可」も含む）
+RENEWAL_GUIDANCE_EXCLUSION_KEYWORDS = [BikoKeyword.RENEWAL_NOT_NEEDED]
+NP_FUKA_KEYWORDS = [BikoKeyword.NP_NOT_ALLOWED]
+# CHK_0007 の前提条件で除外する NotesForUpdate / NotesForETC のキーワード
+# NP不可 は CHK_0007 のNGパターン（CHK0007_NG_COMBINATIONS_B）で判定するため除外には含めない
+# （従来も小文字化した文字列と「NP不可」「ＮＰ不可」を比較しており、一致することはなかった）
+EXCLUSION_KEYWORDS = [BikoKeyword.RENEWAL_NOT_NEEDED, BikoKeyword.SPECIAL_SHIPPING]
+
+def is_chk0007_ng(contains_renewal_guidance_exclusion, contains_np_fuka, current_combination):
+    """CHK_0007 のNG判定（NotesForUpdate のキーワード有無と組み合わせから判定する）"""
+    if not contains_renewal_guidance_exclusion and current_combination in CHK0007_NG_COMBINATIONS_A:
+        return True
+    elif contains_np_fuka and current_combination in CHK0007_NG_COMBINATIONS_B:
+        return True
+    elif not contains_np_fuka and current_combination in CHK0007_NG_COMBINATIONS_C:
+        return True
+    return False
+
+def is_chk0008_ng(contains_renewal_guidance_exclusion, contains_np_fuka, current_combination):
+    """CHK_0008 のNG判定（NotesForUpdate のキーワード有無と組み合わせから判定する）"""
+    if contains_renewal_guidance_exclusion and current_combination in CHK0008_NG_COMBINATIONS_A:
+        return True
+    elif contains_np_fuka and current_combination in CHK0008_NG_COMBINATIONS_B:
+        return True
+    return False
+
 # CHK_0007 更新案内が1(送る新進)の場合stdDsale1(販店1マスタ)が更新案内不要販売店リストに存在する場合NG
 def check_0007(
     row: dict,
@@ -420,51 +755,11 @@ def check_0007(
     if row.get(main_sales_key) not in shop_db_dict:
         return
 
-    # NotesForUpdate の内容を事前に取得し、正規化
-    notes_for_update_text = str(row.get("NotesForUpdate", "")).lower().replace(' ', '').replace('　', '')
-
-    # -- NGパターンの定義 --
-    # パターンA: NotesForUpdateに「更新案内不要」の文字列を含まない
-    is_notes_for_update_not_contains_renewal = not contains_specific_keyword(notes_for_update_text, ["更新案内不要"])
-    
-    # パターンAのNG組み合わせ (maiCloudUpdateLimit, PaymentType, SendUpdateGuidanceState)
-    ng_combinations_A = {
-        (2, 122, 1), (2, 122, 2),
-        (2, 211, 1), (2, 211, 2),
-        (3, 122, 1), (3, 122, 2),
-        (3, 211, 1), (3, 211, 2),
-        (4, 122, 1), (4, 122, 2),
-        (4, 211, 1), (4, 211, 2),
-        (5, 122, 1), (5, 122, 2),
-        (5, 211, 0) 
-    }
-
-    # パターンB: NotesForUpdateに「NP不可」または「ＮＰ不可」の文字列を含む (パターン⑯〜㉑)
-    is_notes_for_update_contains_np_fuka = contains_specific_keyword(notes_for_update_text, ["np不可", "ｎｐ不可"])
+    notes_for_update = row.get("NotesForUpdate")
 
-    # パターンBのNG組み合わせ (maiCloudUpdateLimit, PaymentType, SendUpdateGuidanceState)
-    ng_combinations_B = {
-        (2, 211, 1), (2, 211, 2),
-        (3, 122, 1), (3, 122, 2),
-        (3, 211, 1), (3, 211, 2)
-    }
-
-    # パターンC: NotesForUpdateに「NP不可」または「ＮＰ不可」の文字列を含まない (パターン㉒〜㊱)
-    # これはパターンAとNotesForUpdateの条件が異なるだけで、組み合わせ自体は同じものも含まれるが、
-    # 別の条件セットとして定義する。
-    is_notes_for_update_not_contains_np_fuka = not contains_specific_keyword(notes_for_update_text, ["np不可", "ｎｐ不可"])
-
-    # パターンCのNG組み合わせ (maiCloudUpdateLimit, PaymentType, SendUpdateGuidanceState)
-    ng_combinations_C = {
-        (2, 122, 1), (2, 122, 2),
-        (2, 211, 1), (2, 211, 2),
-        (3, 122, 1), (3, 122, 2),
-        (3, 211, 1), (3, 211, 2),
-        (4, 122, 1), (4, 122, 2),
-        (4, 211, 1), (4, 211, 2),
-        (5, 122, 1), (5, 122, 2),
-        (5, 211, 0) # ㊱のみ SendUpdateGuidanceState=0
-    }
+    # NotesForUpdateに「更新案内不要」/「NP不可」の文字列を含むか
+    contains_renewal_guidance_exclusion = contains_specific_keyword(notes_for_update, RENEWAL_GUIDANCE_EXCLUSION_KEYWORDS)
+    contains_np_fuka = contains_specific_keyword(notes_for_update, NP_FUKA_KEYWORDS)
 
     # 現在の行の該当する値を取得
     store_flags = shop_db_dict[row.get(main_sales_key)]
@@ -472,9 +767,6 @@ def check_0007(
     current_payment_type = row.get(payment_type_key)
     current_send_update_guidance_state = row.get(guidance_state_key)
 
-    # 全てのNGパターンをまとめてチェック
-    is_ng = False
-
     # 現在の組み合わせ (タプル)
     current_combination = (
         current_maicloud_update_limit,
@@ -482,15 +774,8 @@ def check_0007(
         current_send_update_guidance_state
     )
 
-    if is_notes_for_update_not_contains_renewal and current_combination in ng_combinations_A:
-        is_ng = True
-    elif is_notes_for_update_contains_np_fuka and current_combination in ng_combinations_B:
-        is_ng = True
-    elif is_notes_for_update_not_contains_np_fuka and current_combination in ng_combinations_C:
-        is_ng = True
-    
     # NG条件が満たされた場合にエラーメッセージを追加
-    if is_ng:
+    if is_chk0007_ng(contains_renewal_guidance_exclusion, contains_np_fuka, current_combination):
         error_messages.append({
             "シリーズ": "CLOUD", # 固定値と仮定
             "ユーザID": row.get(user_id_key),
@@ -498,7 +783,6 @@ def check_0007(
             "チェックID": check_id
         })
 
-# CHK_0008 更新案内が1(送る新進)の場合stdDsale1(販店1マスタ)が更新案内不要販売店リストに存在する場合NG
 # CHK_0008 更新案内が1(送る新進)の場合stdDsale1(販店1マスタ)が更新案内不要販売店リストに存在する場合NG
 def check_0008(
     row: dict,
@@ -518,7 +802,7 @@ def check_0008(
     # -- 共通条件のチェック --
     # ***_ContractInactive=FALSE に相当
     is_contract_active = is_any_contract_active(row)
-    
+
     if not is_contract_active:
         return # 共通条件を満たさない場合はスキップ
 
@@ -526,35 +810,13 @@ def check_0008(
     if row.get(main_sales_key) not in shop_db_dict:
         return
 
-    # NotesForUpdate の内容を事前に取得し、正規化
-    notes_for_update_text = str(row.get("NotesForUpdate", "")).lower().replace(' ', '').replace('　', '')
+    notes_for_update = row.get("NotesForUpdate")
 
     # -- NotesForUpdate の条件判定 --
     # NotesForUpdateに「更新案内不要」の文字列を含むか
-    contains_renewal_guidance_exclusion = contains_specific_keyword(notes_for_update_text, ["更新案内不要"])
+    contains_renewal_guidance_exclusion = contains_specific_keyword(notes_for_update, RENEWAL_GUIDANCE_EXCLUSION_KEYWORDS)
     # NotesForUpdateに「NP不可」または「ＮＰ不可」の文字列を含むか
-    contains_np_fuka = contains_specific_keyword(notes_for_update_text, ["np不可", "ｎｐ不可"])
-
-    # -- NGパターンの定義 --
-
-    # グループA: NotesForUpdateに「更新案内不要」の文字列を含む (パターン①〜⑳)
-    # maiCloudUpdateLimit, PaymentType, SendUpdateGuidanceState の組み合わせ
-    ng_combinations_group_A = {
-        (1, 122, 1), (1, 122, 2), (1, 211, 1), (1, 211, 2),
-        (2, 122, 1), (2, 122, 2), (2, 211, 1), (2, 211, 2),
-        (3, 122, 1), (3, 122, 2), (3, 211, 1), (3, 211, 2),
-        (4, 122, 1), (4, 122, 2), (4, 211, 1), (4, 211, 2),
-        (5, 122, 1), (5, 122, 2), (5, 211, 1), (5, 211, 2)
-    }
-
-    # グループB: NotesForUpdateに「NP不可」または「ＮＰ不可」の文字列を含む (パターン㉑〜㉘)
-    # maiCloudUpdateLimit, PaymentType, SendUpdateGuidanceState の組み合わせ
-    ng_combinations_group_B = {
-        (1, 122, 1), (1, 122, 2),
-        (2, 122, 1), (2, 122, 2),
-        (4, 122, 1), (4, 122, 2), # maiCloudUpdateLimit=3 は含まれない
-        (5, 122, 1), (5, 122, 2)
-    }
+    contains_np_fuka = contains_specific_keyword(notes_for_update, NP_FUKA_KEYWORDS)
 
     # 現在の行の該当する値を取得
     store_flags = shop_db_dict[row.get(main_sales_key)]
@@ -569,16 +831,8 @@ def check_0008(
         current_send_update_guidance_state
     )
 
-    is_ng = False
-
-    # 各グループの条件とNG組み合わせをチェック
-    if contains_renewal_guidance_exclusion and current_combination in ng_combinations_group_A:
-        is_ng = True
-    elif contains_np_fuka and current_combination in ng_combinations_group_B:
-        is_ng = True
-    
     # NG条件が満たされた場合にエラーメッセージを追加
-    if is_ng:
+    if is_chk0008_ng(contains_renewal_guidance_exclusion, contains_np_fuka, current_combination):
         error_messages.append({
             "シリーズ": "CLOUD",
             "ユーザID": row.get(user_id_key),
@@ -586,30 +840,141 @@ def check_0008(
             "チェックID": check_id
         })
 
-# '更新案内不要', 'NP不可', 'ＮＰ不可' のいずれかの文字列が含まれているかをチェックするヘルパー関数
-def contains_specific_keyword(text_field, keywords):
-    if not text_field:
-        return False
-    normalized_text = str(text_field).lower().replace(' ', '').replace('　', '')
+# --- CHK_0007/0008 の真理値表（列指向評価用） ---
+
+def _truth_table_axes(*combination_sets):
+    """NG組み合わせに現れる値から、各軸（limit, PaymentType, SendUpdateGuidanceState）の 値→添字 の辞書を作る"""
+    axes = []
+    for position in range(3):
+        values = sorted({combination[position] for combinations in combination_sets for combination in combinations})
+        axes.append({value: index for index, value in enumerate(values)})
+    return tuple(axes)
+
+# いずれのNGパターンにも現れない値は真理値表の範囲外（＝NGなし）として扱う
+UPDATE_GUIDANCE_AXES = _truth_table_axes(
+    CHK0007_NG_COMBINATIONS_A, CHK0007_NG_COMBINATIONS_B, CHK0007_NG_COMBINATIONS_C,
+    CHK0008_NG_COMBINATIONS_A, CHK0008_NG_COMBINATIONS_B,
+)
+
+def _compile_truth_table(is_ng):
+    """
+    is_ng を全ての組み合わせで評価し、
+    [更新案内不要の有無][NP不可の有無][maiCloudUpdateLimit][PaymentType][SendUpdateGuidanceState]
+    で引けるNG判定の配列にする。
+    """
+    table = np.zeros((2, 2) + tuple(len(axis) for axis in UPDATE_GUIDANCE_AXES), dtype=bool)
+    for contains_renewal_guidance_exclusion, contains_np_fuka in product((False, True), repeat=2):
+        for combination in product(*UPDATE_GUIDANCE_AXES):
+            index = tuple(axis[value] for axis, value in zip(UPDATE_GUIDANCE_AXES, combination))
+            table[(int(contains_renewal_guidance_exclusion), int(contains_np_fuka)) + index] = is_ng(
+                contains_renewal_guidance_exclusion, contains_np_fuka, combination
+            )
+    return table
+
+CHK0007_NG_TABLE = _compile_truth_table(is_chk0007_ng)
+CHK0008_NG_TABLE = _compile_truth_table(is_chk0008_ng)
+
+def _encode_axis(values, axis):
+    """
+    値を真理値表の添字に変換する（軸に無い値は -1）。
+
+    組み合わせの集合判定と同じく辞書の照合（== による比較）で添字を求めるため、
+    122 と 122.0 は同じ値として扱われる。照合は値の種類ごとに1回だけ行う。
+    """
+    codes, uniques = pd.factorize(np.asarray(values, dtype=object), use_na_sentinel=False)
+    lookup = np.array([axis.get(value, -1) for value in uniques], dtype=np.int64)
+    return lookup[codes] if len(lookup) else np.full(len(codes), -1, dtype=np.int64)
+
+def _update_limit_codes(view, store_column, shop_db_dict):
+    """
+    販売店コードを販売店マスタと突き合わせ、
+    (マスタに存在するか, maiCloudUpdateLimit の添字) を返す。
+    """
+    codes, uniques = pd.factorize(view.get(store_column).to_numpy(), use_na_sentinel=False)
+    if not len(uniques):
+        return np.zeros(len(codes), dtype=bool), np.full(len(codes), -1, dtype=np.int64)
+    exists = np.array([value in shop_db_dict for value in uniques], dtype=bool)
+    limits = [shop_db_dict[value].get('maiCloudUpdateLimit') if value in shop_db_dict else None for value in uniques]
+    return exists[codes], _encode_axis(limits, UPDATE_GUIDANCE_AXES[0])[codes]
+
+def _keyword_flags(view, column, keywords):
+    """contains_specific_keyword(row.get(column), keywords) 相当のマスク（キーワードごとの特徴量の論理和）"""
+    flags = np.zeros(len(view), dtype=bool)
     for keyword in keywords:
-        # keywordsは既に小文字、半角に正規化されていると仮定
-        if keyword in normalized_text:
-            return True
-    return False
+        flags |= view.keyword(column, keyword, default=None).to_numpy()
+    return flags
 
-# '更新案内不要', 'NP不可', 'ＮＰ不可' , '特別発送' のいずれかの文字列が含まれているかをチェックするヘルパー関数
+def _update_guidance_notes(view):
+    """
+    4シリーズで共通の NotesForUpdate / NotesForETC の判定を一度だけ行い、
+    (除外キーワードあり, 更新案内不要を含む, NP不可を含む) を返す。
+    """
+    def build():
+        excluded = (
+            _keyword_flags(view, "NotesForUpdate", EXCLUSION_KEYWORDS)
+            | _keyword_flags(view, "NotesForETC", EXCLUSION_KEYWORDS)
+        )
+        contains_renewal_guidance_exclusion = _keyword_flags(view, "NotesForUpdate", RENEWAL_GUIDANCE_EXCLUSION_KEYWORDS)
+        contains_np_fuka = _keyword_flags(view, "NotesForUpdate", NP_FUKA_KEYWORDS)
+        return excluded, contains_renewal_guidance_exclusion, contains_np_fuka
+    return view.cached("update_guidance_notes", build)
+
+def _has_invalid_store_name_character(value):
+    name = value or ""
+    if not isinstance(name, str):
+        # 行単位の判定（char in 値）と同じ結果にならないため行単位の評価に切り替える
+        raise TypeError(f"文字列以外の販売店名が含まれています: {name!r}")
+    return any(char in name for char in store_name_invalid_characters)
+
+def _store_name_invalid(view, field):
+    """CHK_0006: 販売店名に ▲×■ が含まれるか（販売店名の種類ごとに1回だけ判定する）"""
+    return view.per_value(field, _has_invalid_store_name_character, default=None, dtype=bool).to_numpy()
+
+def _mask_0006_0008(view, shop_db_dict):
+    """
+    check_store_names_and_update_guidance（CHK_0006〜0008）の行ごとのチェックID列を返す。
+
+    4シリーズの販売店コードごとに maiCloudUpdateLimit を一括で引き当て、
+    真理値表から CHK_0007/0008 の該当件数を求める。
+    行単位の関数では CHK_0007/0008 が店名6項目のループ内で呼ばれているため、
+    出力を変えないよう店名の項目ごとに [CHK_0006] + CHK_0007 + CHK_0008 の並びを繰り返す。
+    """
+    invalid = np.column_stack([_store_name_invalid(view, field) for field in store_name_fields])
+    any_active = _contract_matrix(view).any_active
+    excluded, contains_renewal_guidance_exclusion, contains_np_fuka = _update_guidance_notes(view)
+    renewal_index = contains_renewal_guidance_exclusion.astype(np.int64)
+    np_fuka_index = contains_np_fuka.astype(np.int64)
+
+    chk0007_counts = np.zeros(len(view), dtype=np.int64)
+    chk0008_counts = np.zeros(len(view), dtype=np.int64)
+    for guidance_state_key, payment_type_key, store_key in update_guidance_lines:
+        exists, limit = _update_limit_codes(view, store_key, shop_db_dict)
+        payment = _encode_axis(view.get(payment_type_key), UPDATE_GUIDANCE_AXES[1])
+        state = _encode_axis(view.get(guidance_state_key), UPDATE_GUIDANCE_AXES[2])
+        in_table = exists & (limit >= 0) & (payment >= 0) & (state >= 0)
+        index = (renewal_index, np_fuka_index, np.maximum(limit, 0), np.maximum(payment, 0), np.maximum(state, 0))
+        chk0007_counts += any_active & ~excluded & in_table & CHK0007_NG_TABLE[index]
+        chk0008_counts += any_active & in_table & CHK0008_NG_TABLE[index]
+
+    result = [None] * len(view)
+    for position in np.flatnonzero(invalid.any(axis=1) | (chk0007_counts > 0) | (chk0008_counts > 0)):
+        per_field = ["CLOUD_CHK_0007"] * int(chk0007_counts[position]) + ["CLOUD_CHK_0008"] * int(chk0008_counts[position])
+        check_ids = []
+        for field_invalid in invalid[position]:
+            if field_invalid:
+                check_ids.append("CLOUD_CHK_0006")
+            check_ids.extend(per_field)
+        result[position] = check_ids
+    return pd.Series(result, dtype=object)
+
+# keywords のいずれかの文字列が含まれているかをチェックするヘルパー関数
+# 大文字小文字、全角半角を考慮せず、スペースも無視して比較する（remarks.normalize_remarks）
+def contains_specific_keyword(text_field, keywords):
+    return contains_any_keyword(text_field, keywords)
+
+# '更新案内不要', '特別発送' のいずれかの文字列が含まれているかをチェックするヘルパー関数
 def contains_exclusion_keyword(text_field):
-    if not text_field:
-        return False
-    # 大文字小文字、全角半角を考慮せず、スペースも無視して比較するために正規化する
-    normalized_text = text_field.lower().replace(' ', '').replace('　', '')
-    
-    exclusion_keywords = ["更新案内不要", "NP不可", "ＮＰ不可","特別発送"] # 全て小文字、半角に統一
-    
-    for keyword in exclusion_keywords:
-        if keyword in normalized_text:
-            return True
-    return False
+    return contains_any_keyword(text_field, EXCLUSION_KEYWORDS)
 
 # いずれかの契約がアクティブかどうかをチェックする関数
 def is_any_contract_active(row):
@@ -617,7 +982,7 @@ def is_any_contract_active(row):
 
 # 複数年チェック
 def check_subsidy_date(row, error_messages):
-    if "補助金" in (row.get("NotesForRTC") or ""):
+    if contains_keyword(row.get("NotesForRTC"), BikoKeyword.SUBSIDY):
         # 日付のパターンを正規表現で検索
         date_pattern = re.compile(r"\d{4}/\d{1,2}|\d{4}/\d{1,2}/\d{1,2}")
         dates = date_pattern.findall(row["NotesForRTC"])
@@ -627,7 +992,7 @@ def check_subsidy_date(row, error_messages):
                     date_obj = datetime.strptime(date_str, "%Y/%m")
                 else:
                     date_obj = datetime.strptime(date_str, "%Y/%m/%d")
-                if date_obj.date() < datetime.now().date():
+                if date_obj.date() < today():
                     error_messages.append({
                 "シリーズ": "CLOUD",
                 "ユーザID": row["ManagementCode"],
@@ -673,7 +1038,7 @@ def check_active_and_expired(row, error_messages, chk_code):
     active_contracts = get_active_contracts_and_expiration_dates(row)
     
     # 満了日が過去の日付かどうかをチェック
-    expired_contracts = [inactive_field for inactive_field, end_date in active_contracts if end_date < datetime.now()]
+    expired_contracts = [inactive_field for inactive_field, end_date in active_contracts if end_date < now()]
     
     if expired_contracts:
         error_messages.append({
@@ -699,7 +1064,7 @@ def check_inactive_and_not_expired(row, error_messages, chk_code):
     inactive_contracts = [(inactive_field, row[end_field]) for inactive_field, end_field in contract_end_fields.items() if row[inactive_field]]
 
     # 満了日が未来の日付かどうかをチェック
-    future_expired_contracts = [inactive_field for inactive_field, end_date in inactive_contracts if end_date > datetime.now()]
+    future_expired_contracts = [inactive_field for inactive_field, end_date in inactive_contracts if end_date > now()]
     
     if future_expired_contracts:
         error_messages.append({
@@ -716,7 +1081,7 @@ def check_inactive_and_future_start(row, error_messages, chk_code):
     inactive_contracts = [(inactive_field, row[start_field]) for inactive_field, start_field in contract_start_fields.items() if row[inactive_field]]
     
     # 加入日が未来の日付かどうかをチェック
-    future_start_contracts = [inactive_field for inactive_field, start_date in inactive_contracts if start_date > datetime.now()]
+    future_start_contracts = [inactive_field for inactive_field, start_date in inactive_contracts if start_date > now()]
     
     if future_start_contracts:
         error_messages.append({
@@ -764,13 +1129,7 @@ def check_active_and_empty_start(row, error_messages, chk_code):
 # 減らして更新のキーワードがあるかチェックする関数
 def check_notes_for_keywords(row, error_messages, chk_code):
     # 各シリーズのフィールドリスト
-    notes_fields = [
-        'DB_NotesForMultipleYears', 'SB_NotesForMultipleYears', 'FN_NotesForMultipleYears', 
-        'SBT_NotesForMultipleYears', 'DBP_NotesForMultipleYears', 'SBR_NotesForMultipleYears', 
-        'KC_NotesForMultipleYears', 'DQC_NotesForMultipleYears', 'KSSCAN_NotesForMultipleYears', 
-        'PMC_NotesForMultipleYears', 'CQC_NotesForMultipleYears', 'WLC_NotesForMultipleYears', 
-        'KTD_NotesForMultipleYears'
-    ]
+    notes_fields = notes_for_multiple_years_fields
     
     # キーワード
     keyword = '減らして更新'
@@ -815,7 +1174,15 @@ def check_contract_period_within_databank(row, error_messages, chk_code):
         })
 
 # main_checker_app.py から呼び出されるエントリポイント
-def run_cloud_check(progress_callback=None, aux_paths=None):
+@with_as_of
+def run_cloud_check(progress_callback=None, aux_paths=None, chunk_size=None):
+    """
+    CLOUDのデータチェックを実行する。
+
+    chunk_size（省略時は config.ini の [STREAMING]）が1以上の場合は、t_kscmain を
+    chunk_size 行ずつ取得してチェックする（ストリーミング）。
+    """
+    phases = PhaseTimer("CLOUD")
     try:
         errors = []
         if progress_callback:
@@ -835,18 +1202,66 @@ def run_cloud_check(progress_callback=None, aux_paths=None):
 
         if progress_callback:
             progress_callback("CLOUD: 基幹データを取得中...")
-
-        df = fetch_data()
-
-        if df.empty:
-            errors.append({"シリーズ": "CLOUD", "ユーザID": "N/A", "保守整理番号": "", "チェックID": "基幹データが取得できませんでした。"})
-            return pd.DataFrame(errors, columns=["シリーズ", "ユーザID", "保守整理番号", "チェックID"])
-
-        if progress_callback:
-            progress_callback("CLOUD: データチェックを実行中...")
-
-        # validate_data関数に、読み込んだ補助リストを渡す
-        validation_results_df = validate_data(df, progress_callback)
+        phases.start(PHASE_FETCH)
+
+        chunk_size = streaming_chunk_size(chunk_size)
+        if chunk_size:
+            # CLOUD にはテーブル全体を参照するチェックが無いため、事前取得はマスタデータのみ
+            phases.start(PHASE_REFERENCE)
+            reference_data = prepare_reference_data()
+            checked_rows = []
+
+            def validate_chunk(chunk):
+                checked_rows.append(len(chunk))
+                return validate_data(chunk, None, reference_data=reference_data)
+
+            if progress_callback:
+                progress_callback("CLOUD: データチェックを実行中...")
+            # 取得とチェックを交互に行うため、取得の時間もチェックに含まれる
+            phases.start(PHASE_VALIDATE)
+            validation_results_df = validate_in_chunks(
+                iter_data(chunk_size),
+                validate_chunk,
+                ["シリーズ", "ユーザID", "保守整理番号", "チェックID"],
+                progress_callback, "CLOUD",
+            )
+            if not checked_rows:
+                errors.append({"シリーズ": "CLOUD", "ユーザID": "N/A", "保守整理番号": "", "チェックID": "基幹データが取得できませんでした。"})
+                return pd.DataFrame(errors, columns=["シリーズ", "ユーザID", "保守整理番号", "チェックID"])
+        else:
+            df = fetch_data()
+
+            if df.empty:
+                errors.append({"シリーズ": "CLOUD", "ユーザID": "N/A", "保守整理番号": "", "チェックID": "基幹データが取得できませんでした。"})
+                return pd.DataFrame(errors, columns=["シリーズ", "ユーザID", "保守整理番号", "チェックID"])
+
+            if progress_callback:
+                progress_callback("CLOUD: データチェックを実行中...")
+
+            phases.start(PHASE_REFERENCE)
+            reference_data = prepare_reference_data()
+            validate_kwargs = {"reference_data": reference_data}
+            result_columns = ["シリーズ", "ユーザID", "保守整理番号", "チェックID"]
+            phases.start(PHASE_VALIDATE)
+            if incremental_enabled():
+                # 前回の実行から変更された行だけをチェックし、変更の無い行は前回のエラーを再利用する
+                # （チェック結果の保守整理番号は HoshuId のため、HoshuId ごとに比較する）
+                # 当日と比較するチェックは、日付が変わると結果が変わるため毎回全行で実行する
+                validation_results_df = validate_incrementally(
+                    "CLOUD", df, "HoshuId",
+                    lambda rows: validate_sharded(rows, validate_data, result_columns,
+                                                  {**validate_kwargs, "date_dependent": False},
+                                                  progress_label="CLOUD"),
+                    result_columns,
+                    reference_data,
+                    progress_callback,
+                    validate_date_checks=lambda rows: validate_data(rows, None, date_dependent=True, **validate_kwargs),
+                )
+            else:
+                # 行数が多い場合は複数のプロセスでチェックする（config.ini の [SHARDING]）
+                validation_results_df = validate_sharded(df, validate_data, result_columns, validate_kwargs,
+                                                         progress_callback=progress_callback,
+                                                         progress_label="CLOUD")
 
         if validation_results_df.empty:
             return pd.DataFrame(columns=["シリーズ", "ユーザID", "保守整理番号", "チェックID"])
@@ -865,6 +1280,8 @@ def run_cloud_check(progress_callback=None, aux_paths=None):
             "ユーザID": "N/A",
             "チェックID": f"処理中にエラーが発生しました: {e}"
         }], columns=["シリーズ", "ユーザID", "チェックID"])
+    finally:
+        phases.stop()
 
 # メイン処理
 def main():
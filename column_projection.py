@@ -0,0 +1,96 @@
+"""
+列の射影（DBから取得する列の絞り込み）
+
+各シリーズモジュールでは、チェックIDごとに参照する列を CHECK_COLUMNS として宣言します。
+DBからの取得時は、実行するチェックが参照する列の和集合だけを SELECT することで、
+列数の多いテーブルの転送量とDataFrameのメモリ使用量を抑えます。
+
+宣言された列がテーブルに存在しない場合はその列を SELECT に含めません。
+その列を参照するチェックは、従来どおり列欠落のエラー（COLUMN_MISSING_ERROR_ など）になります。
+"""
+
+from typing import Iterable, Optional
+
+
+# SQLの方言
+SQLSERVER = "sqlserver"
+MYSQL = "mysql"
+
+
+def required_columns(
+    check_columns: dict,
+    base_columns: Iterable[str] = (),
+    check_ids: Optional[Iterable[str]] = None,
+) -> list[str]:
+    """
+    実行するチェックが参照する列の和集合を返す。
+
+    Args:
+        check_columns: {チェックID: 参照する列のタプル}
+        base_columns: チェックに関係なく常に取得する列（ユーザID・保守整理番号など）
+        check_ids: 実行するチェックIDの一覧（None の場合は全てのチェック）
+
+    Returns:
+        列名のリスト（宣言順、重複なし）
+    """
+    selected = check_columns.keys() if check_ids is None else [c for c in check_ids if c in check_columns]
+    columns = list(dict.fromkeys(base_columns))
+    for check_id in selected:
+        for column in check_columns[check_id]:
+            if column not in columns:
+                columns.append(column)
+    return columns
+
+
+def _quote(column: str, dialect: str) -> str:
+    if dialect == SQLSERVER:
+        return f"[{column}]"
+    return f"`{column}`"
+
+
+def table_columns(cursor, table: str, dialect: str) -> list[str]:
+    """テーブルの列名を取得する（行は取得しない）。"""
+    if dialect == SQLSERVER:
+        cursor.execute(f"SELECT TOP 0 * FROM {table}")
+    else:
+        cursor.execute(f"SELECT * FROM {table} LIMIT 0")
+    columns = [column[0] for column in cursor.description]
+    cursor.fetchall()
+    return columns
+
+
+def select_list(cursor, tables: list, columns: Optional[Iterable[str]], dialect: str) -> str:
+    """
+    SELECT 句の列リストを作成する。
+
+    Args:
+        cursor: テーブルの列名を調べるためのカーソル
+        tables: [(テーブル名, 修飾子)] のリスト。修飾子が None の場合は列名を修飾しない。
+            同じ列名が複数のテーブルにある場合は先に指定したテーブルの列を使用する。
+        columns: 取得する列（None の場合は全列 = テーブルごとの * ）
+        dialect: SQLSERVER または MYSQL
+
+    Returns:
+        "T.[col1], T.[col2]" のような列リスト
+    """
+    all_columns = ", ".join(f"{qualifier}.*" if qualifier else "*" for _, qualifier in tables)
+    if columns is None:
+        return all_columns
+
+    # 列名の大文字・小文字はDBに合わせる（SELECT * で取得した場合と同じ列名にするため）
+    available = [
+        (qualifier, {name.lower(): name for name in table_columns(cursor, table, dialect)})
+        for table, qualifier in tables
+    ]
+    parts = []
+    for column in columns:
+        for qualifier, names in available:
+            name = names.get(column.lower())
+            if name is not None:
+                quoted = _quote(name, dialect)
+                part = f"{qualifier}.{quoted}" if qualifier else quoted
+                if part not in parts:
+                    parts.append(part)
+                break
+    # 宣言した列がいずれも存在しない場合は従来どおり全列を取得する
+    return ", ".join(parts) if parts else all_columns
@@ -6,7 +6,10 @@
 """
 
 import os
+import codecs
 import configparser
+import logging
+import sys
 from typing import Optional
 
 
@@ -131,41 +134,151 @@ def get_config(config_file: str = 'config.ini') -> configparser.ConfigParser:
     return ConfigManager.get_config(config_file)
 
 
+# ログの出力先（実行ファイルと同じディレクトリ）と形式
+LOG_FILE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'application.log')
+LOG_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+
+
+def configure_logging(console_level: Optional[int] = None) -> None:
+    """
+    application.log へのログ出力を設定する（INFO以上）。
+
+    モジュールの読み込み時には設定せず、画面・ヘッドレス実行などのエントリポイントで1回だけ呼び出します。
+
+    Args:
+        console_level: 指定した場合は、そのレベル以上のログを標準エラー出力にも出力する
+    """
+    if logging.getLogger().handlers:
+        # 設定済みの場合は何もしない（logging.basicConfig と同じ）
+        return
+    handlers: list[logging.Handler] = [logging.FileHandler(LOG_FILE_PATH)]
+    if console_level is not None:
+        console = logging.StreamHandler(sys.stderr)
+        console.setLevel(console_level)
+        handlers.append(console)
+    logging.basicConfig(level=logging.INFO, format=LOG_FORMAT, handlers=handlers)
+
+
+# 補助ファイル（商魂のCSVなど）のエンコーディング候補
+# cp932 は UTF-8 のバイト列も文字化けしたまま読めてしまうことがあるため、UTF-8 を先に判定する
+CSV_ENCODINGS = ['utf-8', 'cp932']
+
+# エンコーディングの判定に使用するファイル先頭のバイト数
+ENCODING_SAMPLE_BYTES = 64 * 1024
+
+
+def _ordered_encodings(encodings: Optional[list[str]]) -> list[str]:
+    """エンコーディング候補を UTF-8 系が先になるように並べ替える。"""
+    candidates = list(dict.fromkeys(encodings or CSV_ENCODINGS))
+    return sorted(candidates, key=lambda e: not codecs.lookup(e).name.startswith('utf-8'))
+
+
+def detect_csv_encoding(
+    file_path: str,
+    encodings: Optional[list[str]] = None,
+    sample_size: Optional[int] = None
+) -> Optional[str]:
+    """
+    ファイル先頭のバイト列（BOMと最大 sample_size バイト）からエンコーディングを判定する。
+    
+    Args:
+        file_path: CSVファイルのパス
+        encodings: エンコーディング候補（Noneの場合は CSV_ENCODINGS）
+        sample_size: 判定に使用する先頭のバイト数（Noneの場合は ENCODING_SAMPLE_BYTES）
+        
+    Returns:
+        先頭を正しく読めたエンコーディング（どれでも読めない場合はNone）
+    """
+    sample_size = sample_size or ENCODING_SAMPLE_BYTES
+    with open(file_path, 'rb') as f:
+        sample = f.read(sample_size + 1)
+    # 先頭だけ読み込んだ場合は、末尾で途切れたマルチバイト文字をエラーにしない
+    final = len(sample) <= sample_size
+    sample = sample[:sample_size]
+
+    if sample.startswith(codecs.BOM_UTF8):
+        return 'utf-8-sig'
+    for encoding in _ordered_encodings(encodings):
+        try:
+            codecs.getincrementaldecoder(encoding)().decode(sample, final=final)
+            return encoding
+        except UnicodeDecodeError:
+            continue
+    return None
+
+
+def read_csv_columns(
+    file_path: str,
+    columns: Optional[list[str]] = None,
+    encodings: Optional[list[str]] = None
+):
+    """
+    エンコーディングを判定してから、CSVファイルを1回だけ読み込む。
+    
+    C エンジンで全列を読み込み、フィールド数がヘッダーより多い行を読み飛ばしてから
+    必要な列だけを返します（usecols を指定すると C エンジンはこの行を読み飛ばさないため）。
+    先頭で判定したエンコーディングでファイルの後半が読めなかった場合のみ、
+    残りの候補で読み込み直します。
+    
+    Args:
+        file_path: CSVファイルのパス
+        columns: 読み込む列（Noneの場合は全ての列）。ファイルに無い列は結果に含まれない
+        encodings: エンコーディング候補（Noneの場合は CSV_ENCODINGS）
+        
+    Returns:
+        読み込んだDataFrame
+        
+    Raises:
+        UnicodeDecodeError: どのエンコーディングでも読み込めない場合
+    """
+    import pandas as pd
+
+    candidates = _ordered_encodings(encodings)
+    detected = detect_csv_encoding(file_path, candidates)
+    order = [detected] + [e for e in candidates if e != detected] if detected else candidates
+    wanted = set(columns) if columns else None
+
+    def read(encoding):
+        df = pd.read_csv(file_path, encoding=encoding, engine='c', on_bad_lines='skip')
+        if wanted:
+            df = df[[column for column in df.columns if column in wanted]]
+        return df
+
+    for encoding in order[:-1]:
+        try:
+            return read(encoding)
+        except UnicodeDecodeError:
+            continue
+    return read(order[-1])
+
+
 def load_csv_with_encoding_detection(
     file_path: str,
     required_columns: Optional[list[str]] = None,
     encodings: Optional[list[str]] = None
 ) -> tuple[bool, any, str]:
     """
-    複数のエンコーディングを試してCSVファイルを読み込む。
+    エンコーディングを判定してCSVファイルを読み込む。
     
     Args:
         file_path: CSVファイルのパス
-        required_columns: 必須カラムのリスト（Noneの場合はチェックしない）
-        encodings: 試すエンコーディングのリスト
+        required_columns: 必須カラムのリスト（Noneの場合はチェックしない。指定した場合はその列だけを読み込む）
+        encodings: エンコーディング候補
         
     Returns:
         (成功フラグ, DataFrame or None, エラーメッセージ)
     """
-    import pandas as pd
-    
     if not file_path or not os.path.exists(file_path):
         return False, None, f"ファイルが見つからないか、パスが無効です: {file_path}"
     
-    if encodings is None:
-        encodings = ['cp932', 'shift_jis', 'utf-8', 'utf-8-sig']
-    
-    for encoding in encodings:
-        try:
-            df = pd.read_csv(file_path, encoding=encoding, engine='python', on_bad_lines='skip')
-            if required_columns:
-                missing = [col for col in required_columns if col not in df.columns]
-                if missing:
-                    return False, None, f"必要なカラム({', '.join(missing)})が不足しています。"
-            return True, df, ""
-        except UnicodeDecodeError:
-            continue
-        except Exception as e:
-            return False, None, f"ファイルの読み込み中にエラーが発生しました: {e}"
-    
-    return False, None, f"ファイル '{file_path}' を適切なエンコーディングで読み込めませんでした。"
+    try:
+        df = read_csv_columns(file_path, required_columns, encodings)
+    except UnicodeDecodeError:
+        return False, None, f"ファイル '{file_path}' を適切なエンコーディングで読み込めませんでした。"
+    except Exception as e:
+        return False, None, f"ファイルの読み込み中にエラーが発生しました: {e}"
+    if required_columns:
+        missing = [col for col in required_columns if col not in df.columns]
+        if missing:
+            return False, None, f"必要なカラム({', '.join(missing)})が不足しています。"
+    return True, df, ""
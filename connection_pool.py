@@ -0,0 +1,229 @@
+"""
+実行単位のDB接続プール
+
+各シリーズモジュールの取得関数は、それぞれ接続を開いて閉じています。
+DEKISPART と INNOSITE を1回実行するだけでも十数回の接続（TLSハンドシェイクとログイン）が
+発生するため、1回のチェック実行の間は設定セクション（DEKISPART_MNT_DB, KSMAIN_MYSQL,
+KSMAIN2_MYSQL, KSCLOUDDB）ごとに接続を保持して再利用します。
+
+取得関数は with connect(セクション名) as conn: の形で接続を使用してください。
+プールが有効な場合（pool_run の with ブロック内）は with ブロックを抜けると接続がプールに返却され、
+次の connect() で疎通を確認してから再利用されます（処理中にエラーになった接続は破棄します）。
+プールが無効な場合は従来どおり毎回新しい接続を開き、with ブロックを抜けると閉じます。
+"""
+
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Optional
+
+from common import _build_sqlserver_conn_str, get_config
+
+
+logger = logging.getLogger(__name__)
+
+
+def mysql_driver():
+    """pymysql を返す（モジュールの読み込み時ではなく、初めて接続するときに読み込む）。"""
+    import pymysql
+
+    return pymysql
+
+
+def sqlserver_driver():
+    """pyodbc を返す（モジュールの読み込み時ではなく、初めて接続するときに読み込む）。"""
+    import pyodbc
+
+    return pyodbc
+
+
+def open_connection(section: str):
+    """
+    config.ini のセクションの設定で新しい接続を開く。
+
+    driver が設定されているセクションは SQL Server（pyodbc）、それ以外は MySQL（pymysql）として接続します。
+    """
+    db_config = get_config()[section]
+    if "driver" in db_config:
+        return sqlserver_driver().connect(_build_sqlserver_conn_str(db_config))
+    return mysql_driver().connect(
+        host=db_config['host'],
+        database=db_config['database'],
+        user=db_config['user'],
+        password=db_config['password'],
+        charset=db_config['charset'],
+    )
+
+
+def _is_alive(conn) -> bool:
+    """接続が使用可能かを確認する。"""
+    try:
+        if hasattr(conn, "ping"):
+            # pymysql: 切断されている場合は例外になる（ここでは再接続しない）
+            conn.ping(reconnect=False)
+        else:
+            cursor = conn.cursor()
+            cursor.execute("SELECT 1")
+            cursor.fetchall()
+            cursor.close()
+        return True
+    except Exception as e:
+        logger.info(f"接続プール: 切断された接続を破棄します: {e}")
+        return False
+
+
+def _close_quietly(conn) -> None:
+    try:
+        conn.close()
+    except Exception:
+        pass
+
+
+class PooledConnection:
+    """
+    プールから貸し出した接続。
+
+    close() で接続を閉じずにプールへ返却します。それ以外の属性は元の接続のものを使用します。
+    """
+
+    def __init__(self, pool: "ConnectionPool", section: str, conn):
+        self._pool = pool
+        self._section = section
+        self._conn = conn
+        self._released = False
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+    def close(self) -> None:
+        if not self._released:
+            self._released = True
+            self._pool.release(self._section, self._conn)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None and not self._released:
+            # 処理中にエラーになった接続は状態が不明なため再利用しない
+            self._released = True
+            self._pool.discard(self._conn)
+        else:
+            self.close()
+
+
+class DirectConnection:
+    """
+    プールを使用しない場合の接続。
+
+    with ブロックを抜けると接続を閉じます（pyodbc の接続は with ブロックを抜けても閉じられないため）。
+    それ以外の属性は元の接続のものを使用します。
+    """
+
+    def __init__(self, conn):
+        self._conn = conn
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._conn.close()
+
+
+class ConnectionPool:
+    """設定セクションごとに未使用の接続を保持するクラス。"""
+
+    def __init__(self):
+        self._idle = {}
+        self._lock = threading.Lock()
+        self._opened = 0
+        self._reused = 0
+
+    def acquire(self, section: str) -> PooledConnection:
+        """セクションの接続を貸し出す（未使用の接続が無い場合は新しく開く）。"""
+        while True:
+            with self._lock:
+                idle = self._idle.get(section)
+                conn = idle.pop() if idle else None
+            if conn is None:
+                break
+            if _is_alive(conn):
+                with self._lock:
+                    self._reused += 1
+                return PooledConnection(self, section, conn)
+            _close_quietly(conn)
+
+        conn = open_connection(section)
+        with self._lock:
+            self._opened += 1
+        return PooledConnection(self, section, conn)
+
+    def release(self, section: str, conn) -> None:
+        """返却された接続を未使用の接続として保持する。"""
+        try:
+            # 読み取りのみのため、トランザクションを終了して次の利用者に最新のデータを見せる
+            conn.rollback()
+        except Exception as e:
+            logger.info(f"接続プール: 返却された接続を破棄します: {e}")
+            _close_quietly(conn)
+            return
+        with self._lock:
+            self._idle.setdefault(section, []).append(conn)
+
+    def discard(self, conn) -> None:
+        """接続を再利用せずに閉じる。"""
+        _close_quietly(conn)
+
+    def close_all(self) -> None:
+        """保持している全ての接続を閉じる。"""
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for connections in idle.values():
+            for conn in connections:
+                _close_quietly(conn)
+
+    def report(self) -> str:
+        """接続の再利用状況を1行の文字列で返す。"""
+        return f"接続プール: 接続 {self._opened} 回, 再利用 {self._reused} 回"
+
+
+# 実行中のプール（返却された接続は、同じセクションに接続する他のシリーズも再利用する）
+_current_pool: Optional[ConnectionPool] = None
+_current_lock = threading.Lock()
+
+
+@contextmanager
+def pool_run():
+    """
+    with ブロックの間、connect() の接続を再利用するプールを有効にする。
+
+    終了時に保持している接続を全て閉じ、再利用状況をログに出力します。
+    """
+    global _current_pool
+    pool = ConnectionPool()
+    with _current_lock:
+        previous = _current_pool
+        _current_pool = pool
+    try:
+        yield pool
+    finally:
+        with _current_lock:
+            _current_pool = previous
+        pool.close_all()
+        logger.info(pool.report())
+
+
+def connect(section: str):
+    """
+    セクションの接続を取得する。
+
+    プールが有効な場合はプールから貸し出し、無効な場合は新しい接続を開きます。
+    どちらの場合も with ブロックで使用してください（close() で返却・切断することもできます）。
+    """
+    pool = _current_pool
+    if pool is None:
+        return DirectConnection(open_connection(section))
+    return pool.acquire(section)
@@ -166,3 +166,4 @@ class BikoKeyword:
     NP_NOT_ALLOWED = "NP不可"
     REDUCE_AND_RENEW = "減らして更新"
     CANCEL = "退会"
+    SEPARATE_SHIPPING = "別送"
@@ -1,62 +1,36 @@
-import importlib
+import multiprocessing
+import sys
+
+# ヘッドレス実行（--headless）は tkinter を読み込まずにチェックを実行して終了する
+if __name__ == "__main__":
+    # 実行ファイル（PyInstaller）でシャーディングのワーカープロセスを起動した場合は、ここでワーカーとして動作する
+    multiprocessing.freeze_support()
+    if "--headless" in sys.argv:
+        import headless
+        sys.exit(headless.main(sys.argv[1:]))
+
+import importlib.util
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
 import pandas as pd
 import threading
 import os
-import sys
 import json
 import datetime
-import shutil
-from pathlib import Path
-
-
-def _get_runtime_root() -> Path:
-    """Return the directory where runtime-writable files should live."""
-    if getattr(sys, "frozen", False):  # PyInstaller runtime
-        return Path(sys.executable).resolve().parent
-    return Path(__file__).resolve().parent
-
-
-def _get_bundle_root() -> Path:
-    """Return the directory where bundled resources are located."""
-    if getattr(sys, "frozen", False) and hasattr(sys, "_MEIPASS"):
-        return Path(sys._MEIPASS)
-    return _get_runtime_root()
 
+import data_snapshot
+import connection_pool
+import profiling
+import series_registry
+import table_cache
+import date_columns
+from check_results import error_message_by_check_id, with_error_messages
+from common import configure_logging
+from runtime_files import RUNTIME_ROOT, enter_runtime_root, ensure_runtime_file
+from series_scheduler import DEFAULT_MAX_WORKERS, run_series_concurrently
 
-RUNTIME_ROOT = _get_runtime_root()
-BUNDLE_ROOT = _get_bundle_root()
 
-if getattr(sys, "frozen", False):
-    try:
-        os.chdir(RUNTIME_ROOT)
-    except OSError:
-        # 変更できない場合はそのまま進行
-        pass
-
-
-def ensure_runtime_file(filename: str, default_text: str | None = None) -> Path:
-    """Ensure a runtime-writable copy of the bundled file exists and return its path."""
-    runtime_path = RUNTIME_ROOT / filename
-    if runtime_path.exists():
-        return runtime_path
-
-    bundle_path = BUNDLE_ROOT / filename
-
-    try:
-        runtime_path.parent.mkdir(parents=True, exist_ok=True)
-        if bundle_path.exists():
-            shutil.copy2(bundle_path, runtime_path)
-        elif default_text is not None:
-            runtime_path.write_text(default_text, encoding="utf-8")
-    except Exception as exc:  # noqa: BLE001 - ログ出力用の包括的例外捕捉
-        print(
-            f"[ERROR] ランタイムファイル '{filename}' を準備できませんでした: {exc}",
-            file=sys.stderr,
-        )
-
-    return runtime_path
+enter_runtime_root()
 
 # 早期の引数チェック - GUI初期化やモジュールインポートの前に実行
 if __name__ == "__main__":
@@ -66,7 +40,9 @@ if __name__ == "__main__":
         print("Options:")
         print("  --help     Show this help message and exit.")
         print("  --test-build    Test build mode for CI/CD systems.")
-        print("  (No other command-line options are currently supported for headless execution.)")
+        print("  --headless --output PATH [options]")
+        print("                  Run checks without the GUI and write results as CSV, Parquet or NDJSON.")
+        print("                  See 'DataCheck.exe --headless --help' for all options and exit codes.")
         sys.exit(0)
     
     if "--test-build" in sys.argv:
@@ -96,78 +72,6 @@ if __name__ == "__main__":
             print("[SUCCESS] Test build completed successfully")
             sys.exit(0)
 
-# 各シリーズのチェックロジックをインポート
-# これらのモジュールは、main_checker_app.py と同じディレクトリに配置されている必要があります。
-SERIES_MODULE_NAMES = ["dekispart", "innosite", "dekispart_school", "cloud"]
-missing_series_modules = []
-missing_dependencies = set()
-
-for module_name in SERIES_MODULE_NAMES:
-    try:
-        globals()[module_name] = importlib.import_module(module_name)
-    except ModuleNotFoundError as error:
-        # error.name は見つからなかったモジュール名を返す
-        if error.name == module_name:
-            missing_series_modules.append(module_name)
-        else:
-            missing_dependencies.add(error.name)
-    except ImportError as error:
-        # GUI環境でない場合は標準エラー出力へ、GUI環境では messagebox で表示
-        if os.environ.get('PYINSTALLER_BUILD') == '1' or os.environ.get('GITHUB_ACTIONS') == 'true':
-            print(f"シリーズチェックモジュール '{module_name}' の読み込み中にエラーが発生しました。\n{error}\nアプリケーションを終了します。", file=sys.stderr)
-        else:
-            messagebox.showerror(
-                "モジュールエラー",
-                (
-                    f"シリーズチェックモジュール '{module_name}' の読み込み中にエラーが発生しました。\n"
-                    f"{error}\n\nアプリケーションを終了します。"
-                ),
-            )
-        sys.exit(1)
-
-if missing_series_modules or missing_dependencies:
-    if os.environ.get('PYINSTALLER_BUILD') != '1' and os.environ.get('GITHUB_ACTIONS') != 'true':
-        error_messages = []
-        if missing_series_modules:
-            file_list = "\n".join(f"  - {name}.py" for name in missing_series_modules)
-            error_messages.append(
-                "以下のシリーズチェックモジュールが見つかりません。"
-                "同じディレクトリに配置されているか確認してください:\n"
-                f"{file_list}"
-            )
-        if missing_dependencies:
-            dep_list = "\n".join(f"  - {name}" for name in sorted(missing_dependencies))
-            install_hint = " pip install " + " ".join(sorted(missing_dependencies))
-            error_messages.append(
-                "以下の外部ライブラリが見つかりません。仮想環境を有効化した上で"
-                f"{install_hint} を実行してください:\n{dep_list}"
-            )
-
-        messagebox.showerror(
-            "モジュールエラー",
-            "\n\n".join(error_messages) + "\n\nアプリケーションを終了します。",
-        )
-        sys.exit(1)
-    else:
-        # PyInstallerビルド中またはGitHub Actions環境ではメッセージボックスを表示せず、エラーログを出力して終了
-        error_messages = []
-        if missing_series_modules:
-            file_list = "\n".join(f"  - {name}.py" for name in missing_series_modules)
-            error_messages.append(
-                "以下のシリーズチェックモジュールが見つかりません。"
-                "同じディレクトリに配置されているか確認してください:\n"
-                f"{file_list}"
-            )
-        if missing_dependencies:
-            dep_list = "\n".join(f"  - {name}" for name in sorted(missing_dependencies))
-            install_hint = " pip install " + " ".join(sorted(missing_dependencies))
-            error_messages.append(
-                "以下の外部ライブラリが見つかりません:\n{dep_list}"
-            )
-        print("Build environment: Suppressing module error messagebox.", file=sys.stderr)
-        print("\n\n".join(error_messages), file=sys.stderr)
-        sys.exit(1)
-
 class DataCheckerApp:
     def __init__(self, master):
         self.master = master
@@ -186,6 +90,7 @@ class DataCheckerApp:
         self.aux_file_paths = {}
         self.font_size = 10 # デフォルトフォントサイズ
         self.theme = "default" # デフォルトテーマ
+        self.max_series_workers = DEFAULT_MAX_WORKERS # 同時に実行するシリーズ数
         self.settings_file = ensure_runtime_file("app_settings.json", default_text="{}")
         self.check_definitions_file = ensure_runtime_file("check_definitions.json") # チェック定義ファイル名
         self.check_definitions = {} # チェック定義を格納する辞書
@@ -295,6 +200,24 @@ class DataCheckerApp:
             )
             btn.pack(padx=10, pady=5, fill="x")
             self.buttons[series_name] = btn
+
+        # 全シリーズを並行に実行するボタン
+        all_btn = ttk.Button(
+            check_execution_frame,
+            text="全シリーズのチェックを実行",
+            command=self.run_all_series_check
+        )
+        all_btn.pack(padx=10, pady=5, fill="x")
+        self.buttons["__ALL__"] = all_btn
+
+        # テーブルキャッシュ（config.ini の [TABLE_CACHE]）を使用せずにDBから取得し直す
+        self.force_refresh_var = tk.BooleanVar(value=False)
+        self.force_refresh_check = ttk.Checkbutton(
+            check_execution_frame,
+            text="キャッシュを使わずDBから再取得",
+            variable=self.force_refresh_var
+        )
+        self.force_refresh_check.pack(padx=10, pady=2, anchor="w")
         
         # 補助ファイル設定ボタン
         self.file_setting_button = ttk.Button(check_execution_frame, text="補助ファイル設定", command=self.open_file_settings)
@@ -343,9 +266,11 @@ class DataCheckerApp:
         self.sort_order_dropdown.bind("<<ComboboxSelected>>", self.apply_filters_and_sort)
 
 
-        # 結果表示フレーム
-        self.results_frame = ttk.LabelFrame(right_pane, text="チェック結果一覧")
-        self.results_frame.grid(row=1, column=0, padx=5, pady=5, sticky="nsew") # 伸縮するように
+        # 結果表示フレーム（チェック結果一覧とパフォーマンスのタブ）
+        self.results_notebook = ttk.Notebook(right_pane)
+        self.results_notebook.grid(row=1, column=0, padx=5, pady=5, sticky="nsew") # 伸縮するように
+        self.results_frame = ttk.Frame(self.results_notebook)
+        self.results_notebook.add(self.results_frame, text="チェック結果一覧")
         self.results_frame.grid_rowconfigure(0, weight=1)
         self.results_frame.grid_columnconfigure(0, weight=1)
 
@@ -370,6 +295,8 @@ class DataCheckerApp:
         vsb.grid(row=0, column=1, sticky="ns")
         hsb.grid(row=1, column=0, sticky="ew")
 
+        self._create_performance_tab()
+
         # サマリーレポートフレーム
         summary_frame = ttk.LabelFrame(right_pane, text="サマリーレポート")
         summary_frame.grid(row=2, column=0, padx=5, pady=5, sticky="nsew") # 伸縮するように
@@ -408,6 +335,64 @@ class DataCheckerApp:
 
         self.progress_bar = ttk.Progressbar(self.status_frame, orient="horizontal", mode="indeterminate", length=200)
 
+        # シリーズごとの進捗（並行実行時に各シリーズの状況を個別に表示する）
+        self.series_progress_frame = ttk.Frame(self.master)
+        self.series_progress_frame.pack(side=tk.BOTTOM, fill=tk.X, padx=5)
+        self.series_progress_labels = {}
+
+    def _create_performance_tab(self):
+        """直前のチェック実行の処理時間（パフォーマンスレポート）を表示するタブを作成する"""
+        performance_frame = ttk.Frame(self.results_notebook)
+        self.results_notebook.add(performance_frame, text="パフォーマンス")
+        performance_frame.grid_rowconfigure(2, weight=1)
+        performance_frame.grid_columnconfigure(0, weight=1)
+
+        # 計測すると行単位のチェックが1割程度遅くなるため、既定は config.ini の [PROFILING]（無ければ計測しない）
+        self.profiling_var = tk.BooleanVar(value=profiling.profiling_enabled())
+        ttk.Checkbutton(
+            performance_frame,
+            text="処理時間を計測する（チェックが1割程度遅くなります）",
+            variable=self.profiling_var
+        ).grid(row=0, column=0, columnspan=2, padx=5, pady=2, sticky="w")
+
+        self.performance_label = ttk.Label(performance_frame, text="「処理時間を計測する」をオンにしてチェックを実行すると処理時間が表示されます。", anchor="w")
+        self.performance_label.grid(row=1, column=0, columnspan=2, padx=5, pady=2, sticky="ew")
+
+        columns = ("シリーズ", "区分", "名前", "時間(秒)", "回数", "エラー件数", "例外件数")
+        self.performance_tree = ttk.Treeview(performance_frame, columns=columns, show="headings")
+        widths = {"シリーズ": 110, "区分": 70, "名前": 220, "時間(秒)": 80, "回数": 70, "エラー件数": 80, "例外件数": 70}
+        for column in columns:
+            self.performance_tree.heading(column, text=column)
+            self.performance_tree.column(column, width=widths[column], anchor="w" if column == "名前" else "center")
+        performance_vsb = ttk.Scrollbar(performance_frame, orient="vertical", command=self.performance_tree.yview)
+        self.performance_tree.configure(yscrollcommand=performance_vsb.set)
+        self.performance_tree.grid(row=2, column=0, sticky="nsew")
+        performance_vsb.grid(row=2, column=1, sticky="ns")
+
+    def _update_performance_report(self):
+        """パフォーマンスタブを直前のチェック実行の計測結果で更新する（GUIスレッドで実行）"""
+        profile = profiling.last_profile()
+        if profile is None:
+            return
+        report = profile.to_dict()
+        for item in self.performance_tree.get_children():
+            self.performance_tree.delete(item)
+        # 処理段階（時間の長い順）、チェック（時間の長い順）の順に表示する
+        for phase in report["phases"]:
+            self.performance_tree.insert("", "end", values=(
+                phase["series"], "処理段階", profiling.PHASE_LABELS.get(phase["phase"], phase["phase"]),
+                f"{phase['seconds']:.3f}", phase["count"], "", "",
+            ))
+        for check in report["checks"]:
+            self.performance_tree.insert("", "end", values=(
+                check["series"], "チェック", check["check"], f"{check['seconds']:.3f}",
+                check["calls"], check["errors"], check["exceptions"],
+            ))
+        self.performance_label.config(
+            text=f"{report['started_at']} の実行: 合計 {report['wall_seconds'] or 0:.1f}秒"
+                 f"（レポート: {profiling.REPORT_PATH}）"
+        )
+
     def load_settings(self):
         """設定ファイルから補助ファイルのパスとフォントサイズを読み込む"""
         if self.settings_file.exists():
@@ -417,6 +402,7 @@ class DataCheckerApp:
                     self.aux_file_paths = settings.get("aux_file_paths", {})
                     self.font_size = settings.get("font_size", 10) # デフォルトは10
                     self.theme = settings.get("theme", "default") # テーマを読み込む
+                    self.max_series_workers = settings.get("max_series_workers", DEFAULT_MAX_WORKERS) # 同時に実行するシリーズ数
                 except json.JSONDecodeError:
                     messagebox.showwarning("設定エラー", "設定ファイルの読み込みに失敗しました。ファイルが破損している可能性があります。")
                     self.aux_file_paths = {}
@@ -431,6 +417,7 @@ class DataCheckerApp:
             "aux_file_paths": self.aux_file_paths,
             "font_size": self.font_size,
             "theme": self.theme,
+            "max_series_workers": self.max_series_workers,
         }
         with self.settings_file.open('w', encoding='utf-8') as f:
             json.dump(settings, f, ensure_ascii=False, indent=4)
@@ -540,14 +527,7 @@ class DataCheckerApp:
         """チェックIDに基づいてエラーメッセージを取得する。
            ユーザー定義メッセージがあればそれを使用し、なければデフォルトを使用する。
         """
-        definition = self.check_definitions.get(check_id)
-        if definition:
-            user_msg = definition.get("user_message")
-            if user_msg:
-                return user_msg
-            else:
-                return definition.get("default_message", "エラー内容が定義されていません。")
-        return f"不明なチェックID: {check_id}"
+        return error_message_by_check_id(self.check_definitions, check_id)
 
 
     def open_file_settings(self):
@@ -935,6 +915,9 @@ class DataCheckerApp:
         for btn in self.buttons.values():
             btn.config(state="disabled")
         self.file_setting_button.config(state="disabled")
+        # Tk の変数はワーカースレッドから参照しないため、ここで値を読み取っておく
+        self.force_refresh = self.force_refresh_var.get()
+        self.profiling_enabled = self.profiling_var.get()
         
         # 設定メニューとヘルプメニューも無効化（処理中に設定変更を防ぐため）
         # nametowidget の代わりにインスタンス変数を使用
@@ -981,9 +964,8 @@ class DataCheckerApp:
         self.master.after(0, lambda: self.status_label.config(text=message))
         self.master.after(0, self.master.update_idletasks)
 
-    def run_single_series_check(self, series_name):
-        self._clear_and_disable_buttons()
-        
+    def _missing_aux_files(self, series_name):
+        """シリーズのチェックに必要な補助ファイルのうち、未設定または見つからないものの表示名を返す"""
         required_paths_map = {
             "DEKISPART": [
                 "individual_list_path", 
@@ -1019,7 +1001,12 @@ class DataCheckerApp:
                 # 表示名を整形 (例: dekispart_individual_list_path -> Dekispart Individual List)
                 display_name = key.replace(f"{series_name.lower()}_", "").replace("_path", "").replace("_", " ").title()
                 missing_files.append(display_name) 
+        return missing_files
 
+    def run_single_series_check(self, series_name):
+        self._clear_and_disable_buttons()
+
+        missing_files = self._missing_aux_files(series_name)
         if missing_files:
             self._enable_buttons_and_check_download()
             messagebox.showwarning("ファイル未設定または見つかりません", 
@@ -1034,71 +1021,151 @@ class DataCheckerApp:
         self.thread = threading.Thread(target=self._perform_checks_threaded, args=([series_name],))
         self.thread.start()
 
+    def run_all_series_check(self):
+        """全シリーズのチェックを並行に実行する"""
+        self._clear_and_disable_buttons()
+
+        # 補助ファイルはシリーズ間で共通のため、1つ目のシリーズで確認する
+        missing_files = self._missing_aux_files(self.all_series[0]) if self.all_series else []
+        if missing_files:
+            self._enable_buttons_and_check_download()
+            messagebox.showwarning("ファイル未設定または見つかりません", 
+                                   f"チェックに必要な以下の補助ファイルが設定されていないか、見つかりません。\n\n"
+                                   f"• " + "\n• ".join(missing_files) + "\n\n"
+                                   f"「補助ファイル設定」から設定してください。")
+            self.status_label.config(text="準備完了")
+            return
+
+        self.status_label.config(text="全シリーズのデータチェックを開始します...")
+        messagebox.showinfo("チェック開始", f"全シリーズ（{', '.join(self.all_series)}）のデータチェックを開始します。バックグラウンドで処理を実行します。")
+        self.thread = threading.Thread(target=self._perform_checks_threaded, args=(list(self.all_series),))
+        self.thread.start()
+
+    def _show_series_progress(self, series_list):
+        """シリーズごとの進捗ラベルを作成する"""
+        for label in self.series_progress_labels.values():
+            label.destroy()
+        self.series_progress_labels = {}
+        for series in series_list:
+            label = ttk.Label(self.series_progress_frame, text=f"{series}: 待機中", anchor="w")
+            label.pack(side=tk.TOP, fill=tk.X)
+            self.series_progress_labels[series] = label
+
+    def update_series_progress(self, series, message):
+        """シリーズごとの進捗ラベルを更新する (スレッドセーフ)"""
+        def update():
+            label = self.series_progress_labels.get(series)
+            if label is not None:
+                label.config(text=message if message.startswith(series) else f"{series}: {message}")
+        self.master.after(0, update)
+
+    def _load_series_runners(self, series_list, on_error):
+        """
+        シリーズのチェックモジュールを読み込み、{シリーズ名: チェックを実行する関数} を返す（ワーカースレッドで実行）
+
+        モジュールは各シリーズを最初に実行する時点で読み込む。読み込めないシリーズは on_error に渡し、
+        他のシリーズのチェックはそのまま実行する。
+        """
+        runners = {}
+        for series in series_list:
+            if not series_registry.is_loaded(series):
+                self.update_progress_label(f"'{series}' のチェックモジュールを読み込んでいます...")
+                self.update_series_progress(series, "モジュールを読み込み中...")
+            try:
+                runners[series] = series_registry.load_series_runner(series)
+            except ImportError as error:
+                on_error(series, error)
+        return runners
+
+    def _run_series_check(self, series, run_check):
+        """1シリーズのチェックを実行し、結果を共通の列構成にして返す（ワーカースレッドで実行）"""
+        progress_callback = lambda message: self.update_series_progress(series, message)
+        progress_callback("実行中...")
+
+        # 各シリーズのモジュールからメインのチェック関数を呼び出す
+        # IMPORTANT: 各モジュールは pd.DataFrame(columns=["シリーズ", "ユーザID", "保守整理番号", "チェックID"]) 
+        # の形式で結果を返すように修正が必要です。
+        results_df = run_check(
+            progress_callback=progress_callback,
+            aux_paths=self.aux_file_paths
+        )
+
+        if results_df is None or results_df.empty:
+            return None
+
+        # 結果DataFrameに必要なカラムが存在することを確認
+        # ここでは "シリーズ", "ユーザID", "チェックID" が必須
+        required_cols_for_check_modules = ["シリーズ", "ユーザID", "チェックID"]
+        # 保守整理番号は必須ではないが、あれば使用する
+        for col in required_cols_for_check_modules:
+            if col not in results_df.columns:
+                # もしチェックモジュールが新しいフォーマットに対応していない場合のエラーハンドリング
+                raise ValueError(f"'{series}' モジュールのチェック結果に必須カラム '{col}' が見つかりません。モジュールが新しい仕様に準拠しているか確認してください。")
+
+        # 保守整理番号カラムがない場合は空の文字列を追加
+        if "保守整理番号" not in results_df.columns:
+            results_df["保守整理番号"] = ""
+        return results_df[["シリーズ", "ユーザID", "保守整理番号", "チェックID"]]
+
+    def _merge_series_result(self, series, results_df):
+        """完了したシリーズの結果を結果一覧に追加する（GUIスレッドで実行）"""
+        count = 0 if results_df is None else len(results_df)
+        if count:
+            self.all_results_df = pd.concat([self.all_results_df, results_df], ignore_index=True)
+            self.apply_filters_and_sort()
+        label = self.series_progress_labels.get(series)
+        if label is not None:
+            label.config(text=f"{series}: 完了（{count}件）")
+
     def _perform_checks_threaded(self, selected_series_list):
-        temp_all_results = []
-        last_error_message = None
+        error_messages = []
+        error_series = []
+
+        def on_result(series, results_df):
+            self.master.after(0, lambda: self._merge_series_result(series, results_df))
+
+        def on_error(series, error):
+            error_series.append(series)
+            error_messages.append(f"{series}: {error}")
+            self.update_series_progress(series, "エラー発生")
+
+        self.master.after(0, lambda: self._show_series_progress(selected_series_list))
 
         try:
-            for i, series in enumerate(selected_series_list):
-                self.master.after(0, lambda s=series: self.status_label.config(text=f"'{s}' のデータチェックを実行中..."))
+            runners = self._load_series_runners(selected_series_list, on_error)
+            self.master.after(0, lambda: self.status_label.config(text=f"{', '.join(selected_series_list)} のデータチェックを実行中..."))
+
+            # 同じ実行の中で DEKISPART / INNOSITE が同じテーブルを取得する場合は1回だけ取得して共有する
+            # DB接続もセクションごとに再利用し、実行の終了時にまとめて閉じる
+            # 日付のチェックは全シリーズで実行開始時点を基準にする
+            # 「処理時間を計測する」がオンの場合は、チェックごとの処理時間をパフォーマンスタブと performance_report.json に出力する
+            with data_snapshot.snapshot_run(), connection_pool.pool_run(), \
+                    table_cache.force_refresh(self.force_refresh), date_columns.as_of_run(), \
+                    profiling.profile_run(enabled=self.profiling_enabled):
+                # シリーズごとに別のDBを待つため、並行に実行して全体の処理時間を短縮する
+                run_series_concurrently(
+                    [(series, lambda s=series, run_check=run_check: self._run_series_check(s, run_check))
+                     for series, run_check in runners.items()],
+                    max_workers=self.max_series_workers,
+                    on_result=on_result,
+                    on_error=on_error,
+                )
 
-                results_df = pd.DataFrame() # 初期化
-                
-                # 各シリーズのモジュールからメインのチェック関数を呼び出す
-                # IMPORTANT: 各モジュールは pd.DataFrame(columns=["シリーズ", "ユーザID", "保守整理番号", "チェックID"]) 
-                # の形式で結果を返すように修正が必要です。
-                if series == "DEKISPART":
-                    results_df = dekispart.run_dekispart_check(
-                        progress_callback=self.update_progress_label,
-                        aux_paths=self.aux_file_paths
-                    )
-                elif series == "INNOSITE":
-                    results_df = innosite.run_innosite_check(
-                        progress_callback=self.update_progress_label,
-                        aux_paths=self.aux_file_paths
-                    )
-                elif series == "DEKISPART_SCHOOL":
-                    results_df = dekispart_school.run_dekispart_school_check(
-                        progress_callback=self.update_progress_label,
-                        aux_paths=self.aux_file_paths
-                    )
-                elif series == "CLOUD":
-                    results_df = cloud.run_cloud_check(
-                        progress_callback=self.update_progress_label,
-                        aux_paths=self.aux_file_paths
-                    )
-
-                if results_df is not None and not results_df.empty:
-                    # 結果DataFrameに必要なカラムが存在することを確認
-                    # ここでは "シリーズ", "ユーザID", "チェックID" が必須
-                    required_cols_for_check_modules = ["シリーズ", "ユーザID", "チェックID"]
-                    # 保守整理番号は必須ではないが、あれば使用する
-                    for col in required_cols_for_check_modules:
-                        if col not in results_df.columns:
-                            # もしチェックモジュールが新しいフォーマットに対応していない場合のエラーハンドリング
-                            raise ValueError(f"'{series}' モジュールのチェック結果に必須カラム '{col}' が見つかりません。モジュールが新しい仕様に準拠しているか確認してください。")
-                    
-                    # stdUserIDは「ユーザID」として扱われるため、カラム名を「ユーザID」にリネーム
-                    if "ユーザID" in results_df.columns:
-                        results_df.rename(columns={"ユーザID": "ユーザID"}, inplace=True)
-
-                    # 保守整理番号カラムが存在する場合は含める
-                    if "保守整理番号" in results_df.columns:
-                        temp_all_results.append(results_df[["シリーズ", "ユーザID", "保守整理番号", "チェックID"]])
-                    else:
-                        # 保守整理番号カラムがない場合は空の文字列を追加
-                        results_df["保守整理番号"] = ""
-                        temp_all_results.append(results_df[["シリーズ", "ユーザID", "保守整理番号", "チェックID"]])
-
-            if temp_all_results:
-                self.all_results_df = pd.concat(temp_all_results, ignore_index=True)
-                self.master.after(0, lambda: messagebox.showinfo("チェック完了", f"{len(self.all_results_df)}件のエラーが見つかりました。結果一覧を確認してください。"))
-            else:
-                self.all_results_df = pd.DataFrame(columns=["シリーズ", "ユーザID", "保守整理番号", "チェックID"]) # エラーがなかった場合も空のDataFrameを設定
-                self.master.after(0, lambda: messagebox.showinfo("チェック完了", "エラーは見つかりませんでした。"))
+            def finish():
+                if error_series:
+                    self.status_label.config(text="エラー発生")
+                    # エラー発生時もTreeviewにエラーメッセージを表示
+                    error_df = pd.DataFrame([{"シリーズ": "System", "ユーザID": "N/A", "保守整理番号": "", "チェックID": "APP_ERROR"}])
+                    self.all_results_df = pd.concat([self.all_results_df, error_df], ignore_index=True)
+                elif not self.all_results_df.empty:
+                    messagebox.showinfo("チェック完了", f"{len(self.all_results_df)}件のエラーが見つかりました。結果一覧を確認してください。")
+                else:
+                    self.all_results_df = pd.DataFrame(columns=["シリーズ", "ユーザID", "保守整理番号", "チェックID"]) # エラーがなかった場合も空のDataFrameを設定
+                    messagebox.showinfo("チェック完了", "エラーは見つかりませんでした。")
+            self.master.after(0, finish)
 
         except Exception as e:
-            last_error_message = f"データチェック中に予期せぬエラーが発生しました。\n\n詳細: {e}\n\n開発者にお問い合わせください。"
+            error_messages.append(str(e))
             self.master.after(0, lambda: self.status_label.config(text="エラー発生"))
             # エラー発生時もTreeviewにエラーメッセージを表示
             error_df = pd.DataFrame([{"シリーズ": "System", "ユーザID": "N/A", "保守整理番号": "", "チェックID": "APP_ERROR"}])
@@ -1106,7 +1173,9 @@ class DataCheckerApp:
 
         finally:
             self.master.after(0, self._enable_buttons_and_check_download)
-            if last_error_message:
+            self.master.after(0, self._update_performance_report)
+            if error_messages:
+                last_error_message = f"データチェック中に予期せぬエラーが発生しました。\n\n詳細: {chr(10).join(error_messages)}\n\n開発者にお問い合わせください。"
                 self.master.after(0, lambda: messagebox.showerror("処理エラー", last_error_message))
 
     def apply_filters_and_sort(self, event=None):
@@ -1236,11 +1305,8 @@ class DataCheckerApp:
             return
 
         # ダウンロードするDataFrameに表示用のエラーメッセージを追加する
-        df_to_save = self.all_results_df.copy()
-        df_to_save["エラー内容"] = df_to_save["チェックID"].apply(self.get_error_message_by_check_id)
-        
         # カラム順を調整 (シリーズ, ユーザID, 保守整理番号, チェックID, エラー内容)
-        df_to_save = df_to_save[["シリーズ", "ユーザID", "保守整理番号", "チェックID", "エラー内容"]]
+        df_to_save = with_error_messages(self.all_results_df, self.check_definitions)
 
         # 日付をファイル名に含める
         timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -1254,11 +1320,14 @@ class DataCheckerApp:
         )
         if file_path:
             try:
-                if file_path.endswith(".csv"):
-                    df_to_save.to_csv(file_path, index=False, encoding='utf-8-sig') # Excelで開く際に文字化けしないようBOM付きUTF-8
-                elif file_path.endswith(".xlsx"):
-                    # pandasのto_excelはopenpyxlエンジンを使用するため、別途importは不要だが、念のためコメント
-                    df_to_save.to_excel(file_path, index=False)
+                # 書き出しの時間は直前のチェック実行のパフォーマンスレポートに追加する
+                with profiling.export_phase():
+                    if file_path.endswith(".csv"):
+                        df_to_save.to_csv(file_path, index=False, encoding='utf-8-sig') # Excelで開く際に文字化けしないようBOM付きUTF-8
+                    elif file_path.endswith(".xlsx"):
+                        # pandasのto_excelはopenpyxlエンジンを使用するため、別途importは不要だが、念のためコメント
+                        df_to_save.to_excel(file_path, index=False)
+                self._update_performance_report()
                 messagebox.showinfo("ダウンロード完了", f"チェック結果を '{os.path.basename(file_path)}' に保存しました。")
             except Exception as e:
                 messagebox.showerror("ダウンロードエラー", f"ファイルの保存中にエラーが発生しました。\n\n詳細: {e}")
@@ -1342,17 +1411,16 @@ class DataCheckerApp:
 
 if __name__ == "__main__":
     # 必要なライブラリのチェックを一元化
+    # DBドライバ（pyodbc / pymysql）はここでは確認しない。見つからない場合はそのドライバを使用するシリーズだけがエラーになる
     required_libraries = {
-        "pyodbc": "pip install pyodbc",
         "pandas": "pip install pandas",
         "openpyxl": "pip install openpyxl", # Excelファイルの読み書きに必要
         "chardet": "pip install chardet",   # ファイルエンコーディング自動判別に便利
     }
 
     for lib, install_cmd in required_libraries.items():
-        try:
-            __import__(lib)
-        except ImportError:
+        # インストールの有無だけを確認する（DBドライバなどは使用するときに読み込む）
+        if importlib.util.find_spec(lib) is None:
             # GUI環境でない場合は標準エラー出力へ、GUI環境では messagebox で表示
             if os.environ.get('PYINSTALLER_BUILD') == '1' or os.environ.get('GITHUB_ACTIONS') == 'true':
                 print(f"'{lib}' がインストールされていません。\n"
@@ -1367,6 +1435,7 @@ if __name__ == "__main__":
                                      f"アプリケーションを終了します。")
             sys.exit(1)
 
+    configure_logging()
     root = tk.Tk()
     app = DataCheckerApp(root)
     root.mainloop()
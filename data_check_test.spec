@@ -11,6 +11,27 @@ datas_list = [
     ('cloud.py', '.'),
     ('common.py', '.'),
     ('constants.py', '.'),
+    ('rule_engine.py', '.'),
+    ('data_snapshot.py', '.'),
+    ('column_projection.py', '.'),
+    ('data_stream.py', '.'),
+    ('series_scheduler.py', '.'),
+    ('reference_prefetch.py', '.'),
+    ('connection_pool.py', '.'),
+    ('table_cache.py', '.'),
+    ('incremental.py', '.'),
+    ('aux_cache.py', '.'),
+    ('reference_index.py', '.'),
+    ('keyword_matcher.py', '.'),
+    ('remarks.py', '.'),
+    ('date_columns.py', '.'),
+    ('sharding.py', '.'),
+    ('dialogs.py', '.'),
+    ('runtime_files.py', '.'),
+    ('check_results.py', '.'),
+    ('headless.py', '.'),
+    ('series_registry.py', '.'),
+    ('profiling.py', '.'),
 ]
 datas_list += copy_metadata('pytz')
 
@@ -22,7 +43,11 @@ a = Analysis(
     datas=datas_list,
     hiddenimports=[
         'dekispart', 'innosite', 'dekispart_school', 'cloud',
-        'common', 'constants',
+        'common', 'constants', 'rule_engine', 'data_snapshot', 'column_projection',
+        'data_stream',
+        'series_scheduler', 'reference_prefetch', 'connection_pool', 'table_cache',
+        'incremental', 'aux_cache', 'reference_index', 'keyword_matcher', 'remarks', 'date_columns',
+        'sharding', 'dialogs', 'runtime_files', 'check_results', 'headless', 'series_registry', 'profiling',
         'tkinter', 'tkinter.ttk', 'tkinter.messagebox', 'tkinter.filedialog',
         'pandas', 'openpyxl', 'configparser', 'chardet'
     ],
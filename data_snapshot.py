@@ -0,0 +1,187 @@
+"""
+実行単位のデータスナップショット
+
+1回のチェック実行（GUIで選択したシリーズの一括実行など）の間、DBから取得した
+テーブルを保持し、複数のシリーズモジュールで共有するためのモジュールです。
+
+DEKISPART と INNOSITE はどちらも DEKISPART_MNT_DB の T_stdData / T_salMst を
+取得するため、同じ実行の中では、取得済みの列で足りる2回目以降の取得をスナップショットから返します。
+スナップショットが開始されていない場合（各モジュールの単体実行など）は従来どおり
+毎回DBから取得します。
+"""
+
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Callable, Hashable, Iterable, Optional
+
+import pandas as pd
+
+
+logger = logging.getLogger(__name__)
+
+# 共有するテーブルのキー（接続先の設定セクション, テーブル名）
+T_STD_DATA = ("DEKISPART_MNT_DB", "T_stdData")
+T_SAL_MST = ("DEKISPART_MNT_DB", "T_salMst")
+
+
+def _copy_on_write_enabled() -> bool:
+    """pandas の Copy-on-Write が有効かを返す（pandas 3 以降は常に有効）。"""
+    if int(pd.__version__.split(".")[0]) >= 3:
+        return True
+    return pd.options.mode.copy_on_write is True
+
+
+class DataSnapshot:
+    """
+    1回のチェック実行の間、取得済みのテーブルを保持するクラス。
+
+    同じキーのテーブルは最初の1回だけ loader で取得し、以降は保持しているDataFrameの
+    コピーを返します。呼び出し側で列を書き換えても、スナップショット本体や他のシリーズが
+    受け取ったDataFrameには影響しません。Copy-on-Write が有効な場合（pandas 3 以降）は
+    データを複製しない浅いコピー、無効な場合（pandas 2 の既定）は深いコピーを返します。
+    列を絞り込んで取得したテーブルは、要求された列が取得済みの列に含まれる場合に限り再利用します。
+    テーブルから作成した参照用の辞書など、DataFrame以外の値も同じ仕組みで共有できます
+    （この場合はコピーせずにそのまま返すため、呼び出し側で変更しないでください）。
+    """
+
+    def __init__(self):
+        # key -> [(取得時に指定した列の集合 または None(全列), テーブル), ...]
+        self._tables = {}
+        self._fetches = 0
+        self._reuses = []
+        self._lock = threading.Lock()
+        self._table_locks = {}
+
+    def get(
+        self,
+        key: Hashable,
+        loader: Callable[[], pd.DataFrame],
+        columns: Optional[Iterable[str]] = None,
+    ) -> pd.DataFrame:
+        """
+        キーに対応するテーブルを返す（未取得の場合のみ loader で取得する）。
+
+        Args:
+            key: テーブルを識別するキー（例: T_STD_DATA）
+            loader: テーブルをDBから取得する関数
+            columns: loader が取得する列（None の場合は全列）
+
+        Returns:
+            テーブルの読み取り用DataFrame（columns を指定した場合はその列のみ）
+        """
+        requested = None if columns is None else list(columns)
+        with self._lock:
+            table_lock = self._table_locks.setdefault(key, threading.Lock())
+        # 同じテーブルを複数のスレッドから同時に要求された場合も取得は1回にする
+        with table_lock:
+            entries = self._tables.setdefault(key, [])
+            entry = next((entry for entry in entries if self._covers(entry[0], requested)), None)
+            if entry is not None:
+                table = self._project(entry[1], requested)
+                with self._lock:
+                    self._reuses.append(table)
+            else:
+                # 取得済みの列で足りない場合は、要求された列で取得し直して追加で保持する
+                table = loader()
+                entries.append((None if requested is None else set(requested), table))
+                with self._lock:
+                    self._fetches += 1
+            if not isinstance(table, pd.DataFrame):
+                return table
+            return table.copy(deep=not _copy_on_write_enabled())
+
+    @staticmethod
+    def _covers(fetched_columns, requested) -> bool:
+        if fetched_columns is None:
+            return True
+        return requested is not None and fetched_columns.issuperset(requested)
+
+    @staticmethod
+    def _project(table, requested):
+        if requested is None or not isinstance(table, pd.DataFrame):
+            return table
+        # DBに存在しない列は取得時にも含まれていないため、存在する列だけを返す
+        return table[[column for column in requested if column in table.columns]]
+
+    def has(self, key: Hashable) -> bool:
+        """キーに対応するテーブルを取得済みかを返す。"""
+        return bool(self._tables.get(key))
+
+    def savings(self) -> dict:
+        """
+        スナップショットの再利用で省略できた取得件数を返す。
+
+        Returns:
+            {"fetches": 省略した取得回数, "rows": 省略した行数, "bytes": 省略したデータ量（メモリ上のバイト数）}
+        """
+        with self._lock:
+            reuses = list(self._reuses)
+        frames = [table for table in reuses if isinstance(table, pd.DataFrame)]
+        return {
+            "fetches": len(reuses),
+            "rows": sum(len(table) for table in frames),
+            "bytes": sum(int(table.memory_usage(deep=True).sum()) for table in frames),
+        }
+
+    def report(self) -> str:
+        """省略できた取得の概要を1行の文字列で返す。"""
+        savings = self.savings()
+        return (
+            f"データスナップショット: 取得 {self._fetches} 回, "
+            f"再利用 {savings['fetches']} 回 (省略 {savings['rows']} 行 / {savings['bytes'] / (1024 * 1024):.1f} MB)"
+        )
+
+
+# 実行中のスナップショット（DEKISPART と INNOSITE が並行に同じテーブルを要求しても取得は1回にする）
+_current_snapshot: Optional[DataSnapshot] = None
+_current_lock = threading.Lock()
+
+
+@contextmanager
+def snapshot_run():
+    """
+    with ブロックの間、fetch_table の結果を共有するスナップショットを有効にする。
+
+    終了時に省略できた取得件数をログに出力します。
+    """
+    global _current_snapshot
+    snapshot = DataSnapshot()
+    with _current_lock:
+        previous = _current_snapshot
+        _current_snapshot = snapshot
+    try:
+        yield snapshot
+    finally:
+        with _current_lock:
+            _current_snapshot = previous
+        logger.info(snapshot.report())
+
+
+def current_snapshot() -> Optional[DataSnapshot]:
+    """実行中のスナップショットを返す（無い場合は None）。"""
+    return _current_snapshot
+
+
+def fetch_table(
+    key: Hashable,
+    loader: Callable[[], pd.DataFrame],
+    columns: Optional[Iterable[str]] = None,
+) -> pd.DataFrame:
+    """
+    テーブルを取得する。
+
+    スナップショットが有効な場合はそこから返し、無効な場合は loader をそのまま呼び出します。
+
+    Args:
+        key: テーブルを識別するキー
+        loader: テーブルをDBから取得する関数
+        columns: loader が取得する列（None の場合は全列）
+
+    Returns:
+        テーブルのDataFrame
+    """
+    snapshot = _current_snapshot
+    if snapshot is None:
+        return loader()
+    return snapshot.get(key, loader, columns)
@@ -0,0 +1,146 @@
+"""
+DBからの分割取得（ストリーミング）
+
+fetchall() で全件を取得すると、DBドライバの行オブジェクト・変換用のリスト・DataFrame が
+同時にメモリ上に存在するため、ピーク時のメモリ使用量がテーブルの数倍になります。
+ストリーミングを有効にすると、fetchmany() で chunk_size 行ずつ取得してDataFrameに変換し、
+すぐにチェックを実行するため、メモリ使用量は chunk_size 行分に抑えられます。
+（pymysql はサーバーサイドカーソル SSCursor を使用します。）
+
+config.ini の例:
+
+    [STREAMING]
+    enabled = true
+    chunk_size = 5000
+
+テーブル全体を参照するチェック（重複IDのチェックなど）は、各シリーズモジュールで
+事前に必要な列だけを取得して判定に使用します。
+各チャンクの列の型はチャンクごとに推定されます。
+
+取得したDataFrameの文字列列のうち値の種類が少ない列（stdItmS・stdNsyu・stdSale1・備考など）は
+dictionary_encode で category 型（辞書符号化）にします。メモリ使用量が減り、
+ルールエンジンの文字列の判定も値の種類ごとに1回だけ行われます（rule_engine.ColumnView.per_value）。
+"""
+
+import logging
+from typing import Callable, Iterable, Iterator, Optional
+
+import pandas as pd
+
+from common import get_config
+
+
+logger = logging.getLogger(__name__)
+
+STREAMING_SECTION = "STREAMING"
+DEFAULT_CHUNK_SIZE = 5000
+
+# 値の種類が行数のこの割合以下の文字列列を辞書符号化する
+CATEGORY_MAX_UNIQUE_RATIO = 0.5
+
+
+def streaming_chunk_size(chunk_size: Optional[int] = None) -> int:
+    """
+    分割取得の行数を返す。
+
+    Args:
+        chunk_size: 行数の指定（None の場合は config.ini の [STREAMING] を使用）
+
+    Returns:
+        1回に取得する行数（0 の場合は分割せずに全件取得する）
+    """
+    if chunk_size is not None:
+        return max(int(chunk_size), 0)
+
+    config = get_config()
+    if not config.has_section(STREAMING_SECTION):
+        return 0
+    section = config[STREAMING_SECTION]
+    try:
+        if not section.getboolean("enabled", fallback=False):
+            return 0
+        return max(section.getint("chunk_size", fallback=DEFAULT_CHUNK_SIZE), 1)
+    except ValueError as e:
+        logger.warning(f"[{STREAMING_SECTION}] の設定が不正なため全件取得します: {e}")
+        return 0
+
+
+def dictionary_encode(df: pd.DataFrame, max_unique_ratio: float = CATEGORY_MAX_UNIQUE_RATIO) -> pd.DataFrame:
+    """
+    値の種類が少ない文字列列を category 型に変換したDataFrameを返す（df は変更しない）。
+
+    対象は全ての値が文字列の列です（str 型の列は欠損値を含んでいても対象）。
+    None を含む object 型の列は category 型にすると None が NaN に変わり、
+    行単位のチェック（value is None など）の結果が変わるため変換しません。
+    """
+    if df.empty:
+        return df
+    encoded = {}
+    for column in df.columns:
+        series = df[column]
+        if isinstance(series, pd.DataFrame):
+            continue  # 列名が重複している場合
+        if pd.api.types.infer_dtype(series, skipna=False) != "string":
+            continue
+        if series.nunique(dropna=False) <= len(series) * max_unique_ratio:
+            encoded[column] = series.astype("category")
+    if not encoded:
+        return df
+    return df.assign(**encoded)
+
+
+def iter_cursor_frames(cursor, chunk_size: int) -> Iterator[pd.DataFrame]:
+    """
+    実行済みのカーソルから chunk_size 行ずつDataFrameを作成して返す。
+
+    各DataFrameのインデックスは全体での行番号（0始まり）になります。
+
+    Args:
+        cursor: execute() 済みのカーソル
+        chunk_size: 1回に取得する行数
+    """
+    columns = [column[0] for column in cursor.description]  # カラム名を取得
+    start = 0
+    while True:
+        rows = cursor.fetchmany(chunk_size)
+        if not rows:
+            break
+        frame = dictionary_encode(pd.DataFrame([tuple(row) for row in rows], columns=columns))
+        frame.index = pd.RangeIndex(start, start + len(frame))
+        start += len(frame)
+        yield frame
+
+
+def validate_in_chunks(
+    frames: Iterable[pd.DataFrame],
+    validate: Callable[[pd.DataFrame], pd.DataFrame],
+    result_columns: list[str],
+    progress_callback: Optional[Callable[[str], None]] = None,
+    progress_label: str = "",
+) -> pd.DataFrame:
+    """
+    チャンクごとにチェックを実行し、結果を1つのDataFrameにまとめる。
+
+    Args:
+        frames: チェック対象のDataFrameを順に返すイテラブル
+        validate: 1チャンク分のチェック関数（結果のDataFrameを返す）
+        result_columns: 結果のDataFrameの列
+        progress_callback: 進捗を報告するためのコールバック関数
+        progress_label: 進捗メッセージの先頭に付けるシリーズ名
+
+    Returns:
+        全チャンクのチェック結果
+    """
+    results = []
+    checked_rows = 0
+    for frame in frames:
+        result = validate(frame)
+        if result is not None and not result.empty:
+            results.append(result)
+        checked_rows += len(frame)
+        if progress_callback:
+            progress_callback(f"{progress_label}: {checked_rows}件をチェックしました")
+
+    if not results:
+        return pd.DataFrame(columns=result_columns)
+    return pd.concat(results, ignore_index=True)[result_columns]
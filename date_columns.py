@@ -0,0 +1,192 @@
+"""
+日付列の一括変換と実行時点（as-of）
+
+日付のチェックは行ごとに datetime.strptime / pd.to_datetime で変換し、その都度 datetime.now() と
+比較していたため、行数に比例して遅いうえ、実行中に日付が変わると行によって基準日が異なっていました。
+
+- 実行時点: as_of_run の間は now() / today() が同じ時点を返します。
+  as_of を指定すると過去の日付を基準に同じ結果を再現できます（例: as_of_run("2024-04-01")）。
+- 日付列: column_dates で列を一度だけ datetime64 に変換し、変換できなかった行を invalid のマスクで返します。
+  変換は値の種類ごとに1回だけ行い（rule_engine.ColumnView.codes）、結果は ColumnView にキャッシュします。
+- 月の加算: add_months（relativedelta(months=n) と同じく月末を超える日は月末にする）、
+  next_month_start（翌月1日）を列全体に対して計算します。
+"""
+
+import functools
+import threading
+from collections import namedtuple
+from contextlib import contextmanager, nullcontext
+from datetime import date, datetime
+from typing import Any, Callable, Optional
+
+import numpy as np
+import pandas as pd
+
+
+DATE_FORMAT = "%Y-%m-%d"
+
+# datetime64 の単位（ns では 9999-12-31 などの日付を表せないため us を使用する）
+_UNIT = "datetime64[us]"
+_NAT = np.datetime64("NaT", "us")
+_MAX = np.datetime64(datetime.max, "us")
+
+# values: datetime64[us] の配列（欠損・変換できない値は NaT）
+# invalid: 値があるのに日付に変換できなかった行のマスク
+ParsedDates = namedtuple("ParsedDates", ["values", "invalid"])
+
+# 実行中の基準時点（as_of_run で設定し、並行に実行している全シリーズが参照する）。
+# with_as_of は基準時点が固定済みの場合は上書きも解除もしない（他のシリーズの実行中に日付が変わらないようにする）
+_as_of: Optional[datetime] = None
+_as_of_lock = threading.Lock()
+
+
+def _to_datetime(value: Any) -> datetime:
+    if isinstance(value, datetime):
+        return value.replace(tzinfo=None) if value.tzinfo else value
+    return pd.Timestamp(value).to_pydatetime()
+
+
+@contextmanager
+def as_of_run(as_of: Any = None):
+    """
+    with ブロックの間、now() / today() の基準時点を固定する。
+
+    Args:
+        as_of: 基準時点（datetime・date・"2024-04-01" などの文字列。None の場合は開始時点）
+    """
+    global _as_of
+    instant = datetime.now() if as_of is None else _to_datetime(as_of)
+    with _as_of_lock:
+        previous = _as_of
+        _as_of = instant
+    try:
+        yield instant
+    finally:
+        with _as_of_lock:
+            _as_of = previous
+
+
+def current_as_of() -> Optional[datetime]:
+    """固定中の基準時点を返す（無い場合は None）。"""
+    return _as_of
+
+
+def frozen(as_of: Any = None):
+    """
+    validate_data などで基準時点を固定するコンテキストを返す。
+
+    as_of を省略し、すでに実行単位で固定されている場合（as_of_run の中）はそれを使用する。
+    """
+    if as_of is None and _as_of is not None:
+        return nullcontext(_as_of)
+    return as_of_run(as_of)
+
+
+def with_as_of(func: Callable) -> Callable:
+    """
+    キーワード引数 as_of を受け取り、基準時点を固定して func を呼び出すデコレータ。
+
+    各シリーズの validate_data / run_*_check に付け、分割取得した全チャンクで同じ基準時点を使用します。
+    """
+    @functools.wraps(func)
+    def wrapper(*args, as_of: Any = None, **kwargs):
+        with frozen(as_of):
+            return func(*args, **kwargs)
+    return wrapper
+
+
+def now() -> datetime:
+    """基準時点（固定されていない場合は現在時刻）を返す。"""
+    return _as_of or datetime.now()
+
+
+def today() -> date:
+    """基準時点の日付を返す。"""
+    return now().date()
+
+
+def as_of_datetime64() -> np.datetime64:
+    """基準時点を datetime64[us] で返す（column_dates の values と比較する場合に使用）。"""
+    return np.datetime64(now(), "us")
+
+
+def today_datetime64() -> np.datetime64:
+    """基準時点の日付（0時）を datetime64[us] で返す。"""
+    return np.datetime64(today(), "D").astype(_UNIT)
+
+
+def parse_date(value: Any, date_format: str = DATE_FORMAT) -> datetime:
+    """
+    行単位のチェックと同じ方法で日付に変換する（Timestamp はそのまま、それ以外は str を date_format で解析）。
+
+    Raises:
+        ValueError: 日付の形式が不正な場合
+    """
+    return value if isinstance(value, pd.Timestamp) else datetime.strptime(str(value), date_format)
+
+
+def _is_missing(value: Any) -> bool:
+    return value is None or (not isinstance(value, str) and bool(pd.isna(value)))
+
+
+def _parse_uniques(uniques, parser: Callable, errors: tuple) -> tuple:
+    values = np.full(len(uniques), _NAT)
+    invalid = np.zeros(len(uniques), dtype=bool)
+    for position, value in enumerate(uniques):
+        if _is_missing(value):
+            continue
+        try:
+            parsed = parser(value)
+            values[position] = _NAT if _is_missing(parsed) else np.datetime64(_to_datetime(parsed), "us")
+        except errors:
+            invalid[position] = True
+    return values, invalid
+
+
+def column_dates(view, column: str, parser: Callable = parse_date, errors: tuple = (ValueError,)) -> ParsedDates:
+    """
+    列を日付（datetime64[us]）に変換する（同じ列・同じ変換関数の組は ColumnView ごとに1回だけ変換する）。
+
+    Args:
+        view: rule_engine.ColumnView
+        column: 列名（列が無い場合は KeyError）
+        parser: 値を日付に変換する関数（行単位のチェックで使用している関数と同じものを渡す）
+        errors: 変換できない値として扱う例外（それ以外の例外はそのまま送出する）
+
+    Returns:
+        ParsedDates（欠損値は NaT で invalid は False）
+    """
+    def build():
+        source = view.source(column)
+        if isinstance(source.dtype, np.dtype) and source.dtype.kind == "M":
+            # datetime64 の列（iterrows では Timestamp）は変換不要
+            values = source.to_numpy().astype(_UNIT)
+            return ParsedDates(values, np.zeros(len(values), dtype=bool))
+        encoded = view.codes(column)
+        if encoded is None:
+            values, invalid = _parse_uniques(view.raw(column).tolist(), parser, errors)
+            return ParsedDates(values, invalid)
+        codes, uniques = encoded
+        values, invalid = _parse_uniques(uniques, parser, errors)
+        return ParsedDates(values[codes], invalid[codes])
+
+    return view.cached(("dates", column, parser, errors), build)
+
+
+def _shift(dates: ParsedDates, offset) -> ParsedDates:
+    shifted = (pd.DatetimeIndex(dates.values) + offset).to_numpy().astype(_UNIT)
+    # datetime の範囲（9999年）を超える日付は行単位の計算では例外になるため、変換できない値とする
+    overflow = shifted > _MAX
+    shifted[overflow] = _NAT
+    return ParsedDates(shifted, dates.invalid | overflow)
+
+
+def add_months(dates: ParsedDates, months: int) -> ParsedDates:
+    """各日付に months か月を加える（date + relativedelta(months=months) 相当）。"""
+    return _shift(dates, pd.DateOffset(months=months))
+
+
+def next_month_start(dates: ParsedDates) -> ParsedDates:
+    """各日付の翌月1日（0時）を返す。"""
+    midnight = pd.DatetimeIndex(dates.values).normalize().to_numpy().astype(_UNIT)
+    return _shift(ParsedDates(midnight, dates.invalid), pd.offsets.MonthBegin(1))
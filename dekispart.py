@@ -1,24 +1,19 @@
-import pyodbc
-import pymysql
 import pandas as pd
+import numpy as np
 from datetime import datetime
-import tkinter as tk
-from tkinter import filedialog, messagebox
+# メッセージボックス・ファイル選択（ヘッドレス実行時は tkinter を使用しない）
+from dialogs import filedialog, hidden_root, messagebox
 from datetime import datetime
 from dateutil.relativedelta import relativedelta
 import os
 import traceback
 import logging
 import configparser
+import re
 from dekispart_school import fetch_data_from_db
 
-# 共通モジュールからDB接続ヘルパー関数をインポート
-from common import (
-    _normalize_odbc_driver,
-    _enable_deprecated_tls_if_requested,
-    _build_sqlserver_conn_str,
-    get_config,
-)
+# 共通モジュールからログ設定関数をインポート
+from common import configure_logging
 
 # 定数モジュールをインポート
 from constants import (
@@ -29,54 +24,184 @@ from constants import (
     BikoKeyword,
 )
 
+# 列指向ルールエンジン
+from rule_engine import (
+    ENGINE_ROW,
+    ENGINE_VECTORIZED,
+    Rule,
+    apply_where,
+    evaluate_rules,
+    is_none,
+    is_value,
+    truthy,
+)
 
-# ログ設定
-# 実行ファイルと同じディレクトリにログを出力する例
-log_file_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'application.log')
-logging.basicConfig(
-    filename=log_file_path,
-    level=logging.INFO, # INFO以上のレベルのログを出力
-    format='%(asctime)s - %(levelname)s - %(message)s'
+# 実行単位で共有するテーブルのスナップショット
+from data_snapshot import (
+    T_SAL_MST,
+    T_STD_DATA,
+    fetch_table,
 )
 
+# 実行するチェックが参照する列だけを取得する
+from column_projection import SQLSERVER, required_columns, select_list
+
+# 分割取得（ストリーミング）
+from data_stream import iter_cursor_frames, streaming_chunk_size, validate_in_chunks
+
+# 参照データの並行取得
+from reference_prefetch import start_prefetch
+
+# 実行単位のDB接続プール
+from connection_pool import connect
+
+# 取得したテーブルのディスクキャッシュ
+from table_cache import fetch_frame
+
+# 差分チェック
+from incremental import incremental_enabled, select_checks, validate_incrementally
+
+# 補助ファイル（商魂のCSV・個人名チェックのExcel）の読み込みキャッシュ
+from aux_cache import read_aux_csv, read_aux_excel
+
+# 照合用の参照データの索引
+from reference_index import ReferenceIndex, column_index, normalized_text
+
+# 複数キーワードの一括照合（CHK_0010 の法人名・個人名チェック）
+from keyword_matcher import KeywordMatcher
+
+# 備考欄の正規化とキーワード判定
+from remarks import contains_keyword
+
+# 日付列の一括変換と実行時点（as-of）
+from date_columns import add_months, as_of_datetime64, column_dates, now, parse_date, with_as_of
+
+# 大きなテーブルのプロセス並列チェック
+from sharding import validate_sharded
+
+# チェックごとの処理時間の計測
+from profiling import PHASE_AUX_LOAD, PHASE_FETCH, PHASE_REFERENCE, PHASE_VALIDATE, PhaseTimer, profiled_check
+
+
+# T_stdData の取得列（チェックに関係なく取得する列と、チェックIDごとに参照する列）
+# チェックを追加・変更した場合は、参照する列をここにも登録してください。
+BASE_COLUMNS = ("stdID", "stdUserID")
+CHECK_COLUMNS = {
+    "DEKISPART_CHK_0001": ("stdItmS",),
+    "DEKISPART_CHK_0002": ("stdItmS",),
+    "DEKISPART_CHK_0003": ("stdItmS",),
+    "DEKISPART_CHK_0004": ("stdKaiyaku", "stdItmS"),
+    "DEKISPART_CHK_0005": (),
+    "DEKISPART_CHK_0006": (),
+    "DEKISPART_CHK_0007": (),
+    "DEKISPART_CHK_0008": (),
+    "DEKISPART_CHK_0009": ("stdSuppID",),
+    "DEKISPART_CHK_0010": ("stdName", "stdFlg4"),
+    "DEKISPART_CHK_0011": ("stdFlg4", "stdTan1"),
+    "DEKISPART_CHK_0012": ("stdFlg4", "stdTan1"),
+    "DEKISPART_CHK_0013": ("stdNamCode",),
+    "DEKISPART_CHK_0014": ("stdNamCode",),
+    "DEKISPART_CHK_0015": ("stdSale1",),
+    "DEKISPART_CHK_0016": ("stdSale1",),
+    "DEKISPART_CHK_0017": ("stdSale1",),
+    "DEKISPART_CHK_0018": ("stdSaleNam1",),
+    "DEKISPART_CHK_0019": ("stdSale1", "stdSale2"),
+    "DEKISPART_CHK_0020": ("stdSale1", "stdSale2"),
+    "DEKISPART_CHK_0021": ("stdSale1", "stdAdd", "stdSale2"),
+    "DEKISPART_CHK_0022": ("stdSale1", "stdNsyu"),
+    "DEKISPART_CHK_0023": ("stdSale1", "stdNsyu"),
+    "DEKISPART_CHK_0024": ("stdSale1", "stdNsyu"),
+    "DEKISPART_CHK_0025": ("stdSale1", "stdNsyu"),
+    "DEKISPART_CHK_0026": ("stdSale1", "stdNsyu"),
+    "DEKISPART_CHK_0027": ("stdKaiyaku", "stdSaleNam1"),
+    "DEKISPART_CHK_0029": ("stdFlg3",),
+    "DEKISPART_CHK_0030": ("stdKaiyaku", "stdReyear1", "stdbiko4"),
+    "DEKISPART_CHK_0031": ("stdKaiyaku", "stdFlg1"),
+    "DEKISPART_CHK_0032": ("stdNsyu",),
+    "DEKISPART_CHK_0033": ("stdJifuriDM", "stdSale1"),
+    "DEKISPART_CHK_0034": ("stdSale1", "stdKaiyaku", "stdJifuriDM", "stdbiko3", "stdKbiko", "stdNsyu"),
+    "DEKISPART_CHK_0035": ("stdKaiyaku", "stdbiko3", "stdJifuriDM", "stdNsyu"),
+    "DEKISPART_CHK_0036": ("stdKaiyaku", "stdbiko3", "stdKbiko", "stdJifuriDM", "stdNsyu"),
+    "DEKISPART_CHK_0037": ("stdKaiyaku", "stdNonRenewal"),
+    "DEKISPART_CHK_0038": ("stdKaiyaku", "stdKbiko", "stdHassouType"),
+    "DEKISPART_CHK_0039": ("stdKaiyaku", "stdKbiko", "stdHassouType"),
+    "DEKISPART_CHK_0040": ("stdTsel",),
+    "DEKISPART_CHK_0041": ("stdKaiyaku", "stdTsel"),
+    "DEKISPART_CHK_0042": ("stdKaiyaku", "stdTpla"),
+    "DEKISPART_CHK_0043": ("stdKaiyaku", "stdTpla"),
+    "DEKISPART_CHK_0044": ("stdReyear1", "stdName", "stdKaiyaku"),
+    "DEKISPART_CHK_0045": ("stdAcday", "stdKaiyaku"),
+    "DEKISPART_CHK_0046": ("stdRemon", "stdKaiyaku"),
+    "DEKISPART_CHK_0047": ("stdAcyear", "stdKaiyaku"),
+    "DEKISPART_CHK_0048": ("stdReyear1", "stdKaiyaku"),
+    "DEKISPART_CHK_0049": ("stdReyear2", "stdKaiyaku"),
+    "DEKISPART_CHK_0050": ("stdKainsyu", "stdKaiyaku"),
+    "DEKISPART_CHK_0051": ("stdName",),
+    "DEKISPART_CHK_0052": ("stdNamef",),
+    "DEKISPART_CHK_0053": ("stdZip",),
+    "DEKISPART_CHK_0054": ("stdAdd",),
+    "DEKISPART_CHK_0055": ("stdTell", "stdKaiyaku"),
+    "DEKISPART_CHK_0056": ("stdKaiyaku", "stdKainsyu", "stdbiko4"),
+    "DEKISPART_CHK_0057": ("stdKaiyaku", "stdHassouType", "stdNsyu"),
+    "DEKISPART_CHK_0058": ("stdKaiyaku", "stdHassouType", "stdKbiko"),
+    "DEKISPART_CHK_0059": ("stdFlg4", "stdSale1"),
+    "DEKISPART_CHK_0060": (),
+}
+
+# 当日と比較するチェック（差分チェックでは前回のエラーを再利用せず、毎回全行でチェックする）
+DATE_DEPENDENT_CHECKS = frozenset({"DEKISPART_CHK_0030", "DEKISPART_CHK_0044"})
+
+# T_salMst の取得列（販売店マスタの辞書で参照する列）
+SALES_MASTER_COLUMNS = ("salCode", "salNotifyRenewal", "salJifuriDM")
+
 # DBからデータを取得
-def fetch_data():
-    config = get_config()
-    db_config = config['DEKISPART_MNT_DB']
-
-    conn_str = _build_sqlserver_conn_str(db_config)
-    conn = pyodbc.connect(conn_str)
-    cursor = conn.cursor()
-    cursor.execute("SELECT * FROM T_stdData")  # 任意のクエリ
-    #cursor.execute("SELECT TOP 1 * FROM T_stdData")  # 任意のクエリ
-    columns = [column[0] for column in cursor.description]  # カラム名を取得
-    data = cursor.fetchall()
-    conn.close()
-
-    # データが1列の場合、各行をリストに変換
-    data = [list(row) for row in data]  # 必要に応じて形状を修正
-
-    # DataFrameに変換
-    df = pd.DataFrame(data, columns=columns)
+def fetch_data(check_ids=None):
+    """
+    T_stdData を取得する。
+
+    Args:
+        check_ids: 実行するチェックIDの一覧（None の場合は全てのチェック）。
+            取得する列は、これらのチェックが参照する列に絞り込みます。
+    """
+    columns = required_columns(CHECK_COLUMNS, BASE_COLUMNS, check_ids)
+    # T_stdData は DEKISPART / INNOSITE で共有する（同じ実行の中では1回だけ取得）
+    return fetch_table(T_STD_DATA, lambda: _fetch_std_data(columns), columns)
+
+def _fetch_std_data(columns=None):
+    with connect('DEKISPART_MNT_DB') as conn:
+        cursor = conn.cursor()
+        select_columns = select_list(cursor, [("T_stdData", None)], columns, SQLSERVER)
+        # DataFrameに変換（テーブルキャッシュが有効な場合はキャッシュから読み込む）
+        df = fetch_frame('DEKISPART_MNT_DB', cursor, f"SELECT {select_columns} FROM T_stdData")
     return df
 
+def iter_data(chunk_size, check_ids=None):
+    """
+    T_stdData を chunk_size 行ずつ取得し、DataFrameとして順に返す（ストリーミング）。
+
+    取得する列は fetch_data と同じです。スナップショットには保持しません。
+    """
+    columns = required_columns(CHECK_COLUMNS, BASE_COLUMNS, check_ids)
+    with connect('DEKISPART_MNT_DB') as conn:
+        cursor = conn.cursor()
+        select_columns = select_list(cursor, [("T_stdData", None)], columns, SQLSERVER)
+        cursor.execute(f"SELECT {select_columns} FROM T_stdData")
+        yield from iter_cursor_frames(cursor, chunk_size)
+
+def fetch_user_id_index():
+    """ストリーミング時の事前取得: CHK_0008・0060 の判定に使用する stdID・stdUserID を全件取得する。"""
+    return fetch_table(T_STD_DATA, lambda: _fetch_std_data(BASE_COLUMNS), BASE_COLUMNS)
+
 def get_sales_master_data():
-    config = get_config()
-    db_config = config['DEKISPART_MNT_DB']
-
-    conn_str = _build_sqlserver_conn_str(db_config)
-    conn = pyodbc.connect(conn_str)
-    cursor = conn.cursor()
-    cursor.execute("SELECT * FROM T_salMst")  # 任意のクエリ
-    columns = [column[0] for column in cursor.description]  # カラム名を取得
-    data = cursor.fetchall()
-    conn.close()
-
-    # データが1列の場合、各行をリストに変換
-    data = [list(row) for row in data]  # 必要に応じて形状を修正
-
-    # DataFrameに変換
-    df = pd.DataFrame(data, columns=columns)
+    # T_salMst は DEKISPART / INNOSITE で共有する（同じ実行の中では1回だけ取得）
+    return fetch_table(T_SAL_MST, lambda: _fetch_sales_master_data(SALES_MASTER_COLUMNS), SALES_MASTER_COLUMNS)
+
+def _fetch_sales_master_data(columns=None):
+    with connect('DEKISPART_MNT_DB') as conn:
+        cursor = conn.cursor()
+        select_columns = select_list(cursor, [("T_salMst", None)], columns, SQLSERVER)
+        # DataFrameに変換（テーブルキャッシュが有効な場合はキャッシュから読み込む）
+        df = fetch_frame('DEKISPART_MNT_DB', cursor, f"SELECT {select_columns} FROM T_salMst")
     return df
 
 def _add_error_message(error_messages, user_id, check_id, maintenance_id=None):
@@ -92,29 +217,17 @@ def get_mysql_connection():
     """
     MySQL（イノサイト）への接続を取得する関数
     innosite.pyのfetch_data関数を参考に実装
+    （チェック実行中は接続プールの接続を再利用する）
     """
-    config = get_config()
-    db_config = config['KSMAIN2_MYSQL']
-
-    return pymysql.connect(
-        host=db_config['host'],
-        database=db_config['database'],
-        user=db_config['user'],
-        password=db_config['password'],
-        charset=db_config['charset'],
-    )
+    return connect('KSMAIN2_MYSQL')
 
 def get_sqlserver_connection():
     """
     SQL Server（デキスパート）への接続を取得する関数
     他のチェック関数でも使用可能
+    （チェック実行中は接続プールの接続を再利用する）
     """
-    config = get_config()
-    db_config = config['DEKISPART_MNT_DB']
-
-
-    conn_str = _build_sqlserver_conn_str(db_config)
-    return pyodbc.connect(conn_str)
+    return connect('DEKISPART_MNT_DB')
 
 # --- 各チェックロジックをカプセル化した関数群 ---
 # 各関数は、対象の行 (Pandas Series) とエラーリストを受け取り、
@@ -251,28 +364,24 @@ def check_0009(row, errors_list):
     if row["stdSuppID"] and str(row["stdUserID"])[:8] != str(row["stdSuppID"])[:8]:
         _add_error_message(errors_list, row["stdUserID"], "DEKISPART_CHK_0009", row.get("stdID", ""))
 
-def check_0010(row, errors_list, individual_list):
+# 法人名キーワード（敬称が「様」の場合に会社名として不適切）
+CORPORATE_KEYWORDS = ["株式", "有限", "合同", "合資", "合名"]
+
+def build_name_matcher(individual_list) -> KeywordMatcher:
+    """CHK_0010 で使用する、法人名キーワードと個人名チェックリストを合わせた照合器を作成する。"""
+    return KeywordMatcher(CORPORATE_KEYWORDS + list(individual_list or []))
+
+def check_0010(row, errors_list, name_matcher):
     """
     DEKISPART_CHK_0010: stdFlg4がTRUEかつstdNameに特定の文字が含まれている場合NG
     法人名キーワード（株式、有限など）と個人名チェックリストの両方をチェック
+
+    name_matcher は build_name_matcher で作成した照合器（キーワードの数によらず stdName を1回走査する）
     """
-    # 法人名キーワード（敬称が「様」の場合に会社名として不適切）
-    corporate_keywords = ["株式", "有限", "合同", "合資", "合名"]
-    
     if row["stdFlg4"] == True and row["stdName"]:
-        std_name = str(row["stdName"])
-        
-        # 法人名キーワードのチェック
-        for keyword in corporate_keywords:
-            if keyword in std_name:
-                _add_error_message(errors_list, row["stdUserID"], "DEKISPART_CHK_0010", row.get("stdID", ""))
-                return  # 1つ見つかったら終了
-        
-        # 個人名チェックリストのチェック
-        for keyword in individual_list:
-            if keyword in std_name:
-                _add_error_message(errors_list, row["stdUserID"], "DEKISPART_CHK_0010", row.get("stdID", ""))
-                return  # 1つ見つかったら終了
+        # 法人名キーワード・個人名チェックリストのいずれかを含む場合はNG（エラーは1件）
+        if name_matcher.search(str(row["stdName"])):
+            _add_error_message(errors_list, row["stdUserID"], "DEKISPART_CHK_0010", row.get("stdID", ""))
 
 def check_0011(row, errors_list):
     """
@@ -445,7 +554,7 @@ def check_0038(row, errors_list):
     DEKISPART_CHK_0038: 加入中に限り、更新案内不要販売店登録がある場合、更新案内フラグは不要でなくてはならない
     """
     if row["stdKaiyaku"] == False:
-        if "更新案内不要" in str(row["stdKbiko"]):
+        if contains_keyword(row["stdKbiko"], BikoKeyword.RENEWAL_NOT_NEEDED):
             if row["stdHassouType"] != 0:
                 _add_error_message(errors_list, row["stdUserID"], "DEKISPART_CHK_0038", row.get("stdID", ""))
 
@@ -454,7 +563,7 @@ def check_0039(row, errors_list):
     DEKISPART_CHK_0039: 加入中に限り、備考に「更新案内不要」が入っている場合、更新案内フラグは不要でなくてはならない
     """
     if row["stdKaiyaku"] == False:
-        if "更新案内不要" in str(row["stdKbiko"]):
+        if contains_keyword(row["stdKbiko"], BikoKeyword.RENEWAL_NOT_NEEDED):
             if row["stdHassouType"] != 0:
                 _add_error_message(errors_list, row["stdUserID"], "DEKISPART_CHK_0039", row.get("stdID", ""))
 
@@ -470,14 +579,14 @@ def check_0030(row, errors_list):
     DEKISPART_CHK_0030: stdKaiyakuがTRUEかつstdbiko4に"特別計算"が含まれ、
                        契約満了日から2か月以上経過している場合NG
     """
-    today = datetime.today()
+    today = now()
     if (
         row["stdKaiyaku"] == True
-        and "特別計算" in str(row["stdbiko4"])
+        and contains_keyword(row["stdbiko4"], BikoKeyword.SPECIAL_CALCULATION)
         and pd.notna(row["stdReyear1"])
     ):
         try:
-            reyear_date = row["stdReyear1"] if isinstance(row["stdReyear1"], pd.Timestamp) else datetime.strptime(str(row["stdReyear1"]), "%Y-%m-%d")
+            reyear_date = parse_date(row["stdReyear1"])
             if today >= reyear_date + relativedelta(months=2):
                 _add_error_message(errors_list, row["stdUserID"], "DEKISPART_CHK_0030", row.get("stdID", ""))
         except ValueError:
@@ -524,10 +633,10 @@ def check_0034(row, errors_list, sales_master_list):
     is_not_cancelled = row.get("stdKaiyaku") is False
     
     # stdbiko3 に「自振DM不要」の文字列を含まない
-    is_stdbiko3_not_containing_jifuri_dm = not (row.get("stdbiko3") and "自振DM不要" in str(row["stdbiko3"]))
+    is_stdbiko3_not_containing_jifuri_dm = not (contains_keyword(row.get("stdbiko3"), BikoKeyword.JIFURI_DM_NOT_NEEDED))
 
     # stdKbiko に「更新案内不要」の文字列を含まない
-    is_std_kbiko_not_containing_renewal = not (row.get("stdKbiko") and "更新案内不要" in str(row["stdKbiko"]))
+    is_std_kbiko_not_containing_renewal = not (contains_keyword(row.get("stdKbiko"), BikoKeyword.RENEWAL_NOT_NEEDED))
 
     # stdNsyu は row から直接取得（文字列として比較）
     is_std_nsyu_122 = str(row.get("stdNsyu")) == "122"
@@ -570,7 +679,7 @@ def check_0035(row, errors_list, sales_master_dict): # sales_master_dict を引
     is_not_cancelled = row.get("stdKaiyaku") is False
     
     # stdbiko3 に「自振DM不要」の文字列を含む
-    is_stdbiko3_containing_jifuri_dm = row.get("stdbiko3") and "自振DM不要" in str(row["stdbiko3"])
+    is_stdbiko3_containing_jifuri_dm = contains_keyword(row.get("stdbiko3"), BikoKeyword.JIFURI_DM_NOT_NEEDED)
 
     is_std_nsyu_122 = str(row.get("stdNsyu")) == "122"
     
@@ -622,10 +731,10 @@ def check_0036(row, errors_list, sales_master_dict): # sales_master_dict を引
     is_not_cancelled = row.get("stdKaiyaku") is False
     
     # stdbiko3 に「自振DM不要」の文字列を含む
-    is_stdbiko3_containing_jifuri_dm = row.get("stdbiko3") and "自振DM不要" in str(row["stdbiko3"])
+    is_stdbiko3_containing_jifuri_dm = contains_keyword(row.get("stdbiko3"), BikoKeyword.JIFURI_DM_NOT_NEEDED)
 
     # stdKbiko に「更新案内不要」の文字列を含む
-    is_std_kbiko_containing_renewal = row.get("stdKbiko") and "更新案内不要" in str(row["stdKbiko"])
+    is_std_kbiko_containing_renewal = contains_keyword(row.get("stdKbiko"), BikoKeyword.RENEWAL_NOT_NEEDED)
 
     is_std_nsyu_122 = str(row.get("stdNsyu")) == "122"
     
@@ -740,7 +849,7 @@ def check_0039_sales_master_related(row, errors_list, sales_master_list):
     # -- 共通条件のチェック --
     is_not_cancelled = row.get("stdKaiyaku") is False
     # stdKbiko が存在し、かつ「更新案内不要」という文字が含まれているか
-    is_kbiko_contains_renewal_text = row.get("stdKbiko") and "更新案内不要" in str(row["stdKbiko"])
+    is_kbiko_contains_renewal_text = contains_keyword(row.get("stdKbiko"), BikoKeyword.RENEWAL_NOT_NEEDED)
 
     # 共通条件が満たされていない場合は、NGではないのでここで終了
     if not (is_not_cancelled and is_kbiko_contains_renewal_text):
@@ -826,20 +935,18 @@ def check_0042(row, errors_list):
     if row["stdKaiyaku"] == False and pd.isna(row["stdTpla"]):
         _add_error_message(errors_list, row["stdUserID"], "DEKISPART_CHK_0042", row.get("stdID", ""))
 
-def check_0043(row, errors_list, salKName2K_dict):
+def check_0043(row, errors_list, valid_office_names):
     """
     DEKISPART_CHK_0043: stdKaiyakuがFALSEの時、stdTpla（営業所名）が
     事前に取得した所属名（salKName2K）として有効かチェック
+
+    valid_office_names は prepare_reference_data で salKName2K の値から作成した索引
     """
     if row["stdKaiyaku"] == False:
         stdTpla_value = str(row["stdTpla"]).strip()
         if not stdTpla_value: # stdTplaが空の場合はチェックをスキップ
             return
 
-        # stdTpla（営業所名）が辞書の値として存在するかチェック
-        # salKName2K_dict は {salCode: 営業所名} の形式
-        valid_office_names = set(salKName2K_dict.values())
-        
         # stdTplaの値が有効な営業所名に含まれているかチェック
         if stdTpla_value not in valid_office_names:
             _add_error_message(errors_list, row["stdUserID"], "DEKISPART_CHK_0043", row.get("stdID", ""))
@@ -852,8 +959,8 @@ def check_0044(row, errors_list):
     if not any(symbol in str(row["stdName"]) for symbol in ["▲", "×", "■"]):
         if pd.notna(row["stdReyear1"]) and str(row["stdReyear1"]).strip() != "":
             try:
-                reyear_date = row["stdReyear1"] if isinstance(row["stdReyear1"], pd.Timestamp) else datetime.strptime(str(row["stdReyear1"]), "%Y-%m-%d")
-                if row["stdKaiyaku"] == True and reyear_date > datetime.now():
+                reyear_date = parse_date(row["stdReyear1"])
+                if row["stdKaiyaku"] == True and reyear_date > now():
                     _add_error_message(errors_list, row["stdUserID"], "DEKISPART_CHK_0044", row.get("stdID", ""))
             except ValueError:
                 _add_error_message(errors_list, row["stdUserID"], "DEKISPART_CHK_0044_DATE_PARSE_ERROR", row.get("stdID", ""))
@@ -933,7 +1040,7 @@ def check_0058(row, errors_list):
     """
     DEKISPART_CHK_0058: 加入中に限り、備考に「別送」が含まれる場合、更新案内フラグは「別送(2)」でなくてはならない
     """
-    if row["stdKaiyaku"] == False and "別送" in str(row["stdKbiko"]) and row["stdHassouType"] != 2:
+    if row["stdKaiyaku"] == False and contains_keyword(row["stdKbiko"], BikoKeyword.SEPARATE_SHIPPING) and row["stdHassouType"] != 2:
         _add_error_message(errors_list, row["stdUserID"], "DEKISPART_CHK_0058", row.get("stdID", ""))
 
 def check_0059(row, errors_list, customers_dict):
@@ -988,26 +1095,10 @@ def check_0060(row, errors_list, chk0060_target_ids, chk0060_item_ids):
         _add_error_message(errors_list, row["stdUserID"], "DEKISPART_CHK_0060", row.get("stdID", ""))
 
 
-def prepare_chk0060_reference_sets(std_ids):
-    """
-    CHK_0060で使用する参照セットを事前に取得する。
-    
-    Issue #16の要件に従い:
-    - INNOSITE DB: t_stdidata で stdipcode='1541'(SiTE-NEXUS) の stdid_i を取得
-    - DEKISPART DB: T_stdItem で itmCode='1494'(3Dイラスト) の itmUser を取得
-    """
-    std_ids = {str(std_id).strip() for std_id in std_ids if pd.notna(std_id) and str(std_id).strip()}
-    if not std_ids:
-        return set(), set()
-
-    mysql_ids = set()
-    sqlserver_ids = set()
-
+def _fetch_site_nexus_ids():
+    """CHK_0060: INNOSITE DB の t_stdidata で stdipcode='1541'(SiTE-NEXUS) の stdid_i を取得する。"""
     mysql_conn = None
     mysql_cursor = None
-    sqlserver_conn = None
-    sqlserver_cursor = None
-
     try:
         mysql_conn = get_mysql_connection()
         mysql_cursor = mysql_conn.cursor()
@@ -1019,9 +1110,10 @@ def prepare_chk0060_reference_sets(std_ids):
             WHERE stdipcode = '1541'
             """
         )
-        mysql_ids = {str(row[0]).strip() for row in mysql_cursor.fetchall() if row and row[0] is not None}
+        return {str(row[0]).strip() for row in mysql_cursor.fetchall() if row and row[0] is not None}
     except Exception as e:
         logging.error(f"CHK_0060 MySQLデータ取得でエラー: {e}")
+        return set()
     finally:
         try:
             mysql_cursor.close()
@@ -1032,6 +1124,10 @@ def prepare_chk0060_reference_sets(std_ids):
         except Exception:
             pass
 
+def _fetch_3d_illust_ids():
+    """CHK_0060: DEKISPART DB の T_stdItem で itmCode='1494'(3Dイラスト) の itmUser を取得する。"""
+    sqlserver_conn = None
+    sqlserver_cursor = None
     try:
         sqlserver_conn = get_sqlserver_connection()
         sqlserver_cursor = sqlserver_conn.cursor()
@@ -1043,9 +1139,10 @@ def prepare_chk0060_reference_sets(std_ids):
             WHERE itmCode = '1494'
             """
         )
-        sqlserver_ids = {str(row[0]).strip() for row in sqlserver_cursor.fetchall() if row and row[0] is not None}
+        return {str(row[0]).strip() for row in sqlserver_cursor.fetchall() if row and row[0] is not None}
     except Exception as e:
         logging.error(f"CHK_0060 SQLServerデータ取得でエラー: {e}")
+        return set()
     finally:
         try:
             sqlserver_cursor.close()
@@ -1056,28 +1153,495 @@ def prepare_chk0060_reference_sets(std_ids):
         except Exception:
             pass
 
+def prepare_chk0060_reference_sets(std_ids=None):
+    """
+    CHK_0060で使用する参照セットを事前に取得する。
+    
+    Issue #16の要件に従い:
+    - INNOSITE DB: t_stdidata で stdipcode='1541'(SiTE-NEXUS) の stdid_i を取得
+    - DEKISPART DB: T_stdItem で itmCode='1494'(3Dイラスト) の itmUser を取得
+
+    2つのDBへのクエリは並行に実行します。
+    std_ids を省略した場合は、T_stdData の取得前に開始できるよう絞り込まずに返します。
+    """
+    if std_ids is not None:
+        std_ids = {str(std_id).strip() for std_id in std_ids if pd.notna(std_id) and str(std_id).strip()}
+        if not std_ids:
+            return set(), set()
+
+    prefetch = start_prefetch(
+        {"site_nexus_ids": _fetch_site_nexus_ids, "3d_illust_ids": _fetch_3d_illust_ids},
+        label="DEKISPART CHK_0060",
+    )
+    mysql_ids = prefetch.result("site_nexus_ids")
+    sqlserver_ids = prefetch.result("3d_illust_ids")
+
+    if std_ids is None:
+        return mysql_ids, sqlserver_ids
     return mysql_ids & std_ids, sqlserver_ids & std_ids
 
+# --- 列指向（ベクトル化）評価用のマスク関数群 ---
+# 各関数は ColumnView を受け取り、対応する check_xxxx がエラーを追加する行を True とした
+# 真偽マスクを返します。判定内容は行単位の関数と完全に一致させてください。
+# 文字列の形式の判定は view.matches で値の種類ごとに1回だけ評価します。
+
+def _mask_itms_prefix(view, itm_s_value, user_id_prefix):
+    """CHK_0001〜0003: stdItmSとstdUserIDの先頭文字の対応"""
+    starts = view.matches("stdUserID", lambda text: text.startswith(user_id_prefix))
+    is_itm = view.raw("stdItmS") == itm_s_value
+    return (is_itm & ~starts) | (starts & ~is_itm)
+
+def _mask_0001(view):
+    return _mask_itms_prefix(view, "ＬＡＮ", "012")
+
+def _mask_0002(view):
+    return _mask_itms_prefix(view, "単体", "8001")
+
+def _mask_0003(view):
+    return _mask_itms_prefix(view, "レンタル", "629")
+
+def _mask_0004(view):
+    not_cancelled = view.raw("stdKaiyaku") == False
+    user_id = view.stripped("stdUserID")
+    itm_s = view.stripped("stdItmS")
+    is_other = (itm_s == "その他") & (user_id != "")
+    is_blank = (itm_s == "") & ~view.matches("stdUserID", _starts_with_0000)
+    return not_cancelled & (is_other | is_blank)
+
+def _starts_with_0000(text):
+    return text.strip().startswith("0000")
+
+def _is_ascii_digits(text):
+    return text.isascii() and text.isdigit()
+
+def _is_invalid_user_id_format(text):
+    """CHK_0005: 8桁未満、先頭8桁が半角数字でない、または9桁以上の半角数字のみ"""
+    user_id = text.strip()
+    return (
+        len(user_id) < 8
+        or not _is_ascii_digits(user_id[:8])
+        or (len(user_id) > 8 and _is_ascii_digits(user_id))
+    )
+
+def _has_full_width_symbol(text):
+    return any(symbol in text for symbol in ("（", "）", "－"))
+
+def _has_whitespace(text):
+    return any(char in text for char in (" ", "　", "\r", "\n"))
+
+def _mask_0005(view):
+    raw = view.raw("stdUserID")
+    user_id = view.stripped("stdUserID")
+    skip = pd.Series(
+        [value is None or (isinstance(value, float) and pd.isna(value)) for value in raw],
+        index=raw.index, dtype=bool,
+    ) | (user_id == "")
+    return ~skip & view.matches("stdUserID", _is_invalid_user_id_format)
+
+def _mask_0006(view):
+    return truthy(view.raw("stdUserID")) & view.matches("stdUserID", _has_full_width_symbol)
+
+def _mask_0007(view):
+    text = view.text("stdUserID")
+    skip = view.raw("stdUserID").isna() | (text == "")
+    return ~skip & view.matches("stdUserID", _has_whitespace)
+
+def _mask_0008(view, duplicate_user_ids):
+    raw = view.raw("stdUserID")
+    skip = raw.isna() | (view.text("stdUserID") == "")
+    return ~skip & raw.isin(list(duplicate_user_ids))
+
+def _mask_0009(view):
+    return truthy(view.raw("stdSuppID")) & (view.text("stdUserID").str[:8] != view.text("stdSuppID").str[:8])
+
+def _mask_0010(view, name_matcher):
+    target = (view.raw("stdFlg4") == True) & truthy(view.raw("stdName"))
+    return target & name_matcher.contains(view.text("stdName"))
+
+def _mask_0011(view):
+    tan1 = view.raw("stdTan1")
+    return (view.raw("stdFlg4") == True) & ~is_none(tan1) & (view.stripped("stdTan1") != "")
+
+def _mask_0012(view):
+    tan1 = view.raw("stdTan1")
+    return (view.raw("stdFlg4") == False) & (is_none(tan1) | (view.stripped("stdTan1") == ""))
+
+def _is_invalid_nam_code(text):
+    """CHK_0013: 空でなく、6桁でないか数字・Bで始まる形式でない"""
+    code = text.strip()
+    return code != "" and (len(code) != 6 or (not code.isdigit() and not code.startswith("B")))
+
+def _mask_0013(view):
+    return view.matches("stdNamCode", _is_invalid_nam_code)
+
+def _mask_0014(view):
+    return view.raw("stdNamCode").isna() | (view.stripped("stdNamCode") == "")
+
+def _is_valid_sale1_format(text):
+    """CHK_0015: 6桁の数字、kshh、または A で始まる"""
+    sale1 = text.strip()
+    return (
+        (sale1.isdigit() and len(sale1) == 6)
+        or (sale1.startswith("kshh") and len(sale1) == 4)
+        or sale1.startswith("A")
+    )
+
+def _contains_ksall(text):
+    return "ksALL" in text
+
+def _mask_0015(view):
+    sale1 = view.stripped("stdSale1")
+    return view.raw("stdSale1").notna() & (sale1 != "") & ~view.matches("stdSale1", _is_valid_sale1_format)
+
+def _mask_0016(view):
+    return view.matches("stdSale1", _contains_ksall)
+
+def _mask_blank(view, column_name):
+    """CHK_0017/0018: 列がNaN・None・空白のみ"""
+    return view.raw(column_name).isna() | (view.stripped(column_name) == "")
+
+def _mask_0017(view):
+    return _mask_blank(view, "stdSale1")
+
+def _mask_0018(view):
+    return _mask_blank(view, "stdSaleNam1")
+
+def _mask_sale1_sale2_prefix(view, sale1_code, sale2_prefix):
+    """CHK_0019/0020: stdSale1とstdSale2の組み合わせ"""
+    is_sale1 = view.text("stdSale1") == sale1_code
+    starts = view.matches("stdSale2", lambda text: text.startswith(sale2_prefix))
+    return (is_sale1 & ~starts) | (starts & ~is_sale1)
+
+def _mask_0019(view):
+    return _mask_sale1_sale2_prefix(view, "004359", "00r")
+
+def _mask_0020(view):
+    return _mask_sale1_sale2_prefix(view, "000286", "ke")
+
+def _starts_with_niigata(text):
+    return text.startswith("新潟県")
+
+def _is_canon(text):
+    return text.lower() == "canon"
+
+def _mask_0021(view):
+    return (
+        (view.text("stdSale1") == "001275")
+        & view.matches("stdAdd", _starts_with_niigata)
+        & ~view.matches("stdSale2", _is_canon)
+    )
+
+def _mask_sale1_nsyu_211(view, sale_code):
+    """CHK_0022〜0026: 指定販売店の入金経路が211以外"""
+    return (view.text("stdSale1") == sale_code) & (view.text("stdNsyu") != "211")
+
+def _mask_0027(view, customers_dict):
+    forbidden_leading_symbols = ["：", "×", "▲", "★", "■"]
+    not_cancelled = is_value(view.raw("stdKaiyaku"), False)
+    codes = view.stripped("stdSaleNam1").tolist()
+    forbidden_by_code = {}
+
+    def is_forbidden(position):
+        code = codes[position]
+        if code not in forbidden_by_code:
+            customer_record = customers_dict.get(code)
+            customer_name1 = (
+                customer_record.get("得意先名１")
+                if customer_record and isinstance(customer_record, dict)
+                else None
+            )
+            forbidden_by_code[code] = bool(
+                customer_name1
+                and any(customer_name1.startswith(symbol) for symbol in forbidden_leading_symbols)
+            )
+        return forbidden_by_code[code]
+
+    return apply_where(not_cancelled, is_forbidden).astype(bool)
+
+def _mask_0029(view):
+    return view.raw("stdFlg3") == True
+
+def _mask_0030(view):
+    target = (
+        (view.raw("stdKaiyaku") == True)
+        & view.keyword("stdbiko4", BikoKeyword.SPECIAL_CALCULATION)
+        & view.raw("stdReyear1").notna()
+    )
+    # 契約満了日の2か月後（日付形式不正の場合もエラーとする）
+    expires = add_months(column_dates(view, "stdReyear1"), 2)
+    return target & (expires.invalid | (expires.values <= as_of_datetime64()))
+
+def _mask_0031(view):
+    return (view.raw("stdKaiyaku") == True) & (view.raw("stdFlg1") == True)
+
+def _mask_0032(view, totalnet_list):
+    return (view.text("stdNsyu") == "121") & ~totalnet_list.isin(view.stripped("stdID"))
+
+def _mask_0033(view, totalnet_list):
+    return is_value(view.raw("stdJifuriDM"), True) & totalnet_list.isin(view.stripped("stdSale1"))
+
+def _mask_biko_contains(view, column_name, keyword):
+    """contains_keyword(row.get(column), keyword) 相当（列が無い場合は含まないものとする）"""
+    return view.keyword(column_name, keyword, default=None)
+
+def _mask_jifuri_dm_common(view):
+    """CHK_0034〜0036共通: 加入中・入金経路122・自振DMがTRUE"""
+    return (
+        is_value(view.get("stdKaiyaku"), False)
+        & (view.text("stdNsyu", default=None) == "122")
+        & is_value(view.get("stdJifuriDM"), True)
+    )
+
+def _mask_0034(view, sales_master_dict):
+    sale1 = view.get("stdSale1").tolist()
+    target = (
+        _mask_jifuri_dm_common(view)
+        & ~_mask_biko_contains(view, "stdbiko3", BikoKeyword.JIFURI_DM_NOT_NEEDED)
+        & ~_mask_biko_contains(view, "stdKbiko", BikoKeyword.RENEWAL_NOT_NEEDED)
+    )
+
+    def is_jifuri_dm_on_master(position):
+        std_sale1 = sale1[position]
+        return std_sale1 in sales_master_dict and sales_master_dict[std_sale1].get("salJifuriDM") is True
+
+    return apply_where(target, is_jifuri_dm_on_master).astype(bool)
+
+def _mask_0035(view):
+    return _mask_jifuri_dm_common(view) & _mask_biko_contains(view, "stdbiko3", BikoKeyword.JIFURI_DM_NOT_NEEDED)
+
+def _mask_0036(view):
+    return (
+        _mask_jifuri_dm_common(view)
+        & _mask_biko_contains(view, "stdbiko3", BikoKeyword.JIFURI_DM_NOT_NEEDED)
+        & _mask_biko_contains(view, "stdKbiko", BikoKeyword.RENEWAL_NOT_NEEDED)
+    )
+
+def _mask_0037(view):
+    return (view.raw("stdKaiyaku") == False) & (view.raw("stdNonRenewal") == True)
+
+def _mask_renewal_not_needed(view):
+    """CHK_0038/0039: 加入中で備考に「更新案内不要」があるのに更新案内フラグが不要(0)でない"""
+    return (
+        (view.raw("stdKaiyaku") == False)
+        & view.keyword("stdKbiko", BikoKeyword.RENEWAL_NOT_NEEDED)
+        & (view.raw("stdHassouType") != 0)
+    )
+
+def _mask_0040(view, sales_person_dict):
+    codes = view.stripped("stdTsel")
+    invalid_by_code = {}
+    for code in pd.unique(codes):
+        person_record = sales_person_dict.get(code)
+        person_name = (
+            person_record.get("担当者名")
+            if person_record and isinstance(person_record, dict)
+            else None
+        )
+        invalid_by_code[code] = bool(
+            person_name
+            and (person_name.startswith("×") or person_name.startswith("・"))
+        )
+    return pd.Series([invalid_by_code[code] for code in codes], index=codes.index, dtype=bool)
+
+def _mask_not_blank(view, column_name):
+    """CHK_0041/0042/0045〜0050/0055: 加入中かつ列がNaN・None"""
+    return (view.raw("stdKaiyaku") == False) & view.raw(column_name).isna()
+
+def _mask_0043(view, valid_office_names):
+    tpla = view.stripped("stdTpla")
+    is_valid_office = view.matches("stdTpla", lambda text: text.strip() in valid_office_names)
+    return (view.raw("stdKaiyaku") == False) & (tpla != "") & ~is_valid_office
+
+def _has_invalid_name_mark(text):
+    return any(mark in text for mark in ("▲", "×", "■"))
+
+def _mask_0044(view):
+    target = (
+        ~view.matches("stdName", _has_invalid_name_mark)
+        & view.raw("stdReyear1").notna()
+        & (view.stripped("stdReyear1") != "")
+    ).to_numpy()
+    reyear1 = column_dates(view, "stdReyear1")
+    is_future = (view.raw("stdKaiyaku") == True).to_numpy() & (reyear1.values > as_of_datetime64())
+    check_ids = np.where(
+        reyear1.invalid, "DEKISPART_CHK_0044_DATE_PARSE_ERROR",
+        np.where(is_future, "DEKISPART_CHK_0044", None),
+    )
+    return pd.Series(np.where(target, check_ids, None), dtype=object)
+
+def _mask_0051(view):
+    return view.raw("stdName").isna()
+
+def _mask_0052(view):
+    value = view.get("stdNamef")
+    is_blank_text = pd.Series(
+        [isinstance(item, str) and item.strip() == "" for item in value],
+        index=value.index, dtype=bool,
+    )
+    return value.isna() | is_blank_text
+
+def _mask_get_blank(view, column_name):
+    """CHK_0053/0054: row.get(column) がNaN・None・空白のみ"""
+    return view.get(column_name).isna() | (view.stripped(column_name, default=None) == "")
+
+def _contains_member_special_calculation(text):
+    return "会員種特別計算" in text
+
+def _mask_0056(view):
+    return (
+        (view.raw("stdKaiyaku") == False)
+        & view.text("stdKainsyu").isin(["D", "CD"])
+        & view.matches("stdbiko4", _contains_member_special_calculation)
+    )
+
+def _mask_0057(view):
+    return (
+        (view.raw("stdKaiyaku") == False)
+        & (view.text("stdNsyu") == "121")
+        & (view.raw("stdHassouType") != 1)
+    )
+
+def _mask_0058(view):
+    return (
+        (view.raw("stdKaiyaku") == False)
+        & view.keyword("stdKbiko", BikoKeyword.SEPARATE_SHIPPING)
+        & (view.raw("stdHassouType") != 2)
+    )
+
+def _mask_0059(view, customers_dict):
+    codes = view.stripped("stdSale1", default="")
+    honorific_by_code = {}
+    for code in pd.unique(codes):
+        customer_info = customers_dict.get(code) if code else None
+        honorific_by_code[code] = str(customer_info.get("会社敬称", "")).strip() if customer_info else ""
+    honorific = pd.Series([honorific_by_code[code] for code in codes], index=codes.index, dtype=object)
+    honorific_flag = truthy(view.get("stdFlg4", False))
+    return (
+        ((honorific == "様") & ~honorific_flag)
+        | ((honorific == "御中") & honorific_flag)
+        | (~honorific.isin(["様", "御中"]) & (honorific != ""))
+    )
+
+def _mask_0060(view, chk0060_target_ids, chk0060_item_ids):
+    std_id = view.get("stdID")
+    return (
+        truthy(std_id)
+        & std_id.isin(list(chk0060_target_ids))
+        & ~std_id.isin(list(chk0060_item_ids))
+    )
+
+def _run_check_function(check_func, row, row_errors, current_user_id, maintenance_id):
+    """行単位のチェック関数を1件実行し、例外はエラー行として記録する"""
+    try:
+        check_func(row, row_errors)
+    except KeyError as e:
+        _add_error_message(row_errors, current_user_id, f"COLUMN_MISSING_ERROR_{check_func.__name__}: {e}", maintenance_id)
+    except Exception as e:
+        _add_error_message(row_errors, current_user_id, f"UNEXPECTED_ERROR_{check_func.__name__}: {e}", maintenance_id)
+
 # データチェック関数
-def validate_data(df, progress_callback, individual_list, totalnet_records, sales_person_records, customers_records):
+def start_reference_prefetch():
+    """
+    DBのマスタデータ（販売店マスタ・CHK_0060 の参照セット・CHK_0043 の辞書）の取得を並行に開始する。
+
+    T_stdData の取得前に呼び出すと、基幹データの取得と重ねて実行できます。
+
+    Returns:
+        ReferencePrefetch: prepare_reference_data の prefetch に渡す取得中の参照データ
+    """
+    return start_prefetch(
+        {
+            "sales_master": get_sales_master_data,
+            "chk0060_reference_sets": prepare_chk0060_reference_sets,
+            "salKName2K": prepare_salKName2K_dict, # CHK_0043のためのデータ
+        },
+        label="DEKISPART",
+    )
+
+def prepare_reference_data(id_df, prefetch=None):
+    """
+    テーブル全体を参照するチェック用のデータと、DBのマスタデータをまとめて作成する。
+
+    Args:
+        id_df: T_stdData の stdID・stdUserID 列を含むDataFrame（全件）
+        prefetch: start_reference_prefetch の結果（None の場合はここで取得を開始する）
+
+    Returns:
+        dict: validate_data の reference_data に渡す辞書
+    """
+    if prefetch is None:
+        prefetch = start_reference_prefetch()
+
+    # CHK_0008 のために、重複しているユーザーIDのセットを事前に作成する
+    duplicate_user_ids = set(id_df[id_df.duplicated(subset=['stdUserID'], keep=False)]['stdUserID'])
+
+    # 販売店マスタの取得
+    sales_master_list = prefetch.result("sales_master") # まずDataFrameとして取得
+    # DataFrameを辞書のリストに変換
+    sales_master_list = sales_master_list.to_dict(orient="records")
+    sales_master_dict = {
+        item["salCode"]: {
+            "salNotifyRenewal": item["salNotifyRenewal"],
+            "salJifuriDM": item["salJifuriDM"],
+        }
+        for item in sales_master_list
+    }
+
+    # 参照セットは T_stdData に存在する stdID に絞り込む
+    std_ids_source = id_df["stdID"] if "stdID" in id_df.columns else []
+    std_ids = {str(std_id).strip() for std_id in std_ids_source if pd.notna(std_id) and str(std_id).strip()}
+    chk0060_target_ids, chk0060_item_ids = prefetch.result("chk0060_reference_sets")
+    chk0060_target_ids = set(chk0060_target_ids) & std_ids
+    chk0060_item_ids = set(chk0060_item_ids) & std_ids
+    salKName2K_dict = prefetch.result("salKName2K")
+    logging.info(prefetch.report())
+
+    return {
+        "duplicate_user_ids": duplicate_user_ids,
+        "sales_master_dict": sales_master_dict,
+        "chk0060_target_ids": chk0060_target_ids,
+        "chk0060_item_ids": chk0060_item_ids,
+        "salKName2K_dict": salKName2K_dict,
+        # salKName2K_dict は {salCode: 営業所名} の形式。CHK_0043 は営業所名で照合する
+        "valid_office_names": ReferenceIndex(salKName2K_dict.values()),
+    }
+
+@with_as_of
+def validate_data(df, progress_callback, individual_list, totalnet_records, sales_person_records, customers_records, engine=ENGINE_VECTORIZED, reference_data=None, date_dependent=None):
+    """
+    デキスパートの全チェックを実行し、エラー一覧のDataFrameを返す。
+
+    engine に ENGINE_VECTORIZED（既定）を指定すると列単位のマスクで評価し、
+    ENGINE_ROW を指定すると従来どおり iterrows で1行ずつ評価する。
+    どちらのエンジンでも出力は同一。
+    df がテーブルの一部（分割取得したチャンク）の場合は、テーブル全体から作成した
+    prepare_reference_data の結果を reference_data に渡してください。
+    date_dependent に True を指定すると当日と比較するチェック（DATE_DEPENDENT_CHECKS）だけ、
+    False を指定するとそれ以外のチェックだけを実行する（差分チェック用）。
+    """
     errors = []  #エラーリストを初期化
     total_ids = len(df)
 
-    # CHK_0008 のために、重複しているユーザーIDのセットを事前に作成する
-    duplicate_user_ids = set(df[df.duplicated(subset=['stdUserID'], keep=False)]['stdUserID'])
+    if reference_data is None:
+        reference_data = prepare_reference_data(df)
+    duplicate_user_ids = reference_data["duplicate_user_ids"]
+    sales_master_dict = reference_data["sales_master_dict"]
+    chk0060_target_ids = reference_data["chk0060_target_ids"]
+    chk0060_item_ids = reference_data["chk0060_item_ids"]
+    valid_office_names = reference_data["valid_office_names"]
 
     # 補助リストを整形
     individual_list = individual_list or []
+    name_matcher = build_name_matcher(individual_list)
 
-    if isinstance(totalnet_records, pd.DataFrame):
-        totalnet_list = {
-            str(val).strip()
-            for val in totalnet_records.get("顧客番号", pd.Series(dtype=str)).dropna().astype(str)
-        }
+    if isinstance(totalnet_records, ReferenceIndex):
+        totalnet_list = totalnet_records
+    elif isinstance(totalnet_records, pd.DataFrame):
+        totalnet_list = column_index(totalnet_records, "顧客番号", key=normalized_text)
     elif isinstance(totalnet_records, (list, set, tuple)):
-        totalnet_list = {str(val).strip() for val in totalnet_records if pd.notna(val)}
+        totalnet_list = ReferenceIndex(totalnet_records, key=normalized_text)
     else:
-        totalnet_list = set()
+        totalnet_list = ReferenceIndex()
 
     sales_person_dict = {}
     for record in sales_person_records or []:
@@ -1091,52 +1655,103 @@ def validate_data(df, progress_callback, individual_list, totalnet_records, sale
         if code and code not in customers_dict:
             customers_dict[code] = record
 
-    # 販売店マスタの取得
-    sales_master_list = get_sales_master_data() # まずDataFrameとして取得
-    # DataFrameを辞書のリストに変換
-    sales_master_list = sales_master_list.to_dict(orient="records")
-    sales_master_dict = {
-        item["salCode"]: {
-            "salNotifyRenewal": item["salNotifyRenewal"],
-            "salJifuriDM": item["salJifuriDM"],
-        }
-        for item in sales_master_list
-    }
-
-    std_ids_source = df["stdID"] if "stdID" in df.columns else []
-    chk0060_target_ids, chk0060_item_ids = prepare_chk0060_reference_sets(std_ids_source)
-    salKName2K_dict = prepare_salKName2K_dict() # CHK_0043のためのデータを事前に取得
-
     # 全てのチェック関数をリストにまとめる
     # ここで定義した関数として実装してください。
-    check_functions = [
+    # 各チェックは (チェックID, 列単位のマスク関数, 行単位のチェック関数) の組で登録します。
+    check_rules = [
         # 基本的なデータ検証 (引数なし)
-        check_0001, check_0002, check_0003, check_0004, check_0005,
-        check_0006, check_0007,
-        check_0009,
-        check_0011, check_0012, check_0013, check_0014, check_0015,
-        check_0016, check_0017, check_0018, check_0019, check_0020,
-        check_0021, check_0022, check_0023, check_0024, check_0025,
-        check_0026, lambda row, errors: check_0027(row, errors, customers_dict), check_0029, check_0030,
-        check_0031, check_0037, check_0038, check_0039,
-        lambda row, errors: check_0040(row, errors, sales_person_dict), check_0041, check_0042,
-        check_0044, check_0045, check_0046, check_0047, check_0048,
-        check_0049, check_0050, check_0051, check_0052, check_0053,
-        check_0054, check_0055, check_0056, check_0057, check_0058,
+        Rule("DEKISPART_CHK_0001", _mask_0001, check_0001),
+        Rule("DEKISPART_CHK_0002", _mask_0002, check_0002),
+        Rule("DEKISPART_CHK_0003", _mask_0003, check_0003),
+        Rule("DEKISPART_CHK_0004", _mask_0004, check_0004),
+        Rule("DEKISPART_CHK_0005", _mask_0005, check_0005),
+        Rule("DEKISPART_CHK_0006", _mask_0006, check_0006),
+        Rule("DEKISPART_CHK_0007", _mask_0007, check_0007),
+        Rule("DEKISPART_CHK_0009", _mask_0009, check_0009),
+        Rule("DEKISPART_CHK_0011", _mask_0011, check_0011),
+        Rule("DEKISPART_CHK_0012", _mask_0012, check_0012),
+        Rule("DEKISPART_CHK_0013", _mask_0013, check_0013),
+        Rule("DEKISPART_CHK_0014", _mask_0014, check_0014),
+        Rule("DEKISPART_CHK_0015", _mask_0015, check_0015),
+        Rule("DEKISPART_CHK_0016", _mask_0016, check_0016),
+        Rule("DEKISPART_CHK_0017", _mask_0017, check_0017),
+        Rule("DEKISPART_CHK_0018", _mask_0018, check_0018),
+        Rule("DEKISPART_CHK_0019", _mask_0019, check_0019),
+        Rule("DEKISPART_CHK_0020", _mask_0020, check_0020),
+        Rule("DEKISPART_CHK_0021", _mask_0021, check_0021),
+        Rule("DEKISPART_CHK_0022", lambda view: _mask_sale1_nsyu_211(view, "000332"), check_0022),
+        Rule("DEKISPART_CHK_0023", lambda view: _mask_sale1_nsyu_211(view, "A30777"), check_0023),
+        Rule("DEKISPART_CHK_0024", lambda view: _mask_sale1_nsyu_211(view, "000583"), check_0024),
+        Rule("DEKISPART_CHK_0025", lambda view: _mask_sale1_nsyu_211(view, "000659"), check_0025),
+        Rule("DEKISPART_CHK_0026", lambda view: _mask_sale1_nsyu_211(view, "000759"), check_0026),
+        Rule("DEKISPART_CHK_0027", lambda view: _mask_0027(view, customers_dict),
+             lambda row, errors: check_0027(row, errors, customers_dict)),
+        Rule("DEKISPART_CHK_0029", _mask_0029, check_0029),
+        Rule("DEKISPART_CHK_0030", _mask_0030, check_0030),
+        Rule("DEKISPART_CHK_0031", _mask_0031, check_0031),
+        Rule("DEKISPART_CHK_0037", _mask_0037, check_0037),
+        Rule("DEKISPART_CHK_0038", _mask_renewal_not_needed, check_0038),
+        Rule("DEKISPART_CHK_0039", _mask_renewal_not_needed, check_0039),
+        Rule("DEKISPART_CHK_0040", lambda view: _mask_0040(view, sales_person_dict),
+             lambda row, errors: check_0040(row, errors, sales_person_dict)),
+        Rule("DEKISPART_CHK_0041", lambda view: _mask_not_blank(view, "stdTsel"), check_0041),
+        Rule("DEKISPART_CHK_0042", lambda view: _mask_not_blank(view, "stdTpla"), check_0042),
+        Rule("DEKISPART_CHK_0044", _mask_0044, check_0044),
+        Rule("DEKISPART_CHK_0045", lambda view: _mask_not_blank(view, "stdAcday"), check_0045),
+        Rule("DEKISPART_CHK_0046", lambda view: _mask_not_blank(view, "stdRemon"), check_0046),
+        Rule("DEKISPART_CHK_0047", lambda view: _mask_not_blank(view, "stdAcyear"), check_0047),
+        Rule("DEKISPART_CHK_0048", lambda view: _mask_not_blank(view, "stdReyear1"), check_0048),
+        Rule("DEKISPART_CHK_0049", lambda view: _mask_not_blank(view, "stdReyear2"), check_0049),
+        Rule("DEKISPART_CHK_0050", lambda view: _mask_not_blank(view, "stdKainsyu"), check_0050),
+        Rule("DEKISPART_CHK_0051", _mask_0051, check_0051),
+        Rule("DEKISPART_CHK_0052", _mask_0052, check_0052),
+        Rule("DEKISPART_CHK_0053", lambda view: _mask_get_blank(view, "stdZip"), check_0053),
+        Rule("DEKISPART_CHK_0054", lambda view: _mask_get_blank(view, "stdAdd"), check_0054),
+        Rule("DEKISPART_CHK_0055", lambda view: _mask_not_blank(view, "stdTell"), check_0055),
+        Rule("DEKISPART_CHK_0056", _mask_0056, check_0056),
+        Rule("DEKISPART_CHK_0057", _mask_0057, check_0057),
+        Rule("DEKISPART_CHK_0058", _mask_0058, check_0058),
 
         # 外部データ (リスト/辞書) を引数に取るチェック
         # 各lambda関数は、rowとerrorsに加えて必要な外部データを渡します。
-        lambda row, errors: check_0008(row, errors, duplicate_user_ids),
-        lambda row, errors: check_0010(row, errors, individual_list),
-        lambda row, errors: check_0032(row, errors, totalnet_list),
-        lambda row, errors: check_0033(row, errors, totalnet_list),
-        lambda row, errors: check_0034(row, errors, sales_master_dict),
-        lambda row, errors: check_0035(row, errors, sales_master_dict),
-        lambda row, errors: check_0036(row, errors, sales_master_dict),
-        lambda row, errors: check_0043(row, errors, salKName2K_dict),
-        lambda row, errors: check_0059(row, errors, customers_dict),
-        lambda row, errors: check_0060(row, errors, chk0060_target_ids, chk0060_item_ids),
+        Rule("DEKISPART_CHK_0008", lambda view: _mask_0008(view, duplicate_user_ids),
+             lambda row, errors: check_0008(row, errors, duplicate_user_ids)),
+        Rule("DEKISPART_CHK_0010", lambda view: _mask_0010(view, name_matcher),
+             lambda row, errors: check_0010(row, errors, name_matcher)),
+        Rule("DEKISPART_CHK_0032", lambda view: _mask_0032(view, totalnet_list),
+             lambda row, errors: check_0032(row, errors, totalnet_list)),
+        Rule("DEKISPART_CHK_0033", lambda view: _mask_0033(view, totalnet_list),
+             lambda row, errors: check_0033(row, errors, totalnet_list)),
+        Rule("DEKISPART_CHK_0034", lambda view: _mask_0034(view, sales_master_dict),
+             lambda row, errors: check_0034(row, errors, sales_master_dict)),
+        Rule("DEKISPART_CHK_0035", _mask_0035,
+             lambda row, errors: check_0035(row, errors, sales_master_dict)),
+        Rule("DEKISPART_CHK_0036", _mask_0036,
+             lambda row, errors: check_0036(row, errors, sales_master_dict)),
+        Rule("DEKISPART_CHK_0043", lambda view: _mask_0043(view, valid_office_names),
+             lambda row, errors: check_0043(row, errors, valid_office_names)),
+        Rule("DEKISPART_CHK_0059", lambda view: _mask_0059(view, customers_dict),
+             lambda row, errors: check_0059(row, errors, customers_dict)),
+        Rule("DEKISPART_CHK_0060", lambda view: _mask_0060(view, chk0060_target_ids, chk0060_item_ids),
+             lambda row, errors: check_0060(row, errors, chk0060_target_ids, chk0060_item_ids)),
     ]
+    check_rules = select_checks(check_rules, DATE_DEPENDENT_CHECKS, date_dependent, key=lambda rule: rule.check_id)
+
+    if engine == ENGINE_VECTORIZED:
+        hits = evaluate_rules(
+            df, check_rules, _add_error_message, _run_check_function,
+            user_id_column="stdUserID", maintenance_id_column="stdID",
+            progress_callback=progress_callback, progress_label="DEKISPART",
+        )
+        maintenance_ids = df["stdID"].tolist() if "stdID" in df.columns else [""] * total_ids
+        for position, error in hits:
+            # 保守整理番号を追加
+            if "保守整理番号" not in error or not error["保守整理番号"]:
+                error["保守整理番号"] = maintenance_ids[position]
+            errors.append(error)
+        return pd.DataFrame(errors, columns=["シリーズ", "ユーザID", "保守整理番号", "チェックID"])
+
+    check_functions = [profiled_check("DEKISPART", rule.check_id, rule.row_check) for rule in check_rules]
 
     for index, row in df.iterrows():
         current_user_id = row.get("stdUserID")
@@ -1149,12 +1764,7 @@ def validate_data(df, progress_callback, individual_list, totalnet_records, sale
 
         # 各チェック関数を実行
         for check_func in check_functions:
-            try:
-                check_func(row, row_errors)
-            except KeyError as e:
-                _add_error_message(row_errors, current_user_id, f"COLUMN_MISSING_ERROR_{check_func.__name__}: {e}", maintenance_id)
-            except Exception as e:
-                _add_error_message(row_errors, current_user_id, f"UNEXPECTED_ERROR_{check_func.__name__}: {e}", maintenance_id)
+            _run_check_function(check_func, row, row_errors, current_user_id, maintenance_id)
 
         # 保守整理番号を追加
         for error in row_errors:
@@ -1180,7 +1790,7 @@ def load_individual_list_from_excel(file_path=None):
         # messagebox.showerror("エラー", f"個人名チェックファイルが見つからないか、パスが無効です: {file_path}")
         return [] # 空のリストを返す
     try:
-        df = pd.read_excel(file_path)
+        df = read_aux_excel(file_path, ["検索文字"])
         if "検索文字" in df.columns:
             keywords = df["検索文字"].dropna().astype(str).tolist()
             return keywords
@@ -1197,30 +1807,26 @@ def load_totalnet_list_from_csv(file_path=None):
         # messagebox.showerror("エラー", f"トータルネット登録ファイルが見つからないか、パスが無効です: {file_path}")
         return pd.DataFrame(columns=["顧客番号"]) # 空のDataFrameを返す
 
-    encodings = ['cp932', 'shift_jis', 'utf-8', 'utf-8-sig']
-    for encoding in encodings:
-        try:
-            df = pd.read_csv(file_path, encoding=encoding, engine='python', on_bad_lines='skip')
-            # 必須カラムのチェック
-            if "顧客番号" in df.columns:
-                return df[["顧客番号"]] # DataFrameとして返す
-            else:
-                messagebox.showerror("ファイル読み込みエラー", f"トータルネット登録ファイル '{file_path}' に '顧客番号' カラムが見つかりません。")
-                return pd.DataFrame(columns=["顧客番号"])
-        except UnicodeDecodeError:
-            continue # 次のエンコーディングを試す
-        except Exception as e:
-            messagebox.showerror("ファイル読み込みエラー", f"トータルネット登録ファイルの読み込み中にエラーが発生しました: {e}")
+    try:
+        df = read_aux_csv(file_path, ["顧客番号"])
+        # 必須カラムのチェック
+        if "顧客番号" in df.columns:
+            return df[["顧客番号"]] # DataFrameとして返す
+        else:
+            messagebox.showerror("ファイル読み込みエラー", f"トータルネット登録ファイル '{file_path}' に '顧客番号' カラムが見つかりません。")
             return pd.DataFrame(columns=["顧客番号"])
-    messagebox.showerror("ファイル読み込みエラー", f"トータルネット登録ファイル '{file_path}' を適切なエンコーディングで読み込めませんでした。")
-    return pd.DataFrame(columns=["顧客番号"])
+    except UnicodeDecodeError:
+        messagebox.showerror("ファイル読み込みエラー", f"トータルネット登録ファイル '{file_path}' を適切なエンコーディングで読み込めませんでした。")
+        return pd.DataFrame(columns=["顧客番号"])
+    except Exception as e:
+        messagebox.showerror("ファイル読み込みエラー", f"トータルネット登録ファイルの読み込み中にエラーが発生しました: {e}")
+        return pd.DataFrame(columns=["顧客番号"])
 
 # 不要販売店リストを読み込む関数は削除されました（要望#005対応）
 
 # 個人名リストファイルを選択する
 def get_individual_list_file_path():
-    root = tk.Tk()
-    root.withdraw()  # ウィンドウを非表示にする
+    root = hidden_root()  # 非表示のウィンドウ
     file_path = filedialog.askopenfilename(title="個人名チェックファイルを選択してください", filetypes=[("Excel Files", "*.xlsx")])
     return file_path
 
@@ -1228,8 +1834,7 @@ def get_individual_list_file_path():
 
 # トータルネットファイルを選択する
 def get_totalnet_file_path():
-    root = tk.Tk()
-    root.withdraw()  # ウィンドウを非表示にする
+    root = hidden_root()  # 非表示のウィンドウ
     file_path = filedialog.askopenfilename(title="トータルネット登録ファイルを選択してください", filetypes=[("CSV Files", "*.csv")])
     return file_path
 
@@ -1239,28 +1844,24 @@ def load_sales_person_list_from_csv(file_path=None):
         # messagebox.showerror("エラー", f"担当者マスタファイルが見つからないか、パスが無効です: {file_path}")
         return [] # 空のリストを返す
 
-    encodings = ['cp932', 'shift_jis', 'utf-8', 'utf-8-sig']
     required_columns = ["担当者コード", "担当者名", "部門コード"]
-    for encoding in encodings:
-        try:
-            df = pd.read_csv(file_path, encoding=encoding, engine='python', on_bad_lines='skip')
-            if not all(col in df.columns for col in required_columns):
-                messagebox.showerror("ファイル読み込みエラー", f"担当者マスタファイル '{file_path}' に必要なカラム({', '.join(required_columns)})が不足しています。")
-                return []
-            sales_person_list = df[required_columns].to_dict(orient='records')
-            return sales_person_list
-        except UnicodeDecodeError:
-            continue
-        except Exception as e:
-            messagebox.showerror("ファイル読み込みエラー", f"担当者マスタファイルの読み込み中にエラーが発生しました: {e}")
+    try:
+        df = read_aux_csv(file_path, required_columns)
+        if not all(col in df.columns for col in required_columns):
+            messagebox.showerror("ファイル読み込みエラー", f"担当者マスタファイル '{file_path}' に必要なカラム({', '.join(required_columns)})が不足しています。")
             return []
-    messagebox.showerror("ファイル読み込みエラー", f"担当者マスタファイル '{file_path}' を適切なエンコーディングで読み込めませんでした。")
-    return []
+        sales_person_list = df[required_columns].to_dict(orient='records')
+        return sales_person_list
+    except UnicodeDecodeError:
+        messagebox.showerror("ファイル読み込みエラー", f"担当者マスタファイル '{file_path}' を適切なエンコーディングで読み込めませんでした。")
+        return []
+    except Exception as e:
+        messagebox.showerror("ファイル読み込みエラー", f"担当者マスタファイルの読み込み中にエラーが発生しました: {e}")
+        return []
 
 # 担当者マスタファイルを選択する
 def get_sales_person_list_file_path():
-    root = tk.Tk()
-    root.withdraw()  # ウィンドウを非表示にする
+    root = hidden_root()  # 非表示のウィンドウ
     file_path = filedialog.askopenfilename(title="担当者マスタを選択してください", filetypes=[("CSV Files", "*.csv")])
     return file_path
 
@@ -1270,37 +1871,42 @@ def load_customers_list_from_csv(file_path=None):
         # messagebox.showerror("エラー", f"得意先マスタファイルが見つからないか、パスが無効です: {file_path}")
         return [] # 空のリストを返す
 
-    encodings = ['cp932', 'shift_jis', 'utf-8', 'utf-8-sig']
     required_columns = ["得意先コード", "得意先名１", "使用区分", "会社敬称"]
-    for encoding in encodings:
-        try:
-            df = pd.read_csv(file_path, encoding=encoding, engine='python', on_bad_lines='skip')
-            if not all(col in df.columns for col in required_columns):
-                messagebox.showerror("ファイル読み込みエラー", f"得意先マスタファイル '{file_path}' に必要なカラム({', '.join(required_columns)})が不足しています。")
-                return []
-            customers_list = df[required_columns].to_dict(orient='records')
-            return customers_list
-        except UnicodeDecodeError:
-            continue
-        except Exception as e:
-            messagebox.showerror("ファイル読み込みエラー", f"得意先マスタファイルの読み込み中にエラーが発生しました: {e}")
+    try:
+        df = read_aux_csv(file_path, required_columns)
+        if not all(col in df.columns for col in required_columns):
+            messagebox.showerror("ファイル読み込みエラー", f"得意先マスタファイル '{file_path}' に必要なカラム({', '.join(required_columns)})が不足しています。")
             return []
-    messagebox.showerror("ファイル読み込みエラー", f"得意先マスタファイル '{file_path}' を適切なエンコーディングで読み込めませんでした。")
-    return []
+        customers_list = df[required_columns].to_dict(orient='records')
+        return customers_list
+    except UnicodeDecodeError:
+        messagebox.showerror("ファイル読み込みエラー", f"得意先マスタファイル '{file_path}' を適切なエンコーディングで読み込めませんでした。")
+        return []
+    except Exception as e:
+        messagebox.showerror("ファイル読み込みエラー", f"得意先マスタファイルの読み込み中にエラーが発生しました: {e}")
+        return []
 
 # 得意先マスタファイルを選択する
 def get_customers_list_file_path():
-    root = tk.Tk()
-    root.withdraw()  # ウィンドウを非表示にする
+    root = hidden_root()  # 非表示のウィンドウ
     file_path = filedialog.askopenfilename(title="得意先マスタを選択してください", filetypes=[("CSV Files", "*.csv")])
     return file_path
 
 # main_checker_app.py から呼び出されるエントリポイント
-def run_dekispart_check(progress_callback=None, aux_paths=None):
+@with_as_of
+def run_dekispart_check(progress_callback=None, aux_paths=None, chunk_size=None):
+    """
+    DEKISPARTのデータチェックを実行する。
+
+    chunk_size（省略時は config.ini の [STREAMING]）が1以上の場合は、T_stdData を
+    chunk_size 行ずつ取得してチェックする（ストリーミング）。
+    """
+    phases = PhaseTimer("DEKISPART")
     try:
         errors = []
         if progress_callback:
             progress_callback("DEKISPART: 補助ファイルを読み込み中...")
+        phases.start(PHASE_AUX_LOAD)
 
         # 補助ファイルの読み込み
         individual_list_path = aux_paths.get("individual_list_path")
@@ -1329,8 +1935,14 @@ def run_dekispart_check(progress_callback=None, aux_paths=None):
 
         if progress_callback:
             progress_callback("DEKISPART: 基幹データを取得中...")
+        phases.start(PHASE_FETCH)
+
+        # マスタデータの取得を先に開始し、T_stdData の取得と並行に実行する
+        prefetch = start_reference_prefetch()
 
-        df = fetch_data()
+        chunk_size = streaming_chunk_size(chunk_size)
+        # ストリーミング時は、テーブル全体を参照するチェック用に stdID・stdUserID だけを先に取得する
+        df = fetch_user_id_index() if chunk_size else fetch_data()
 
         if df.empty:
             errors.append({"シリーズ": "DEKISPART", "ユーザID": "N/A", "チェックID": "DEKISPART_CHK_0013"})
@@ -1339,13 +1951,45 @@ def run_dekispart_check(progress_callback=None, aux_paths=None):
         if progress_callback:
             progress_callback("DEKISPART: データチェックを実行中...")
 
+        phases.start(PHASE_REFERENCE)
+        reference_data = prepare_reference_data(df, prefetch)
         # validate_data関数に、読み込んだ補助リストを渡す
-        validation_results_df = validate_data(df, progress_callback,
-                                             individual_names,
-                                             totalnet_df, # DataFrameをそのまま渡す
-                                             # unnecessary_dealer_list削除（要望#005対応）
-                                             sales_person_list, # リストをそのまま渡す
-                                             customers_list) # リストをそのまま渡す
+        validate_kwargs = {
+            "individual_list": individual_names,
+            "totalnet_records": totalnet_df,
+            "sales_person_records": sales_person_list,
+            "customers_records": customers_list,
+            "reference_data": reference_data,
+        }
+        result_columns = ["シリーズ", "ユーザID", "保守整理番号", "チェックID"]
+        # ストリーミングでは取得とチェックを交互に行うため、取得の時間もチェックに含まれる
+        phases.start(PHASE_VALIDATE)
+        if chunk_size:
+            del df
+            validation_results_df = validate_in_chunks(
+                iter_data(chunk_size),
+                lambda chunk: validate_data(chunk, None, **validate_kwargs),
+                result_columns,
+                progress_callback, "DEKISPART",
+            )
+        elif incremental_enabled():
+            # 前回の実行から変更された行だけをチェックし、変更の無い行は前回のエラーを再利用する
+            # 当日と比較するチェックは、日付が変わると結果が変わるため毎回全行で実行する
+            validation_results_df = validate_incrementally(
+                "DEKISPART", df, "stdID",
+                lambda rows: validate_sharded(rows, validate_data, result_columns,
+                                              {**validate_kwargs, "date_dependent": False},
+                                              progress_label="DEKISPART"),
+                result_columns,
+                [reference_data, individual_names, totalnet_df, sales_person_list, customers_list],
+                progress_callback,
+                validate_date_checks=lambda rows: validate_data(rows, None, date_dependent=True, **validate_kwargs),
+            )
+        else:
+            # 行数が多い場合は複数のプロセスでチェックする（config.ini の [SHARDING]）
+            validation_results_df = validate_sharded(df, validate_data, result_columns, validate_kwargs,
+                                                     progress_callback=progress_callback,
+                                                     progress_label="DEKISPART")
 
         if validation_results_df.empty:
             return pd.DataFrame(columns=["シリーズ", "ユーザID", "チェックID"])
@@ -1364,6 +2008,8 @@ def run_dekispart_check(progress_callback=None, aux_paths=None):
             "ユーザID": "N/A",
             "エラー内容": f"処理中にエラーが発生しました: {e}"
         }], columns=["シリーズ", "ユーザID", "エラー内容"])
+    finally:
+        phases.stop()
 
 def main():
     data = fetch_data()
@@ -1378,4 +2024,5 @@ def main():
     save_to_excel(errors_df)
 
 if __name__ == "__main__":
+    configure_logging()
     main()
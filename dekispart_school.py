@@ -1,14 +1,35 @@
-import pymysql
 import pandas as pd
-from datetime import datetime, timedelta
-import tkinter as tk
-from tkinter import filedialog, messagebox
+from dateutil.relativedelta import relativedelta
+# メッセージボックス・ファイル選択（ヘッドレス実行時は tkinter を使用しない）
+from dialogs import filedialog, hidden_root, messagebox
 import re
 import os
 import traceback
 from typing import Callable
 import configparser
 
+from column_projection import MYSQL, required_columns, select_list
+from data_stream import iter_cursor_frames, streaming_chunk_size, validate_in_chunks
+from connection_pool import connect, mysql_driver
+from table_cache import fetch_frame
+from incremental import incremental_enabled, select_checks, validate_incrementally
+from aux_cache import read_aux_csv
+from reference_index import ReferenceIndex, column_index
+from remarks import contains_keyword
+from date_columns import today, with_as_of
+from sharding import validate_sharded
+from profiling import (
+    PHASE_AUX_LOAD,
+    PHASE_FETCH,
+    PHASE_REFERENCE,
+    PHASE_VALIDATE,
+    PhaseTimer,
+    check_name,
+    profiled_check,
+    profiled_checks,
+)
+from constants import BikoKeyword
+
 # --- 設定値 ---
 class Config:
     # データベース接続設定はconfig.iniに移行しました
@@ -57,6 +78,41 @@ class Config:
     AUX_FILE_TOTALNET_MISSING_ID = CHK_ID_PREFIX + "AUX_FILE_TOTALNET_MISSING"
     AUX_FILE_UNNECESSARY_DEALER_MISSING_ID = CHK_ID_PREFIX + "AUX_FILE_UNNECESSARY_DEALER_MISSING"
 
+# t_stdddata の取得列（チェックに関係なく取得する列と、チェックIDごとに参照する列）
+# チェックを追加・変更した場合は、参照する列をここにも登録してください。
+BASE_COLUMNS = ("stdDID", "stdID_D")
+CHECK_COLUMNS = {
+    Config.CHK_ID_0002: (),
+    Config.CHK_ID_0003: (),
+    Config.CHK_ID_0004: ("stdDsupID",),
+    Config.CHK_ID_0007: ("stdDsale1",),
+    Config.CHK_ID_0008: ("stdDsale1",),
+    Config.CHK_ID_0009: ("stdDsale1", "stdDsale2"),
+    Config.CHK_ID_0010: ("stdDsale1", "stdDsale2"),
+    Config.CHK_ID_0011: ("stdDsale1", "stdDsale2"),
+    Config.CHK_ID_0012: ("stdDKaiyaku", "stdDsale1"),
+    Config.CHK_ID_0013: ("stdDsale1", "stdDNsyu"),
+    Config.CHK_ID_0014: ("stdDsale1", "stdDnkeiro"),
+    Config.CHK_ID_0015: ("stdDsale1", "stdDNsyu"),
+    Config.CHK_ID_0016: ("stdDsale1", "stdDNsyu"),
+    Config.CHK_ID_0017: ("stdDsale1", "stdDNsyu"),
+    Config.CHK_ID_0018: ("stdDKaiyaku", "stdDFlg1"),
+    Config.CHK_ID_0019: ("stdDNsyu",),
+    Config.CHK_ID_0020: ("userbikou1", "stdDNsyu"),
+    Config.CHK_ID_0021: ("stdDsale1", "stdDNsyu"),
+    Config.CHK_ID_0022: ("stdDKaiyaku", "stdDtselno"),
+    Config.CHK_ID_0023: ("stdDKaiyaku", "stdDtselno"),
+    Config.CHK_ID_0024: ("stdDKaiyaku", "stdDReyear1"),
+    Config.CHK_ID_0025: ("stdDKaiyaku", "stdDReyear1"),
+    Config.CHK_ID_0026: ("stdDKaiyaku", "stdDAcday"),
+    Config.CHK_ID_0027: ("stdDKaiyaku", "stdDAcday"),
+    Config.CHK_ID_0028: ("stdDKaiyaku", "stdDRemon"),
+    Config.CHK_ID_0029: ("stdDKaiyaku", "stdDReyear1"),
+    Config.CHK_ID_0030: ("stdDKaiyaku", "stdDReyear1"),
+    Config.CHK_ID_0031: ("stdDKaiyaku", "stdDReyear2"),
+    Config.CHK_ID_0032: ("stdDKaiyaku", "stdDKaiyakuOP"),
+}
+
 
 # --- 汎用関数 ---
 def create_error_entry(user_id: str, check_id: str, maintenance_id: str = None) -> dict:
@@ -69,38 +125,35 @@ def create_error_entry(user_id: str, check_id: str, maintenance_id: str = None)
         "チェックID": check_id,
     }
 
-def fetch_data_from_db(config_section: str, query: str) -> pd.DataFrame:
+def fetch_data_from_db(
+    config_section: str,
+    query: str,
+    tables: list | None = None,
+    columns: list[str] | None = None,
+) -> pd.DataFrame:
     """
     指定されたDB設定とクエリを使用してデータを取得し、DataFrameとして返す。
+
+    tables を指定した場合、query の {columns} を columns に絞り込んだ SELECT 句の列リストに置き換える。
     """
     try:
-        config = configparser.ConfigParser()
-        config.read('config.ini')
-        db_config = config[config_section]
-
-        with pymysql.connect(
-            host=db_config['host'],
-            database=db_config['database'],
-            user=db_config['user'],
-            password=db_config['password'],
-            charset=db_config['charset']
-        ) as conn:
+        with connect(config_section) as conn:
             with conn.cursor() as cursor:
-                cursor.execute(query)
-                columns = [desc[0] for desc in cursor.description]
-                data = cursor.fetchall()
-        return pd.DataFrame(data, columns=columns)
-    except pymysql.Error as e:
+                if tables is not None:
+                    query = query.format(columns=select_list(cursor, tables, columns, MYSQL))
+                # テーブルキャッシュが有効な場合はキャッシュから読み込む
+                return fetch_frame(config_section, cursor, query)
+    except mysql_driver().Error as e:
         messagebox.showerror("データベースエラー", f"データベースからのデータ取得中にエラーが発生しました: {e}")
         print(f"Database error details: {traceback.format_exc()}")
         return pd.DataFrame() # 空のDataFrameを返す
 
 def select_file_with_gui(title: str, filetypes: list) -> str:
     """GUIを使ってファイル選択ダイアログを表示し、選択されたファイルのパスを返す。"""
-    root = tk.Tk()
-    root.withdraw()  # ウィンドウを非表示にする
+    root = hidden_root()  # 非表示のウィンドウ
     file_path = filedialog.askopenfilename(title=title, filetypes=filetypes)
-    root.destroy() # ウィンドウを破棄
+    if root is not None:
+        root.destroy() # ウィンドウを破棄
     return file_path
 
 def load_csv_to_dataframe(file_path: str, required_column: str) -> pd.DataFrame:
@@ -109,23 +162,20 @@ def load_csv_to_dataframe(file_path: str, required_column: str) -> pd.DataFrame:
         messagebox.showerror("ファイル読み込みエラー", f"ファイルが見つからないか、パスが無効です: {file_path}")
         return pd.DataFrame(columns=[required_column])
 
-    encodings = ['cp932', 'shift_jis', 'utf-8', 'utf-8-sig']
-    for encoding in encodings:
-        try:
-            df = pd.read_csv(file_path, encoding=encoding, engine='python', on_bad_lines='skip')
-            if required_column in df.columns:
-                return df[[required_column]]
-            else:
-                messagebox.showerror("ファイル読み込みエラー", f"ファイル '{file_path}' に '{required_column}' カラムが見つかりません。")
-                return pd.DataFrame(columns=[required_column])
-        except UnicodeDecodeError:
-            continue
-        except Exception as e:
-            messagebox.showerror("ファイル読み込みエラー", f"ファイルの読み込み中にエラーが発生しました: {e}")
-            print(f"File load error details: {traceback.format_exc()}")
+    try:
+        df = read_aux_csv(file_path, [required_column])
+        if required_column in df.columns:
+            return df[[required_column]]
+        else:
+            messagebox.showerror("ファイル読み込みエラー", f"ファイル '{file_path}' に '{required_column}' カラムが見つかりません。")
             return pd.DataFrame(columns=[required_column])
-    messagebox.showerror("ファイル読み込みエラー", f"ファイル '{file_path}' を適切なエンコーディングで読み込めませんでした。")
-    return pd.DataFrame(columns=[required_column])
+    except UnicodeDecodeError:
+        messagebox.showerror("ファイル読み込みエラー", f"ファイル '{file_path}' を適切なエンコーディングで読み込めませんでした。")
+        return pd.DataFrame(columns=[required_column])
+    except Exception as e:
+        messagebox.showerror("ファイル読み込みエラー", f"ファイルの読み込み中にエラーが発生しました: {e}")
+        print(f"File load error details: {traceback.format_exc()}")
+        return pd.DataFrame(columns=[required_column])
 
 def load_excel_column_to_list(file_path: str, sheet_name: str, column_name: str, skiprows: int) -> list[str]:
     """Excelファイルから特定のシート、列、行スキップでデータを読み込み、リストとして返す。"""
@@ -153,10 +203,34 @@ def load_excel_column_to_list(file_path: str, sheet_name: str, column_name: str,
         return []
 
 # --- データ取得関数 ---
-def fetch_innosite_data() -> pd.DataFrame:
-    """INNOSiTEデータを取得する。"""
-    query = "SELECT t_stdddata.* FROM t_stdddata ORDER BY payuserid ASC;"
-    return fetch_data_from_db("KSMAIN2_MYSQL", query)
+def fetch_innosite_data(check_ids: list[str] | None = None) -> pd.DataFrame:
+    """
+    INNOSiTEデータを取得する。
+
+    取得する列は check_ids（None の場合は全てのチェック）が参照する列に絞り込む。
+    """
+    columns = required_columns(CHECK_COLUMNS, BASE_COLUMNS, check_ids)
+    query = "SELECT {columns} FROM t_stdddata ORDER BY payuserid ASC;"
+    return fetch_data_from_db("KSMAIN2_MYSQL", query, [("t_stdddata", "t_stdddata")], columns)
+
+def iter_innosite_data(chunk_size: int, check_ids: list[str] | None = None):
+    """
+    INNOSiTEデータを chunk_size 行ずつ取得し、DataFrameとして順に返す（ストリーミング）。
+
+    サーバーサイドカーソル（SSCursor）を使用するため、全件をメモリに読み込まない。
+    """
+    columns = required_columns(CHECK_COLUMNS, BASE_COLUMNS, check_ids)
+    with connect("KSMAIN2_MYSQL") as conn:
+        with conn.cursor() as cursor:
+            select_columns = select_list(cursor, [("t_stdddata", "t_stdddata")], columns, MYSQL)
+        with conn.cursor(mysql_driver().cursors.SSCursor) as cursor:
+            cursor.execute(f"SELECT {select_columns} FROM t_stdddata ORDER BY payuserid ASC;")
+            yield from iter_cursor_frames(cursor, chunk_size)
+
+def fetch_innosite_id_data() -> pd.DataFrame:
+    """ストリーミング時の事前取得: CHK_0003 の判定に使用する stdDID・stdID_D を全件取得する。"""
+    query = "SELECT {columns} FROM t_stdddata ORDER BY payuserid ASC;"
+    return fetch_data_from_db("KSMAIN2_MYSQL", query, [("t_stdddata", "t_stdddata")], list(BASE_COLUMNS))
 
 def fetch_excluded_sales_data() -> pd.DataFrame:
     """営業データを取得する。"""
@@ -243,7 +317,7 @@ def check_dekispart_school_0011(row: pd.Series, error_messages: list[dict]):
     if row.get("stdDsale1") == "001275" and not str(row.get("stdDsale2", "")).strip():
         error_messages.append(create_error_entry(row["stdDID"], Config.CHK_ID_0011, row.get("stdID_D", "")))
 
-def check_dekispart_school_0012(row: pd.Series, bankrupt_shop_data: list[str], error_messages: list[dict]):
+def check_dekispart_school_0012(row: pd.Series, bankrupt_shop_data: ReferenceIndex, error_messages: list[dict]):
     """CHK_0012: 登録販売店が倒産指定されているかチェック。"""
     if not row["stdDKaiyaku"] and row["stdDsale1"] in bankrupt_shop_data:
         error_messages.append(create_error_entry(row["stdDID"], Config.CHK_ID_0012, row.get("stdID_D", "")))
@@ -278,7 +352,7 @@ def check_dekispart_school_0018(row: pd.Series, error_messages: list[dict]):
     if row["stdDKaiyaku"] and row["stdDFlg1"]:
         error_messages.append(create_error_entry(row["stdDID"], Config.CHK_ID_0018, row.get("stdID_D", "")))
 
-def check_dekispart_school_0019(row: pd.Series, totalnet_list: list[str], error_messages: list[dict]):
+def check_dekispart_school_0019(row: pd.Series, totalnet_list: ReferenceIndex, error_messages: list[dict]):
     """CHK_0019: stdDNsyu(入金経路)が121の場合にトータルネットに登録がなければNG。"""
     if str(row["stdDNsyu"]) == "121" and str(row["stdDID"]) not in totalnet_list: # stdID_D は typo ? stdDIDが正しいか？
         error_messages.append(create_error_entry(row["stdDID"], Config.CHK_ID_0019, row.get("stdID_D", "")))
@@ -286,8 +360,7 @@ def check_dekispart_school_0019(row: pd.Series, totalnet_list: list[str], error_
 def check_dekispart_school_0020(row: pd.Series, error_messages: list[dict]):
     """CHK_0020: 備考(userbikou1)に更新案内不要という文字列があれば、更新案内が不要(112)となっていない場合にエラー。"""
     # 備考(userbikou1)に「更新案内不要」という文字列がある場合のチェック
-    userbikou1 = str(row.get("userbikou1", "")).strip()
-    if "更新案内不要" in userbikou1 and str(row["stdDNsyu"]) != "112":
+    if contains_keyword(row.get("userbikou1"), BikoKeyword.RENEWAL_NOT_NEEDED) and str(row["stdDNsyu"]) != "112":
         error_messages.append(create_error_entry(row["stdDID"], Config.CHK_ID_0020, row.get("stdID_D", "")))
 
 def check_dekispart_school_0021(row: pd.Series, error_messages: list[dict]):
@@ -295,7 +368,7 @@ def check_dekispart_school_0021(row: pd.Series, error_messages: list[dict]):
     if str(row["stdDNsyu"]) != "112" and row["stdDsale1"] == "B88299":
         error_messages.append(create_error_entry(row["stdDID"], Config.CHK_ID_0021, row.get("stdID_D", "")))
 
-def check_dekispart_school_0022(row: pd.Series, excluded_sales_list: list[str], error_messages: list[dict]):
+def check_dekispart_school_0022(row: pd.Series, excluded_sales_list: ReferenceIndex, error_messages: list[dict]):
     """CHK_0022: stdDKaiyakuがfalseの場合、stdDtselnoが対象外営業リストに含まれている場合NG。"""
     if not row["stdDKaiyaku"] and row.get("stdDtselno") in excluded_sales_list:
         error_messages.append(create_error_entry(row["stdDID"], Config.CHK_ID_0022, row.get("stdID_D", "")))
@@ -309,7 +382,7 @@ def check_dekispart_school_0024(row: pd.Series, error_messages: list[dict]):
     """CHK_0024: stdDKaiyakuがfalseの場合、stdDReyear1が過去の日付になっていたらNG。"""
     if not row["stdDKaiyaku"] and pd.notna(row["stdDReyear1"]):
         try:
-            if pd.to_datetime(row["stdDReyear1"]).date() < datetime.now().date():
+            if pd.to_datetime(row["stdDReyear1"]).date() < today():
                 error_messages.append(create_error_entry(row["stdDID"], Config.CHK_ID_0024, row.get("stdID_D", "")))
         except ValueError:
             # 日付変換エラーもエラーとして扱うか、別のチェック項目とする
@@ -319,7 +392,7 @@ def check_dekispart_school_0025(row: pd.Series, error_messages: list[dict]):
     """CHK_0025: stdDKaiyakuがtrueの場合、stdDReyear1が未来の日付になっていたらNG。"""
     if row["stdDKaiyaku"] and pd.notna(row["stdDReyear1"]):
         try:
-            if pd.to_datetime(row["stdDReyear1"]).date() > datetime.now().date():
+            if pd.to_datetime(row["stdDReyear1"]).date() > today():
                 error_messages.append(create_error_entry(row["stdDID"], Config.CHK_ID_0025, row.get("stdID_D", "")))
         except ValueError:
             pass
@@ -329,7 +402,7 @@ def check_dekispart_school_0026(row: pd.Series, error_messages: list[dict]):
     if not row["stdDKaiyaku"] and pd.notna(row["stdDAcday"]):
         try:
             # 1年2か月 = 14か月
-            if pd.to_datetime(row["stdDAcday"]).date() < (datetime.now().date() - timedelta(days=14*30)): # 近似値
+            if pd.to_datetime(row["stdDAcday"]).date() < today() - relativedelta(months=14):
                 error_messages.append(create_error_entry(row["stdDID"], Config.CHK_ID_0026, row.get("stdID_D", "")))
         except ValueError:
             pass
@@ -338,7 +411,7 @@ def check_dekispart_school_0027(row: pd.Series, error_messages: list[dict]):
     """CHK_0027: stdDKaiyakuがtrueの場合、stdDAcdayが未来の日付になっていたらNG。"""
     if row["stdDKaiyaku"] and pd.notna(row["stdDAcday"]):
         try:
-            if pd.to_datetime(row["stdDAcday"]).date() > datetime.now().date():
+            if pd.to_datetime(row["stdDAcday"]).date() > today():
                 error_messages.append(create_error_entry(row["stdDID"], Config.CHK_ID_0027, row.get("stdID_D", "")))
         except ValueError:
             pass
@@ -358,7 +431,7 @@ def check_dekispart_school_0030(row: pd.Series, error_messages: list[dict]):
     if not row["stdDKaiyaku"] and pd.notna(row["stdDReyear1"]):
         try:
             # 1年3か月 = 15か月
-            if pd.to_datetime(row["stdDReyear1"]).date() > (datetime.now().date() + timedelta(days=15*30)): # 近似値
+            if pd.to_datetime(row["stdDReyear1"]).date() > today() + relativedelta(months=15):
                 error_messages.append(create_error_entry(row["stdDID"], Config.CHK_ID_0030, row.get("stdID_D", "")))
         except ValueError:
             pass
@@ -373,25 +446,84 @@ def check_dekispart_school_0032(row: pd.Series, error_messages: list[dict]):
     if row["stdDKaiyaku"] and not row["stdDKaiyakuOP"]:
         error_messages.append(create_error_entry(row["stdDID"], Config.CHK_ID_0032, row.get("stdID_D", "")))
 
+# 当日と比較するチェック（差分チェックでは前回のエラーを再利用せず、毎回全行でチェックする）
+DATE_DEPENDENT_CHECKS = frozenset({
+    check_dekispart_school_0024,
+    check_dekispart_school_0025,
+    check_dekispart_school_0026,
+    check_dekispart_school_0027,
+    check_dekispart_school_0030,
+})
+
 # --- メインチェック関数 ---
+@with_as_of
 def validate_data(
     df: pd.DataFrame,
     progress_callback: Callable | None,
-    totalnet_list_df: pd.DataFrame,
-    excluded_sales_list: list[str],
-    bankrupt_shop_data: list[str]
+    totalnet_list_df: pd.DataFrame | ReferenceIndex,
+    excluded_sales_list: list[str] | ReferenceIndex,
+    bankrupt_shop_data: list[str] | ReferenceIndex,
+    include_duplicate_check: bool = True,
+    date_dependent: bool | None = None,
 ) -> pd.DataFrame:
     """
     INNOSiTEデータを検証し、エラーをDataFrameとして返す。
+
+    df がテーブルの一部（分割取得したチャンク）の場合は include_duplicate_check=False とし、
+    CHK_0003（ID重複）は全件の stdDID に対して別途実行する。
+    チャンクごとに呼び出す場合は、参照データを ReferenceIndex にして渡すと索引の作成は1回で済む。
+    date_dependent に True を指定すると当日と比較するチェック（DATE_DEPENDENT_CHECKS）だけ、
+    False を指定するとそれ以外のチェックだけを実行する（差分チェック用）。
     """
     errors: list[dict] = []
     total_ids = len(df)
     
-    # 補助リストを必要な形式に変換（もし必要であれば）
-    totalnet_list = totalnet_list_df["顧客番号"].astype(str).tolist() if not totalnet_list_df.empty else []
+    # 補助リストを照合用の索引に変換（作成済みの索引はそのまま使用する）
+    if isinstance(totalnet_list_df, ReferenceIndex):
+        totalnet_list = totalnet_list_df
+    else:
+        totalnet_list = column_index(totalnet_list_df, "顧客番号", key=str)
+    if not isinstance(excluded_sales_list, ReferenceIndex):
+        excluded_sales_list = ReferenceIndex(excluded_sales_list)
+    if not isinstance(bankrupt_shop_data, ReferenceIndex):
+        bankrupt_shop_data = ReferenceIndex(bankrupt_shop_data)
     
-    # CHK_0003 のためのID重複チェック (一度だけ実行)
-    check_dekispart_school_0003_duplicate(df, errors)
+    # CHK_0003 のためのID重複チェック (一度だけ実行。当日とは比較しない)
+    if include_duplicate_check and not date_dependent:
+        profiled_check("DEKISPART_SCHOOL", check_name(check_dekispart_school_0003_duplicate),
+                       check_dekispart_school_0003_duplicate)(df, errors)
+
+    # 行ごとのチェック関数（参照データを使用するチェックは lambda で渡す）
+    check_functions = profiled_checks("DEKISPART_SCHOOL", select_checks([
+        check_dekispart_school_0002,
+        check_dekispart_school_0004,
+        check_dekispart_school_0007,
+        check_dekispart_school_0008,
+        check_dekispart_school_0009,
+        check_dekispart_school_0010,
+        check_dekispart_school_0011,
+        lambda row, errors: check_dekispart_school_0012(row, bankrupt_shop_data, errors),
+        check_dekispart_school_0013,
+        check_dekispart_school_0014,
+        check_dekispart_school_0015,
+        check_dekispart_school_0016,
+        check_dekispart_school_0017,
+        check_dekispart_school_0018,
+        lambda row, errors: check_dekispart_school_0019(row, totalnet_list, errors),
+        check_dekispart_school_0020,
+        check_dekispart_school_0021,
+        lambda row, errors: check_dekispart_school_0022(row, excluded_sales_list, errors),
+        check_dekispart_school_0023,
+        check_dekispart_school_0024,
+        check_dekispart_school_0025,
+        check_dekispart_school_0026,
+        check_dekispart_school_0027,
+        check_dekispart_school_0028,
+        check_dekispart_school_0029,
+        check_dekispart_school_0030,
+        check_dekispart_school_0031,
+        check_dekispart_school_0032,
+    ], DATE_DEPENDENT_CHECKS, date_dependent))
 
     for index, row in df.iterrows():
         row_errors: list[dict] = []
@@ -403,34 +535,8 @@ def validate_data(
 
         # 個別のチェック関数を呼び出し (関数名をCHK_IDを含む形に修正)
         # 各チェック関数に保守整理番号を渡す
-        check_dekispart_school_0002(row, row_errors)
-        check_dekispart_school_0004(row, row_errors)
-        check_dekispart_school_0007(row, row_errors)
-        check_dekispart_school_0008(row, row_errors)
-        check_dekispart_school_0009(row, row_errors)
-        check_dekispart_school_0010(row, row_errors)
-        check_dekispart_school_0011(row, row_errors)
-        check_dekispart_school_0012(row, bankrupt_shop_data, row_errors)
-        check_dekispart_school_0013(row, row_errors)
-        check_dekispart_school_0014(row, row_errors)
-        check_dekispart_school_0015(row, row_errors)
-        check_dekispart_school_0016(row, row_errors)
-        check_dekispart_school_0017(row, row_errors)
-        check_dekispart_school_0018(row, row_errors)
-        check_dekispart_school_0019(row, totalnet_list, row_errors)
-        check_dekispart_school_0020(row, row_errors)
-        check_dekispart_school_0021(row, row_errors)
-        check_dekispart_school_0022(row, excluded_sales_list, row_errors)
-        check_dekispart_school_0023(row, row_errors)
-        check_dekispart_school_0024(row, row_errors)
-        check_dekispart_school_0025(row, row_errors)
-        check_dekispart_school_0026(row, row_errors)
-        check_dekispart_school_0027(row, row_errors)
-        check_dekispart_school_0028(row, row_errors)
-        check_dekispart_school_0029(row, row_errors)
-        check_dekispart_school_0030(row, row_errors)
-        check_dekispart_school_0031(row, row_errors)
-        check_dekispart_school_0032(row, row_errors)
+        for check_func in check_functions:
+            check_func(row, row_errors)
         
         # 保守整理番号を追加
         for error in row_errors:
@@ -455,15 +561,25 @@ def save_results_to_excel(errors_df: pd.DataFrame):
         messagebox.showinfo("完了", "エラーは見つかりませんでした。Excel ファイルは作成されません。")
 
 # --- エントリポイント ---
-def run_dekispart_school_check(progress_callback: Callable | None = None, aux_paths: dict | None = None) -> pd.DataFrame:
+@with_as_of
+def run_dekispart_school_check(
+    progress_callback: Callable | None = None,
+    aux_paths: dict | None = None,
+    chunk_size: int | None = None,
+) -> pd.DataFrame:
     """
     DEKISPART_SCHOOLのデータチェックを実行するメインエントリポイント。
+
+    chunk_size（省略時は config.ini の [STREAMING]）が1以上の場合は、t_stdddata を
+    chunk_size 行ずつ取得してチェックする（ストリーミング）。
     """
     all_errors: list[dict] = []
+    phases = PhaseTimer("DEKISPART_SCHOOL")
 
     try:
         if progress_callback:
             progress_callback("DEKISPART_SCHOOL: 補助ファイルを読み込み中...")
+        phases.start(PHASE_AUX_LOAD)
 
         # 補助ファイルのパスを取得
         totalnet_list_path = aux_paths.get("totalnet_list_path") if aux_paths else Config.TOTALNET_LIST_DEFAULT_PATH
@@ -471,6 +587,7 @@ def run_dekispart_school_check(progress_callback: Callable | None = None, aux_pa
 
         totalnet_df = load_totalnet_list(totalnet_list_path)
         # 不要販売店リストの読み込みは削除されました（要望#005対応）
+        phases.start(PHASE_REFERENCE)
         excluded_sales_df = fetch_excluded_sales_data()
         bankrupt_shop_df = fetch_bankrupt_shop_data()
 
@@ -488,11 +605,18 @@ def run_dekispart_school_check(progress_callback: Callable | None = None, aux_pa
 
         excluded_sales_list = excluded_sales_df["salCode"].tolist() if not excluded_sales_df.empty else []
         bankrupt_shop_data = bankrupt_shop_df["maiCode"].tolist() if not bankrupt_shop_df.empty else []
+        # 行ごとに照合する参照データは、チャンクごとに作り直さないよう実行ごとに一度だけ索引にする
+        totalnet_index = column_index(totalnet_df, "顧客番号", key=str)
+        excluded_sales_index = ReferenceIndex(excluded_sales_list)
+        bankrupt_shop_index = ReferenceIndex(bankrupt_shop_data)
 
         if progress_callback:
             progress_callback("DEKISPART_SCHOOL: 基幹データを取得中...")
+        phases.start(PHASE_FETCH)
 
-        df = fetch_innosite_data()
+        chunk_size = streaming_chunk_size(chunk_size)
+        # ストリーミング時は、CHK_0003（ID重複）の判定用に stdDID・stdID_D だけを先に取得する
+        df = fetch_innosite_id_data() if chunk_size else fetch_innosite_data()
 
         if df.empty:
             all_errors.append(create_error_entry("N/A", Config.DATA_FETCH_ERROR_ID))
@@ -501,14 +625,69 @@ def run_dekispart_school_check(progress_callback: Callable | None = None, aux_pa
         if progress_callback:
             progress_callback("DEKISPART_SCHOOL: データチェックを実行中...")
 
-        validation_results_df = validate_data(
-            df,
-            progress_callback,
-            totalnet_df,
-            # unnecessary_dealer_list削除（要望#005対応）
-            excluded_sales_list,
-            bankrupt_shop_data
-        )
+        # テーブルの一部（チャンク・差分・シャード）に対して呼び出すため、CHK_0003 は別途全行で実行する
+        validate_kwargs = {
+            "totalnet_list_df": totalnet_index,
+            "excluded_sales_list": excluded_sales_index,
+            "bankrupt_shop_data": bankrupt_shop_index,
+            "include_duplicate_check": False,
+        }
+        result_columns = ["シリーズ", "ユーザID", "保守整理番号", "チェックID"]
+        # ストリーミングでは取得とチェックを交互に行うため、取得の時間もチェックに含まれる
+        phases.start(PHASE_VALIDATE)
+        check_duplicates = profiled_check("DEKISPART_SCHOOL", check_name(check_dekispart_school_0003_duplicate),
+                                          check_dekispart_school_0003_duplicate)
+        if chunk_size:
+            duplicate_errors: list[dict] = []
+            check_duplicates(df, duplicate_errors)
+            del df
+            chunk_results_df = validate_in_chunks(
+                iter_innosite_data(chunk_size),
+                lambda chunk: validate_data(chunk, None, **validate_kwargs),
+                result_columns,
+                progress_callback, "DEKISPART_SCHOOL",
+            )
+            validation_results_df = pd.concat(
+                [pd.DataFrame(duplicate_errors, columns=result_columns),
+                 chunk_results_df],
+                ignore_index=True,
+            ) if duplicate_errors else chunk_results_df
+        elif incremental_enabled():
+            # 前回の実行から変更された行だけをチェックし、変更の無い行は前回のエラーを再利用する
+            # CHK_0003（ID重複）はテーブル全体で判定するため、差分チェックとは別に全行で実行する
+            duplicate_errors: list[dict] = []
+            check_duplicates(df, duplicate_errors)
+            # 当日と比較するチェックは、日付が変わると結果が変わるため毎回全行で実行する
+            changed_results_df = validate_incrementally(
+                "DEKISPART_SCHOOL", df, "stdID_D",
+                lambda rows: validate_sharded(rows, validate_data, result_columns,
+                                              {**validate_kwargs, "date_dependent": False},
+                                              progress_label="DEKISPART_SCHOOL"),
+                result_columns,
+                [totalnet_df, excluded_sales_list, bankrupt_shop_data],
+                progress_callback,
+                validate_date_checks=lambda rows: validate_sharded(rows, validate_data, result_columns,
+                                                                   {**validate_kwargs, "date_dependent": True},
+                                                                   progress_label="DEKISPART_SCHOOL"),
+            )
+            validation_results_df = pd.concat(
+                [pd.DataFrame(duplicate_errors, columns=result_columns),
+                 changed_results_df],
+                ignore_index=True,
+            ) if duplicate_errors else changed_results_df
+        else:
+            # 行数が多い場合は複数のプロセスでチェックする（config.ini の [SHARDING]）
+            # CHK_0003 のエラーは validate_data(include_duplicate_check=True) と同じく先頭に置く
+            duplicate_errors: list[dict] = []
+            check_duplicates(df, duplicate_errors)
+            sharded_results_df = validate_sharded(
+                df, validate_data, result_columns, validate_kwargs,
+                progress_callback=progress_callback, progress_label="DEKISPART_SCHOOL",
+            )
+            validation_results_df = pd.concat(
+                [pd.DataFrame(duplicate_errors, columns=result_columns), sharded_results_df],
+                ignore_index=True,
+            ) if duplicate_errors else sharded_results_df
 
         return validation_results_df.assign(シリーズ="DEKISPART_SCHOOL")[["シリーズ", "ユーザID", "保守整理番号", "チェックID"]]
 
@@ -521,6 +700,8 @@ def run_dekispart_school_check(progress_callback: Callable | None = None, aux_pa
             "ユーザID": "N/A",
             "チェックID": f"処理中にエラーが発生しました: {e}"
         }], columns=["シリーズ", "ユーザID", "チェックID"])
+    finally:
+        phases.stop()
 
 # --- GUI連携用関数 ---
 def get_auxiliary_file_paths() -> dict:
@@ -0,0 +1,98 @@
+"""
+メッセージボックス・ファイル選択ダイアログ（ヘッドレス実行対応）
+
+各シリーズのモジュールは、補助ファイルの読み込みエラーなどを tkinter.messagebox で表示していました。
+そのため、GUIを使用しないバッチ実行（data_check.py --headless）でも tkinter が必要になり、
+サーバーでの実行中にダイアログが表示されて処理が止まることがありました。
+
+ここでは tkinter.messagebox / tkinter.filedialog と同じ呼び出し方の messagebox / filedialog を提供します。
+
+- GUI（既定）: 初めて表示するときに tkinter を読み込み、従来どおりダイアログを表示します。
+- ヘッドレス（set_headless(True)）: tkinter を読み込まず、ログと標準エラー出力に書き出します。
+  showerror で通知されたエラーは reported_errors() で取得でき、終了コードの判定に使用します。
+  ファイル選択ダイアログは空文字（未選択）を返します。
+"""
+
+import logging
+import sys
+import threading
+
+
+logger = logging.getLogger(__name__)
+
+_headless = False
+_reported_errors: list[str] = []
+_lock = threading.Lock()
+
+
+def set_headless(enabled: bool = True) -> None:
+    """ヘッドレス実行にする（通知したエラーの記録もクリアする）。"""
+    global _headless
+    with _lock:
+        _headless = enabled
+        _reported_errors.clear()
+
+
+def is_headless() -> bool:
+    return _headless
+
+
+def reported_errors() -> list[str]:
+    """ヘッドレス実行中に showerror で通知されたエラー（"タイトル: メッセージ"）を返す。"""
+    with _lock:
+        return list(_reported_errors)
+
+
+def _notify(kind: str, level: int, title: str, message, options: dict):
+    if not _headless:
+        from tkinter import messagebox as tk_messagebox
+
+        return getattr(tk_messagebox, kind)(title, message, **options)
+    text = f"{title}: {message}" if message else str(title)
+    logger.log(level, text)
+    if level >= logging.WARNING:
+        print(text, file=sys.stderr)
+    if level >= logging.ERROR:
+        with _lock:
+            _reported_errors.append(text)
+    return "ok"
+
+
+class _MessageBox:
+    """tkinter.messagebox と同じ呼び出し方の通知"""
+
+    def showinfo(self, title=None, message=None, **options):
+        return _notify("showinfo", logging.INFO, title, message, options)
+
+    def showwarning(self, title=None, message=None, **options):
+        return _notify("showwarning", logging.WARNING, title, message, options)
+
+    def showerror(self, title=None, message=None, **options):
+        return _notify("showerror", logging.ERROR, title, message, options)
+
+
+class _FileDialog:
+    """tkinter.filedialog と同じ呼び出し方のファイル選択（ヘッドレス実行時は未選択）"""
+
+    def askopenfilename(self, **options) -> str:
+        if _headless:
+            logger.warning(f"ヘッドレス実行のためファイルを選択できません: {options.get('title', '')}")
+            return ""
+        from tkinter import filedialog as tk_filedialog
+
+        return tk_filedialog.askopenfilename(**options)
+
+
+messagebox = _MessageBox()
+filedialog = _FileDialog()
+
+
+def hidden_root():
+    """ファイル選択ダイアログの親にする非表示のウィンドウを作成する（ヘッドレス実行時は None）。"""
+    if _headless:
+        return None
+    import tkinter as tk
+
+    root = tk.Tk()
+    root.withdraw()  # ウィンドウを非表示にする
+    return root
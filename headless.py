@@ -0,0 +1,237 @@
+"""
+ヘッドレス実行（GUIを使用しないバッチ実行）
+
+サーバーでの夜間実行など、画面を操作せずにチェックを実行して結果をファイルに書き出します。
+tkinter は読み込みません（各シリーズのメッセージボックスはログと標準エラー出力に書き出します）。
+
+使用例:
+
+    DataCheck.exe --headless --output results.csv
+    python data_check.py --headless --series DEKISPART CLOUD --output results.ndjson
+    python data_check.py --headless --output results.parquet --as-of 2024-04-01 --totalnet-list 支払人マスタ.csv
+
+補助ファイルのパスは app_settings.json（画面の「補助ファイル設定」で保存したもの）から読み込み、
+--individual-list などを指定した場合はそちらを使用します。
+
+終了コード:
+
+    0  チェックが完了し、エラーは見つからなかった
+    1  チェックが完了し、エラーが見つかった
+    2  引数・設定の誤り（補助ファイルが見つからないなど）
+    3  チェックまたは結果の書き出しに失敗した（DB接続エラー・補助ファイルの読み込みエラーなど）
+"""
+
+import argparse
+import json
+import logging
+import sys
+import time
+from pathlib import Path
+
+import pandas as pd
+
+import connection_pool
+import data_snapshot
+import date_columns
+import dialogs
+import profiling
+import table_cache
+from check_results import (
+    OUTPUT_FORMATS,
+    RESULT_COLUMNS,
+    load_check_definitions,
+    output_format,
+    with_error_messages,
+    write_results,
+)
+from common import configure_logging
+from runtime_files import enter_runtime_root, ensure_runtime_file
+from series_registry import SERIES_RUNNERS, load_series_runner
+from series_scheduler import DEFAULT_MAX_WORKERS, run_series_concurrently
+
+EXIT_OK = 0
+EXIT_FINDINGS = 1
+EXIT_USAGE = 2
+EXIT_FAILED = 3
+
+# チェックに必要な補助ファイル（app_settings.json の aux_file_paths のキー: 引数名）
+AUX_PATH_OPTIONS = {
+    "individual_list_path": "--individual-list",
+    "totalnet_list_path": "--totalnet-list",
+    "sales_person_list_path": "--sales-person-list",
+    "customers_list_path": "--customers-list",
+}
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="DataCheck.exe --headless",
+        description="GUIを使用せずにデータチェックを実行し、結果をファイルに書き出します。",
+        epilog="終了コード: 0=エラーなし, 1=エラーあり, 2=引数・設定の誤り, 3=チェックまたは書き出しの失敗",
+    )
+    parser.add_argument("--headless", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--series", nargs="+", metavar="SERIES", type=str.upper,
+                        choices=list(SERIES_RUNNERS), default=list(SERIES_RUNNERS),
+                        help=f"チェックするシリーズ（既定: 全シリーズ。{', '.join(SERIES_RUNNERS)}）")
+    parser.add_argument("--output", "-o", required=True, help="結果の出力先ファイル（.csv / .parquet / .ndjson）")
+    parser.add_argument("--format", choices=OUTPUT_FORMATS, help="出力形式（省略時は出力先の拡張子から判定）")
+    parser.add_argument("--settings", help="設定ファイル（既定: 実行ファイルと同じディレクトリの app_settings.json）")
+    parser.add_argument("--check-definitions", help="チェック定義ファイル（既定: check_definitions.json）")
+    for key, option in AUX_PATH_OPTIONS.items():
+        parser.add_argument(option, dest=key, metavar="PATH", help=f"補助ファイル（app_settings.json の {key} より優先）")
+    parser.add_argument("--as-of", help="日付のチェックの基準日時（例: 2024-04-01。省略時は実行開始時点）")
+    parser.add_argument("--refresh", action="store_true", help="テーブルキャッシュを使わずDBから再取得する")
+    parser.add_argument("--profile", action="store_true",
+                        help="チェックごとの処理時間を計測し performance_report.json に書き出す（処理時間が1割程度増えます）")
+    parser.add_argument("--max-series-workers", type=int, help="同時に実行するシリーズ数（既定: app_settings.json の max_series_workers）")
+    parser.add_argument("--verbose", "-v", action="store_true", help="進捗を標準エラー出力に表示する")
+    return parser
+
+
+def load_settings(path) -> dict:
+    """app_settings.json を読み込む（無い場合は空の辞書）。"""
+    path = Path(path)
+    if not path.exists():
+        return {}
+    with path.open("r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def resolve_aux_paths(settings: dict, args: argparse.Namespace) -> dict:
+    """app_settings.json の補助ファイルのパスに、引数で指定したパスを上書きして返す。"""
+    aux_paths = dict(settings.get("aux_file_paths", {}))
+    for key in AUX_PATH_OPTIONS:
+        value = getattr(args, key, None)
+        if value:
+            aux_paths[key] = value
+    return aux_paths
+
+
+def missing_aux_files(aux_paths: dict) -> list[str]:
+    """未設定または見つからない補助ファイルの引数名を返す。"""
+    return [
+        option for key, option in AUX_PATH_OPTIONS.items()
+        if not aux_paths.get(key) or not Path(aux_paths[key]).exists()
+    ]
+
+
+def _series_task(series: str, run_check, aux_paths: dict, verbose: bool, durations: dict):
+    def progress_callback(message):
+        print(message if message.startswith(series) else f"{series}: {message}", file=sys.stderr)
+
+    def task():
+        started = time.perf_counter()
+        try:
+            results_df = run_check(progress_callback=progress_callback if verbose else None, aux_paths=aux_paths)
+        finally:
+            durations[series] = time.perf_counter() - started
+        if results_df is None or results_df.empty:
+            return pd.DataFrame(columns=RESULT_COLUMNS)
+        if "保守整理番号" not in results_df.columns:
+            results_df = results_df.assign(保守整理番号="")
+        return results_df[RESULT_COLUMNS]
+
+    return task
+
+
+def run_series(series_list: list[str], aux_paths: dict, as_of=None, refresh: bool = False,
+               max_workers: int | None = None, verbose: bool = False,
+               profile: bool = False) -> tuple[pd.DataFrame, dict, list[str]]:
+    """
+    シリーズのチェックを画面と同じ方法（シリーズの並行実行・テーブルの共有・基準時点の固定）で実行する。
+
+    profile が False の場合、処理時間の計測は config.ini の [PROFILING] に従う。
+
+    Returns:
+        (全シリーズの結果, {シリーズ名: 処理時間（秒）}, 失敗したシリーズのエラー)
+    """
+    durations = {}
+    failures = []
+
+    def on_error(series, error):
+        failures.append(f"{series}: {error}")
+
+    # モジュールの読み込みはシリーズのスレッドを開始する前に行う（読み込めないシリーズだけを失敗にする）
+    runners = {}
+    for series in series_list:
+        try:
+            runners[series] = load_series_runner(series)
+        except ImportError as e:
+            on_error(series, e)
+
+    with data_snapshot.snapshot_run(), connection_pool.pool_run(), \
+            table_cache.force_refresh(refresh), date_columns.as_of_run(as_of), \
+            profiling.profile_run(enabled=True if profile else None):
+        results = run_series_concurrently(
+            [(series, _series_task(series, runners[series], aux_paths, verbose, durations)) for series in runners],
+            max_workers=max_workers,
+            on_error=on_error,
+        )
+
+    # 結果は指定したシリーズの順に並べる（完了した順にしない）
+    frames = [results[series] for series in series_list if series in results and not results[series].empty]
+    results_df = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=RESULT_COLUMNS)
+    return results_df, durations, failures
+
+
+def main(argv=None) -> int:
+    """ヘッドレス実行のエントリポイント（終了コードを返す）。"""
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    configure_logging(console_level=logging.INFO if args.verbose else logging.WARNING)
+    dialogs.set_headless(True)
+    enter_runtime_root()
+
+    try:
+        fmt = output_format(args.output, args.format)
+        settings = load_settings(args.settings or ensure_runtime_file("app_settings.json", default_text="{}"))
+        check_definitions = load_check_definitions(args.check_definitions or ensure_runtime_file("check_definitions.json"))
+        if args.as_of:
+            args.as_of = pd.Timestamp(args.as_of).to_pydatetime()
+    except (ValueError, OSError) as e:
+        print(f"[ERROR] {e}", file=sys.stderr)
+        return EXIT_USAGE
+
+    series_list = list(dict.fromkeys(args.series))
+    aux_paths = resolve_aux_paths(settings, args)
+    missing = missing_aux_files(aux_paths)
+    if missing:
+        print(f"[ERROR] 補助ファイルが設定されていないか、見つかりません: {', '.join(missing)}", file=sys.stderr)
+        return EXIT_USAGE
+
+    max_workers = args.max_series_workers or settings.get("max_series_workers", DEFAULT_MAX_WORKERS)
+    started = time.perf_counter()
+    results_df, durations, failures = run_series(
+        series_list, aux_paths, as_of=args.as_of, refresh=args.refresh,
+        max_workers=max_workers, verbose=args.verbose, profile=args.profile,
+    )
+    elapsed = time.perf_counter() - started
+    failures += dialogs.reported_errors()
+    if failures:
+        # 画面と同じく、エラーが発生したことを結果にも残す
+        error_df = pd.DataFrame([{"シリーズ": "System", "ユーザID": "N/A", "保守整理番号": "", "チェックID": "APP_ERROR"}])
+        results_df = pd.concat([results_df, error_df], ignore_index=True)
+
+    try:
+        with profiling.export_phase():
+            write_results(with_error_messages(results_df, check_definitions), args.output, fmt)
+    except Exception as e:
+        print(f"[ERROR] 結果を '{args.output}' に書き出せませんでした: {e}", file=sys.stderr)
+        return EXIT_FAILED
+
+    for series in series_list:
+        count = int((results_df["シリーズ"] == series).sum())
+        duration = durations.get(series)
+        timing = f"{duration:.1f}秒" if duration is not None else "未実行"
+        print(f"{series}: {count}件 ({timing})")
+    print(f"合計: {len(results_df)}件 ({elapsed:.1f}秒) -> {args.output}")
+
+    if failures:
+        for failure in failures:
+            print(f"[ERROR] {failure}", file=sys.stderr)
+        return EXIT_FAILED
+    return EXIT_FINDINGS if not results_df.empty else EXIT_OK
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,295 @@
+"""
+差分チェック（前回の実行から変更された行だけをチェックする）
+
+基幹データは1日にごく一部しか変更されないため、毎回全行をチェックし直す代わりに、
+行ごとのフィンガープリント（取得した列の値のハッシュ）と、その行のエラーを保存しておき、
+次回は新規・変更された行だけをチェックします。変更されていない行は前回のエラーを再利用し、
+全行分のチェック結果をまとめて返します。
+
+行はチェック結果の「保守整理番号」に出力される列（DEKISPART: stdID, INNOSITE: stdid_i,
+DEKISPART_SCHOOL: stdID_D, CLOUD: HoshuId）の値でまとめて比較します。同じ値の行が複数ある場合は、
+そのうち1行でも変更されていればまとめてチェックし直します。
+
+更新日・契約終了日などを当日と比較するチェック（各シリーズの DATE_DEPENDENT_CHECKS）は、
+行が変わらなくても日付が変わると結果が変わるため、前回のエラーは再利用せず毎回全行でチェックします。
+いずれも数列だけを参照する軽いチェックのため、日付が変わっても他のチェックは変更された行だけで済みます。
+
+次の場合は全行をチェックし直します。
+
+- 参照データ（マスタデータ・補助ファイル・テーブル全体から作成した重複IDなど）が変わった
+- チェック処理を定義しているモジュール（シリーズモジュールと CHECK_MODULES）のソースが変わった
+  （実行ファイル化してソースが無い場合は、実行ファイルが更新された）
+- 取得した列が変わった
+
+config.ini の例:
+
+    [INCREMENTAL]
+    enabled = true
+    directory = incremental_state
+"""
+
+import hashlib
+import importlib
+import inspect
+import logging
+import os
+import pickle
+import sys
+from typing import Any, Callable, Optional
+
+import numpy as np
+import pandas as pd
+
+from common import get_config
+from runtime_files import RUNTIME_ROOT
+
+
+logger = logging.getLogger(__name__)
+
+INCREMENTAL_SECTION = "INCREMENTAL"
+# 実行ファイル（PyInstaller）の場合も残るよう、app_settings.json などと同じディレクトリに置く
+DEFAULT_DIRECTORY = str(RUNTIME_ROOT / "incremental_state")
+
+# チェック結果で行を識別する列
+ERROR_KEY_COLUMN = "保守整理番号"
+
+# シリーズモジュール以外で、チェック結果に影響するモジュール（ソースが変わった場合は全行をチェックし直す）
+CHECK_MODULES = ("constants", "rule_engine", "remarks", "keyword_matcher", "date_columns", "reference_index")
+
+
+def incremental_enabled() -> bool:
+    """config.ini の [INCREMENTAL] で差分チェックが有効になっているかを返す。"""
+    config = get_config()
+    if not config.has_section(INCREMENTAL_SECTION):
+        return False
+    try:
+        return config[INCREMENTAL_SECTION].getboolean("enabled", fallback=False)
+    except ValueError as e:
+        logger.warning(f"[{INCREMENTAL_SECTION}] の設定が不正なため全行をチェックします: {e}")
+        return False
+
+
+def _state_directory() -> str:
+    config = get_config()
+    if config.has_section(INCREMENTAL_SECTION):
+        return config[INCREMENTAL_SECTION].get("directory", DEFAULT_DIRECTORY) or DEFAULT_DIRECTORY
+    return DEFAULT_DIRECTORY
+
+
+def _key(value) -> Optional[str]:
+    """行を識別する値を文字列にする（空の場合は None）。"""
+    if value is None or (not isinstance(value, str) and pd.isna(value)):
+        return None
+    text = str(value).strip()
+    return text or None
+
+
+def _update_digest(digest, value: Any) -> None:
+    """値の内容から実行ごとに変わらないハッシュを計算する（set や dict の順序に依存しない）。"""
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        digest.update(repr(list(value.columns) if isinstance(value, pd.DataFrame) else value.name).encode("utf-8"))
+        digest.update(pd.util.hash_pandas_object(value, index=True).values.tobytes())
+    elif isinstance(value, dict):
+        digest.update(b"{")
+        for key in sorted(value, key=repr):
+            digest.update(repr(key).encode("utf-8"))
+            _update_digest(digest, value[key])
+        digest.update(b"}")
+    elif isinstance(value, (set, frozenset)):
+        digest.update(repr(sorted(repr(item) for item in value)).encode("utf-8"))
+    elif isinstance(value, (list, tuple)):
+        digest.update(b"[")
+        for item in value:
+            _update_digest(digest, item)
+        digest.update(b"]")
+    else:
+        digest.update(repr(value).encode("utf-8"))
+
+
+def reference_fingerprint(reference_inputs: Any, validate: Optional[Callable] = None) -> str:
+    """
+    参照データ・チェック処理のソースからフィンガープリントを作成する。
+
+    実行日は含めません（当日と比較するチェックは validate_incrementally の validate_date_checks で毎回実行する）。
+    ソースが取得できない場合（実行ファイル化した場合など）は、代わりに実行ファイルのサイズと更新日時を含めます。
+
+    Args:
+        reference_inputs: チェック結果に影響する行以外のデータ（参照データ・補助ファイルなど）
+        validate: チェック関数（定義しているモジュールと CHECK_MODULES のソースをフィンガープリントに含める）
+    """
+    digest = hashlib.sha1()
+    _update_digest(digest, reference_inputs)
+    sources = [importlib.import_module(name) for name in CHECK_MODULES]
+    if validate is not None:
+        sources.insert(0, validate)
+    missing_source = False
+    for source in sources:
+        try:
+            with open(inspect.getsourcefile(source), "rb") as f:
+                digest.update(f.read())
+        except (TypeError, OSError):
+            missing_source = True
+    if missing_source:
+        # 実行ファイルを更新した場合（チェック処理が変わった可能性がある）も前回のエラーを再利用しない
+        stat = os.stat(sys.executable)
+        digest.update(f"{stat.st_size}:{stat.st_mtime_ns}".encode("utf-8"))
+    return digest.hexdigest()
+
+
+def select_checks(checks: list, date_checks, date_dependent: Optional[bool] = None, key: Optional[Callable] = None) -> list:
+    """
+    validate_data の引数 date_dependent に応じて、実行するチェックを選ぶ。
+
+    Args:
+        checks: チェック（関数・Rule）のリスト
+        date_checks: 当日と比較するチェック（key で変換した値の集合）
+        date_dependent: None の場合は全て、True の場合は date_checks だけ、False の場合は date_checks 以外
+        key: チェックから date_checks と比較する値を取り出す関数（None の場合はチェックそのもの）
+    """
+    if date_dependent is None:
+        return list(checks)
+    return [check for check in checks if ((key(check) if key else check) in date_checks) == date_dependent]
+
+
+def row_fingerprints(df: pd.DataFrame, key_column: str) -> pd.Series:
+    """
+    行を識別する値ごとのフィンガープリントを返す。
+
+    Returns:
+        {行を識別する値: 同じ値を持つ行のハッシュの合計} の Series（値が空の行は含まない）
+    """
+    keys = df[key_column].map(_key)
+    hashes = pd.Series(pd.util.hash_pandas_object(df, index=False).values, index=df.index)
+    valid = keys.notna()
+    # 行の並び順に依存しないよう、同じキーの行のハッシュは合計（桁あふれは無視）でまとめる
+    grouped = pd.DataFrame({"key": keys[valid], "hash": hashes[valid]}).groupby("key", sort=False)["hash"]
+    return grouped.sum().astype("uint64")
+
+
+def _load_state(path: str) -> Optional[dict]:
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, "rb") as f:
+            return pickle.load(f)
+    except Exception as e:
+        logger.info(f"差分チェック: 前回の状態を読み込めないため全行をチェックします: {e}")
+        return None
+
+
+def _save_state(path: str, state: dict) -> None:
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path + ".tmp", "wb") as f:
+            pickle.dump(state, f)
+        os.replace(path + ".tmp", path)
+    except Exception as e:
+        logger.warning(f"差分チェック: 状態を保存できませんでした: {e}")
+
+
+def validate_incrementally(
+    series: str,
+    df: pd.DataFrame,
+    key_column: str,
+    validate: Callable[[pd.DataFrame], pd.DataFrame],
+    result_columns: list[str],
+    reference_inputs: Any,
+    progress_callback: Optional[Callable[[str], None]] = None,
+    state_directory: Optional[str] = None,
+    validate_date_checks: Optional[Callable[[pd.DataFrame], pd.DataFrame]] = None,
+) -> pd.DataFrame:
+    """
+    前回の実行から変更された行だけをチェックし、全行分のチェック結果を返す。
+
+    当日と比較するチェックは validate から除き、validate_date_checks に渡してください。
+    validate の結果は保存して次回に再利用し、validate_date_checks は毎回全行に対して実行します。
+
+    Args:
+        series: シリーズ名（状態ファイルの名前に使用）
+        df: チェック対象の全行
+        key_column: チェック結果の「保守整理番号」に出力される列
+        validate: 行の一部（DataFrame）を、当日と比較しないチェックでチェックして結果を返す関数。
+            テーブル全体を参照するチェックは、全行から作成した参照データを使用してください。
+        result_columns: 結果のDataFrameの列
+        reference_inputs: チェック結果に影響する行以外のデータ（変わった場合は全行をチェックし直す）
+        progress_callback: 進捗を報告するためのコールバック関数
+        state_directory: 状態を保存するディレクトリ（None の場合は config.ini の設定）
+        validate_date_checks: 全行を当日と比較するチェックでチェックして結果を返す関数（無い場合は None）
+
+    Returns:
+        全行分のチェック結果
+    """
+    date_results = validate_date_checks(df) if validate_date_checks is not None else None
+    if key_column not in df.columns:
+        logger.info(f"差分チェック: {series} に {key_column} 列が無いため全行をチェックします")
+        return _concat_results([validate(df), date_results], result_columns)
+
+    state_path = os.path.join(state_directory or _state_directory(), f"{series}.pkl")
+    fingerprints = row_fingerprints(df, key_column)
+    reference = reference_fingerprint(reference_inputs, validate)
+
+    state = _load_state(state_path)
+    usable = (
+        state is not None
+        and state.get("reference") == reference
+        and state.get("columns") == list(df.columns)
+    )
+    if usable:
+        previous = state["fingerprints"]
+        common = fingerprints.index.intersection(previous.index)
+        # uint64 のまま比較する（reindex すると欠損値のために float になり精度が落ちる）
+        same = fingerprints[common].to_numpy() == previous[common].to_numpy()
+        unchanged_keys = set(common[same])
+    else:
+        unchanged_keys = set()
+
+    keys = df[key_column].map(_key)
+    changed_rows = df[~keys.isin(unchanged_keys).to_numpy()]
+    message = f"{series}: 差分チェック 変更 {len(changed_rows)} 行 / 全 {len(df)} 行"
+    logger.info(message)
+    if progress_callback:
+        progress_callback(message)
+
+    empty = pd.DataFrame(columns=result_columns)
+    if len(changed_rows):
+        new_results = validate(changed_rows)
+        if new_results is None or new_results.empty:
+            new_results = empty
+        if ERROR_KEY_COLUMN in new_results.columns:
+            # 保守整理番号が行に対応しないエラー（列の欠落など）はテーブル単位のエラーとして扱う
+            is_row_error = new_results[ERROR_KEY_COLUMN].map(_key).isin(set(fingerprints.index)).to_numpy()
+        else:
+            is_row_error = np.zeros(len(new_results), dtype=bool)
+        new_row_errors = new_results[is_row_error]
+        table_errors = new_results[~is_row_error]
+    else:
+        # 変更された行が無い場合は、前回のテーブル単位のエラー（列の欠落など）を再利用する
+        new_row_errors = empty
+        table_errors = state["table_errors"] if usable else empty
+
+    if usable and unchanged_keys:
+        previous_errors = state["row_errors"]
+        reused_errors = previous_errors[previous_errors[ERROR_KEY_COLUMN].map(_key).isin(unchanged_keys).to_numpy()]
+    else:
+        reused_errors = empty
+
+    row_errors = pd.concat(
+        [frame for frame in (reused_errors, new_row_errors) if not frame.empty] or [empty],
+        ignore_index=True,
+    )
+    _save_state(state_path, {
+        "reference": reference,
+        "columns": list(df.columns),
+        "fingerprints": fingerprints,
+        "row_errors": row_errors,
+        "table_errors": table_errors,
+    })
+
+    return _concat_results([table_errors, row_errors, date_results], result_columns)
+
+
+def _concat_results(frames: list, result_columns: list[str]) -> pd.DataFrame:
+    merged = [frame for frame in frames if frame is not None and not frame.empty]
+    if not merged:
+        return pd.DataFrame(columns=result_columns)
+    return pd.concat(merged, ignore_index=True)[result_columns]
@@ -1,183 +1,254 @@
-import pymysql
 import pandas as pd
-from datetime import datetime
-import tkinter as tk
-from tkinter import filedialog, messagebox
+# メッセージボックス・ファイル選択（ヘッドレス実行時は tkinter を使用しない）
+from dialogs import filedialog, hidden_root, messagebox
 import os
 import traceback # Import traceback for detailed error logging
+import logging
 import configparser
 import re
-import pyodbc
-
-# 共通モジュールからDB接続ヘルパー関数をインポート
-from common import (
-    _normalize_odbc_driver,
-    _enable_deprecated_tls_if_requested,
-    _build_sqlserver_conn_str,
-    get_config,
-)
 
 # 定数モジュールをインポート
 from constants import (
+    BikoKeyword,
     DealerCode,
     PaymentRoute,
     SeriesName,
 )
 
+# 実行単位で共有するテーブルのスナップショット
+from data_snapshot import (
+    T_SAL_MST,
+    T_STD_DATA,
+    fetch_table,
+)
+
+# 実行するチェックが参照する列だけを取得する
+from column_projection import MYSQL, SQLSERVER, required_columns, select_list
+
+# 分割取得（ストリーミング）
+from data_stream import iter_cursor_frames, streaming_chunk_size, validate_in_chunks
+
+# 参照データの並行取得
+from reference_prefetch import start_prefetch
+
+# 実行単位のDB接続プール
+from connection_pool import connect, mysql_driver
+
+# 取得したテーブルのディスクキャッシュ
+from table_cache import fetch_frame
+
+# 差分チェック
+from incremental import incremental_enabled, select_checks, validate_incrementally
+
+# 補助ファイル（商魂のCSV）の読み込みキャッシュ
+from aux_cache import read_aux_csv
+
+# 照合用の参照データの索引
+from reference_index import ReferenceIndex, column_index, normalized_text
+
+# 備考欄の正規化とキーワード判定
+from remarks import contains_keyword
+
+# 実行時点（as-of）と日付の変換
+from date_columns import parse_date, today, with_as_of
+
+# 大きなテーブルのプロセス並列チェック
+from sharding import validate_sharded
+
+# チェックごとの処理時間の計測
+from profiling import PHASE_AUX_LOAD, PHASE_FETCH, PHASE_REFERENCE, PHASE_VALIDATE, PhaseTimer, profiled_checks
+
+
+# INNOSiTEデータの取得列（チェックに関係なく取得する列と、チェックIDごとに参照する列）
+# チェックを追加・変更した場合は、参照する列をここにも登録してください。
+BASE_COLUMNS = ("stdid_i", "stdiinnoid")
+CHECK_COLUMNS = {
+    "INNOSITE_CHK_0001": (),
+    "INNOSITE_CHK_0002": ("stdidiscount", "stdipricetotal", "stdiKainsyu", "stdipccode"),
+    "INNOSITE_CHK_0003": (),
+    "INNOSITE_CHK_0004": ("stdisale1",),
+    "INNOSITE_CHK_0005": ("stdisale1",),
+    "INNOSITE_CHK_0006": ("stdisale1", "stdisale2"),
+    "INNOSITE_CHK_0007": ("stdisale1", "stdisale2"),
+    "INNOSITE_CHK_0008": ("stdisale1", "stdisale2"),
+    "INNOSITE_CHK_0009": ("stdikaiyaku", "stdisale1"),
+    "INNOSITE_CHK_0010": ("stdisale1", "stdiNsyu"),
+    "INNOSITE_CHK_0011": ("stdisale1", "stdiNsyu"),
+    "INNOSITE_CHK_0012": ("stdisale1", "stdiNsyu"),
+    "INNOSITE_CHK_0013": ("stdisale1", "stdiNsyu"),
+    "INNOSITE_CHK_0014": ("stdisale1", "stdiNsyu"),
+    "INNOSITE_CHK_0016": ("stdikaiyaku", "stdibiko1", "stdibiko2"),
+    "INNOSITE_CHK_0017": ("stdidicount", "stdiKainsyu"),
+    "INNOSITE_CHK_0020": ("stdikaiyaku", "stdiflg1"),
+    "INNOSITE_CHK_0021": ("stdiNsyu",),
+    "INNOSITE_CHK_0022": ("stdikaiyaku", "stdireyear1"),
+    "INNOSITE_CHK_0023": ("stdikaiyaku", "stdireyear1", "stdibiko2"),
+    "INNOSITE_CHK_0024": ("stdikaiyaku", "stdiacday", "stdireyear2"),
+    "INNOSITE_CHK_0025": ("stdikaiyaku", "stdiacday", "stdibiko2"),
+    "INNOSITE_CHK_0026": ("stdiremon", "stdikaiyaku"),
+    "INNOSITE_CHK_0027": ("stdiAcyear", "stdikaiyaku"),
+    "INNOSITE_CHK_0028": ("stdireyear1", "stdikaiyaku"),
+    "INNOSITE_CHK_0029": ("stdireyear2", "stdikaiyaku"),
+    "INNOSITE_CHK_0030": ("stdiKainsyu", "stdikaiyaku"),
+    "INNOSITE_CHK_0031": ("stdiremon", "stdikaiyaku"),
+    "INNOSITE_CHK_0033": ("stdikaiyaku", "stditselno"),
+    "INNOSITE_CHK_0034": ("stdisale1", "stdiNsyu", "stdiNotifyRenewalType", "stdikaiyaku", "stdibiko2"),
+    "INNOSITE_CHK_0039": ("stdikaiyaku", "stditselno"),
+    "INNOSITE_CHK_0040": ("stdikaiyaku", "stdisale1"),
+}
+
+# T_salMst の取得列（販売店マスタの辞書で参照する列）
+SALES_MASTER_COLUMNS = ("salCode", "salNotifyRenewal", "salJifuriDM")
+
 
 # INNOSiTEデータを取得
-def fetch_data():
+def fetch_data(check_ids=None):
+    """
+    t_stdidata と t_stdiproid を結合して取得する。
 
-    # MySQLへの接続
-    config = get_config()
-    db_config = config['KSMAIN2_MYSQL']
-
-    conn = pymysql.connect(
-        host=db_config['host'],
-        database=db_config['database'],
-        user=db_config['user'],
-        password=db_config['password'],
-        charset=db_config['charset'],
-    )
-    cursor = conn.cursor()
-    cursor.execute("SELECT t_stdidata.*, t_stdiproid.* FROM t_stdidata INNER JOIN t_stdiproid ON t_stdidata.stdiid = t_stdiproid.id_stdiid ORDER BY stdid_i ASC;")  # 任意のクエリ
-    
-    # カラム名を取得
-    columns = [desc[0] for desc in cursor.description]
-    data = cursor.fetchall()
-    conn.close()
+    Args:
+        check_ids: 実行するチェックIDの一覧（None の場合は全てのチェック）。
+            取得する列は、これらのチェックが参照する列に絞り込みます。
+    """
+    columns = required_columns(CHECK_COLUMNS, BASE_COLUMNS, check_ids)
 
-    # DataFrameに変換
-    df = pd.DataFrame(data, columns=columns)
+    # MySQLへの接続
+    with connect('KSMAIN2_MYSQL') as conn:
+        cursor = conn.cursor()
+        select_columns = select_list(
+            cursor, [("t_stdidata", "t_stdidata"), ("t_stdiproid", "t_stdiproid")], columns, MYSQL
+        )
+        # DataFrameに変換（テーブルキャッシュが有効な場合はキャッシュから読み込む）
+        df = fetch_frame('KSMAIN2_MYSQL', cursor, f"SELECT {select_columns} FROM t_stdidata INNER JOIN t_stdiproid ON t_stdidata.stdiid = t_stdiproid.id_stdiid ORDER BY stdid_i ASC;")
 
     return df
 
 # 営業データを取得
 def fetch_excluded_sales_data():
     # MySQLへの接続
-    config = get_config()
-    db_config = config['KSMAIN_MYSQL']
-
-    conn = pymysql.connect(
-        host=db_config['host'],
-        database=db_config['database'],
-        user=db_config['user'],
-        password=db_config['password'],
-        charset=db_config['charset'],
-    )
-    cursor = conn.cursor()
-    cursor.execute("SELECT salCode, salKName FROM t_salmst_k WHERE salKName LIKE '%×%' OR salKName LIKE '%・%';")
-    
-    # カラム名を取得
-    columns = [desc[0] for desc in cursor.description]
-    data = cursor.fetchall()
-    conn.close()
-
-    # DataFrameに変換
-    df = pd.DataFrame(data, columns=columns)
+    with connect('KSMAIN_MYSQL') as conn:
+        cursor = conn.cursor()
+        # DataFrameに変換（テーブルキャッシュが有効な場合はキャッシュから読み込む）
+        df = fetch_frame('KSMAIN_MYSQL', cursor, "SELECT salCode, salKName FROM t_salmst_k WHERE salKName LIKE '%×%' OR salKName LIKE '%・%';")
 
     return df
 
 # 倒産している販売店データ取得
 def fetch_bankrupt_shop_data():
     # MySQLへの接続
-    config = get_config()
-    db_config = config['KSMAIN_MYSQL']
-
-    conn = pymysql.connect(
-        host=db_config['host'],
-        database=db_config['database'],
-        user=db_config['user'],
-        password=db_config['password'],
-        charset=db_config['charset'],
-    )
-    cursor = conn.cursor()
-    cursor.execute("SELECT maiCode FROM t_stdmain_h WHERE maiName1 LIKE '%★%' OR maiName1 LIKE '%×%' OR maiName1 LIKE '%▲%';")
-    
-    # カラム名を取得
-    columns = [desc[0] for desc in cursor.description]
-    data = cursor.fetchall()
-    conn.close()
-
-    # DataFrameに変換
-    df = pd.DataFrame(data, columns=columns)
+    with connect('KSMAIN_MYSQL') as conn:
+        cursor = conn.cursor()
+        # DataFrameに変換（テーブルキャッシュが有効な場合はキャッシュから読み込む）
+        df = fetch_frame('KSMAIN_MYSQL', cursor, "SELECT maiCode FROM t_stdmain_h WHERE maiName1 LIKE '%★%' OR maiName1 LIKE '%×%' OR maiName1 LIKE '%▲%';")
 
     return df
 
+def iter_data(chunk_size, check_ids=None):
+    """
+    INNOSiTEデータを chunk_size 行ずつ取得し、DataFrameとして順に返す（ストリーミング）。
+
+    サーバーサイドカーソル（SSCursor）を使用するため、全件をメモリに読み込みません。
+    """
+    columns = required_columns(CHECK_COLUMNS, BASE_COLUMNS, check_ids)
+    with connect('KSMAIN2_MYSQL') as conn:
+        select_columns = select_list(
+            conn.cursor(), [("t_stdidata", "t_stdidata"), ("t_stdiproid", "t_stdiproid")], columns, MYSQL
+        )
+        cursor = conn.cursor(mysql_driver().cursors.SSCursor)
+        cursor.execute(f"SELECT {select_columns} FROM t_stdidata INNER JOIN t_stdiproid ON t_stdidata.stdiid = t_stdiproid.id_stdiid ORDER BY stdid_i ASC;")
+        yield from iter_cursor_frames(cursor, chunk_size)
+
 # 保守DBからデータを取得
 def fetch_hosyu_data():
-    config = get_config()
-    db_config = config['DEKISPART_MNT_DB']
-
-    conn_str = _build_sqlserver_conn_str(db_config)
-    conn = pyodbc.connect(conn_str)
-    cursor = conn.cursor()
-    cursor.execute("SELECT * FROM T_stdData")  # 任意のクエリ
-    #cursor.execute("SELECT TOP 1 * FROM T_stdData")  # 任意のクエリ
-    columns = [column[0] for column in cursor.description]  # カラム名を取得
-    data = cursor.fetchall()
-    conn.close()
-
-    # データが1列の場合、各行をリストに変換
-    data = [list(row) for row in data]  # 必要に応じて形状を修正
-
-    # DataFrameに変換
-    df = pd.DataFrame(data, columns=columns)
+    # T_stdData は DEKISPART / INNOSITE で共有する（同じ実行の中では1回だけ取得）
+    return fetch_table(T_STD_DATA, _fetch_std_data)
+
+def _fetch_std_data(columns=None):
+    with connect('DEKISPART_MNT_DB') as conn:
+        cursor = conn.cursor()
+        select_columns = select_list(cursor, [("T_stdData", None)], columns, SQLSERVER)
+        # DataFrameに変換（テーブルキャッシュが有効な場合はキャッシュから読み込む）
+        df = fetch_frame('DEKISPART_MNT_DB', cursor, f"SELECT {select_columns} FROM T_stdData")
     return df
 
 def get_sales_master_data():
-    config = get_config()
-    db_config = config['DEKISPART_MNT_DB']
-
-    conn_str = _build_sqlserver_conn_str(db_config)
-    conn = pyodbc.connect(conn_str)
-    cursor = conn.cursor()
-    cursor.execute("SELECT * FROM T_salMst")  # 任意のクエリ
-    columns = [column[0] for column in cursor.description]  # カラム名を取得
-    data = cursor.fetchall()
-    conn.close()
-
-    # データが1列の場合、各行をリストに変換
-    data = [list(row) for row in data]  # 必要に応じて形状を修正
-
-    # DataFrameに変換
-    df = pd.DataFrame(data, columns=columns)
+    # T_salMst は DEKISPART / INNOSITE で共有する（同じ実行の中では1回だけ取得）
+    return fetch_table(T_SAL_MST, lambda: _fetch_sales_master_data(SALES_MASTER_COLUMNS), SALES_MASTER_COLUMNS)
+
+def _fetch_sales_master_data(columns=None):
+    with connect('DEKISPART_MNT_DB') as conn:
+        cursor = conn.cursor()
+        select_columns = select_list(cursor, [("T_salMst", None)], columns, SQLSERVER)
+        # DataFrameに変換（テーブルキャッシュが有効な場合はキャッシュから読み込む）
+        df = fetch_frame('DEKISPART_MNT_DB', cursor, f"SELECT {select_columns} FROM T_salMst")
     return df
 
+# 保守DB(T_stdData)の参照マップで使用する列
+MAINTENANCE_ID_REFERENCE_COLUMNS = ["stdID", "stdAdd", "stdTselNo", "stdSale1"]
+# 参照マップをスナップショットで共有する際のキー
+MAINTENANCE_ID_REFERENCE = T_STD_DATA + ("maintenance_id_reference",)
+
+def _fetch_maintenance_id_reference_data():
+    """保守DBから参照マップの作成に必要な列だけを取得します。"""
+    # 同じ実行の中で T_stdData を取得済みの場合（列が足りる場合）はそれを使用する
+    return fetch_table(
+        T_STD_DATA,
+        lambda: _fetch_std_data(MAINTENANCE_ID_REFERENCE_COLUMNS),
+        MAINTENANCE_ID_REFERENCE_COLUMNS,
+    )
+
+def _stripped_text_list(series):
+    """str(値).strip() を列全体にまとめて適用し、リストで返します。"""
+    return pd.Series(series.to_numpy(dtype=object).astype(str), dtype=object).str.strip().tolist()
+
+def build_maintenance_id_reference_maps(hosyu_df=None):
+    """
+    保守DBから整理番号(stdID)をキーにした参照マップをまとめて作成します。
+
+    保守DBの取得は1回だけ行い、住所(stdAdd)・営業担当(stdTselNo)・販店1マスタ(stdSale1)の
+    3つのマップを作成します。キー・値はいずれも str(値).strip() で整形済みです。
+
+    Args:
+        hosyu_df (pd.DataFrame, optional): 保守DBのデータ。省略時はDBから取得します。
+
+    Returns:
+        dict: {"address": {...}, "sales_representative": {...}, "sale1": {...}}
+    """
+    if hosyu_df is None:
+        hosyu_df = _fetch_maintenance_id_reference_data()
+    maintenance_ids = _stripped_text_list(hosyu_df["stdID"])
+    return {
+        "address": dict(zip(maintenance_ids, _stripped_text_list(hosyu_df["stdAdd"]))),
+        "sales_representative": dict(zip(maintenance_ids, _stripped_text_list(hosyu_df["stdTselNo"]))),
+        "sale1": dict(zip(maintenance_ids, _stripped_text_list(hosyu_df["stdSale1"]))),
+    }
+
+def get_maintenance_id_reference_maps():
+    """整理番号の参照マップを返します（同じ実行の中では1回だけ作成します）。"""
+    return fetch_table(MAINTENANCE_ID_REFERENCE, build_maintenance_id_reference_maps)
+
 # 保守DB情報から整理番号、住所リストのマッピングリスト取得
-def get_maintenance_id_address_map():
+def get_maintenance_id_address_map(reference_maps=None):
     """
     保守DBから整理番号(stdID)と住所(stdAdd)のマップを取得します。
     キーはstdID、値は整形済みのstdAddです。
     """
-    hosyu_data_map = {}
-    # fetch_hosyu_dataの結果がDataFrameであることを前提としています。
-    for index, row_hosyu in fetch_hosyu_data().iterrows():
-        hosyu_data_map[str(row_hosyu["stdID"]).strip()] = str(row_hosyu["stdAdd"]).strip()
-    return hosyu_data_map
-    
+    return (reference_maps or get_maintenance_id_reference_maps())["address"]
+
 # 保守DB情報から整理番号、営業担当のマッピングリスト取得
-def get_maintenance_id_salses_representative_map():
+def get_maintenance_id_salses_representative_map(reference_maps=None):
     """
     保守DBから整理番号(stdID)営業担当()のマップを取得します。
     キーはstdID、値は整形済みの()です。
     """
-    hosyu_data_map = {}
-    # fetch_hosyu_dataの結果がDataFrameであることを前提としています。
-    for index, row_hosyu in fetch_hosyu_data().iterrows():
-        hosyu_data_map[str(row_hosyu["stdID"]).strip()] = str(row_hosyu["stdTselNo"]).strip()
-    return hosyu_data_map
+    return (reference_maps or get_maintenance_id_reference_maps())["sales_representative"]
 
-def get_maintenance_id_sale1_map():
+def get_maintenance_id_sale1_map(reference_maps=None):
     """
     保守DBから整理番号(stdID)と販店1マスタ(stdSale1)のマップを取得します。
     キーはstdID、値は整形済みのstdSale1です。
     """
-    hosyu_data_map = {}
-    # fetch_hosyu_dataの結果がDataFrameであることを前提としています。
-    for index, row_hosyu in fetch_hosyu_data().iterrows():
-        hosyu_data_map[str(row_hosyu["stdID"]).strip()] = str(row_hosyu["stdSale1"]).strip()
-    return hosyu_data_map
+    return (reference_maps or get_maintenance_id_reference_maps())["sale1"]
 
 # 担当者マスタ（商魂）を読み込む
 def load_sales_person_list_from_csv(file_path=None):
@@ -185,28 +256,24 @@ def load_sales_person_list_from_csv(file_path=None):
         # messagebox.showerror("エラー", f"担当者マスタファイルが見つからないか、パスが無効です: {file_path}")
         return [] # 空のリストを返す
 
-    encodings = ['cp932', 'shift_jis', 'utf-8', 'utf-8-sig']
     required_columns = ["担当者コード", "担当者名", "部門コード"]
-    for encoding in encodings:
-        try:
-            df = pd.read_csv(file_path, encoding=encoding, engine='python', on_bad_lines='skip')
-            if not all(col in df.columns for col in required_columns):
-                messagebox.showerror("ファイル読み込みエラー", f"担当者マスタファイル '{file_path}' に必要なカラム({', '.join(required_columns)})が不足しています。")
-                return []
-            sales_person_list = df[required_columns].to_dict(orient='records')
-            return sales_person_list
-        except UnicodeDecodeError:
-            continue
-        except Exception as e:
-            messagebox.showerror("ファイル読み込みエラー", f"担当者マスタファイルの読み込み中にエラーが発生しました: {e}")
+    try:
+        df = read_aux_csv(file_path, required_columns)
+        if not all(col in df.columns for col in required_columns):
+            messagebox.showerror("ファイル読み込みエラー", f"担当者マスタファイル '{file_path}' に必要なカラム({', '.join(required_columns)})が不足しています。")
             return []
-    messagebox.showerror("ファイル読み込みエラー", f"担当者マスタファイル '{file_path}' を適切なエンコーディングで読み込めませんでした。")
-    return []
+        sales_person_list = df[required_columns].to_dict(orient='records')
+        return sales_person_list
+    except UnicodeDecodeError:
+        messagebox.showerror("ファイル読み込みエラー", f"担当者マスタファイル '{file_path}' を適切なエンコーディングで読み込めませんでした。")
+        return []
+    except Exception as e:
+        messagebox.showerror("ファイル読み込みエラー", f"担当者マスタファイルの読み込み中にエラーが発生しました: {e}")
+        return []
 
 # 担当者マスタファイルを選択する
 def get_sales_person_list_file_path():
-    root = tk.Tk()
-    root.withdraw()  # ウィンドウを非表示にする
+    root = hidden_root()  # 非表示のウィンドウ
     file_path = filedialog.askopenfilename(title="担当者マスタを選択してください", filetypes=[("CSV Files", "*.csv")])
     return file_path
 
@@ -216,28 +283,24 @@ def load_customers_list_from_csv(file_path=None):
         # messagebox.showerror("エラー", f"得意先マスタファイルが見つからないか、パスが無効です: {file_path}")
         return [] # 空のリストを返す
 
-    encodings = ['cp932', 'shift_jis', 'utf-8', 'utf-8-sig']
     required_columns = ["得意先コード", "得意先名１", "使用区分"]
-    for encoding in encodings:
-        try:
-            df = pd.read_csv(file_path, encoding=encoding, engine='python', on_bad_lines='skip')
-            if not all(col in df.columns for col in required_columns):
-                messagebox.showerror("ファイル読み込みエラー", f"得意先マスタファイル '{file_path}' に必要なカラム({', '.join(required_columns)})が不足しています。")
-                return []
-            customers_list = df[required_columns].to_dict(orient='records')
-            return customers_list
-        except UnicodeDecodeError:
-            continue
-        except Exception as e:
-            messagebox.showerror("ファイル読み込みエラー", f"得意先マスタファイルの読み込み中にエラーが発生しました: {e}")
+    try:
+        df = read_aux_csv(file_path, required_columns)
+        if not all(col in df.columns for col in required_columns):
+            messagebox.showerror("ファイル読み込みエラー", f"得意先マスタファイル '{file_path}' に必要なカラム({', '.join(required_columns)})が不足しています。")
             return []
-    messagebox.showerror("ファイル読み込みエラー", f"得意先マスタファイル '{file_path}' を適切なエンコーディングで読み込めませんでした。")
-    return []
+        customers_list = df[required_columns].to_dict(orient='records')
+        return customers_list
+    except UnicodeDecodeError:
+        messagebox.showerror("ファイル読み込みエラー", f"得意先マスタファイル '{file_path}' を適切なエンコーディングで読み込めませんでした。")
+        return []
+    except Exception as e:
+        messagebox.showerror("ファイル読み込みエラー", f"得意先マスタファイルの読み込み中にエラーが発生しました: {e}")
+        return []
 
 # 得意先マスタファイルを選択する
 def get_customers_list_file_path():
-    root = tk.Tk()
-    root.withdraw()  # ウィンドウを非表示にする
+    root = hidden_root()  # 非表示のウィンドウ
     file_path = filedialog.askopenfilename(title="得意先マスタを選択してください", filetypes=[("CSV Files", "*.csv")])
     return file_path
 
@@ -382,9 +445,8 @@ def check_innosite_0014(row, errors_list):
 def check_innosite_0016(row, errors_list):
     """INNOSITE_CHK_0016: stdibiko1、stdibiko2に「補助金」を含む場合はNG（退会ユーザーのみ）"""
     if row.get("stdikaiyaku", False):
-        stdibiko1 = str(row.get("stdibiko1", "")).strip()
-        stdibiko2 = str(row.get("stdibiko2", "")).strip()
-        if "補助金" in stdibiko1 or "補助金" in stdibiko2:
+        if (contains_keyword(row.get("stdibiko1"), BikoKeyword.SUBSIDY)
+                or contains_keyword(row.get("stdibiko2"), BikoKeyword.SUBSIDY)):
             _add_error_message(errors_list, row["stdiinnoid"], "INNOSITE_CHK_0016", row.get("stdid_i", ""))
 
 def check_innosite_0017(row, errors_list):
@@ -412,8 +474,8 @@ def check_innosite_0022(row, errors_list):
     if not row.get("stdikaiyaku", False) and pd.notna(row.get("stdireyear1")):
         try:
             # PandasのTimestamp型かdatetimeオブジェクトか確認して処理
-            ireyear1_date = row["stdireyear1"].date() if isinstance(row["stdireyear1"], pd.Timestamp) else datetime.strptime(str(row["stdireyear1"]), "%Y-%m-%d").date()
-            if ireyear1_date < datetime.now().date():
+            ireyear1_date = parse_date(row["stdireyear1"]).date()
+            if ireyear1_date < today():
                 _add_error_message(errors_list, row["stdiinnoid"], "INNOSITE_CHK_0022", row.get("stdid_i", ""))
         except (ValueError, TypeError):
             # 日付形式が不正な場合や型が異なる場合のハンドリング
@@ -422,11 +484,11 @@ def check_innosite_0022(row, errors_list):
 def check_innosite_0023(row, errors_list):
     """INNOSITE_CHK_0023: stdikaiyakuがtrueの場合、stdireyear1が未来の日付になっていたらNG。ただし、stdibiko2に退会の文字があればOKとする"""
     if row.get("stdikaiyaku", False):
-        stdibiko2 = str(row.get("stdibiko2", "")).strip()
+        is_cancel_noted = contains_keyword(row.get("stdibiko2"), BikoKeyword.CANCEL)
         if pd.notna(row.get("stdireyear1")):
             try:
-                ireyear1_date = row["stdireyear1"].date() if isinstance(row["stdireyear1"], pd.Timestamp) else datetime.strptime(str(row["stdireyear1"]), "%Y-%m-%d").date()
-                if ireyear1_date > datetime.now().date() and "退会" not in stdibiko2:
+                ireyear1_date = parse_date(row["stdireyear1"]).date()
+                if ireyear1_date > today() and not is_cancel_noted:
                     _add_error_message(errors_list, row["stdiinnoid"], "INNOSITE_CHK_0023", row.get("stdid_i", ""))
             except (ValueError, TypeError):
                 _add_error_message(errors_list, row["stdiinnoid"], "INNOSITE_CHK_0023_DATE_ERROR", row.get("stdid_i", ""))
@@ -446,9 +508,9 @@ def check_innosite_0024(row, errors_list):
 
         try:
             # 加入日をパース
-            stdiacday_date = datetime.strptime(stdiacday_str, "%Y-%m-%d").date()
+            stdiacday_date = parse_date(stdiacday_str).date()
             # 会員期間開始日をパース
-            stdireyear2_date = datetime.strptime(stdireyear2_str, "%Y-%m-%d").date()
+            stdireyear2_date = parse_date(stdireyear2_str).date()
 
             # 加入日の翌月1日を計算
             # 加入日の月を1ヶ月進める
@@ -468,11 +530,11 @@ def check_innosite_0024(row, errors_list):
 def check_innosite_0025(row, errors_list):
     """INNOSITE_CHK_0025: stdikaiyakuがtrueの場合、stdiacdayが未来の日付になっていたらNG。ただし、stdibiko2に退会の文字があればOKとする"""
     if row.get("stdikaiyaku", False):
-        stdibiko2 = str(row.get("stdibiko2", "")).strip()
+        is_cancel_noted = contains_keyword(row.get("stdibiko2"), BikoKeyword.CANCEL)
         if pd.notna(row.get("stdiacday")):
             try:
-                stdiacday_date = row["stdiacday"].date() if isinstance(row["stdiacday"], pd.Timestamp) else datetime.strptime(str(row["stdiacday"]), "%Y-%m-%d").date()
-                if stdiacday_date > datetime.now().date() and "退会" not in stdibiko2:
+                stdiacday_date = parse_date(row["stdiacday"]).date()
+                if stdiacday_date > today() and not is_cancel_noted:
                     _add_error_message(errors_list, row["stdiinnoid"], "INNOSITE_CHK_0025", row.get("stdid_i", ""))
             except (ValueError, TypeError):
                 _add_error_message(errors_list, row["stdiinnoid"], "INNOSITE_CHK_0025_DATE_ERROR", row.get("stdid_i", ""))
@@ -544,7 +606,7 @@ def check_innosite_0034(row, errors_list, sales_master_dict):
 
     # stdibiko2 に「更新案内不要」の文字列が含まれていない
     # row.get("stdibiko2") が None または空文字列の場合も「含まない」と判断
-    is_ibiko2_not_containing_renewal = not (row.get("stdibiko2") and "更新案内不要" in str(row["stdibiko2"]))
+    is_ibiko2_not_containing_renewal = not contains_keyword(row.get("stdibiko2"), BikoKeyword.RENEWAL_NOT_NEEDED)
 
     # salNotifyRenewal が True であることを sales_master_dict から確認
     is_sal_notify_renewal_true = False
@@ -600,7 +662,7 @@ def check_innosite_0035(row, errors_list, sales_master_dict):
     is_active_contract = row.get("stdikaiyaku") is False # 解約されていない
 
     # stdibiko2 に「更新案内不要」の文字列が含まれている
-    is_ibiko2_containing_renewal = row.get("stdibiko2") and "更新案内不要" in str(row["stdibiko2"])
+    is_ibiko2_containing_renewal = contains_keyword(row.get("stdibiko2"), BikoKeyword.RENEWAL_NOT_NEEDED)
 
     # 全ての共通条件が満たされているか
     common_conditions_met = (
@@ -679,14 +741,11 @@ def check_innosite_0036(row, errors_list, sales_master_dict):
         return
 
     # -- NGパターンのチェック --
-    # stdibiko2 の内容を取得し、正規化
-    stdibiko2_text = str(row.get("stdibiko2", "")).lower().replace(' ', '').replace('　', '')
-
     # stdibiko2 に「自振DM不要」の文字列が含まれていない
-    is_ibiko2_not_containing_jifuri_dm = "自振dm不要" not in stdibiko2_text
+    is_ibiko2_not_containing_jifuri_dm = not contains_keyword(row.get("stdibiko2"), BikoKeyword.JIFURI_DM_NOT_NEEDED)
 
     # stdibiko2 に「更新案内不要」の文字列が含まれていない
-    is_ibiko2_not_containing_renewal = "更新案内不要" not in stdibiko2_text
+    is_ibiko2_not_containing_renewal = not contains_keyword(row.get("stdibiko2"), BikoKeyword.RENEWAL_NOT_NEEDED)
 
     # どちらか一方のNGパターン条件が満たされた場合にNG (ここを修正)
     if is_ibiko2_not_containing_jifuri_dm or is_ibiko2_not_containing_renewal:
@@ -708,7 +767,7 @@ def check_innosite_0037(row, errors_list, sales_master_dict):
     is_active_contract = row.get("stdikaiyaku") is False
 
     # stdibiko2 に「自振DM不要」の文字列が含まれている
-    is_ibiko2_containing_jifuri_dm = row.get("stdibiko2") and "自振DM不要" in str(row["stdibiko2"])
+    is_ibiko2_containing_jifuri_dm = contains_keyword(row.get("stdibiko2"), BikoKeyword.JIFURI_DM_NOT_NEEDED)
 
     is_stdi_nsyu_122 = row.get("stdiNsyu") == 122
     
@@ -758,7 +817,7 @@ def check_innosite_0038(row, errors_list, sales_master_dict):
     is_active_contract = row.get("stdikaiyaku") is False
 
     # stdibiko2 に「更新案内不要」の文字列が含まれている
-    is_ibiko2_containing_renewal = row.get("stdibiko2") and "更新案内不要" in str(row["stdibiko2"])
+    is_ibiko2_containing_renewal = contains_keyword(row.get("stdibiko2"), BikoKeyword.RENEWAL_NOT_NEEDED)
 
     is_stdi_nsyu_122 = row.get("stdiNsyu") == 122
     
@@ -818,37 +877,61 @@ def check_innosite_0040(row, errors_list, maintenance_id_sale1_map):
             if innosite_sale1 == dekisu_sale1:
                 _add_error_message(errors_list, row["stdiinnoid"], "INNOSITE_CHK_0040", row.get("stdid_i", ""))
 
+# 当日と比較するチェック（差分チェックでは前回のエラーを再利用せず、毎回全行でチェックする）
+DATE_DEPENDENT_CHECKS = frozenset({check_innosite_0022, check_innosite_0023, check_innosite_0025})
+
 # --- メインのバリデーション実行関数 ---
-def validate_data(df, progress_callback, totalnet_list, sales_person_list):
+def start_reference_prefetch():
     """
-    INNOSITEデータのバリデーションを実行します。
+    マスタデータ/設定の取得を並行に開始する。
 
-    Args:
-        df (pd.DataFrame): チェック対象のDataFrame。
-        progress_callback (callable, optional): 進捗を報告するためのコールバック関数。
-                                                 引数として進捗メッセージを受け取ります。
+    基幹データの取得前に呼び出すと、基幹データの取得と重ねて実行できます。
 
     Returns:
-        pd.DataFrame: エラーメッセージを含むDataFrame。エラーがない場合は空のDataFrame。
+        ReferencePrefetch: prepare_reference_data の prefetch に渡す取得中の参照データ
     """
-    all_errors = []
-    total_ids = len(df)
+    return start_prefetch(
+        {
+            "totalnet_list": load_totalnet_list_from_csv,
+            "excluded_sales": fetch_excluded_sales_data, # CHK_0034のロジックから未使用の可能性？
+            "bankrupt_shop": fetch_bankrupt_shop_data,
+            # 保守DBの参照マップは1回の取得でまとめて作成する
+            "maintenance_id_reference_maps": get_maintenance_id_reference_maps,
+            "sales_person_list": load_sales_person_list_from_csv,
+            "sales_master": get_sales_master_data,
+        },
+        label="INNOSITE",
+    )
+
+def prepare_reference_data(prefetch=None):
+    """
+    チェックで使用するマスタデータ/設定をまとめてロードします。
 
+    Args:
+        prefetch: start_reference_prefetch の結果（None の場合はここで取得を開始する）
+
+    Returns:
+        dict: validate_data の reference_data に渡す辞書
+    """
     print("--- マスタデータ/設定のロード ---")
-    # マスタデータ/設定のロードはループの外で一度だけ行う
-    totalnet_list = load_totalnet_list_from_csv()
-    excluded_sales_list = fetch_excluded_sales_data()["salCode"].tolist() # CHK_0034のロジックから未使用の可能性？
-    bankrupt_shop_data = fetch_bankrupt_shop_data()["maiCode"].tolist()
-    maintenance_id_address_map = get_maintenance_id_address_map()
-    maintenance_id_sales_representative_map = get_maintenance_id_salses_representative_map() # 未使用の可能性？
-    maintenance_id_sale1_map = get_maintenance_id_sale1_map()
-    sales_person_list = load_sales_person_list_from_csv()
+    # マスタデータ/設定のロードはループの外で一度だけ行う（各クエリは並行に実行する）
+    if prefetch is None:
+        prefetch = start_reference_prefetch()
+    # 行ごとに照合する参照データは索引（ハッシュ集合）にしておく
+    totalnet_list = column_index(prefetch.result("totalnet_list"), "顧客番号", key=normalized_text)
+    excluded_sales_list = column_index(prefetch.result("excluded_sales"), "salCode")
+    bankrupt_shop_data = column_index(prefetch.result("bankrupt_shop"), "maiCode")
+    maintenance_id_reference_maps = prefetch.result("maintenance_id_reference_maps")
+    maintenance_id_address_map = get_maintenance_id_address_map(maintenance_id_reference_maps)
+    maintenance_id_sales_representative_map = get_maintenance_id_salses_representative_map(maintenance_id_reference_maps) # 未使用の可能性？
+    maintenance_id_sale1_map = get_maintenance_id_sale1_map(maintenance_id_reference_maps)
+    sales_person_list = prefetch.result("sales_person_list")
     sales_person_dict = {
         str(person["担当者コード"]): person["担当者名"]
         for person in sales_person_list
         if "担当者コード" in person and "担当者名" in person
     }
-    sales_master_df = get_sales_master_data()
+    sales_master_df = prefetch.result("sales_master")
     sales_master_dict = {
         item["salCode"]: {
             "salNotifyRenewal": item.get("salNotifyRenewal", False), # キーが存在しない場合を考慮
@@ -856,8 +939,50 @@ def validate_data(df, progress_callback, totalnet_list, sales_person_list):
         }
         for item in sales_master_df.to_dict(orient="records")
     }
+    logging.info(prefetch.report())
     print("--- マスタデータ/設定のロード完了 ---")
 
+    return {
+        "totalnet_list": totalnet_list,
+        "excluded_sales_list": excluded_sales_list,
+        "bankrupt_shop_data": bankrupt_shop_data,
+        "maintenance_id_address_map": maintenance_id_address_map,
+        "maintenance_id_sales_representative_map": maintenance_id_sales_representative_map,
+        "maintenance_id_sale1_map": maintenance_id_sale1_map,
+        "sales_person_dict": sales_person_dict,
+        "sales_master_dict": sales_master_dict,
+    }
+
+@with_as_of
+def validate_data(df, progress_callback, totalnet_list, sales_person_list, reference_data=None, date_dependent=None):
+    """
+    INNOSITEデータのバリデーションを実行します。
+
+    Args:
+        df (pd.DataFrame): チェック対象のDataFrame。
+        progress_callback (callable, optional): 進捗を報告するためのコールバック関数。
+                                                 引数として進捗メッセージを受け取ります。
+        reference_data (dict, optional): prepare_reference_data の結果。
+                                         分割取得したチャンクごとに呼び出す場合に、ロード済みのデータを渡します。
+        date_dependent (bool, optional): True の場合は当日と比較するチェック（DATE_DEPENDENT_CHECKS）だけ、
+                                         False の場合はそれ以外のチェックだけを実行します（差分チェック用）。
+
+    Returns:
+        pd.DataFrame: エラーメッセージを含むDataFrame。エラーがない場合は空のDataFrame。
+    """
+    all_errors = []
+    total_ids = len(df)
+
+    if reference_data is None:
+        reference_data = prepare_reference_data()
+    totalnet_list = reference_data["totalnet_list"]
+    bankrupt_shop_data = reference_data["bankrupt_shop_data"]
+    maintenance_id_address_map = reference_data["maintenance_id_address_map"]
+    maintenance_id_sales_representative_map = reference_data["maintenance_id_sales_representative_map"]
+    maintenance_id_sale1_map = reference_data["maintenance_id_sale1_map"]
+    sales_person_dict = reference_data["sales_person_dict"]
+    sales_master_dict = reference_data["sales_master_dict"]
+
     # 全てのチェック関数をリストにまとめる
     # 特定のマスタデータに依存するチェックは、引数として渡す
     check_functions = [
@@ -869,7 +994,7 @@ def validate_data(df, progress_callback, totalnet_list, sales_person_list):
         check_innosite_0006,
         check_innosite_0007,
         lambda row, errors: check_innosite_0008(row, errors, maintenance_id_address_map), # マップを渡す
-        lambda row, errors: check_innosite_0009(row, errors, bankrupt_shop_data), # リストを渡す
+        lambda row, errors: check_innosite_0009(row, errors, bankrupt_shop_data), # 索引を渡す
         check_innosite_0010,
         check_innosite_0011,
         check_innosite_0012,
@@ -879,7 +1004,7 @@ def validate_data(df, progress_callback, totalnet_list, sales_person_list):
         check_innosite_0017,
         # CHK_0018, CHK_0019 はコメントアウトされているため含めません
         check_innosite_0020,
-        lambda row, errors: check_deposit_route_totalnet_for_ng(row, totalnet_list, errors), # totalnet_listを渡す
+        lambda row, errors: check_deposit_route_totalnet_for_ng(row, totalnet_list, errors), # トータルネット登録の索引を渡す
         check_innosite_0022,
         check_innosite_0023,
         check_innosite_0024,
@@ -896,6 +1021,9 @@ def validate_data(df, progress_callback, totalnet_list, sales_person_list):
         lambda row, errors: check_innosite_0039(row, errors, maintenance_id_sales_representative_map), # maintenance_id_sales_representative_mapを渡す
         lambda row, errors: check_innosite_0040(row, errors, maintenance_id_sale1_map), # maintenance_id_sale1_mapを渡す
     ]
+    check_functions = select_checks(check_functions, DATE_DEPENDENT_CHECKS, date_dependent)
+    # パフォーマンスレポート用にチェックごとの時間を計測する（計測しない場合はそのまま）
+    check_functions = profiled_checks("INNOSITE", check_functions)
 
     for index, row in df.iterrows():
         row_errors = [] # 各行のエラーを格納するリスト
@@ -940,35 +1068,32 @@ def load_totalnet_list_from_csv(file_path=None):
         # messagebox.showerror("エラー", f"トータルネット登録ファイルが見つからないか、パスが無効です: {file_path}")
         return pd.DataFrame(columns=["顧客番号"]) # 空のDataFrameを返す
 
-    encodings = ['cp932', 'shift_jis', 'utf-8', 'utf-8-sig']
-    for encoding in encodings:
-        try:
-            df = pd.read_csv(file_path, encoding=encoding, engine='python', on_bad_lines='skip')
-            # 必須カラムのチェック
-            if "顧客番号" in df.columns:
-                return df[["顧客番号"]] # DataFrameとして返す
-            else:
-                messagebox.showerror("ファイル読み込みエラー", f"トータルネット登録ファイル '{file_path}' に '顧客番号' カラムが見つかりません。")
-                return pd.DataFrame(columns=["顧客番号"])
-        except UnicodeDecodeError:
-            continue # 次のエンコーディングを試す
-        except Exception as e:
-            messagebox.showerror("ファイル読み込みエラー", f"トータルネット登録ファイルの読み込み中にエラーが発生しました: {e}")
+    try:
+        df = read_aux_csv(file_path, ["顧客番号"])
+        # 必須カラムのチェック
+        if "顧客番号" in df.columns:
+            return df[["顧客番号"]] # DataFrameとして返す
+        else:
+            messagebox.showerror("ファイル読み込みエラー", f"トータルネット登録ファイル '{file_path}' に '顧客番号' カラムが見つかりません。")
             return pd.DataFrame(columns=["顧客番号"])
-    messagebox.showerror("ファイル読み込みエラー", f"トータルネット登録ファイル '{file_path}' を適切なエンコーディングで読み込めませんでした。")
-    return pd.DataFrame(columns=["顧客番号"])
+    except UnicodeDecodeError:
+        messagebox.showerror("ファイル読み込みエラー", f"トータルネット登録ファイル '{file_path}' を適切なエンコーディングで読み込めませんでした。")
+        return pd.DataFrame(columns=["顧客番号"])
+    except Exception as e:
+        messagebox.showerror("ファイル読み込みエラー", f"トータルネット登録ファイルの読み込み中にエラーが発生しました: {e}")
+        return pd.DataFrame(columns=["顧客番号"])
 
 # トータルネットファイルを選択する
 def get_totalnet_file_path():
-    root = tk.Tk()
-    root.withdraw()  # ウィンドウを非表示にする
+    root = hidden_root()  # 非表示のウィンドウ
     file_path = filedialog.askopenfilename(title="トータルネット登録ファイルを選択してください", filetypes=[("CSV Files", "*.csv")])
     return file_path
 
 # CHK_0021 stdNsyu(入金経路)が121の場合にトータルネットに登録がなければNG
-def check_deposit_route_totalnet_for_ng(row: dict, keywords: list, error_messages: list):
+# keywords はトータルネット登録の顧客番号の索引（前後の空白を除いた文字列）
+def check_deposit_route_totalnet_for_ng(row: dict, keywords: ReferenceIndex, error_messages: list):
     if row["stdiNsyu"] == 121:
-        if row["stdid_i"] not in keywords:
+        if normalized_text(row["stdid_i"]) not in keywords:
             error_messages.append({
                     "シリーズ": "INNOSITE",
                     "ユーザID": row["stdiinnoid"],
@@ -976,11 +1101,20 @@ def check_deposit_route_totalnet_for_ng(row: dict, keywords: list, error_message
                 })
 
 # main_checker_app.py から呼び出されるエントリポイント
-def run_innosite_check(progress_callback=None, aux_paths=None):
+@with_as_of
+def run_innosite_check(progress_callback=None, aux_paths=None, chunk_size=None):
+    """
+    INNOSITEのデータチェックを実行する。
+
+    chunk_size（省略時は config.ini の [STREAMING]）が1以上の場合は、INNOSiTEデータを
+    chunk_size 行ずつ取得してチェックする（ストリーミング）。
+    """
+    phases = PhaseTimer("INNOSITE")
     try:
         errors = []
         if progress_callback:
             progress_callback("DEKISPART: 補助ファイルを読み込み中...")
+        phases.start(PHASE_AUX_LOAD)
 
         # 補助ファイルの読み込み
         totalnet_df = load_totalnet_list_from_csv(aux_paths.get("totalnet_list_path"))
@@ -1005,20 +1139,75 @@ def run_innosite_check(progress_callback=None, aux_paths=None):
 
         if progress_callback:
             progress_callback("INNOSITE: 基幹データを取得中...")
-
-        df = fetch_data()
-
-        if df.empty:
-            errors.append({"シリーズ": "INNOSITE", "ユーザID": "N/A", "保守整理番号": "", "エラー内容": "基幹データが取得できませんでした。"})
-            return pd.DataFrame(errors, columns=["シリーズ", "ユーザID", "保守整理番号", "エラー内容"])
-
-        if progress_callback:
-            progress_callback("INNOSITE: データチェックを実行中...")
-
-        # validate_data関数に、読み込んだ補助リストを渡す
-        validation_results_df = validate_data(df, progress_callback,
-                                             totalnet_df, 
-                                             sales_person_list)
+        phases.start(PHASE_FETCH)
+
+        # マスタデータ/設定の取得を先に開始し、基幹データの取得と並行に実行する
+        prefetch = start_reference_prefetch()
+
+        chunk_size = streaming_chunk_size(chunk_size)
+        if chunk_size:
+            # INNOSITE にはテーブル全体を参照するチェックが無いため、事前取得はマスタデータのみ
+            phases.start(PHASE_REFERENCE)
+            reference_data = prepare_reference_data(prefetch)
+            checked_rows = []
+
+            def validate_chunk(chunk):
+                checked_rows.append(len(chunk))
+                return validate_data(chunk, None, totalnet_df, sales_person_list, reference_data=reference_data)
+
+            if progress_callback:
+                progress_callback("INNOSITE: データチェックを実行中...")
+            # 取得とチェックを交互に行うため、取得の時間もチェックに含まれる
+            phases.start(PHASE_VALIDATE)
+            validation_results_df = validate_in_chunks(
+                iter_data(chunk_size),
+                validate_chunk,
+                ["シリーズ", "ユーザID", "保守整理番号", "チェックID"],
+                progress_callback, "INNOSITE",
+            )
+            if not checked_rows:
+                errors.append({"シリーズ": "INNOSITE", "ユーザID": "N/A", "保守整理番号": "", "エラー内容": "基幹データが取得できませんでした。"})
+                return pd.DataFrame(errors, columns=["シリーズ", "ユーザID", "保守整理番号", "エラー内容"])
+        else:
+            df = fetch_data()
+
+            if df.empty:
+                errors.append({"シリーズ": "INNOSITE", "ユーザID": "N/A", "保守整理番号": "", "エラー内容": "基幹データが取得できませんでした。"})
+                return pd.DataFrame(errors, columns=["シリーズ", "ユーザID", "保守整理番号", "エラー内容"])
+
+            if progress_callback:
+                progress_callback("INNOSITE: データチェックを実行中...")
+
+            phases.start(PHASE_REFERENCE)
+            reference_data = prepare_reference_data(prefetch)
+            # validate_data関数に、読み込んだ補助リストを渡す
+            validate_kwargs = {
+                "totalnet_list": totalnet_df,
+                "sales_person_list": sales_person_list,
+                "reference_data": reference_data,
+            }
+            result_columns = ["シリーズ", "ユーザID", "保守整理番号", "チェックID"]
+            phases.start(PHASE_VALIDATE)
+            if incremental_enabled():
+                # 前回の実行から変更された行だけをチェックし、変更の無い行は前回のエラーを再利用する
+                # 当日と比較するチェックは、日付が変わると結果が変わるため毎回全行で実行する
+                validation_results_df = validate_incrementally(
+                    "INNOSITE", df, "stdid_i",
+                    lambda rows: validate_sharded(rows, validate_data, result_columns,
+                                                  {**validate_kwargs, "date_dependent": False},
+                                                  progress_label="INNOSITE"),
+                    result_columns,
+                    [reference_data, totalnet_df, sales_person_list],
+                    progress_callback,
+                    validate_date_checks=lambda rows: validate_sharded(rows, validate_data, result_columns,
+                                                                       {**validate_kwargs, "date_dependent": True},
+                                                                       progress_label="INNOSITE"),
+                )
+            else:
+                # 行数が多い場合は複数のプロセスでチェックする（config.ini の [SHARDING]）
+                validation_results_df = validate_sharded(df, validate_data, result_columns, validate_kwargs,
+                                                         progress_callback=progress_callback,
+                                                         progress_label="INNOSITE")
 
         if validation_results_df.empty:
             return pd.DataFrame(columns=["シリーズ", "ユーザID", "保守整理番号", "チェックID"])
@@ -1038,6 +1227,8 @@ def run_innosite_check(progress_callback=None, aux_paths=None):
             "保守整理番号": "",
             "エラー内容": f"処理中にエラーが発生しました: {e}"
         }], columns=["シリーズ", "ユーザID", "保守整理番号", "エラー内容"])
+    finally:
+        phases.stop()
 
 # メイン処理
 def main():
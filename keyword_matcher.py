@@ -0,0 +1,115 @@
+"""
+複数キーワードの一括照合（Aho–Corasick 法）
+
+DEKISPART_CHK_0010 の個人名チェックのように、多数のキーワードのいずれかが文字列に
+含まれるかを判定するチェックでは、キーワードごとに部分一致を調べると
+「行数 × キーワード数」の検索になり、キーワードが増えるほど遅くなります。
+KeywordMatcher はキーワード全体から一度だけオートマトンを作成し、
+各文字列を1回走査するだけで判定します。
+
+列全体を判定する場合（contains）は、同じ値を1回だけ走査します。
+pyahocorasick がインストールされている場合はそれを使用し、無い場合は
+同じアルゴリズムの Python 実装を使用します（結果は同じです）。
+"""
+
+from collections import deque
+from typing import Iterable
+
+import numpy as np
+import pandas as pd
+
+try:
+    import ahocorasick
+except ImportError:  # 任意の依存パッケージ
+    ahocorasick = None
+
+
+class KeywordMatcher:
+    """
+    キーワードのいずれかを含むかを判定するオートマトン（作成後は変更しない）。
+
+    Args:
+        keywords: キーワード（重複は除く。空文字を含む場合は全ての文字列が一致する）
+    """
+
+    def __init__(self, keywords: Iterable[str]):
+        self.keywords = tuple(dict.fromkeys(str(keyword) for keyword in keywords))
+        # `"" in text` は常に True のため、空文字のキーワードがあれば全て一致とする
+        self._match_all = "" in self.keywords
+        patterns = [keyword for keyword in self.keywords if keyword]
+        self._automaton = None
+        if ahocorasick is not None and patterns:
+            self._automaton = ahocorasick.Automaton()
+            for keyword in patterns:
+                self._automaton.add_word(keyword, keyword)
+            self._automaton.make_automaton()
+        else:
+            self._build(patterns)
+
+    def _build(self, patterns: list[str]) -> None:
+        # 状態0が根。_goto[状態][文字] -> 次の状態、_fail[状態] -> 失敗時の遷移先
+        self._goto = [{}]
+        self._terminal = [False]
+        for keyword in patterns:
+            state = 0
+            for char in keyword:
+                next_state = self._goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto[state][char] = next_state
+                    self._goto.append({})
+                    self._terminal.append(False)
+                state = next_state
+            self._terminal[state] = True
+
+        self._fail = [0] * len(self._goto)
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[next_state] = self._goto[fail].get(char, 0)
+                # 失敗時の遷移先で終わるキーワードも、この状態で見つかったものとする
+                self._terminal[next_state] = self._terminal[next_state] or self._terminal[self._fail[next_state]]
+                queue.append(next_state)
+
+    def search(self, text: str) -> bool:
+        """text がキーワードのいずれかを含むかを返す。"""
+        if self._match_all:
+            return True
+        if self._automaton is not None:
+            for _ in self._automaton.iter(text):
+                return True
+            return False
+        if len(self._goto) == 1:
+            return False
+
+        goto, fail, terminal = self._goto, self._fail, self._terminal
+        state = 0
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if terminal[state]:
+                return True
+        return False
+
+    def contains(self, values: pd.Series) -> pd.Series:
+        """
+        列の各値がキーワードのいずれかを含むかを返す（同じ値は1回だけ走査する）。
+
+        文字列以外の値（None・NaN など）は一致しないものとします。
+
+        Returns:
+            values と同じ index の bool の Series
+        """
+        codes, uniques = pd.factorize(values, use_na_sentinel=True)
+        found = np.fromiter(
+            (isinstance(value, str) and self.search(value) for value in uniques),
+            dtype=bool, count=len(uniques),
+        )
+        # 欠損値（コード -1）は一致しない
+        result = np.append(found, False)[codes]
+        return pd.Series(result, index=values.index)
@@ -0,0 +1,328 @@
+"""
+チェックごとの処理時間の計測（パフォーマンスレポート）
+
+1回のチェック実行（GUIで選択したシリーズの一括実行・ヘッドレス実行）の間、次の値を集計し、
+終了時に application.log と同じディレクトリの performance_report.json に書き出します。
+
+- チェックごとの累計時間・呼び出し回数・出力したエラー件数・発生した例外の件数
+  （行単位のチェックは1行ごとの呼び出し、列単位のチェックはマスクの評価1回を1回と数えます）
+- シリーズごとの処理段階（補助ファイルの読み込み・基幹データの取得・参照データの作成・チェック）の時間
+- 結果の書き出しの時間
+
+計測すると行単位のチェックは1行ごとに時間を記録するため、行単位のエンジンでは処理時間が
+1割程度（2万行の合成データで7〜12%）増えます。このため既定では計測せず、画面の「パフォーマンス」タブの
+「処理時間を計測する」、ヘッドレス実行の --profile、または config.ini で有効にした場合だけ計測します。
+計測が開始されていない場合（各モジュールの単体実行など）は、チェック関数をそのまま使用するため
+処理時間は変わりません。シャーディングしたチェックは、各ワーカープロセスの時間を合計します。
+ストリーミング（分割取得）では取得とチェックを交互に行うため、取得の時間もチェックに含まれます。
+
+config.ini の例（常に計測する場合）:
+
+    [PROFILING]
+    enabled = true
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Callable, Iterable, Optional
+
+from common import LOG_FILE_PATH, get_config
+
+
+logger = logging.getLogger(__name__)
+
+PROFILING_SECTION = "PROFILING"
+REPORT_PATH = os.path.join(os.path.dirname(LOG_FILE_PATH), "performance_report.json")
+
+# 処理段階
+PHASE_AUX_LOAD = "aux_load"
+PHASE_FETCH = "fetch"
+PHASE_REFERENCE = "reference"
+PHASE_VALIDATE = "validate"
+PHASE_EXPORT = "export"
+PHASE_LABELS = {
+    PHASE_AUX_LOAD: "補助ファイルの読み込み",
+    PHASE_FETCH: "基幹データの取得",
+    PHASE_REFERENCE: "参照データの作成",
+    PHASE_VALIDATE: "チェック",
+    PHASE_EXPORT: "結果の書き出し",
+}
+
+# シリーズに属さない処理（結果の書き出しなど）のシリーズ名
+RUN_SCOPE = "全体"
+
+
+class Profile:
+    """1回のチェック実行の計測結果を保持するクラス。"""
+
+    def __init__(self):
+        self.started_at = datetime.now()
+        self._started = time.perf_counter()
+        self.wall_seconds: Optional[float] = None
+        # (シリーズ, チェック名) -> [累計時間, 呼び出し回数, エラー件数, 例外件数]
+        self._checks: dict[tuple, list] = {}
+        # (シリーズ, 処理段階) -> [累計時間, 回数]
+        self._phases: dict[tuple, list] = {}
+        self._lock = threading.Lock()
+
+    def check_stats(self, series: str, check: str) -> list:
+        """チェックの集計値のリストを返す（無い場合は作成する）。"""
+        key = (series, check)
+        stats = self._checks.get(key)
+        if stats is None:
+            with self._lock:
+                stats = self._checks.setdefault(key, [0.0, 0, 0, 0])
+        return stats
+
+    def add_check(self, series: str, check: str, seconds: float, calls: int = 1, errors: int = 0, exceptions: int = 0) -> None:
+        stats = self.check_stats(series, check)
+        with self._lock:
+            stats[0] += seconds
+            stats[1] += calls
+            stats[2] += errors
+            stats[3] += exceptions
+
+    def add_phase(self, series: str, phase: str, seconds: float) -> None:
+        with self._lock:
+            stats = self._phases.setdefault((series, phase), [0.0, 0])
+            stats[0] += seconds
+            stats[1] += 1
+
+    def finish(self) -> None:
+        self.wall_seconds = time.perf_counter() - self._started
+
+    def export_stats(self) -> dict:
+        """ワーカープロセスから送るための集計値（merge で合算する）。"""
+        with self._lock:
+            return {
+                "checks": {key: list(stats) for key, stats in self._checks.items()},
+                "phases": {key: list(stats) for key, stats in self._phases.items()},
+            }
+
+    def merge(self, exported: dict) -> None:
+        """export_stats の結果を合算する。"""
+        for (series, check), (seconds, calls, errors, exceptions) in exported["checks"].items():
+            self.add_check(series, check, seconds, calls, errors, exceptions)
+        for (series, phase), (seconds, count) in exported["phases"].items():
+            with self._lock:
+                stats = self._phases.setdefault((series, phase), [0.0, 0])
+                stats[0] += seconds
+                stats[1] += count
+
+    def to_dict(self) -> dict:
+        """JSON に書き出す形式（チェック・処理段階とも時間の長い順）。"""
+        with self._lock:
+            checks = [
+                {"series": series, "check": check, "seconds": round(seconds, 6), "calls": calls,
+                 "errors": errors, "exceptions": exceptions}
+                for (series, check), (seconds, calls, errors, exceptions) in self._checks.items()
+            ]
+            phases = [
+                {"series": series, "phase": phase, "seconds": round(seconds, 6), "count": count}
+                for (series, phase), (seconds, count) in self._phases.items()
+            ]
+        checks.sort(key=lambda item: item["seconds"], reverse=True)
+        phases.sort(key=lambda item: item["seconds"], reverse=True)
+        return {
+            "started_at": self.started_at.isoformat(timespec="seconds"),
+            "wall_seconds": None if self.wall_seconds is None else round(self.wall_seconds, 6),
+            "phases": phases,
+            "checks": checks,
+        }
+
+
+# 実行中の計測（並行に実行した全シリーズのチェック時間を1つのレポートにまとめる）
+_current_profile: Optional[Profile] = None
+_last_profile: Optional[Profile] = None
+_current_lock = threading.Lock()
+
+
+def profiling_enabled() -> bool:
+    """config.ini の [PROFILING] で計測が有効になっているかを返す（既定: 無効）。"""
+    config = get_config()
+    if not config.has_section(PROFILING_SECTION):
+        return False
+    try:
+        return config[PROFILING_SECTION].getboolean("enabled", fallback=False)
+    except ValueError as e:
+        logger.warning(f"[{PROFILING_SECTION}] の設定が不正なため計測しません: {e}")
+        return False
+
+
+def current_profile() -> Optional[Profile]:
+    """実行中の計測を返す（無い場合は None）。"""
+    return _current_profile
+
+
+def last_profile() -> Optional[Profile]:
+    """最後に終了した計測を返す（無い場合は None）。"""
+    return _last_profile
+
+
+@contextmanager
+def profile_run(enabled: Optional[bool] = None, write_report_file: bool = True):
+    """
+    with ブロックの間、チェックと処理段階の時間を計測する。
+
+    終了時にレポートを REPORT_PATH に書き出します。
+
+    Args:
+        enabled: 計測するかどうか（None の場合は config.ini の [PROFILING] を使用）
+        write_report_file: False の場合はレポートを書き出さない（ワーカープロセスなど）
+    """
+    global _current_profile, _last_profile
+    if enabled is None:
+        enabled = profiling_enabled()
+    if not enabled:
+        # 計測しない実行の書き出し時間を、以前の実行の計測に追加しないようにする
+        with _current_lock:
+            if _current_profile is None:
+                _last_profile = None
+        yield None
+        return
+
+    profile = Profile()
+    with _current_lock:
+        previous = _current_profile
+        _current_profile = profile
+    try:
+        yield profile
+    finally:
+        profile.finish()
+        with _current_lock:
+            _current_profile = previous
+            _last_profile = profile
+        if write_report_file:
+            write_report(profile)
+
+
+def write_report(profile: Profile, path: Optional[str] = None) -> None:
+    """レポートを JSON で書き出す（path の既定は REPORT_PATH。失敗してもチェックの結果には影響させない）。"""
+    path = path or REPORT_PATH
+    tmp_path = path + ".tmp"
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(profile.to_dict(), f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, path)
+        logger.info(f"パフォーマンスレポートを {path} に書き出しました")
+    except OSError as e:
+        logger.warning(f"パフォーマンスレポートを書き出せませんでした: {e}")
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def read_report(path: Optional[str] = None) -> Optional[dict]:
+    """書き出したレポートを読み込む（path の既定は REPORT_PATH。無い場合は None）。"""
+    path = path or REPORT_PATH
+    if not os.path.exists(path):
+        return None
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def check_name(check_func: Callable) -> str:
+    """
+    チェック関数の表示名を返す。
+
+    参照データを渡すための lambda（lambda row, errors: check_xxx(row, errors, ...)）は、
+    呼び出しているチェック関数の名前にする。
+    """
+    name = getattr(check_func, "__name__", None) or repr(check_func)
+    if name == "<lambda>":
+        code = getattr(check_func, "__code__", None)
+        if code is not None and code.co_names:
+            return code.co_names[0]
+    return name
+
+
+def profiled_check(series: str, check: str, check_func: Callable) -> Callable:
+    """
+    行単位のチェック関数 check_func(row, errors) を、計測しながら実行する関数にして返す。
+
+    計測が開始されていない場合は check_func をそのまま返す。例外は記録してからそのまま送出する。
+    """
+    profile = _current_profile
+    if profile is None:
+        return check_func
+    stats = profile.check_stats(series, check)
+    perf_counter = time.perf_counter
+
+    def run(row, errors):
+        count = len(errors)
+        started = perf_counter()
+        try:
+            check_func(row, errors)
+        except Exception:
+            stats[3] += 1
+            raise
+        finally:
+            stats[0] += perf_counter() - started
+            stats[1] += 1
+            stats[2] += len(errors) - count
+
+    # 例外をエラー行にする際に関数名を使用するため、元の関数の名前を引き継ぐ
+    run.__name__ = getattr(check_func, "__name__", run.__name__)
+    return run
+
+
+def profiled_checks(series: str, check_functions: Iterable[Callable]) -> list:
+    """check_functions の各関数に profiled_check を適用したリストを返す（名前は check_name）。"""
+    if _current_profile is None:
+        return list(check_functions)
+    return [profiled_check(series, check_name(func), func) for func in check_functions]
+
+
+def record_check(series: str, check: str, seconds: float, calls: int = 1, errors: int = 0, exceptions: int = 0) -> None:
+    """列単位で評価したチェックなど、まとめて計測した時間を記録する。"""
+    profile = _current_profile
+    if profile is not None:
+        profile.add_check(series, check, seconds, calls, errors, exceptions)
+
+
+class PhaseTimer:
+    """
+    シリーズの処理段階の時間を計測するクラス。
+
+    start で次の段階を開始すると、実行中の段階は終了します。途中で return する処理でも
+    計測が残らないよう、最後に stop を呼び出してください（try / finally など）。
+    """
+
+    def __init__(self, series: str):
+        self.series = series
+        self._profile = _current_profile
+        self._phase: Optional[str] = None
+        self._started = 0.0
+
+    def start(self, phase: str) -> None:
+        self.stop()
+        if self._profile is not None:
+            self._phase = phase
+            self._started = time.perf_counter()
+
+    def stop(self) -> None:
+        if self._phase is not None:
+            self._profile.add_phase(self.series, self._phase, time.perf_counter() - self._started)
+            self._phase = None
+
+
+@contextmanager
+def export_phase():
+    """
+    結果の書き出しの時間を、直前の実行の計測に追加してレポートを書き直す。
+
+    書き出しはチェックの実行が終わった後に行うため、profile_run の外側で使用します。
+    """
+    profile = _current_profile or _last_profile
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        if profile is not None:
+            profile.add_phase(RUN_SCOPE, PHASE_EXPORT, time.perf_counter() - started)
+            if profile is not _current_profile:
+                write_report(profile)
@@ -0,0 +1,71 @@
+"""
+照合用の参照データ（対象外営業リスト・倒産販売店・トータルネット登録など）の索引
+
+チェックの中には、参照データのリストや DataFrame に対して行ごとに `in` で照合するものがあり、
+リストの長さに比例して遅くなっていました（DataFrame に対する `in` は列名との照合になるため誤りでもあります）。
+参照データは実行ごとに一度だけ ReferenceIndex（不変のハッシュ集合）にして、各チェックに渡します。
+
+- 行単位のチェック: `value in index`（O(1)）
+- 列単位のチェック（マスク）: `index.isin(series)`（作成済みのハッシュ表を使い回してベクトル化して判定）
+
+ReferenceIndex は frozenset のサブクラスのため、集合として比較・反復でき、
+差分チェックの参照データのフィンガープリントにもそのまま使用できます。
+"""
+
+from typing import Any, Callable, Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+
+def normalized_text(value: Any) -> str:
+    """値を前後の空白を除いた文字列にする（コードを文字列として照合する場合の正規化）。"""
+    return str(value).strip()
+
+
+def _is_missing(value: Any) -> bool:
+    return value is None or (not isinstance(value, str) and pd.isna(value))
+
+
+class ReferenceIndex(frozenset):
+    """
+    照合用の参照データ（作成後は変更しない）。
+
+    Args:
+        values: 参照データの値（list・set・Series など。None・NaN は含めない）
+        key: 値を正規化する関数（例: normalized_text）。照合する側の値も同じ関数で正規化してください。
+    """
+
+    def __new__(cls, values: Iterable = (), key: Optional[Callable[[Any], Any]] = None):
+        if isinstance(values, (pd.Series, pd.Index)):
+            values = values.tolist()
+        items = (value for value in values if not _is_missing(value))
+        if key is not None:
+            items = (key(value) for value in items)
+        return super().__new__(cls, items)
+
+    def _lookup_index(self) -> pd.Index:
+        # 作成は初回の isin のみ（同じ索引を複数のチャンク・チェックで使い回す）
+        index = self.__dict__.get("_index")
+        if index is None:
+            index = self._index = pd.Index(list(self), dtype=object)
+        return index
+
+    def isin(self, values) -> pd.Series:
+        """
+        values の各要素が参照データに含まれるかを返す。
+
+        Returns:
+            values が Series の場合は同じ index の bool の Series、それ以外は bool の配列
+        """
+        found = self._lookup_index().get_indexer(values) >= 0
+        if isinstance(values, pd.Series):
+            return pd.Series(found, index=values.index)
+        return np.asarray(found)
+
+
+def column_index(df: Optional[pd.DataFrame], column: str, key: Optional[Callable[[Any], Any]] = None) -> ReferenceIndex:
+    """DataFrame の列から索引を作成する（df が None・空・列が無い場合は空の索引）。"""
+    if df is None or df.empty or column not in df.columns:
+        return ReferenceIndex()
+    return ReferenceIndex(df[column], key=key)
@@ -0,0 +1,99 @@
+"""
+参照データの並行取得（プリフェッチ）
+
+各シリーズのチェックでは、基幹データ（T_stdData など）の他に、販売店マスタや
+別DBの参照用テーブルなど、互いに依存しない複数のクエリを実行します。
+これらを順番に実行すると、処理時間は各クエリの応答待ちの合計になります。
+
+start_prefetch で全てのクエリをスレッドで同時に開始し、基幹データの取得と並行して
+実行することで、処理時間を最も遅いクエリの応答時間に近づけます。
+クエリごとの所要時間はログに出力し、latencies() / report() で確認できます。
+"""
+
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+
+logger = logging.getLogger(__name__)
+
+# 同時に実行するクエリ数の既定値
+DEFAULT_MAX_WORKERS = 8
+
+
+class ReferencePrefetch:
+    """
+    並行に取得中の参照データを保持するクラス。
+
+    result(name) は取得が完了するまで待ってから結果を返します。
+    取得中に発生した例外は result(name) の呼び出し時に送出します。
+    """
+
+    def __init__(
+        self,
+        loaders: dict,
+        max_workers: Optional[int] = None,
+        label: str = "",
+    ):
+        """
+        Args:
+            loaders: {参照データ名: 取得する関数}
+            max_workers: 同時に実行するクエリ数（None の場合は DEFAULT_MAX_WORKERS）
+            label: ログに出力するシリーズ名
+        """
+        self.label = label
+        self._latencies = {}
+        self._lock = threading.Lock()
+        workers = max(1, min(max_workers or DEFAULT_MAX_WORKERS, len(loaders) or 1))
+        executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="prefetch")
+        self._futures = {
+            name: executor.submit(self._timed, name, loader) for name, loader in loaders.items()
+        }
+        # 登録したクエリの完了後にスレッドを終了する（ここでは完了を待たない）
+        executor.shutdown(wait=False)
+
+    def _timed(self, name: str, loader: Callable[[], Any]) -> Any:
+        start = time.perf_counter()
+        try:
+            return loader()
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                self._latencies[name] = elapsed
+            logger.info(f"{self.label} 参照データ取得 {name}: {elapsed:.2f}秒")
+
+    def result(self, name: str) -> Any:
+        """参照データを返す（取得中の場合は完了を待つ）。"""
+        return self._futures[name].result()
+
+    def results(self) -> dict:
+        """全ての参照データを {参照データ名: 結果} で返す（全ての取得の完了を待つ）。"""
+        return {name: future.result() for name, future in self._futures.items()}
+
+    def latencies(self) -> dict:
+        """完了したクエリの所要時間（秒）を、時間のかかった順に返す。"""
+        with self._lock:
+            return dict(sorted(self._latencies.items(), key=lambda item: item[1], reverse=True))
+
+    def report(self) -> str:
+        """クエリごとの所要時間を1行の文字列で返す。"""
+        latencies = self.latencies()
+        details = ", ".join(f"{name} {elapsed:.2f}秒" for name, elapsed in latencies.items())
+        return f"{self.label} 参照データ取得時間: {details}"
+
+
+def start_prefetch(loaders: dict, max_workers: Optional[int] = None, label: str = "") -> ReferencePrefetch:
+    """
+    参照データの取得をまとめて開始する。
+
+    Args:
+        loaders: {参照データ名: 取得する関数}
+        max_workers: 同時に実行するクエリ数
+        label: ログに出力するシリーズ名
+
+    Returns:
+        取得中の参照データ（ReferencePrefetch）
+    """
+    return ReferencePrefetch(loaders, max_workers, label)
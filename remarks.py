@@ -0,0 +1,51 @@
+"""
+備考欄の正規化とキーワード判定
+
+備考欄（stdKbiko, stdbiko3, stdbiko4, stdibiko2, NotesForUpdate, NotesForETC, NotesForRTC など）の
+キーワード（constants.BikoKeyword）の判定は、各チェックがそれぞれ str() に変換し、
+小文字化・空白の除去を行ってから部分一致を調べていました。
+ここでは備考の値を一度だけ正規化し（値ごとにキャッシュ）、全てのチェックが同じ基準で判定します。
+
+正規化の内容:
+
+- NFKC 正規化（全角英数字・半角カナなどの表記の揺れを統一）
+- 小文字化
+- 空白（全角空白を含む）の除去
+
+キーワードも同じ正規化を行ってから照合するため、「ＮＰ不可」「NP不可」「np 不可」は同じキーワードとして扱います。
+None・NaN は空の備考として扱います。
+列単位のチェックでは rule_engine.ColumnView.keyword でキーワードごとの真偽列（特徴量）を作成します。
+"""
+
+import re
+import unicodedata
+from functools import lru_cache
+from typing import Any, Iterable
+
+import pandas as pd
+
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=65536)
+def _normalize_text(text: str) -> str:
+    return _WHITESPACE.sub("", unicodedata.normalize("NFKC", text)).lower()
+
+
+def normalize_remarks(value: Any) -> str:
+    """備考の値を照合用に正規化した文字列を返す（None・NaN は空文字）。"""
+    if value is None or value is pd.NA or value is pd.NaT or (isinstance(value, float) and value != value):
+        return ""
+    return _normalize_text(str(value))
+
+
+def contains_keyword(value: Any, keyword: str) -> bool:
+    """備考の値にキーワードが含まれるかを返す（どちらも正規化してから照合する）。"""
+    return _normalize_text(keyword) in normalize_remarks(value)
+
+
+def contains_any_keyword(value: Any, keywords: Iterable[str]) -> bool:
+    """備考の値にキーワードのいずれかが含まれるかを返す。"""
+    text = normalize_remarks(value)
+    return any(_normalize_text(keyword) in text for keyword in keywords)
@@ -0,0 +1,370 @@
+"""
+列指向ルールエンジン
+
+各シリーズモジュールの validate_data で、行ごとの iterrows ではなく
+列全体に対する真偽マスクとしてチェックを評価するための共通部品です。
+
+チェック1件を「真偽マスクを返す関数」と「従来の行単位チェック関数」の組
+(Rule) として登録し、マスクからエラー行を一括で収集します。
+マスクの評価で例外が発生した場合は、そのチェックに限り行単位の関数で
+評価し直すため、列欠落時のエラー行なども従来と同じ形で出力されます。
+
+文字列の判定（前方一致・形式の正規表現・キーワード・マスタの照合など）は
+ColumnView.per_value で列の値の種類ごとに1回だけ評価し、行に展開します。
+取得時に辞書符号化（category 型）された列は、その符号をそのまま使用します。
+"""
+
+import time
+from collections import namedtuple
+from typing import Callable, Optional
+
+import numpy as np
+import pandas as pd
+
+from profiling import profiled_check, record_check
+from remarks import normalize_remarks
+
+
+# 評価エンジンの種類
+ENGINE_ROW = "row"
+ENGINE_VECTORIZED = "vectorized"
+
+# check_id: マスクがTrueの行に付与するチェックID
+# mask: ColumnView を受け取り、次のいずれかの列を返す関数（None の場合は常に行単位で評価）
+#   - 真偽マスク(bool): True の行に check_id のエラーを1件
+#   - 整数の列: 値の件数だけ check_id のエラー（同じチェックを複数の項目に対して行う場合）
+#   - object の列: チェックID、またはチェックIDのリスト（該当なしは None）
+# row_check: 従来の行単位チェック関数 (row, errors_list)。マスク評価に失敗した際のフォールバックに使用
+Rule = namedtuple("Rule", ["check_id", "mask", "row_check"])
+
+# ColumnView.text/stripped で「列が無ければ KeyError」を表す既定値
+_RAISE = object()
+
+
+class ColumnView:
+    """
+    DataFrameの列を、iterrows で得られる値と同じ形（object型）で参照するためのビュー。
+
+    iterrows は各行を object 型の Series に変換するため、bool列は Python の bool、
+    日付列は Timestamp として取り出されます。マスク関数が行単位の関数と同じ判定を
+    行えるよう、列をその形に揃えたうえで変換結果をキャッシュします。
+    インデックスは 0 から始まる行位置です。
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        self._df = df
+        self._index = pd.RangeIndex(len(df))
+        self._cache = {}
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def has(self, column: str) -> bool:
+        """列が存在するかを返す。"""
+        return column in self._df.columns
+
+    def raw(self, column: str) -> pd.Series:
+        """
+        列の値を object 型で返す。
+
+        列が存在しない場合は row[column] と同様に KeyError を送出する。
+        """
+        key = ("raw", column)
+        if key not in self._cache:
+            values = self._df[column].to_numpy(dtype=object)
+            self._cache[key] = pd.Series(values, index=self._index, dtype=object)
+        return self._cache[key]
+
+    def source(self, column: str) -> pd.Series:
+        """元のDataFrameの列を dtype を保ったまま返す（列が無ければ KeyError）。"""
+        return self._df[column]
+
+    def get(self, column: str, default=None) -> pd.Series:
+        """列が存在しない場合に default で埋めた列を返す（row.get(column, default) 相当）。"""
+        if self.has(column):
+            return self.raw(column)
+        return self.constant(default)
+
+    def truthy(self, column: str) -> pd.Series:
+        """bool(row[column]) 相当の真偽マスクを返す。"""
+        key = ("truthy", column)
+        if key not in self._cache:
+            source = self._df[column]
+            kind = source.dtype.kind if isinstance(source.dtype, np.dtype) else None
+            if kind == "b":
+                values = source.to_numpy(dtype=bool)
+            elif kind in ("i", "u", "f"):
+                # NaN は bool(nan) が True のため 0 との比較で判定できる
+                values = source.to_numpy() != 0
+            else:
+                values = truthy(self.raw(column)).to_numpy()
+            self._cache[key] = pd.Series(values, index=self._index, dtype=bool)
+        return self._cache[key]
+
+    def codes(self, column: str, default=_RAISE) -> Optional[tuple]:
+        """
+        列を辞書符号化した (行ごとの符号, 値の一覧) を返す（values[codes] が raw(column) と同じ値になる）。
+
+        category 型の列は取得時の符号をそのまま使用する。文字列・数値・真偽値以外の値を含む列など、
+        値の種類ごとにまとめると行単位の判定と結果が変わりうる列（1 と 1.0 と True など）は None を返す。
+        default を指定した場合は row.get(column, default) の列を符号化する。
+        """
+        key = ("codes", column, default)
+        if key not in self._cache:
+            if default is not _RAISE and not self.has(column):
+                encoded = (np.zeros(len(self), dtype=np.intp), np.array([default], dtype=object))
+            else:
+                encoded = _encode(self._df[column])
+            self._cache[key] = encoded
+        return self._cache[key]
+
+    def per_value(self, column: str, func: Callable, default=_RAISE, dtype=object) -> pd.Series:
+        """
+        func(row[column]) 相当の列を、値の種類ごとに1回だけ func を呼び出して作成する。
+
+        符号化できない列は行ごとに func を呼び出す。default を指定した場合は func(row.get(column, default)) 相当。
+        """
+        encoded = self.codes(column, default)
+        if encoded is None:
+            return pd.Series(_apply(func, self.raw(column), dtype), index=self._index, dtype=dtype)
+        codes, uniques = encoded
+        return pd.Series(_apply(func, uniques, dtype)[codes], index=self._index, dtype=dtype)
+
+    def matches(self, column: str, predicate: Callable[[str], bool], default=_RAISE) -> pd.Series:
+        """
+        predicate(str(row[column])) 相当の真偽マスクを値の種類ごとに評価して返す。
+
+        同じ列・同じ関数の組は1回だけ評価する（関数はモジュールで定義したものを渡すと共有される）。
+        """
+        key = ("matches", column, predicate, default)
+        if key not in self._cache:
+            self._cache[key] = self.per_value(column, lambda value: bool(predicate(str(value))), default, dtype=bool)
+        return self._cache[key]
+
+    def cached(self, key, factory: Callable):
+        """複数のマスク関数で共有する中間結果（行列など）を一度だけ作成して返す。"""
+        cache_key = ("cached", key)
+        if cache_key not in self._cache:
+            self._cache[cache_key] = factory()
+        return self._cache[cache_key]
+
+    def constant(self, value) -> pd.Series:
+        """全行が value の object 型の列を返す。"""
+        return pd.Series([value] * len(self), index=self._index, dtype=object)
+
+    def text(self, column: str, default=_RAISE) -> pd.Series:
+        """
+        str(row[column]) 相当の文字列列を返す。
+
+        default を指定した場合は str(row.get(column, default)) 相当になる。
+        """
+        key = ("text", column, default)
+        if key not in self._cache:
+            self._cache[key] = self.per_value(column, str, default)
+        return self._cache[key]
+
+    def stripped(self, column: str, default=_RAISE) -> pd.Series:
+        """str(row[column]).strip() 相当の文字列列を返す。"""
+        key = ("stripped", column, default)
+        if key not in self._cache:
+            self._cache[key] = self.per_value(column, lambda value: str(value).strip(), default)
+        return self._cache[key]
+
+    def remarks(self, column: str, default=_RAISE) -> pd.Series:
+        """
+        remarks.normalize_remarks(row[column]) 相当の正規化した備考の列を返す。
+
+        default を指定した場合は row.get(column, default) を正規化する。正規化は値の種類ごとに1回だけ行う。
+        """
+        key = ("remarks", column, default)
+        if key not in self._cache:
+            self._cache[key] = self.per_value(column, normalize_remarks, default)
+        return self._cache[key]
+
+    def keyword(self, column: str, keyword: str, default=_RAISE) -> pd.Series:
+        """
+        remarks.contains_keyword(row[column], keyword) 相当の真偽マスク（備考のキーワード特徴量）を返す。
+
+        列とキーワードの組ごとに1回だけ作成し、同じキーワードを参照する全てのチェックで共有する。
+        """
+        key = ("keyword", column, keyword, default)
+        if key not in self._cache:
+            normalized_keyword = normalize_remarks(keyword)
+            self._cache[key] = self.per_value(
+                column, lambda value: normalized_keyword in normalize_remarks(value), default, dtype=bool
+            )
+        return self._cache[key]
+
+
+def _apply(func: Callable, values, dtype) -> np.ndarray:
+    """func を各値に適用した配列を返す（戻り値がリストなどでも1要素として格納する）"""
+    results = np.empty(len(values), dtype=dtype)
+    for position, value in enumerate(values):
+        results[position] = func(value)
+    return results
+
+
+def _encode(source: pd.Series) -> Optional[tuple]:
+    """ColumnView.codes の本体（列を (符号, 値の一覧) にする。まとめられない列は None）"""
+    if isinstance(source.dtype, pd.CategoricalDtype):
+        codes = source.cat.codes.to_numpy().astype(np.intp)
+        uniques = source.cat.categories.to_numpy(dtype=object)
+        if (codes < 0).any():
+            # 欠損値は iterrows と同じく NaN として末尾に追加する
+            uniques = np.append(uniques, np.array([np.nan], dtype=object))
+            codes = np.where(codes < 0, len(uniques) - 1, codes)
+        return codes, uniques
+
+    kind = source.dtype.kind if isinstance(source.dtype, np.dtype) else None
+    if kind in ("b", "i", "u", "f"):
+        values = source.to_numpy()
+    else:
+        values = source.to_numpy(dtype=object)
+        if pd.api.types.infer_dtype(values, skipna=True) not in ("string", "empty"):
+            return None
+    codes, uniques = pd.factorize(values, use_na_sentinel=True)
+    codes = codes.astype(np.intp)
+    uniques = np.asarray(uniques).astype(object)
+    missing = codes < 0
+    if missing.any():
+        # None と NaN は str() の結果などが異なるため、欠損値は種類ごとに別の値とする
+        missing_values = {}
+        raw = source.to_numpy(dtype=object)
+        missing_codes = []
+        for value in raw[missing]:
+            entry = missing_values.setdefault(type(value), (len(uniques) + len(missing_values), value))
+            missing_codes.append(entry[0])
+        codes[missing] = missing_codes
+        uniques = np.append(uniques, np.array([value for _, value in missing_values.values()], dtype=object))
+    return codes, uniques
+
+
+# --- マスク関数で共通して使用する小さなヘルパー ---
+
+def truthy(series: pd.Series) -> pd.Series:
+    """bool(value) 相当の真偽マスクを返す（if value: の判定）。"""
+    return pd.Series([bool(value) for value in series], index=series.index, dtype=bool)
+
+
+def is_value(series: pd.Series, value) -> pd.Series:
+    """value is True / value is False のような同一性判定のマスクを返す。"""
+    return pd.Series([item is value for item in series], index=series.index, dtype=bool)
+
+
+def is_none(series: pd.Series) -> pd.Series:
+    """value is None のマスクを返す（NaN は含まない）。"""
+    return is_value(series, None)
+
+
+def contains_any(text: pd.Series, keywords) -> pd.Series:
+    """文字列列に keywords のいずれかが含まれるかのマスクを返す。"""
+    mask = pd.Series(False, index=text.index, dtype=bool)
+    for keyword in keywords:
+        mask |= text.str.contains(keyword, regex=False)
+    return mask
+
+
+def apply_where(mask: pd.Series, func: Callable, default=False) -> pd.Series:
+    """
+    mask が True の行にだけ func(位置) を適用した object 型の列を返す。
+
+    日付解析など、行単位の判定をそのまま残したい条件を候補行に限定して評価するために使用する。
+    """
+    values = [default] * len(mask)
+    for position in np.flatnonzero(mask.to_numpy(dtype=bool)):
+        values[position] = func(position)
+    return pd.Series(values, index=mask.index, dtype=object)
+
+
+def _iter_rule_hits(rule: Rule, result: pd.Series):
+    """マスク関数の戻り値から (行位置, チェックIDのリスト) を順に取り出す。"""
+    if pd.api.types.is_bool_dtype(result.dtype):
+        for position in np.flatnonzero(result.to_numpy(dtype=bool)):
+            yield position, [rule.check_id]
+    elif pd.api.types.is_integer_dtype(result.dtype):
+        counts = result.to_numpy()
+        for position in np.flatnonzero(counts):
+            yield position, [rule.check_id] * int(counts[position])
+    else:
+        for position, value in enumerate(result.tolist()):
+            if value is None or (isinstance(value, float) and value != value):
+                continue
+            if isinstance(value, (list, tuple)):
+                if value:
+                    yield position, list(value)
+            else:
+                yield position, [value]
+
+
+def evaluate_rules(
+    df: pd.DataFrame,
+    rules: list,
+    add_error: Callable,
+    run_row_check: Callable,
+    user_id_column: str,
+    maintenance_id_column: str,
+    progress_callback: Optional[Callable] = None,
+    progress_label: str = "",
+) -> list:
+    """
+    ルール一覧を列単位で評価し、エラー行を行順・ルール順に並べて返す。
+
+    Args:
+        df: チェック対象のDataFrame
+        rules: Rule のリスト（従来の check_functions と同じ順序）
+        add_error: _add_error_message(errors_list, user_id, check_id, maintenance_id) 相当の関数
+        run_row_check: 行単位チェック関数を1件実行する関数
+            (check_func, row, row_errors, user_id, maintenance_id)
+        user_id_column: ユーザIDの列名
+        maintenance_id_column: 保守整理番号の列名
+        progress_callback: 進捗通知用のコールバック
+        progress_label: 進捗メッセージの接頭辞（シリーズ名）
+
+    Returns:
+        (行位置, エラー辞書) のリスト
+    """
+    view = ColumnView(df)
+    user_ids = view.get(user_id_column).tolist()
+    maintenance_ids = view.get(maintenance_id_column, "").tolist()
+    # ユーザID列が無い場合、マスク評価ではエラー行の内容を再現できないため全件行単位で評価する
+    vectorizable = view.has(user_id_column)
+
+    rows = None
+    hits = []
+    total_rules = len(rules)
+    for rule_position, rule in enumerate(rules):
+        if progress_callback:
+            progress_callback(f"{progress_label}: {rule.check_id} を評価中 ({rule_position + 1}/{total_rules})")
+
+        result = None
+        started = time.perf_counter()
+        if vectorizable and rule.mask is not None:
+            try:
+                result = rule.mask(view)
+            except Exception:
+                # マスクの評価に失敗した回数を例外として記録する
+                record_check(progress_label, rule.check_id, time.perf_counter() - started, calls=0, exceptions=1)
+                result = None
+
+        if result is None:
+            # フォールバック: このルールだけ行単位で評価する（1行ごとの時間を計測する）
+            if rows is None:
+                rows = [row for _, row in df.iterrows()]
+            row_check = profiled_check(progress_label, rule.check_id, rule.row_check)
+            for position, row in enumerate(rows):
+                row_errors = []
+                run_row_check(row_check, row, row_errors, user_ids[position], maintenance_ids[position])
+                hits.extend((position, rule_position, error) for error in row_errors)
+            continue
+
+        hit_count = len(hits)
+        for position, check_ids in _iter_rule_hits(rule, result):
+            errors = []
+            for check_id in check_ids:
+                add_error(errors, user_ids[position], check_id, maintenance_ids[position])
+            hits.extend((position, rule_position, error) for error in errors)
+        record_check(progress_label, rule.check_id, time.perf_counter() - started, errors=len(hits) - hit_count)
+
+    # 従来の出力順（行ごとに check_functions の順）に並べ替える
+    hits.sort(key=lambda hit: (hit[0], hit[1]))
+    return [(position, error) for position, _, error in hits]
@@ -0,0 +1,62 @@
+"""
+実行時に読み書きするファイル（app_settings.json・check_definitions.json など）の場所
+
+実行ファイル（PyInstaller）の場合は実行ファイルと同じディレクトリ、スクリプトの場合はこのファイルと同じ
+ディレクトリに置きます。画面（data_check.py）とヘッドレス実行（headless.py）で同じファイルを使用します。
+"""
+
+import os
+import shutil
+import sys
+from pathlib import Path
+
+
+def _get_runtime_root() -> Path:
+    """Return the directory where runtime-writable files should live."""
+    if getattr(sys, "frozen", False):  # PyInstaller runtime
+        return Path(sys.executable).resolve().parent
+    return Path(__file__).resolve().parent
+
+
+def _get_bundle_root() -> Path:
+    """Return the directory where bundled resources are located."""
+    if getattr(sys, "frozen", False) and hasattr(sys, "_MEIPASS"):
+        return Path(sys._MEIPASS)
+    return _get_runtime_root()
+
+
+RUNTIME_ROOT = _get_runtime_root()
+BUNDLE_ROOT = _get_bundle_root()
+
+
+def enter_runtime_root() -> None:
+    """実行ファイルの場合は、config.ini などを相対パスで読めるよう作業ディレクトリを RUNTIME_ROOT にする。"""
+    if getattr(sys, "frozen", False):
+        try:
+            os.chdir(RUNTIME_ROOT)
+        except OSError:
+            # 変更できない場合はそのまま進行
+            pass
+
+
+def ensure_runtime_file(filename: str, default_text: str | None = None) -> Path:
+    """Ensure a runtime-writable copy of the bundled file exists and return its path."""
+    runtime_path = RUNTIME_ROOT / filename
+    if runtime_path.exists():
+        return runtime_path
+
+    bundle_path = BUNDLE_ROOT / filename
+
+    try:
+        runtime_path.parent.mkdir(parents=True, exist_ok=True)
+        if bundle_path.exists():
+            shutil.copy2(bundle_path, runtime_path)
+        elif default_text is not None:
+            runtime_path.write_text(default_text, encoding="utf-8")
+    except Exception as exc:  # noqa: BLE001 - ログ出力用の包括的例外捕捉
+        print(
+            f"[ERROR] ランタイムファイル '{filename}' を準備できませんでした: {exc}",
+            file=sys.stderr,
+        )
+
+    return runtime_path
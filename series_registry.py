@@ -0,0 +1,79 @@
+"""
+シリーズのチェックモジュールの登録と読み込み
+
+各シリーズのモジュール名とチェックを実行する関数名を登録しておき、モジュールはそのシリーズを最初に
+実行する時点で読み込みます。起動時に全シリーズのモジュールを読み込まないため、あるシリーズの
+モジュールや外部ライブラリが見つからない場合も、影響はそのシリーズだけになります。
+
+画面（data_check.py）とヘッドレス実行（headless.py）で同じ登録を使用します。
+シリーズを追加する場合は SERIES_RUNNERS に登録してください。
+"""
+
+import importlib
+import threading
+from typing import Callable
+
+# シリーズ名: (モジュール名, チェックを実行する関数名)
+SERIES_RUNNERS = {
+    "DEKISPART": ("dekispart", "run_dekispart_check"),
+    "INNOSITE": ("innosite", "run_innosite_check"),
+    "DEKISPART_SCHOOL": ("dekispart_school", "run_dekispart_school_check"),
+    "CLOUD": ("cloud", "run_cloud_check"),
+}
+
+_runners: dict[str, Callable] = {}
+_load_lock = threading.Lock()
+
+
+class SeriesLoadError(ImportError):
+    """シリーズのチェックモジュールを読み込めなかった"""
+
+
+def is_loaded(series: str) -> bool:
+    """シリーズのモジュールを読み込み済みかどうか。"""
+    return series in _runners
+
+
+def load_series_runner(series: str) -> Callable:
+    """
+    シリーズのチェックを実行する関数を返す（モジュールは最初に呼び出した時点で読み込む）。
+
+    Raises:
+        SeriesLoadError: 登録されていないシリーズ、またはモジュール・外部ライブラリが見つからない場合
+    """
+    runner = _runners.get(series)
+    if runner is not None:
+        return runner
+    if series not in SERIES_RUNNERS:
+        raise SeriesLoadError(f"シリーズ '{series}' のチェックモジュールは登録されていません。")
+
+    module_name, function_name = SERIES_RUNNERS[series]
+    # 複数のスレッドから同時に呼び出された場合も、読み込みは1回だけ行う
+    with _load_lock:
+        runner = _runners.get(series)
+        if runner is not None:
+            return runner
+        try:
+            module = importlib.import_module(module_name)
+        except ModuleNotFoundError as error:
+            # error.name は見つからなかったモジュール名を返す
+            if error.name == module_name:
+                message = (
+                    f"シリーズチェックモジュール '{module_name}.py' が見つかりません。"
+                    "同じディレクトリに配置されているか確認してください。"
+                )
+            else:
+                message = (
+                    f"シリーズチェックモジュール '{module_name}' に必要な外部ライブラリ '{error.name}' が見つかりません。"
+                    f"仮想環境を有効化した上で pip install {error.name} を実行してください。"
+                )
+            raise SeriesLoadError(message) from error
+        except ImportError as error:
+            raise SeriesLoadError(
+                f"シリーズチェックモジュール '{module_name}' の読み込み中にエラーが発生しました。\n{error}"
+            ) from error
+        runner = getattr(module, function_name, None)
+        if runner is None:
+            raise SeriesLoadError(f"シリーズチェックモジュール '{module_name}' に関数 '{function_name}' がありません。")
+        _runners[series] = runner
+        return runner
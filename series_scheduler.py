@@ -0,0 +1,74 @@
+"""
+シリーズの並行実行
+
+各シリーズ（DEKISPART, INNOSITE, DEKISPART_SCHOOL, CLOUD）のチェックは、処理時間の大半が
+それぞれ別のDBの応答待ちです。シリーズをスレッドで並行に実行することで、全体の処理時間を
+最も遅いシリーズの処理時間に近づけます。
+
+結果は完了したシリーズから順にコールバックで通知します。コールバックはワーカースレッドではなく
+run_series_concurrently を呼び出したスレッドで実行されます（GUIへの反映は呼び出し側で
+master.after などを使用してください）。
+
+実行単位の状態（data_snapshot.snapshot_run のスナップショット、connection_pool.pool_run のプール、
+date_columns.as_of_run の基準時点、profiling.profile_run の計測）は、ワーカースレッドからも参照できるよう
+スレッドローカルではなく各モジュールのグローバル変数に保持しています。呼び出し側は
+run_series_concurrently の前にこれらの with ブロックを開始し、全シリーズが完了してから終了してください。
+"""
+
+import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Callable, Iterable, Optional
+
+
+logger = logging.getLogger(__name__)
+
+# 同時に実行するシリーズ数の既定値（シリーズ数と同じ）
+DEFAULT_MAX_WORKERS = 4
+
+
+def run_series_concurrently(
+    tasks: Iterable[tuple[str, Callable[[], Any]]],
+    max_workers: Optional[int] = None,
+    on_result: Optional[Callable[[str, Any], None]] = None,
+    on_error: Optional[Callable[[str, BaseException], None]] = None,
+) -> dict:
+    """
+    シリーズのチェックを並行に実行する。
+
+    Args:
+        tasks: (シリーズ名, チェックを実行する関数) のリスト
+        max_workers: 同時に実行するシリーズ数（None の場合は DEFAULT_MAX_WORKERS、1 の場合は順番に実行）
+        on_result: シリーズが完了するたびに (シリーズ名, 結果) で呼び出す関数
+        on_error: シリーズで例外が発生した場合に (シリーズ名, 例外) で呼び出す関数。
+            None の場合は他のシリーズの完了を待ってから例外を送出する。
+
+    Returns:
+        {シリーズ名: 結果}（完了した順）
+    """
+    tasks = list(tasks)
+    if not tasks:
+        return {}
+    workers = max(1, min(max_workers or DEFAULT_MAX_WORKERS, len(tasks)))
+
+    results = {}
+    first_error = None
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="series") as executor:
+        futures = {executor.submit(task): series for series, task in tasks}
+        for future in as_completed(futures):
+            series = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                logger.error(f"{series} のチェック中にエラーが発生しました: {e}")
+                if on_error is None:
+                    first_error = first_error or e
+                else:
+                    on_error(series, e)
+                continue
+            results[series] = result
+            if on_result is not None:
+                on_result(series, result)
+
+    if first_error is not None:
+        raise first_error
+    return results
@@ -0,0 +1,159 @@
+"""
+大きなテーブルのプロセス並列チェック（シャーディング）
+
+列単位に評価できないチェック（行ごとの Python の処理が残るもの）は1つのCPUコアで実行されるため、
+行数が多いテーブルでは他のコアが空いたままになります。
+シャーディングを有効にすると、取得したDataFrameを連続した行の範囲（シャード）に分割し、
+ProcessPoolExecutor の複数のプロセスでチェックします。
+
+- 参照データ（validate に渡す引数）はワーカープロセスの起動時に1回だけ送り、シャードごとには送りません。
+- 結果はシャードの順に連結するため、1プロセスでチェックした場合と同じ行順になります。
+  テーブル全体を参照するチェック（重複IDなど）は、ストリーミングと同様に全行から作成した参照データを渡してください。
+- 行数が min_rows 未満の場合や workers が1以下の場合は、従来どおり同じプロセスでチェックします。
+- 日付のチェックの基準時点（date_columns.now()）はワーカープロセスにも引き継ぎます。
+
+config.ini の例:
+
+    [SHARDING]
+    enabled = true
+    workers = 4
+    min_rows = 100000
+
+workers を省略した場合は CPU のコア数を使用します。
+"""
+
+import logging
+import os
+from typing import Any, Callable, Optional
+
+import numpy as np
+import pandas as pd
+
+import date_columns
+import profiling
+from common import get_config
+
+
+logger = logging.getLogger(__name__)
+
+SHARDING_SECTION = "SHARDING"
+DEFAULT_MIN_ROWS = 100000
+# 1ワーカーあたりのシャード数（処理時間の偏りを均すため、ワーカー数より多く分割する）
+SHARDS_PER_WORKER = 2
+
+# ワーカープロセスごとの状態（_init_worker で設定する）
+_worker_validate: Optional[Callable] = None
+_worker_kwargs: dict = {}
+_worker_as_of = None
+_worker_profile = False
+
+
+def sharding_workers(rows: int, workers: Optional[int] = None, min_rows: Optional[int] = None) -> int:
+    """
+    rows 行をチェックするプロセス数を返す（1 の場合は同じプロセスでチェックする）。
+
+    Args:
+        rows: チェックする行数
+        workers: プロセス数の指定（None の場合は config.ini の [SHARDING] を使用）
+        min_rows: シャーディングする最小の行数（None の場合は config.ini の [SHARDING] を使用）
+    """
+    if workers is None or min_rows is None:
+        config = get_config()
+        if not config.has_section(SHARDING_SECTION):
+            return 1
+        section = config[SHARDING_SECTION]
+        try:
+            if not section.getboolean("enabled", fallback=False):
+                return 1
+            if workers is None:
+                workers = section.getint("workers", fallback=os.cpu_count() or 1)
+            if min_rows is None:
+                min_rows = section.getint("min_rows", fallback=DEFAULT_MIN_ROWS)
+        except ValueError as e:
+            logger.warning(f"[{SHARDING_SECTION}] の設定が不正なため1プロセスでチェックします: {e}")
+            return 1
+    if rows < max(min_rows, 2):
+        return 1
+    return max(1, min(int(workers), rows))
+
+
+def split_shards(df: pd.DataFrame, shards: int) -> list[pd.DataFrame]:
+    """df を行順を保ったまま shards 個の連続した範囲に分割する（空のシャードは含めない）。"""
+    bounds = np.linspace(0, len(df), shards + 1).astype(int)
+    return [df.iloc[start:end] for start, end in zip(bounds[:-1], bounds[1:]) if end > start]
+
+
+def _init_worker(validate: Callable, kwargs: dict, as_of, profile: bool = False) -> None:
+    global _worker_validate, _worker_kwargs, _worker_as_of, _worker_profile
+    _worker_validate = validate
+    _worker_kwargs = kwargs
+    _worker_as_of = as_of
+    _worker_profile = profile
+
+
+def _validate_shard(shard: pd.DataFrame) -> tuple[pd.DataFrame, Optional[dict]]:
+    """シャードをチェックし、(結果, 計測結果) を返す（計測しない場合の計測結果は None）。"""
+    with date_columns.as_of_run(_worker_as_of), \
+            profiling.profile_run(enabled=_worker_profile, write_report_file=False) as profile:
+        result = _worker_validate(shard, progress_callback=None, **_worker_kwargs)
+    return result, None if profile is None else profile.export_stats()
+
+
+def validate_sharded(
+    df: pd.DataFrame,
+    validate: Callable[..., pd.DataFrame],
+    result_columns: list[str],
+    kwargs: Optional[dict[str, Any]] = None,
+    workers: Optional[int] = None,
+    min_rows: Optional[int] = None,
+    progress_callback: Optional[Callable[[str], None]] = None,
+    progress_label: str = "",
+) -> pd.DataFrame:
+    """
+    validate(df, progress_callback=..., **kwargs) を、行数に応じて複数のプロセスで実行する。
+
+    Args:
+        df: チェック対象の全行
+        validate: チェック関数（モジュールの最上位で定義した関数。ワーカープロセスに送るため lambda は不可）
+        result_columns: 結果のDataFrameの列
+        kwargs: validate に渡す引数（参照データなど。ワーカープロセスごとに1回だけ送る）
+        workers: プロセス数（None の場合は config.ini の [SHARDING] を使用）
+        min_rows: シャーディングする最小の行数（None の場合は config.ini の [SHARDING] を使用）
+        progress_callback: 進捗を報告するためのコールバック関数（ワーカープロセスには渡さない）
+        progress_label: 進捗メッセージの先頭に付けるシリーズ名
+
+    Returns:
+        全行のチェック結果（行順は1プロセスでチェックした場合と同じ）
+    """
+    kwargs = kwargs or {}
+    workers = sharding_workers(len(df), workers, min_rows)
+    if workers <= 1:
+        return validate(df, progress_callback=progress_callback, **kwargs)
+
+    # multiprocessing の読み込みはシャーディングする場合だけ行う
+    from concurrent.futures import ProcessPoolExecutor
+
+    shards = split_shards(df, workers * SHARDS_PER_WORKER)
+    logger.info(f"{progress_label}: {len(df)}行を{len(shards)}個のシャードに分割し、{workers}プロセスでチェックします")
+    results = []
+    checked_rows = 0
+    # チェックごとの処理時間は各ワーカープロセスで計測し、実行中の計測に合算する
+    profile = profiling.current_profile()
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(validate, kwargs, date_columns.now(), profile is not None),
+    ) as executor:
+        # map は投入した順に結果を返すため、連結すると元の行順になる
+        for shard, (result, stats) in zip(shards, executor.map(_validate_shard, shards)):
+            if stats is not None and profile is not None:
+                profile.merge(stats)
+            if result is not None and not result.empty:
+                results.append(result)
+            checked_rows += len(shard)
+            if progress_callback:
+                progress_callback(f"{progress_label}: {checked_rows}件をチェックしました")
+
+    if not results:
+        return pd.DataFrame(columns=result_columns)
+    return pd.concat(results, ignore_index=True)[result_columns]
@@ -0,0 +1,580 @@
+"""
+ベンチマーク用の合成データ
+
+DBや補助ファイルに接続せずに各シリーズの validate_data を実行できるよう、乱数のシードを固定して
+基幹データと参照データ（マスタ・補助ファイル）を作成します。同じシード・行数からは常に同じデータを作成します。
+
+- 基幹データ: T_stdData（DEKISPART）、t_stdidata と t_stdiproid の結合（INNOSITE）、
+  t_stdddata（DEKISPART_SCHOOL）、t_kscmain と t_KentemConnectContract の結合（CLOUD）
+- 参照データ: T_salMst・t_salmst_k・t_stdmain_h と、補助ファイル（トータルネット・担当者マスタ・
+  得意先マスタ・個人名リスト）。マスタの件数は基幹データの行数に合わせて増やします。
+
+値の大部分はチェックを通過する正常な値とし、一部の行（おおよそ数％）にチェックでエラーになる値を混ぜます。
+参照データは各シリーズの prepare_reference_data と同じ処理で validate_data に渡す形に変換するため、
+DBから取得した場合と同じ経路でチェックされます。
+
+使用例:
+
+    data = series_data("DEKISPART", SIZES["100k"], seed=0)
+    result = dekispart.validate_data(data.frame, None, **data.validate_kwargs)
+"""
+
+import zlib
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+from reference_index import column_index
+from reference_prefetch import start_prefetch
+
+
+# ベンチマークの行数
+SIZES = {"10k": 10_000, "100k": 100_000, "1m": 1_000_000}
+DEFAULT_SEED = 0
+# 日付のチェックの基準日時（validate_data の as_of に渡すと、実行日に関係なく同じ結果になる）
+AS_OF = pd.Timestamp("2025-04-01")
+
+# エラーになる値を混ぜる行の割合（項目ごと）
+ANOMALY_RATIO = 0.005
+
+# チェックの条件に使用されている販売店コード（個別の条件で判定されるもの）
+SPECIAL_SHOP_CODES = ["004359", "000286", "001275", "000332", "A30777", "000583", "000659", "000759", "B88299"]
+NSYU_TYPES = [121, 122, 211, 112]
+OFFICE_NAMES = ["札幌営業所", "仙台営業所", "東京営業所", "名古屋営業所", "大阪営業所", "広島営業所", "福岡営業所"]
+PREFECTURES = ["北海道", "宮城県", "新潟県", "東京都", "神奈川県", "愛知県", "大阪府", "広島県", "福岡県"]
+# 備考（大部分は空欄）
+REMARKS = ["", "更新案内不要", "補助金", "退会", "NP不可", "特別発送", "減らして更新"]
+REMARK_WEIGHTS = [0.97, 0.005, 0.005, 0.005, 0.005, 0.005, 0.005]
+
+
+def _rng(seed: int, table: str) -> np.random.Generator:
+    """テーブルごとの乱数（作成する順序やテーブルの組み合わせに関係なく同じ値になる）。"""
+    return np.random.default_rng([seed, zlib.crc32(table.encode("utf-8"))])
+
+
+def _codes(prefix: str, count: int, width: int, start: int = 1) -> np.ndarray:
+    return np.array([f"{prefix}{number:0{width}d}" for number in range(start, start + count)], dtype=object)
+
+
+def _pick(rng: np.random.Generator, values, rows: int, p=None) -> np.ndarray:
+    values = np.asarray(values, dtype=object)
+    return values[rng.choice(len(values), size=rows, p=p)]
+
+
+def _anomalies(rng: np.random.Generator, rows: int, ratio: float = ANOMALY_RATIO) -> np.ndarray:
+    return rng.random(rows) < ratio
+
+
+def _blank(rng: np.random.Generator, values: np.ndarray, ratio: float = ANOMALY_RATIO) -> np.ndarray:
+    """一部の値を None（NULL）にする。"""
+    values = values.astype(object)
+    values[_anomalies(rng, len(values), ratio)] = None
+    return values
+
+
+def _dates(rng: np.random.Generator, rows: int, start: str, end: str) -> np.ndarray:
+    """start〜end の日付（datetime64[ns]。SQL Server から取得した列と同じ型）。"""
+    first, last = pd.Timestamp(start).value // 86_400_000_000_000, pd.Timestamp(end).value // 86_400_000_000_000
+    return rng.integers(first, last, size=rows).astype("datetime64[D]").astype("datetime64[ns]")
+
+
+def _date_objects(values: np.ndarray, missing: np.ndarray) -> np.ndarray:
+    """datetime.date の配列（MySQL から取得した列と同じく、NULL は None）。"""
+    result = np.array([date.fromisoformat(str(value)[:10]) for value in values.astype("datetime64[D]")], dtype=object)
+    result[missing] = None
+    return result
+
+
+def _month_start_after(values: np.ndarray) -> np.ndarray:
+    """各日付の翌月1日。"""
+    return (values.astype("datetime64[M]") + 1).astype("datetime64[ns]")
+
+
+# --- 参照データ ---
+
+class ReferenceTables:
+    """
+    基幹データと対応する参照データ（マスタ・補助ファイル）。
+
+    maintenance は INNOSITE の参照マップの作成に使用する T_stdData の列（stdID・stdAdd・stdTselNo・stdSale1）で、
+    INNOSITE の stdid_i と同じ整理番号を持ちます。
+    """
+
+    def __init__(self, rows: int, seed: int = DEFAULT_SEED):
+        rng = _rng(seed, "reference")
+        shops = max(200, rows // 100)
+        staff = max(50, rows // 1000)
+        self.rows = rows
+        self.maintenance_ids = _codes("D", rows, 7)
+
+        self.shop_codes = np.concatenate([_codes("", shops, 6, start=1000), np.array(SPECIAL_SHOP_CODES, dtype=object)])
+        # T_salMst: 販売店マスタ
+        self.sales_master = pd.DataFrame({
+            "salCode": self.shop_codes,
+            "salNotifyRenewal": rng.random(len(self.shop_codes)) < 0.2,
+            "salJifuriDM": rng.random(len(self.shop_codes)) < 0.1,
+        })
+        # t_stdmain_h: 販売店（名称に ★・×・▲ を含む販売店は倒産扱い）
+        shop_names = np.array([f"販売店{code}" for code in self.shop_codes], dtype=object)
+        bankrupt = rng.random(len(shop_names)) < 0.02
+        shop_names[bankrupt] = "▲" + shop_names[bankrupt]
+        self.shop_master = pd.DataFrame({
+            "maiCode": self.shop_codes,
+            "maiName1": shop_names,
+            "maiCloudUpdateLimit": rng.integers(0, 3, size=len(shop_names)),
+        })
+
+        # t_salmst_k: 営業担当（名称に ×・・ を含む担当者は対象外営業）
+        self.staff_codes = _codes("S", staff, 4)
+        staff_names = np.array([f"担当{code}" for code in self.staff_codes], dtype=object)
+        excluded = rng.random(staff) < 0.02
+        staff_names[excluded] = "×" + staff_names[excluded]
+        self.salmst_k = pd.DataFrame({
+            "salCode": self.staff_codes,
+            "salKName": staff_names,
+            "salKName2K": _pick(rng, OFFICE_NAMES, staff),
+        })
+
+        # 補助ファイル（商魂の担当者マスタ・得意先マスタ、トータルネット、個人名リスト）
+        person_names = staff_names.copy()
+        person_names[rng.random(staff) < 0.02] = "・退職者"
+        self.sales_persons = pd.DataFrame({
+            "担当者コード": self.staff_codes,
+            "担当者名": person_names,
+            "部門コード": _pick(rng, ["001", "002", "003"], staff),
+        })
+        customer_names = shop_names.copy()
+        customer_names[rng.random(len(customer_names)) < 0.01] = "×不正店"
+        self.customers = pd.DataFrame({
+            "得意先コード": self.shop_codes,
+            "得意先名１": customer_names,
+            "使用区分": "",
+            "会社敬称": _pick(rng, ["様", "御中", "", "殿"], len(customer_names), p=[0.6, 0.35, 0.04, 0.01]),
+        })
+        # トータルネット（支払人マスタ）: 入金経路が自振(121)の整理番号・スクールのユーザーID
+        self.school_ids = _codes("", rows, 8, start=20_000_000)
+        self.totalnet_mask = rng.random(rows) < 0.3
+        self.totalnet = pd.DataFrame({"顧客番号": np.concatenate([
+            self.maintenance_ids[self.totalnet_mask], self.school_ids[self.totalnet_mask], self.shop_codes[:10],
+        ])})
+        self.individual_names = ["山田太郎", "佐藤花子", "鈴木一郎", "田中次郎"]
+
+        # CHK_0060（DEKISPART）の参照セット: SiTE-NEXUS の整理番号と 3Dイラストの整理番号
+        chk0060 = rng.random(rows)
+        self.site_nexus_ids = set(self.maintenance_ids[chk0060 < 0.02])
+        self.illust_ids = set(self.maintenance_ids[chk0060 < 0.01])
+
+        # T_stdData の参照列（INNOSITE の参照マップ用）
+        self.maintenance_staff = rng.integers(0, staff, size=rows)
+        self.maintenance = pd.DataFrame({
+            "stdID": self.maintenance_ids,
+            "stdAdd": [f"{prefecture}テスト市" for prefecture in _pick(rng, PREFECTURES, rows)],
+            "stdTselNo": self.staff_codes[self.maintenance_staff],
+            "stdSale1": _pick(rng, self.shop_codes, rows),
+        })
+
+    def excluded_sales(self) -> pd.DataFrame:
+        """対象外営業（t_salmst_k の名称に ×・・ を含む担当者）。"""
+        return self.salmst_k[self.salmst_k["salKName"].str.contains("×|・")][["salCode", "salKName"]]
+
+    def bankrupt_shops(self) -> pd.DataFrame:
+        """倒産している販売店（t_stdmain_h の名称に ★・×・▲ を含む販売店）。"""
+        return self.shop_master[self.shop_master["maiName1"].str.contains("★|×|▲")][["maiCode"]]
+
+    def salKName2K(self) -> dict:
+        return self.salmst_k.drop_duplicates(subset="salCode").set_index("salCode")["salKName2K"].to_dict()
+
+
+# --- 基幹データ ---
+
+def _membership_dates(rng: np.random.Generator, kaiyaku: np.ndarray):
+    """
+    加入日・会員期間の終了日(reyear1)・開始日(reyear2)。
+
+    加入中は AS_OF の前の1年以内に加入して会員期間が AS_OF 以降まで続き、退会済みは期間が終了している日付にする。
+    """
+    rows = len(kaiyaku)
+    acday = np.where(kaiyaku, _dates(rng, rows, "2012-01-01", "2023-12-01"), _dates(rng, rows, "2024-05-01", "2025-03-01"))
+    reyear2 = _month_start_after(acday)
+    reyear1 = reyear2 + np.timedelta64(364, "D")
+    return acday, reyear1, reyear2
+
+
+def _nsyu(rng: np.random.Generator, reference: ReferenceTables) -> np.ndarray:
+    """入金経路（トータルネットに登録がある場合だけ自振(121)）。"""
+    rows = reference.rows
+    nsyu = np.where(reference.totalnet_mask, 121, _pick(rng, [122, 211, 112], rows, p=[0.7, 0.25, 0.05]))
+    nsyu[_anomalies(rng, rows)] = 121
+    return nsyu
+
+
+def _sale2(rng: np.random.Generator, sale1: np.ndarray) -> np.ndarray:
+    """販店2（販店1が 004359・000286 の場合だけ入力する）。"""
+    sale2 = np.where(np.isin(sale1, ["004359", "000286"]), "00r1", "").astype(object)
+    sale2[_anomalies(rng, len(sale1), 0.002)] = "00r9"
+    return sale2
+
+
+def _user_ids(rng: np.random.Generator, prefixes: np.ndarray) -> np.ndarray:
+    """
+    先頭が prefixes の8桁のユーザーID（一部は重複させる）。
+
+    先頭以外の桁数で表せる件数を超える場合（1m の行数で先頭4桁の場合など）は、それ以外にも重複します。
+    """
+    rows = len(prefixes)
+    user_ids = np.empty(rows, dtype=object)
+    for prefix in np.unique(prefixes):
+        positions = np.flatnonzero(prefixes == prefix)
+        width = 8 - len(prefix)
+        serials = rng.permutation(len(positions)) % 10 ** width
+        user_ids[positions] = [f"{prefix}{serial:0{width}d}" for serial in serials]
+    duplicated = np.flatnonzero(_anomalies(rng, rows, 0.002))
+    user_ids[duplicated] = user_ids[(duplicated + 1) % rows]
+    return user_ids
+
+
+# stdItmS とユーザーIDの先頭（CHK_0001〜0003）
+ITEM_USER_ID_PREFIXES = {"ＬＡＮ": "012", "単体": "8001", "レンタル": "629"}
+
+
+def generate_std_data(reference: ReferenceTables, seed: int = DEFAULT_SEED) -> pd.DataFrame:
+    """T_stdData（DEKISPART）の合成データ（SQL Server の日付列は datetime64）。"""
+    rows = reference.rows
+    rng = _rng(seed, "T_stdData")
+
+    items = _pick(rng, list(ITEM_USER_ID_PREFIXES), rows, p=[0.7, 0.05, 0.25])
+    prefixes = np.array([ITEM_USER_ID_PREFIXES[item] for item in items], dtype=object)
+    user_ids = _user_ids(rng, prefixes)
+    mismatched = _anomalies(rng, rows)
+    items[mismatched] = _pick(rng, list(ITEM_USER_ID_PREFIXES), int(mismatched.sum()))
+    supp_ids = user_ids.copy()
+    supp_ids[_anomalies(rng, rows)] = "99999999"
+
+    sale1 = _pick(rng, reference.shop_codes, rows)
+    invalid_sale1 = _anomalies(rng, rows)
+    sale1[invalid_sale1] = _pick(rng, ["ksALL", "12345", "", None], int(invalid_sale1.sum()))
+    # 敬称フラグは得意先マスタの会社敬称（様）と合わせる
+    honorifics = dict(zip(reference.customers["得意先コード"], reference.customers["会社敬称"]))
+    flg4 = np.array([honorifics.get(code) == "様" for code in sale1])
+    flg4 ^= _anomalies(rng, rows)
+    # 敬称が様の場合は個人名で、担当者は空欄
+    names = np.where(flg4, _pick(rng, ["高橋一郎", "伊藤和子", "渡辺誠"], rows),
+                     _pick(rng, ["株式会社テスト建設", "テスト測量有限会社", "合同会社サンプル"], rows))
+    tan1 = np.where(flg4, "", _pick(rng, ["担当太郎", "担当花子"], rows)).astype(object)
+    tan1[_anomalies(rng, rows)] = "（未定）"
+
+    kaiyaku = rng.random(rows) < 0.15
+    acday, reyear1, reyear2 = _membership_dates(rng, kaiyaku)
+    reyear1[_anomalies(rng, rows)] = np.datetime64("NaT")
+    nsyu = _nsyu(rng, reference)
+    hassou = np.where(nsyu == 121, 1, rng.integers(0, 3, size=rows))
+
+    return pd.DataFrame({
+        "stdID": reference.maintenance_ids,
+        "stdUserID": user_ids,
+        "stdItmS": items,
+        "stdKaiyaku": kaiyaku,
+        "stdSuppID": supp_ids,
+        "stdTan1": tan1,
+        "stdNamCode": sale1.copy(),
+        "stdSale1": sale1,
+        "stdSaleNam1": sale1.copy(),
+        "stdSale2": _sale2(rng, sale1),
+        "stdNsyu": nsyu,
+        "stdAdd": reference.maintenance["stdAdd"].to_numpy(),
+        "stdKbiko": _pick(rng, REMARKS, rows, p=REMARK_WEIGHTS),
+        "stdbiko3": _pick(rng, REMARKS, rows, p=REMARK_WEIGHTS),
+        "stdbiko4": _pick(rng, REMARKS, rows, p=REMARK_WEIGHTS),
+        "stdJifuriDM": rng.random(rows) < 0.1,
+        "stdHassouType": hassou,
+        "stdNonRenewal": rng.random(rows) < 0.01,
+        "stdTsel": _blank(rng, _pick(rng, reference.staff_codes, rows)),
+        "stdTpla": _blank(rng, reference.salmst_k["salKName2K"].to_numpy()[rng.integers(0, len(reference.staff_codes), rows)]),
+        "stdReyear1": reyear1,
+        "stdReyear2": reyear2,
+        "stdAcday": acday,
+        "stdRemon": _blank(rng, rng.integers(1, 13, size=rows)),
+        "stdAcyear": _blank(rng, rng.integers(2012, 2026, size=rows)),
+        "stdKainsyu": rng.integers(1, 6, size=rows),
+        "stdName": names,
+        "stdNamef": _pick(rng, ["テストケンセツ", "テストソクリョウ", "サンプル"], rows),
+        "stdZip": _blank(rng, _pick(rng, ["1000001", "9500001", "0600001"], rows)),
+        "stdTell": _blank(rng, _pick(rng, ["0312345678", "0252345678", "0112345678"], rows)),
+        "stdFlg4": flg4,
+        "stdFlg3": _anomalies(rng, rows),
+        "stdFlg1": _anomalies(rng, rows),
+    })
+
+
+# INNOSiTE の製品（stdiinnoid の先頭4桁, stdipccode, 1本あたりの価格）。CHK_0002 の価格計算と同じ組み合わせ
+INNOSITE_PRODUCTS = [
+    ("3110", "1439", 60000),
+    ("3510", "1483", 60000),
+    ("3210", "1541", 20000),
+    ("3310", "1546", 40000),
+    ("3610", "1607", 90000),
+    ("3410", "1608", 30000),
+]
+
+
+def generate_innosite_data(reference: ReferenceTables, seed: int = DEFAULT_SEED) -> pd.DataFrame:
+    """t_stdidata と t_stdiproid を結合した INNOSITE の合成データ（MySQL の日付列は datetime.date）。"""
+    rows = reference.rows
+    rng = _rng(seed, "t_stdidata")
+
+    product = rng.integers(0, len(INNOSITE_PRODUCTS), size=rows)
+    prefixes = np.array([item[0] for item in INNOSITE_PRODUCTS], dtype=object)[product]
+    pccodes = np.array([item[1] for item in INNOSITE_PRODUCTS], dtype=object)[product]
+    unit_prices = np.array([item[2] for item in INNOSITE_PRODUCTS])[product]
+    kainsyu = rng.integers(1, 6, size=rows)
+    # 3本目半額は先頭2製品だけ（stdidiscount = -1）
+    discount = np.where((product < 2) & (kainsyu >= 3) & (rng.random(rows) < 0.3), -1, 0)
+    price = np.where(discount == -1, unit_prices * 2 + unit_prices / 2 * (kainsyu - 2), unit_prices * kainsyu)
+    price = price + np.where(_anomalies(rng, rows), 1000.0, 0.0)
+
+    sale1 = _blank(rng, _pick(rng, reference.shop_codes, rows))
+    kaiyaku = rng.random(rows) < 0.15
+    acday, reyear1, reyear2 = _membership_dates(rng, kaiyaku)
+    # 営業担当はデキスパートの保守と別の担当者（CHK_0039）
+    staff = len(reference.staff_codes)
+    sales_rep = (reference.maintenance_staff + rng.integers(1, staff, size=rows)) % staff
+    same_rep = _anomalies(rng, rows)
+    sales_rep[same_rep] = reference.maintenance_staff[same_rep]
+
+    return pd.DataFrame({
+        "stdid_i": reference.maintenance_ids,
+        "stdiinnoid": _user_ids(rng, prefixes),
+        "stdidiscount": discount,
+        "stdipricetotal": price,
+        "stdiKainsyu": kainsyu,
+        "stdipccode": pccodes,
+        "stdisale1": sale1,
+        "stdisale2": _sale2(rng, sale1),
+        "stdikaiyaku": kaiyaku,
+        "stdiNsyu": _nsyu(rng, reference),
+        "stdibiko1": _pick(rng, REMARKS, rows, p=REMARK_WEIGHTS),
+        "stdibiko2": _pick(rng, REMARKS, rows, p=REMARK_WEIGHTS),
+        "stdidicount": discount == -1,
+        "stdiflg1": _anomalies(rng, rows),
+        "stdireyear1": _date_objects(reyear1, _anomalies(rng, rows)),
+        "stdiacday": _date_objects(acday, _anomalies(rng, rows)),
+        "stdireyear2": _date_objects(reyear2, _anomalies(rng, rows)),
+        "stdiremon": _blank(rng, rng.integers(1, 13, size=rows)),
+        "stdiAcyear": _blank(rng, rng.integers(2012, 2026, size=rows)),
+        "stditselno": reference.staff_codes[sales_rep],
+        "stdiNotifyRenewalType": _pick(rng, [0, 1, 2], rows, p=[0.99, 0.005, 0.005]),
+    })
+
+
+def generate_school_data(reference: ReferenceTables, seed: int = DEFAULT_SEED) -> pd.DataFrame:
+    """t_stdddata（DEKISPART_SCHOOL）の合成データ（MySQL の日付列は datetime.date）。"""
+    rows = reference.rows
+    rng = _rng(seed, "t_stdddata")
+
+    user_ids = reference.school_ids.copy()
+    # CHK_0003: IDの重複
+    duplicated = np.flatnonzero(_anomalies(rng, rows, 0.002))
+    user_ids[duplicated] = user_ids[(duplicated + 1) % rows]
+    supp_ids = user_ids.copy()
+    supp_ids[_anomalies(rng, rows)] = "99999999"
+
+    sale1 = _blank(rng, _pick(rng, reference.shop_codes, rows))
+    kaiyaku = rng.random(rows) < 0.15
+    acday, reyear1, reyear2 = _membership_dates(rng, kaiyaku)
+    nsyu = _nsyu(rng, reference)
+
+    return pd.DataFrame({
+        "stdDID": user_ids,
+        "stdID_D": reference.maintenance_ids,
+        "stdDsupID": _blank(rng, supp_ids, 0.1),
+        "stdDsale1": sale1,
+        "stdDsale2": _sale2(rng, sale1),
+        "stdDKaiyaku": kaiyaku,
+        "stdDNsyu": nsyu,
+        "stdDnkeiro": nsyu.copy(),
+        "stdDFlg1": _anomalies(rng, rows),
+        "userbikou1": _pick(rng, REMARKS, rows, p=REMARK_WEIGHTS),
+        "stdDtselno": _pick(rng, reference.staff_codes, rows),
+        "stdDReyear1": _date_objects(reyear1, _anomalies(rng, rows)),
+        "stdDAcday": _date_objects(acday, _anomalies(rng, rows)),
+        "stdDRemon": _blank(rng, rng.integers(1, 13, size=rows)),
+        "stdDReyear2": _date_objects(reyear2, _anomalies(rng, rows)),
+        "stdDKaiyakuOP": kaiyaku & ~_anomalies(rng, rows, 0.02),
+    })
+
+
+# CLOUD の契約（退会フラグの列の接頭辞）。KDB は複数年備考・処理中の列が無い
+CLOUD_CONTRACTS = ["DB", "SB", "FN", "SBT", "DBP", "SBR", "KC", "DQC", "KSSCAN", "PMC", "CQC", "WLC", "KTD", "KDB"]
+
+
+def generate_kscmain_data(reference: ReferenceTables, seed: int = DEFAULT_SEED) -> pd.DataFrame:
+    """t_kscmain と t_KentemConnectContract を結合した CLOUD の合成データ。"""
+    rows = reference.rows
+    rng = _rng(seed, "t_kscmain")
+    as_of = np.datetime64(AS_OF, "ns")
+
+    columns = {
+        "ManagementCode": _codes("M", rows, 8),
+        "HoshuId": _blank(rng, reference.maintenance_ids.copy()),
+    }
+    notes = _pick(rng, ["", "更新案内不要", "NP不可", "特別発送"], rows, p=[0.94, 0.02, 0.02, 0.02])
+    update_limits = dict(zip(reference.shop_master["maiCode"], reference.shop_master["maiCloudUpdateLimit"]))
+    for prefix, store_column in [("", "CloudStoreCode"), ("KsNavi", "KsNaviStoreCode"),
+                                 ("KDC", "KDCStoreCode"), ("KSAR", "KSARStoreCode")]:
+        store_codes = _pick(rng, reference.shop_codes, rows)
+        if prefix:
+            # 快測ナビ以外のシリーズは契約が無い行が多い
+            store_codes = _blank(rng, store_codes, 0.3 if prefix == "KsNavi" else 0.8)
+        # 更新案内は、販売店の更新期限が通常(1)の場合だけ送り、備考に更新案内不要とある場合は送らない
+        limits = np.array([update_limits.get(code, 0) for code in store_codes])
+        state = np.where((limits == 1) & (notes != "更新案内不要"), _pick(rng, [1, 2], rows), 0)
+        state[_anomalies(rng, rows, 0.002)] = 1
+        columns[prefix + "SendUpdateGuidanceState"] = state
+        # NP不可の場合は振込(211)
+        columns[prefix + "PaymentType"] = np.where(notes == "NP不可", 211, _pick(rng, [122, 211], rows))
+        columns[store_column] = store_codes
+    invalid_store = _anomalies(rng, rows)
+    columns["CloudStoreCode"][invalid_store] = _pick(rng, ["ksALL", "12345", "A1234"], int(invalid_store.sum()))
+    columns["CloudStoreCode2"] = _pick(rng, ["", None, "00r1"], rows, p=[0.8, 0.19, 0.01])
+    for field in ["CloudStoreName", "KsNaviStoreName", "KSARStoreName"]:
+        names = np.array([f"販売店{code}" for code in _pick(rng, reference.shop_codes, rows)], dtype=object)
+        names[_anomalies(rng, rows, 0.002)] = "▲閉店"
+        columns[field] = names
+        columns[field + "2"] = _pick(rng, ["", "×"], rows, p=[0.998, 0.002])
+    columns["NotesForUpdate"] = notes
+    columns["NotesForETC"] = _pick(rng, ["", "特別発送"], rows, p=[0.98, 0.02])
+    columns["NotesForRTC"] = _pick(rng, ["", "補助金"], rows, p=[0.98, 0.02])
+    columns["SalesRepresentativeCode"] = _pick(rng, reference.staff_codes, rows)
+
+    for contract in CLOUD_CONTRACTS:
+        # 契約中は期間が AS_OF を含み、退会済みは期間が終了している
+        inactive = rng.random(rows) < 0.6
+        start = np.where(inactive, _dates(rng, rows, "2018-01-01", "2022-01-01"), _dates(rng, rows, "2024-04-02", "2025-04-01"))
+        end = np.where(inactive, start + np.timedelta64(365, "D"), as_of + np.timedelta64(365, "D"))
+        wrong = _anomalies(rng, rows, 0.001)
+        end[wrong] = np.where(inactive[wrong], as_of + np.timedelta64(30, "D"), as_of - np.timedelta64(30, "D"))
+        inactive = inactive.astype(object)
+        if contract == "KC":
+            # KENTEM-CONNECT は LEFT JOIN のため、契約の無い行は NULL
+            no_contract = rng.random(rows) < 0.5
+            inactive[no_contract] = None
+            start[no_contract] = np.datetime64("NaT")
+            end[no_contract] = np.datetime64("NaT")
+        columns[f"{contract}_ContractInactive"] = inactive
+        columns[f"{contract}_ContractStart"] = start
+        columns[f"{contract}_ContractEnd"] = end
+        if contract not in ("KC", "KDB"):
+            columns[f"{contract}_UpdateInprogress"] = rng.random(rows) < 0.002
+        if contract != "KDB":
+            columns[f"{contract}_NotesForMultipleYears"] = _pick(rng, ["", "減らして更新"], rows, p=[0.998, 0.002])
+    return pd.DataFrame(columns)
+
+
+# --- シリーズごとの validate_data の引数 ---
+
+class SeriesData:
+    """
+    シリーズの合成データ。
+
+    validate_data(frame, None, **validate_kwargs) でチェックできます（DEKISPART・CLOUD は engine も指定可能）。
+    """
+
+    def __init__(self, series: str, frame: pd.DataFrame, validate_kwargs: dict, reference: ReferenceTables):
+        self.series = series
+        self.frame = frame
+        self.validate_kwargs = validate_kwargs
+        self.reference = reference
+
+
+def _loaded(value):
+    return lambda: value
+
+
+def _dekispart_data(reference: ReferenceTables, seed: int) -> SeriesData:
+    import dekispart
+
+    frame = generate_std_data(reference, seed)
+    # DBの代わりに合成したマスタを返す取得処理で、prepare_reference_data を実行する
+    prefetch = start_prefetch({
+        "sales_master": _loaded(reference.sales_master),
+        "chk0060_reference_sets": _loaded((reference.site_nexus_ids, reference.illust_ids)),
+        "salKName2K": _loaded(reference.salKName2K()),
+    }, label="SYNTHETIC DEKISPART")
+    return SeriesData("DEKISPART", frame, {
+        "individual_list": reference.individual_names,
+        "totalnet_records": reference.totalnet,
+        "sales_person_records": reference.sales_persons.to_dict(orient="records"),
+        "customers_records": reference.customers.to_dict(orient="records"),
+        "reference_data": dekispart.prepare_reference_data(frame, prefetch),
+    }, reference)
+
+
+def _innosite_data(reference: ReferenceTables, seed: int) -> SeriesData:
+    import innosite
+
+    sales_persons = reference.sales_persons.to_dict(orient="records")
+    prefetch = start_prefetch({
+        "totalnet_list": _loaded(reference.totalnet),
+        "excluded_sales": _loaded(reference.excluded_sales()),
+        "bankrupt_shop": _loaded(reference.bankrupt_shops()),
+        "maintenance_id_reference_maps": _loaded(innosite.build_maintenance_id_reference_maps(reference.maintenance)),
+        "sales_person_list": _loaded(sales_persons),
+        "sales_master": _loaded(reference.sales_master),
+    }, label="SYNTHETIC INNOSITE")
+    return SeriesData("INNOSITE", generate_innosite_data(reference, seed), {
+        "totalnet_list": reference.totalnet,
+        "sales_person_list": sales_persons,
+        "reference_data": innosite.prepare_reference_data(prefetch),
+    }, reference)
+
+
+def _school_data(reference: ReferenceTables, seed: int) -> SeriesData:
+    # run_dekispart_school_check と同じく、マスタはコードのリストで渡す
+    return SeriesData("DEKISPART_SCHOOL", generate_school_data(reference, seed), {
+        "totalnet_list_df": reference.totalnet,
+        "excluded_sales_list": reference.excluded_sales()["salCode"].tolist(),
+        "bankrupt_shop_data": reference.bankrupt_shops()["maiCode"].tolist(),
+    }, reference)
+
+
+def _cloud_data(reference: ReferenceTables, seed: int) -> SeriesData:
+    # cloud.prepare_reference_data と同じ形（対象外営業の索引と、販売店コードごとの更新期限）
+    shop_db_dict = {
+        item["maiCode"]: {"maiCloudUpdateLimit": item["maiCloudUpdateLimit"]}
+        for item in reference.shop_master.to_dict(orient="records")
+    }
+    return SeriesData("CLOUD", generate_kscmain_data(reference, seed), {
+        "reference_data": {
+            "excluded_sales_list": column_index(reference.excluded_sales(), "salCode"),
+            "shop_db_dict": shop_db_dict,
+        },
+    }, reference)
+
+
+_SERIES_DATA = {
+    "DEKISPART": _dekispart_data,
+    "INNOSITE": _innosite_data,
+    "DEKISPART_SCHOOL": _school_data,
+    "CLOUD": _cloud_data,
+}
+SERIES = tuple(_SERIES_DATA)
+
+
+def series_data(series: str, rows: int, seed: int = DEFAULT_SEED, reference: ReferenceTables = None) -> SeriesData:
+    """
+    シリーズの基幹データと validate_data の引数を作成する。
+
+    Args:
+        series: シリーズ名（SERIES のいずれか）
+        rows: 基幹データの行数
+        seed: 乱数のシード
+        reference: 作成済みの参照データ（複数のシリーズで共有する場合。rows と同じ行数で作成したもの）
+    """
+    if series not in _SERIES_DATA:
+        raise ValueError(f"シリーズ '{series}' の合成データはありません（{', '.join(SERIES)}）")
+    if reference is None:
+        reference = ReferenceTables(rows, seed)
+    elif reference.rows != rows:
+        raise ValueError(f"参照データの行数（{reference.rows}）が基幹データの行数（{rows}）と一致しません")
+    return _SERIES_DATA[series](reference, seed)
@@ -0,0 +1,241 @@
+"""
+取得したテーブルのディスクキャッシュ
+
+チェック定義を調整しながらGUIから繰り返し実行する場合など、DBのデータが変わっていないのに
+毎回全件を取得し直すのを避けるため、取得したDataFrameを（接続先の設定セクション, クエリ）を
+キーとしてローカルに保存し、次回の実行で再利用します。
+
+保存形式は pyarrow がインストールされている場合は Parquet（列指向）、無い場合は pickle です。
+キャッシュは次の条件を全て満たす場合に使用し、それ以外はDBから取得して保存し直します。
+
+- 保存からの経過時間がテーブルごとの有効期間（TTL）以内
+- 変更確認クエリ（件数と更新日時列の最大値）の結果が保存時と同じ
+- 強制再取得（force_refresh）が指定されていない
+
+config.ini の例:
+
+    [TABLE_CACHE]
+    enabled = true
+    directory = table_cache
+    ttl = 600
+    ttl.T_stdData = 3600
+    update_column.T_stdData = YOUR_UPDATE_COLUMN
+
+ttl.<テーブル名> / update_column.<テーブル名> を省略した場合は、ttl の値と件数のみで判定します。
+変更確認はクエリと同じ FROM 句・WHERE 句で行うため、条件で絞り込んだクエリは
+条件に一致する行の件数（と更新日時列の最大値）で判定します。
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import time
+from contextlib import contextmanager
+from typing import Optional
+
+import pandas as pd
+
+from common import get_config
+from data_stream import dictionary_encode
+from runtime_files import RUNTIME_ROOT
+
+
+logger = logging.getLogger(__name__)
+
+CACHE_SECTION = "TABLE_CACHE"
+DEFAULT_TTL_SECONDS = 600
+DEFAULT_DIRECTORY = str(RUNTIME_ROOT / "table_cache")
+
+FORMAT_PARQUET = "parquet"
+FORMAT_PICKLE = "pickle"
+
+# FROM 句と WHERE 句（ORDER BY / 末尾のセミコロンより前）
+_FROM_CLAUSE = re.compile(r"\bFROM\s+(.+?)(?:\s+ORDER\s+BY\b|\s*;|\s*$)", re.IGNORECASE | re.DOTALL)
+
+_force_refresh = False
+_force_lock = threading.Lock()
+
+
+@contextmanager
+def force_refresh(enabled: bool = True):
+    """with ブロックの間、キャッシュを使用せずにDBから取得し直す（取得結果はキャッシュに保存する）。"""
+    global _force_refresh
+    with _force_lock:
+        previous = _force_refresh
+        _force_refresh = enabled
+    try:
+        yield
+    finally:
+        with _force_lock:
+            _force_refresh = previous
+
+
+def _settings():
+    config = get_config()
+    if not config.has_section(CACHE_SECTION):
+        return None
+    section = config[CACHE_SECTION]
+    try:
+        if not section.getboolean("enabled", fallback=False):
+            return None
+    except ValueError as e:
+        logger.warning(f"[{CACHE_SECTION}] の設定が不正なためキャッシュを使用しません: {e}")
+        return None
+    return section
+
+
+def _table_name(from_clause: str) -> str:
+    return from_clause.split()[0]
+
+
+def _ttl(settings, table: str) -> float:
+    # configparser のキーは小文字になる
+    value = settings.get(f"ttl.{table.lower()}", settings.get("ttl", str(DEFAULT_TTL_SECONDS)))
+    try:
+        return float(value)
+    except ValueError:
+        return float(DEFAULT_TTL_SECONDS)
+
+
+def _directory(settings) -> str:
+    return settings.get("directory", DEFAULT_DIRECTORY) or DEFAULT_DIRECTORY
+
+
+def _cache_key(config_section: str, query: str) -> str:
+    normalized = " ".join(query.split())
+    return hashlib.sha1(f"{config_section}\n{normalized}".encode("utf-8")).hexdigest()
+
+
+def _probe(cursor, settings, from_clause: str) -> list:
+    """クエリの条件に一致する行の件数と更新日時列の最大値を取得する（テーブル本体は取得しない）。"""
+    update_column = settings.get(f"update_column.{_table_name(from_clause).lower()}", "").strip()
+    select = f"COUNT(*), MAX({update_column})" if update_column else "COUNT(*)"
+    cursor.execute(f"SELECT {select} FROM {from_clause}")
+    row = cursor.fetchone()
+    # JSONで保存するため文字列にして比較する
+    return [str(value) for value in row]
+
+
+def _parquet_available() -> bool:
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def _write(path: str, df: pd.DataFrame) -> str:
+    if _parquet_available():
+        try:
+            df.to_parquet(path + ".tmp")
+            return FORMAT_PARQUET
+        except Exception as e:
+            # 型が混在する列など Parquet で保存できない場合は pickle で保存する
+            logger.info(f"テーブルキャッシュ: Parquet で保存できないため pickle で保存します: {e}")
+    df.to_pickle(path + ".tmp")
+    return FORMAT_PICKLE
+
+
+def _read(path: str, file_format: str) -> pd.DataFrame:
+    if file_format == FORMAT_PARQUET:
+        return pd.read_parquet(path)
+    return pd.read_pickle(path)
+
+
+def _fetch_from_db(cursor, query: str) -> pd.DataFrame:
+    cursor.execute(query)
+    columns = [column[0] for column in cursor.description]  # カラム名を取得
+    data = cursor.fetchall()
+    # 行オブジェクト（pyodbc.Row など）をタプルに変換してDataFrameにする
+    # 値の種類が少ない文字列列は辞書符号化する（キャッシュにも category 型のまま保存される）
+    return dictionary_encode(pd.DataFrame([tuple(row) for row in data], columns=columns))
+
+
+def fetch_frame(config_section: str, cursor, query: str) -> pd.DataFrame:
+    """
+    クエリの結果をDataFrameとして取得する（キャッシュが有効な場合はキャッシュを使用する）。
+
+    Args:
+        config_section: 接続先の設定セクション（キャッシュのキーに使用）
+        cursor: クエリを実行するカーソル
+        query: 実行するクエリ
+
+    Returns:
+        クエリの結果
+    """
+    settings = _settings()
+    if settings is None:
+        return _fetch_from_db(cursor, query)
+
+    match = _FROM_CLAUSE.search(query)
+    if match is None:
+        return _fetch_from_db(cursor, query)
+    from_clause = " ".join(match.group(1).split())
+    table = _table_name(from_clause)
+
+    directory = _directory(settings)
+    base = os.path.join(directory, _cache_key(config_section, query))
+    meta_path = base + ".json"
+    data_path = base + ".data"
+
+    try:
+        probe = _probe(cursor, settings, from_clause)
+    except Exception as e:
+        logger.info(f"テーブルキャッシュ: {table} の変更確認に失敗したためDBから取得します: {e}")
+        return _fetch_from_db(cursor, query)
+
+    if not _force_refresh and os.path.exists(meta_path) and os.path.exists(data_path):
+        try:
+            with open(meta_path, encoding="utf-8") as f:
+                meta = json.load(f)
+            age = time.time() - meta["fetched_at"]
+            if age <= _ttl(settings, table) and meta["probe"] == probe:
+                df = _read(data_path, meta["format"])
+                logger.info(f"テーブルキャッシュ: {table} をキャッシュから読み込みました（{len(df)}行, {age:.0f}秒前に取得）")
+                return df
+        except Exception as e:
+            logger.info(f"テーブルキャッシュ: {table} のキャッシュを読み込めないためDBから取得します: {e}")
+
+    df = _fetch_from_db(cursor, query)
+    try:
+        os.makedirs(directory, exist_ok=True)
+        file_format = _write(data_path, df)
+        os.replace(data_path + ".tmp", data_path)
+        meta = {
+            "config_section": config_section,
+            "query": query,
+            "table": table,
+            "fetched_at": time.time(),
+            "probe": probe,
+            "format": file_format,
+            "rows": len(df),
+        }
+        with open(meta_path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(meta, f, ensure_ascii=False)
+        os.replace(meta_path + ".tmp", meta_path)
+    except Exception as e:
+        logger.warning(f"テーブルキャッシュ: {table} を保存できませんでした: {e}")
+    return df
+
+
+def clear(directory: Optional[str] = None) -> int:
+    """
+    キャッシュを全て削除する。
+
+    Returns:
+        削除したテーブルの数
+    """
+    if directory is None:
+        settings = _settings()
+        directory = _directory(settings) if settings is not None else DEFAULT_DIRECTORY
+    if not os.path.isdir(directory):
+        return 0
+    removed = 0
+    for name in os.listdir(directory):
+        if name.endswith((".json", ".data", ".tmp")):
+            os.remove(os.path.join(directory, name))
+            removed += name.endswith(".json")
+    return removed
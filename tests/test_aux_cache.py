@@ -0,0 +1,70 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import pandas as pd
+
+import aux_cache
+
+
+class AuxCacheTests(unittest.TestCase):
+    def setUp(self):
+        self.work_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.work_dir, ignore_errors=True)
+        self.cache_dir = os.path.join(self.work_dir, "cache")
+        patcher = patch("aux_cache.DEFAULT_DIRECTORY", self.cache_dir)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        aux_cache.clear()
+        self.addCleanup(aux_cache.clear)
+
+        self.csv_path = os.path.join(self.work_dir, "customers.csv")
+        self._write_csv("得意先コード,得意先名１,備考\n1001,テスト商事,a\n1002,サンプル工業,b\n")
+
+    def _write_csv(self, text):
+        with open(self.csv_path, "w", encoding="cp932") as f:
+            f.write(text)
+
+    def test_hit_skips_parsing_and_returns_selected_columns(self):
+        first = aux_cache.read_aux_csv(self.csv_path, ["得意先コード", "得意先名１"])
+        self.assertEqual(list(first.columns), ["得意先コード", "得意先名１"])
+
+        with patch("aux_cache.read_csv_columns", side_effect=AssertionError("parsed again")):
+            second = aux_cache.read_aux_csv(self.csv_path, ["得意先コード", "得意先名１"])
+        pd.testing.assert_frame_equal(first, second)
+
+    def test_disk_cache_is_used_by_a_new_process(self):
+        aux_cache.read_aux_csv(self.csv_path, ["得意先コード"])
+        aux_cache.clear()  # メモリのキャッシュを消して次のプロセスを再現する
+
+        with patch("aux_cache.read_csv_columns", side_effect=AssertionError("parsed again")):
+            df = aux_cache.read_aux_csv(self.csv_path, ["得意先コード"])
+        self.assertEqual(df["得意先コード"].tolist(), [1001, 1002])
+
+    def test_changed_file_is_parsed_again(self):
+        aux_cache.read_aux_csv(self.csv_path, ["得意先コード"])
+        self._write_csv("得意先コード,得意先名１,備考\n2001,更新後,c\n")
+        stat = os.stat(self.csv_path)
+        os.utime(self.csv_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+        df = aux_cache.read_aux_csv(self.csv_path, ["得意先コード"])
+        self.assertEqual(df["得意先コード"].tolist(), [2001])
+
+    def test_missing_columns_are_not_cached(self):
+        df = aux_cache.read_aux_csv(self.csv_path, ["担当者コード"])
+
+        self.assertNotIn("担当者コード", df.columns)
+        self.assertFalse(os.path.exists(self.cache_dir))
+
+    def test_undecodable_file_raises_decode_error(self):
+        with open(self.csv_path, "wb") as f:
+            f.write(b"\x81\xff\x81\xff")
+
+        with self.assertRaises(UnicodeDecodeError):
+            aux_cache.read_aux_csv(self.csv_path, ["得意先コード"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,88 @@
+import json
+import os
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+from types import SimpleNamespace
+from unittest.mock import patch
+
+
+def _forbidden_connect(*args, **kwargs):  # pragma: no cover - safeguard
+    raise RuntimeError("Unexpected DB connection during tests")
+
+
+sys.modules.setdefault("pymysql", SimpleNamespace(connect=_forbidden_connect))
+sys.modules.setdefault("pyodbc", SimpleNamespace(connect=_forbidden_connect))
+
+import benchmark
+import synthetic_data
+from date_columns import as_of_run
+from rule_engine import ENGINE_ROW, ENGINE_VECTORIZED
+
+
+def _report(*results):
+    return {"commit": "abc1234", "created_at": "2025-04-01T12:00:00", "results": list(results)}
+
+
+def _result(series, mode, seconds, rows=1000):
+    return {"series": series, "rows": rows, "mode": mode, "seconds": seconds}
+
+
+class BenchmarkTests(unittest.TestCase):
+    def test_runs_each_engine_mode(self):
+        results = benchmark.run_benchmarks(["CLOUD", "INNOSITE"], [200], report=lambda message: None)
+
+        self.assertEqual([(item["series"], item["mode"]) for item in results],
+                         [("CLOUD", ENGINE_ROW), ("CLOUD", ENGINE_VECTORIZED), ("INNOSITE", ENGINE_ROW)])
+        self.assertEqual(results[0]["errors"], results[1]["errors"])
+        self.assertTrue(all(item["rows"] == 200 and item["seconds"] > 0 for item in results))
+
+    def test_modes_are_filtered_by_series(self):
+        self.assertEqual(benchmark.benchmark_modes("INNOSITE", [ENGINE_VECTORIZED]), [])
+        self.assertEqual(benchmark.benchmark_modes("DEKISPART", workers=2),
+                         [ENGINE_ROW, ENGINE_VECTORIZED, benchmark.MODE_SHARDED])
+
+    def test_sharded_school_checks_duplicates_across_shards(self):
+        data = synthetic_data.series_data("DEKISPART_SCHOOL", 200)
+        frame = data.frame.copy()
+        # 先頭と末尾（別のシャード）の行を同じIDにする
+        frame.loc[frame.index[-1], "stdDID"] = frame.loc[frame.index[0], "stdDID"]
+        data = synthetic_data.SeriesData(data.series, frame, data.validate_kwargs, data.reference)
+
+        with as_of_run(synthetic_data.AS_OF):
+            row = benchmark.time_validate(data, ENGINE_ROW)
+            sharded = benchmark.time_validate(data, benchmark.MODE_SHARDED, workers=2)
+
+        self.assertEqual(sharded["errors"], row["errors"])
+
+    def test_compare_flags_slower_results(self):
+        previous = _report(_result("CLOUD", ENGINE_ROW, 2.0), _result("CLOUD", ENGINE_VECTORIZED, 1.0))
+        current = _report(_result("CLOUD", ENGINE_ROW, 2.1), _result("CLOUD", ENGINE_VECTORIZED, 1.5),
+                          _result("INNOSITE", ENGINE_ROW, 1.0))
+
+        comparison = benchmark.compare_reports(previous, current, threshold=1.2)
+
+        self.assertEqual([(row[2], row[-1]) for row in comparison], [(ENGINE_ROW, False), (ENGINE_VECTORIZED, True)])
+
+    def test_main_saves_results_and_compares(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            previous_path = os.path.join(tmpdir, "previous.json")
+            with open(previous_path, "w", encoding="utf-8") as f:
+                json.dump(_report(_result("DEKISPART_SCHOOL", ENGINE_ROW, 1e-9, rows=100)), f)
+            output = os.path.join(tmpdir, "current.json")
+
+            with patch("benchmark.configure_logging"), redirect_stdout(StringIO()) as stdout:
+                code = benchmark.main(["--series", "dekispart_school", "--rows", "100",
+                                       "--output", output, "--compare", previous_path])
+
+            with open(output, encoding="utf-8") as f:
+                report = json.load(f)
+        self.assertEqual([(item["series"], item["rows"]) for item in report["results"]], [("DEKISPART_SCHOOL", 100)])
+        self.assertEqual(code, 1)
+        self.assertIn("遅くなりました", stdout.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,114 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import pandas as pd
+from pandas.testing import assert_frame_equal
+
+import check_results
+from check_results import OUTPUT_COLUMNS, output_format, with_error_messages, write_results
+
+
+DEFINITIONS = {
+    "CHK_A": {"default_message": "既定のメッセージ", "user_message": ""},
+    "CHK_B": {"default_message": "既定", "user_message": "ユーザーのメッセージ"},
+    "CHK_C": {"user_message": ""},
+}
+
+
+def _results():
+    return pd.DataFrame({
+        "シリーズ": ["DEKISPART", "CLOUD", "CLOUD", "INNOSITE"],
+        "ユーザID": ["0001", 12, None, "U"],
+        "保守整理番号": ["A1", "B1", "", "C1"],
+        "チェックID": ["CHK_A", "CHK_B", "CHK_C", "CHK_X"],
+    }, dtype=object)
+
+
+class ErrorMessageTests(unittest.TestCase):
+    def test_messages(self):
+        df = with_error_messages(_results(), DEFINITIONS)
+
+        self.assertEqual(list(df.columns), OUTPUT_COLUMNS)
+        self.assertEqual(
+            df["エラー内容"].tolist(),
+            ["既定のメッセージ", "ユーザーのメッセージ", "エラー内容が定義されていません。", "不明なチェックID: CHK_X"],
+        )
+
+    def test_missing_maintenance_id_column(self):
+        df = with_error_messages(_results().drop(columns=["保守整理番号"]), DEFINITIONS)
+
+        self.assertEqual(df["保守整理番号"].tolist(), ["", "", "", ""])
+
+
+class WriteResultsTests(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.df = with_error_messages(_results(), DEFINITIONS)
+
+    def _path(self, name):
+        return os.path.join(self.tmpdir.name, "nested", name)
+
+    def test_output_format(self):
+        self.assertEqual(output_format("a.CSV"), check_results.FORMAT_CSV)
+        self.assertEqual(output_format("a.jsonl"), check_results.FORMAT_NDJSON)
+        self.assertEqual(output_format("a.out", "Parquet"), check_results.FORMAT_PARQUET)
+        with self.assertRaises(ValueError):
+            output_format("a.txt")
+        with self.assertRaises(ValueError):
+            output_format("a.csv", "xlsx")
+
+    def test_csv(self):
+        path = self._path("results.csv")
+
+        self.assertEqual(write_results(self.df, path), "csv")
+
+        with open(path, "rb") as f:
+            self.assertTrue(f.read().startswith(b"\xef\xbb\xbf"))
+        read = pd.read_csv(path, dtype=str, keep_default_na=False, encoding="utf-8-sig")
+        self.assertEqual(read["ユーザID"].tolist(), ["0001", "12", "", "U"])
+        self.assertEqual(read["エラー内容"].tolist(), self.df["エラー内容"].tolist())
+
+    def test_ndjson(self):
+        path = self._path("results.ndjson")
+
+        write_results(self.df, path)
+
+        with open(path, encoding="utf-8") as f:
+            lines = f.read().splitlines()
+        self.assertEqual(len(lines), 4)
+        self.assertIn("不明なチェックID", lines[3])
+        read = pd.read_json(path, lines=True, dtype=False)
+        self.assertEqual(read["チェックID"].tolist(), self.df["チェックID"].tolist())
+
+    def test_parquet(self):
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            self.skipTest("pyarrow がインストールされていません")
+        path = self._path("results.parquet")
+
+        write_results(self.df, path)
+
+        read = pd.read_parquet(path)
+        expected = self.df.astype(str).astype(object).where(self.df.notna(), None)
+        assert_frame_equal(read.astype(object).where(read.notna(), None), expected, check_dtype=False)
+
+    def test_failed_write_keeps_previous_file(self):
+        path = self._path("results.csv")
+        write_results(self.df, path)
+
+        with self.assertRaises(ValueError):
+            write_results(self.df, path, "xlsx")
+        with patch.object(pd.DataFrame, "to_csv", side_effect=OSError("disk full")):
+            with self.assertRaises(OSError):
+                write_results(self.df.head(1), path)
+
+        self.assertEqual(len(pd.read_csv(path, encoding="utf-8-sig")), 4)
+        self.assertFalse(os.path.exists(path + ".tmp"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,146 @@
+import sys
+import unittest
+from itertools import product
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pandas as pd
+from pandas.testing import assert_frame_equal
+
+
+def _forbidden_connect(*args, **kwargs):  # pragma: no cover - safeguard
+    raise RuntimeError("Unexpected DB connection during tests")
+
+
+sys.modules.setdefault("pymysql", SimpleNamespace(connect=_forbidden_connect))
+sys.modules.setdefault("pyodbc", SimpleNamespace(connect=_forbidden_connect))
+
+import cloud
+from data_stream import validate_in_chunks
+from rule_engine import ENGINE_ROW, ENGINE_VECTORIZED, ColumnView
+
+PAST = pd.Timestamp("2000-01-01")
+FUTURE = pd.Timestamp("2099-01-01")
+
+
+def _cloud_row(**overrides):
+    row = {
+        "ManagementCode": "M001",
+        "HoshuId": "H001",
+        "CloudStoreCode": "123456",
+        "CloudStoreCode2": "",
+        "CloudStoreName": "販売店",
+        "CloudStoreName2": "",
+        "KsNaviStoreName": "",
+        "KsNaviStoreName2": "",
+        "KSARStoreName": "",
+        "KSARStoreName2": "",
+        "KsNaviStoreCode": "123456",
+        "KDCStoreCode": None,
+        "KSARStoreCode": None,
+        "SendUpdateGuidanceState": 1,
+        "PaymentType": 122,
+        "KsNaviSendUpdateGuidanceState": 0,
+        "KsNaviPaymentType": 211,
+        "KDCSendUpdateGuidanceState": 0,
+        "KDCPaymentType": 0,
+        "KSARSendUpdateGuidanceState": 0,
+        "KSARPaymentType": 0,
+        "NotesForUpdate": "",
+        "NotesForETC": "",
+        "NotesForRTC": "",
+        "SalesRepresentativeCode": "S01",
+    }
+    for field in cloud.contract_fields:
+        row[field] = True
+        row[cloud.contract_start_fields[field]] = PAST
+        row[cloud.contract_end_fields[field]] = PAST
+    for inprogress_field in cloud.contract_inprogress_fields.values():
+        row[inprogress_field] = False
+    for field in cloud.contract_fields:
+        row[field.replace("ContractInactive", "NotesForMultipleYears")] = ""
+    row.update(overrides)
+    return row
+
+
+def _sample_frame():
+    rows = [
+        _cloud_row(),
+        _cloud_row(ManagementCode="M002", HoshuId="H002", DB_ContractInactive=False, DB_ContractEnd=PAST,
+                   SalesRepresentativeCode="X01", CloudStoreCode="ksALL", NotesForUpdate="NP不可"),
+        _cloud_row(ManagementCode="M003", HoshuId=None, SB_ContractInactive=True, SB_ContractEnd=FUTURE,
+                   FN_ContractStart=FUTURE, DB_UpdateInprogress=True, SB_UpdateInprogress=True,
+                   CloudStoreName="▲閉店", SB_NotesForMultipleYears="減らして更新"),
+        _cloud_row(ManagementCode="M004", HoshuId="H004", KC_ContractInactive=None, KC_ContractStart=None,
+                   KC_ContractEnd=None, CloudStoreCode="004359", NotesForETC="特別発送"),
+        _cloud_row(ManagementCode="M005", HoshuId="H005", DBP_ContractInactive=False, DBP_ContractEnd=FUTURE,
+                   CloudStoreCode="000286", CloudStoreCode2=None, KsNaviStoreName="×",
+                   NotesForUpdate="更新案内不要"),
+    ]
+    return pd.DataFrame(rows)
+
+
+class CloudEngineTests(unittest.TestCase):
+    def _validate(self, df, engine):
+        excluded_sales = pd.DataFrame({"salCode": ["X01"], "salKName": ["×営業"]})
+        shop_db = pd.DataFrame({"maiCode": ["123456", "ksALL"], "maiCloudUpdateLimit": [2, 3]})
+        with patch("cloud.fetch_excluded_sales_data", return_value=excluded_sales), patch(
+            "cloud.get_shop_db_data", return_value=shop_db
+        ):
+            return cloud.validate_data(df, progress_callback=None, engine=engine)
+
+    def test_vectorized_matches_row_engine(self):
+        df = _sample_frame()
+
+        row_result = self._validate(df, ENGINE_ROW)
+        vectorized_result = self._validate(df, ENGINE_VECTORIZED)
+
+        self.assertTrue(
+            {"CLOUD_CHK_0011", "CLOUD_CHK_0012", "CLOUD_CHK_0013", "CLOUD_CHK_0014", "CLOUD_CHK_0016"}
+            .issubset(set(row_result["チェックID"]))
+        )
+        assert_frame_equal(vectorized_result, row_result)
+
+    def test_chunked_validation_matches_full_frame(self):
+        df = _sample_frame()
+        full_result = self._validate(df, ENGINE_VECTORIZED)
+
+        chunks = [df.iloc[start:start + 2] for start in range(0, len(df), 2)]
+        chunked_result = validate_in_chunks(
+            chunks, lambda chunk: self._validate(chunk, ENGINE_VECTORIZED), list(full_result.columns)
+        )
+
+        assert_frame_equal(chunked_result, full_result)
+
+    def test_contract_matrix_reductions(self):
+        df = _sample_frame()
+        view = ColumnView(df)
+        matrix = cloud.ContractMatrix(view)
+
+        self.assertEqual(matrix.inactive.shape, (len(df), len(cloud.contract_fields)))
+        self.assertEqual(matrix.any_active.tolist(), [False, True, False, True, True])
+        self.assertEqual(cloud._mask_0011(view).tolist(), [0, 0, 2, 0, 0])
+
+    def test_update_guidance_truth_tables_match_rules(self):
+        limit_axis, payment_axis, state_axis = cloud.UPDATE_GUIDANCE_AXES
+        for renewal, np_fuka in product((False, True), repeat=2):
+            for combination in product(list(limit_axis) + [0], list(payment_axis) + [0], list(state_axis) + [9]):
+                codes = [axis.get(value, -1) for axis, value in zip(cloud.UPDATE_GUIDANCE_AXES, combination)]
+                for table, is_ng in ((cloud.CHK0007_NG_TABLE, cloud.is_chk0007_ng),
+                                     (cloud.CHK0008_NG_TABLE, cloud.is_chk0008_ng)):
+                    compiled = min(codes) >= 0 and bool(table[(int(renewal), int(np_fuka), *codes)])
+                    self.assertEqual(compiled, is_ng(renewal, np_fuka, combination), (renewal, np_fuka, combination))
+
+    def test_update_guidance_mask_repeats_per_store_name_field(self):
+        df = _sample_frame()
+        shop_db_dict = {"123456": {"maiCloudUpdateLimit": 2}, "ksALL": {"maiCloudUpdateLimit": 3}}
+
+        result = cloud._mask_0006_0008(ColumnView(df), shop_db_dict).tolist()
+
+        self.assertEqual(result[1], ["CLOUD_CHK_0007"] * len(cloud.store_name_fields))
+        self.assertEqual(result[2], ["CLOUD_CHK_0006"])
+        self.assertIsNone(result[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
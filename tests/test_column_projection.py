@@ -0,0 +1,104 @@
+import ast
+import inspect
+import re
+import sys
+import unittest
+from types import SimpleNamespace
+
+
+def _forbidden_connect(*args, **kwargs):  # pragma: no cover - safeguard
+    raise RuntimeError("Unexpected DB connection during tests")
+
+
+sys.modules.setdefault("pymysql", SimpleNamespace(connect=_forbidden_connect))
+sys.modules.setdefault("pyodbc", SimpleNamespace(connect=_forbidden_connect))
+
+import dekispart
+import dekispart_school
+import innosite
+from column_projection import MYSQL, SQLSERVER, required_columns, select_list
+
+
+class SchemaCursor:
+    """テーブルごとの列名だけを返すカーソル"""
+
+    def __init__(self, schemas):
+        self.schemas = schemas
+        self.queries = []
+        self.description = None
+
+    def execute(self, query):
+        self.queries.append(query)
+        table = re.search(r"FROM (\w+)", query).group(1)
+        self.description = [(name,) for name in self.schemas[table]]
+
+    def fetchall(self):
+        return []
+
+
+def _declared_columns(module, pattern, check_id_format, prefixes):
+    """check_ 関数の中で文字列として参照している列と、宣言された列の差分を返す"""
+    missing = {}
+    for name, function in inspect.getmembers(module, inspect.isfunction):
+        match = re.fullmatch(pattern, name)
+        if not match or function.__module__ != module.__name__:
+            continue
+        check_id = check_id_format.format(match.group(1))
+        if check_id not in module.CHECK_COLUMNS:
+            continue
+        referenced = {
+            node.value
+            for node in ast.walk(ast.parse(inspect.getsource(function)))
+            if isinstance(node, ast.Constant) and isinstance(node.value, str)
+            and re.fullmatch(r"\w+", node.value) and node.value.startswith(prefixes)
+        }
+        declared = set(module.CHECK_COLUMNS[check_id]) | set(module.BASE_COLUMNS)
+        if referenced - declared:
+            missing[check_id] = referenced - declared
+    return missing
+
+
+class ColumnProjectionTests(unittest.TestCase):
+    def test_required_columns_is_ordered_union(self):
+        check_columns = {"CHK_1": ("a", "b"), "CHK_2": ("b", "c"), "CHK_3": ("d",)}
+
+        self.assertEqual(required_columns(check_columns, ("id",)), ["id", "a", "b", "c", "d"])
+        self.assertEqual(required_columns(check_columns, ("id",), ["CHK_2", "CHK_X"]), ["id", "b", "c"])
+
+    def test_select_list_uses_database_casing_and_skips_missing(self):
+        cursor = SchemaCursor({"T_stdData": ["stdID", "StdUserID", "stdName"]})
+
+        result = select_list(cursor, [("T_stdData", None)], ["stdID", "stdUserID", "stdNothing"], SQLSERVER)
+
+        self.assertEqual(result, "[stdID], [StdUserID]")
+        self.assertEqual(cursor.queries, ["SELECT TOP 0 * FROM T_stdData"])
+
+    def test_select_list_for_join_prefers_first_table(self):
+        cursor = SchemaCursor({"a": ["id", "x"], "b": ["id", "y"]})
+
+        result = select_list(cursor, [("a", "a"), ("b", "b")], ["id", "y", "x"], MYSQL)
+
+        self.assertEqual(result, "a.`id`, b.`y`, a.`x`")
+        self.assertEqual(cursor.queries, ["SELECT * FROM a LIMIT 0", "SELECT * FROM b LIMIT 0"])
+
+    def test_select_list_falls_back_to_all_columns(self):
+        cursor = SchemaCursor({"a": ["id"], "b": ["id"]})
+
+        self.assertEqual(select_list(cursor, [("a", "a"), ("b", "b")], None, MYSQL), "a.*, b.*")
+        self.assertEqual(select_list(cursor, [("a", None)], ["nothing"], MYSQL), "*")
+
+    def test_declared_columns_cover_row_checks(self):
+        self.assertEqual(_declared_columns(dekispart, r"check_(\d{4})", "DEKISPART_CHK_{}", ("std",)), {})
+        self.assertEqual(
+            _declared_columns(innosite, r"check_innosite_(\d{4})", "INNOSITE_CHK_{}", ("std",)), {}
+        )
+        self.assertEqual(
+            _declared_columns(
+                dekispart_school, r"check_dekispart_school_(\d{4})", "DEKISPART_SCHOOL_CHK_{}", ("std", "userbikou")
+            ),
+            {},
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
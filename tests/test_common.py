@@ -0,0 +1,83 @@
+import codecs
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import pandas as pd
+
+import common
+
+
+class CsvEncodingTests(unittest.TestCase):
+    def setUp(self):
+        self.work_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.work_dir, ignore_errors=True)
+
+    def _write(self, name, data: bytes):
+        path = os.path.join(self.work_dir, name)
+        with open(path, "wb") as f:
+            f.write(data)
+        return path
+
+    def test_detects_bom_utf8_and_cp932(self):
+        text = "担当者コード,担当者名\n1,山田\n"
+        bom = self._write("bom.csv", codecs.BOM_UTF8 + text.encode("utf-8"))
+        utf8 = self._write("utf8.csv", text.encode("utf-8"))
+        sjis = self._write("sjis.csv", text.encode("cp932"))
+
+        self.assertEqual(common.detect_csv_encoding(bom), "utf-8-sig")
+        self.assertEqual(common.detect_csv_encoding(utf8), "utf-8")
+        self.assertEqual(common.detect_csv_encoding(sjis), "cp932")
+
+    def test_multibyte_character_cut_at_sample_boundary_is_ignored(self):
+        data = "得意先".encode("utf-8") * 10
+        path = self._write("cut.csv", data)
+
+        self.assertEqual(common.detect_csv_encoding(path, sample_size=len(data) - 1), "utf-8")
+
+    def test_reads_only_required_columns_in_one_pass(self):
+        text = "得意先コード,得意先名１,備考\n1001,テスト商事,a\n1002,サンプル工業,b\n"
+        path = self._write("customers.csv", text.encode("cp932"))
+
+        with patch("pandas.read_csv", wraps=pd.read_csv) as read_csv:
+            df = common.read_csv_columns(path, ["得意先コード", "得意先名１"])
+
+        self.assertEqual(read_csv.call_count, 1)
+        self.assertEqual(read_csv.call_args.kwargs["encoding"], "cp932")
+        self.assertEqual(list(df.columns), ["得意先コード", "得意先名１"])
+        self.assertEqual(df["得意先名１"].tolist(), ["テスト商事", "サンプル工業"])
+
+    def test_falls_back_when_file_changes_encoding_after_sample(self):
+        # 先頭（判定に使用する範囲）は ASCII のみで、後半に cp932 の文字がある
+        data = b"code,name\n" + b"1,a\n" * 100 + "2,山田\n".encode("cp932")
+        path = self._write("mixed.csv", data)
+
+        with patch("common.ENCODING_SAMPLE_BYTES", 64):
+            self.assertEqual(common.detect_csv_encoding(path), "utf-8")
+            df = common.read_csv_columns(path, ["name"])
+
+        self.assertEqual(df["name"].iloc[-1], "山田")
+
+    def test_rows_with_too_many_fields_are_skipped(self):
+        path = self._write("staff.csv", "code,name,dept\n001,a,b\n002,c,d,e\n003,f,g\n".encode("utf-8"))
+
+        df = common.read_csv_columns(path, ["code", "name"])
+
+        self.assertEqual(list(df.columns), ["code", "name"])
+        self.assertEqual(df["code"].tolist(), [1, 3])
+        self.assertEqual(df["name"].tolist(), ["a", "f"])
+
+    def test_load_csv_with_encoding_detection_reports_missing_columns(self):
+        path = self._write("totalnet.csv", "顧客番号\n1\n".encode("utf-8"))
+
+        ok, df, message = common.load_csv_with_encoding_detection(path, ["顧客番号", "担当者コード"])
+
+        self.assertFalse(ok)
+        self.assertIsNone(df)
+        self.assertIn("担当者コード", message)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,115 @@
+import sys
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
+
+
+def _forbidden_connect(*args, **kwargs):  # pragma: no cover - safeguard
+    raise RuntimeError("Unexpected DB connection during tests")
+
+
+sys.modules.setdefault("pymysql", SimpleNamespace(connect=_forbidden_connect))
+sys.modules.setdefault("pyodbc", SimpleNamespace(connect=_forbidden_connect))
+
+import connection_pool
+
+
+class FakeConnection:
+    def __init__(self, section):
+        self.section = section
+        self.alive = True
+        self.closed = False
+        self.rollbacks = 0
+
+    def ping(self, reconnect=False):
+        if not self.alive:
+            raise OSError("connection lost")
+
+    def rollback(self):
+        self.rollbacks += 1
+
+    def cursor(self):
+        return SimpleNamespace(section=self.section)
+
+    def close(self):
+        self.closed = True
+
+
+class ConnectionPoolTests(unittest.TestCase):
+    def setUp(self):
+        self.opened = []
+
+        def open_connection(section):
+            conn = FakeConnection(section)
+            self.opened.append(conn)
+            return conn
+
+        patcher = patch("connection_pool.open_connection", side_effect=open_connection)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_without_pool_each_connect_opens_and_closes(self):
+        first = connection_pool.connect("KSMAIN_MYSQL")
+        first.close()
+        second = connection_pool.connect("KSMAIN_MYSQL")
+
+        self.assertIsNot(first, second)
+        self.assertTrue(first.closed)
+        self.assertEqual(len(self.opened), 2)
+
+    def test_without_pool_with_block_closes_connection(self):
+        with self.assertRaises(ValueError):
+            with connection_pool.connect("DEKISPART_MNT_DB"):
+                raise ValueError("query failed")
+        with connection_pool.connect("DEKISPART_MNT_DB") as conn:
+            self.assertEqual(conn.cursor().section, "DEKISPART_MNT_DB")
+
+        self.assertTrue(all(conn.closed for conn in self.opened))
+
+    def test_connections_are_reused_per_section_and_closed_at_end(self):
+        with connection_pool.pool_run() as pool:
+            for _ in range(3):
+                conn = connection_pool.connect("KSMAIN_MYSQL")
+                self.assertEqual(conn.cursor().section, "KSMAIN_MYSQL")
+                conn.close()
+            with connection_pool.connect("DEKISPART_MNT_DB"):
+                pass
+            connection_pool.connect("DEKISPART_MNT_DB").close()
+
+            self.assertEqual([conn.section for conn in self.opened], ["KSMAIN_MYSQL", "DEKISPART_MNT_DB"])
+            self.assertFalse(any(conn.closed for conn in self.opened))
+            self.assertIn("再利用 3 回", pool.report())
+
+        self.assertTrue(all(conn.closed for conn in self.opened))
+
+    def test_concurrent_borrowers_get_separate_connections(self):
+        with connection_pool.pool_run():
+            first = connection_pool.connect("KSMAIN_MYSQL")
+            second = connection_pool.connect("KSMAIN_MYSQL")
+            first.close()
+            second.close()
+
+        self.assertEqual(len(self.opened), 2)
+
+    def test_dead_connection_is_replaced(self):
+        with connection_pool.pool_run():
+            connection_pool.connect("KSMAIN_MYSQL").close()
+            self.opened[0].alive = False
+            connection_pool.connect("KSMAIN_MYSQL").close()
+
+            self.assertEqual(len(self.opened), 2)
+            self.assertTrue(self.opened[0].closed)
+
+    def test_connection_is_discarded_after_error(self):
+        with connection_pool.pool_run():
+            with self.assertRaises(ValueError):
+                with connection_pool.connect("KSMAIN_MYSQL"):
+                    raise ValueError("query failed")
+            self.assertTrue(self.opened[0].closed)
+            connection_pool.connect("KSMAIN_MYSQL").close()
+
+        self.assertEqual(len(self.opened), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
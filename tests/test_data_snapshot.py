@@ -0,0 +1,94 @@
+import sys
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pandas as pd
+
+
+def _forbidden_connect(*args, **kwargs):  # pragma: no cover - safeguard
+    raise RuntimeError("Unexpected DB connection during tests")
+
+
+sys.modules.setdefault("pymysql", SimpleNamespace(connect=_forbidden_connect))
+sys.modules.setdefault("pyodbc", SimpleNamespace(connect=_forbidden_connect))
+
+import data_snapshot
+import dekispart
+import innosite
+
+
+class DataSnapshotTests(unittest.TestCase):
+    def setUp(self):
+        self.calls = 0
+
+    def _loader(self, columns=None):
+        self.calls += 1
+        df = pd.DataFrame({"stdID": ["A001", "A002"], "stdAdd": ["東京都", "新潟県"], "stdName": ["a", "b"]})
+        return df if columns is None else df[[column for column in columns if column in df.columns]]
+
+    def test_fetch_table_without_run_calls_loader_every_time(self):
+        data_snapshot.fetch_table(data_snapshot.T_STD_DATA, self._loader)
+        data_snapshot.fetch_table(data_snapshot.T_STD_DATA, self._loader)
+
+        self.assertEqual(self.calls, 2)
+
+    def test_table_is_fetched_once_per_run(self):
+        with data_snapshot.snapshot_run() as snapshot:
+            first = data_snapshot.fetch_table(data_snapshot.T_STD_DATA, self._loader)
+            second = data_snapshot.fetch_table(data_snapshot.T_STD_DATA, self._loader)
+
+        self.assertEqual(self.calls, 1)
+        self.assertIsNone(data_snapshot.current_snapshot())
+        pd.testing.assert_frame_equal(first, second)
+        savings = snapshot.savings()
+        self.assertEqual(savings["fetches"], 1)
+        self.assertEqual(savings["rows"], 2)
+        self.assertGreater(savings["bytes"], 0)
+
+    def test_changes_by_one_consumer_do_not_leak(self):
+        with data_snapshot.snapshot_run():
+            first = data_snapshot.fetch_table(data_snapshot.T_STD_DATA, self._loader)
+            first.loc[0, "stdAdd"] = "変更"
+            first["extra"] = 1
+            second = data_snapshot.fetch_table(data_snapshot.T_STD_DATA, self._loader)
+
+        self.assertEqual(second.loc[0, "stdAdd"], "東京都")
+        self.assertNotIn("extra", second.columns)
+
+    def test_projected_table_is_reused_only_for_covered_columns(self):
+        with data_snapshot.snapshot_run():
+            narrow = data_snapshot.fetch_table(
+                data_snapshot.T_STD_DATA, lambda: self._loader(["stdID", "stdAdd"]), ["stdID", "stdAdd"]
+            )
+            narrower = data_snapshot.fetch_table(
+                data_snapshot.T_STD_DATA, lambda: self._loader(["stdID"]), ["stdID"]
+            )
+            self.assertEqual(self.calls, 1)
+            wider = data_snapshot.fetch_table(
+                data_snapshot.T_STD_DATA, lambda: self._loader(["stdID", "stdName"]), ["stdID", "stdName"]
+            )
+            full = data_snapshot.fetch_table(data_snapshot.T_STD_DATA, self._loader)
+
+        self.assertEqual(self.calls, 3)
+        self.assertEqual(list(narrow.columns), ["stdID", "stdAdd"])
+        self.assertEqual(list(narrower.columns), ["stdID"])
+        self.assertEqual(list(wider.columns), ["stdID", "stdName"])
+        self.assertEqual(list(full.columns), ["stdID", "stdAdd", "stdName"])
+
+    def test_dekispart_and_innosite_share_std_data(self):
+        with patch("dekispart._fetch_std_data", side_effect=self._loader), patch(
+            "innosite._fetch_std_data", side_effect=self._loader
+        ):
+            with data_snapshot.snapshot_run():
+                innosite_df = innosite.fetch_hosyu_data()
+                dekispart_df = dekispart.fetch_data()
+
+        self.assertEqual(self.calls, 1)
+        # DEKISPART は宣言した列のうちテーブルに存在する列だけを受け取る
+        self.assertEqual(set(dekispart_df.columns), {"stdID", "stdAdd", "stdName"})
+        pd.testing.assert_frame_equal(dekispart_df, innosite_df[list(dekispart_df.columns)])
+
+
+if __name__ == "__main__":
+    unittest.main()
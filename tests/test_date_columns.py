@@ -0,0 +1,84 @@
+import random
+import unittest
+from datetime import date, datetime
+
+import numpy as np
+import pandas as pd
+from dateutil.relativedelta import relativedelta
+
+import date_columns
+from date_columns import add_months, as_of_run, column_dates, next_month_start, now, parse_date, today, with_as_of
+from rule_engine import ColumnView
+
+
+class AsOfTests(unittest.TestCase):
+    def test_as_of_run_freezes_now(self):
+        with as_of_run("2024-04-01 09:30"):
+            self.assertEqual(now(), datetime(2024, 4, 1, 9, 30))
+            self.assertEqual(today(), date(2024, 4, 1))
+        self.assertIsNone(date_columns.current_as_of())
+
+    def test_with_as_of_uses_outer_run_unless_given(self):
+        @with_as_of
+        def current():
+            return now()
+
+        with as_of_run(date(2024, 4, 1)):
+            self.assertEqual(current(), datetime(2024, 4, 1))
+            self.assertEqual(current(as_of="2020-01-01"), datetime(2020, 1, 1))
+            self.assertEqual(now(), datetime(2024, 4, 1))
+
+
+class ColumnDatesTests(unittest.TestCase):
+    def test_matches_row_parsing(self):
+        values = [pd.Timestamp("2024-01-31"), "2024-1-5", "2024/01/05", "", None, np.nan, "2024-01-05", 20240105]
+        df = pd.DataFrame({"stdReyear1": pd.Series(values, dtype=object)})
+
+        parsed = column_dates(ColumnView(df), "stdReyear1")
+
+        for position, value in enumerate(values):
+            if value is None or (isinstance(value, float) and np.isnan(value)):
+                self.assertTrue(np.isnat(parsed.values[position]))
+                self.assertFalse(parsed.invalid[position])
+                continue
+            try:
+                expected = parse_date(value)
+            except ValueError:
+                self.assertTrue(parsed.invalid[position], value)
+            else:
+                self.assertFalse(parsed.invalid[position], value)
+                self.assertEqual(pd.Timestamp(parsed.values[position]), expected)
+
+    def test_datetime_column_is_not_parsed_again(self):
+        df = pd.DataFrame({"stdReyear1": pd.to_datetime(["2024-01-01", None])})
+        view = ColumnView(df)
+
+        parsed = column_dates(view, "stdReyear1")
+
+        self.assertEqual(parsed.invalid.tolist(), [False, False])
+        self.assertIs(column_dates(view, "stdReyear1"), parsed)
+
+    def test_add_months_matches_relativedelta(self):
+        random.seed(0)
+        days = [datetime(2000, 1, 1) + relativedelta(days=random.randint(0, 12000)) for _ in range(300)]
+        df = pd.DataFrame({"d": [day.strftime("%Y-%m-%d") for day in days]})
+        parsed = column_dates(ColumnView(df), "d")
+
+        for months in (-14, 1, 2, 15):
+            shifted = add_months(parsed, months)
+            expected = [day + relativedelta(months=months) for day in days]
+            self.assertEqual([pd.Timestamp(value) for value in shifted.values], expected)
+
+    def test_next_month_start_and_overflow(self):
+        df = pd.DataFrame({"d": ["2024-12-15", "2024-01-01", "9999-12-01"]})
+
+        result = next_month_start(column_dates(ColumnView(df), "d"))
+
+        self.assertEqual([pd.Timestamp(value) for value in result.values[:2]],
+                         [pd.Timestamp("2025-01-01"), pd.Timestamp("2024-02-01")])
+        # datetime の範囲を超える日付は変換できない値とする
+        self.assertEqual(result.invalid.tolist(), [False, False, True])
+
+
+if __name__ == "__main__":
+    unittest.main()
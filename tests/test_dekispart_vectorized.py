@@ -0,0 +1,210 @@
+import sys
+import unittest
+from contextlib import ExitStack
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pandas as pd
+from pandas.testing import assert_frame_equal
+
+
+def _forbidden_connect(*args, **kwargs):  # pragma: no cover - safeguard
+    raise RuntimeError("Unexpected DB connection during tests")
+
+
+sys.modules.setdefault("pymysql", SimpleNamespace(connect=_forbidden_connect))
+sys.modules.setdefault("pyodbc", SimpleNamespace(connect=_forbidden_connect))
+
+import dekispart
+from data_stream import dictionary_encode, iter_cursor_frames, validate_in_chunks
+from rule_engine import ENGINE_ROW, ENGINE_VECTORIZED
+
+
+def _base_row(**overrides):
+    row = {
+        "stdID": "A001",
+        "stdUserID": "01234567",
+        "stdItmS": "ＬＡＮ",
+        "stdKaiyaku": False,
+        "stdSuppID": "01234567",
+        "stdTan1": "担当太郎",
+        "stdNamCode": "123456",
+        "stdSale1": "123456",
+        "stdSaleNam1": "CUST1",
+        "stdSale2": "00r1",
+        "stdNsyu": 122,
+        "stdAdd": "東京都千代田区",
+        "stdKbiko": "",
+        "stdbiko3": "",
+        "stdbiko4": "",
+        "stdJifuriDM": False,
+        "stdHassouType": 1,
+        "stdNonRenewal": False,
+        "stdTsel": "SEL1",
+        "stdTpla": "TPLA1",
+        "stdReyear1": pd.Timestamp("2020-01-01"),
+        "stdReyear2": pd.Timestamp("2021-01-01"),
+        "stdAcday": 1,
+        "stdRemon": 1,
+        "stdAcyear": 2020,
+        "stdKainsyu": "A",
+        "stdName": "テスト太郎",
+        "stdNamef": "テストタロウ",
+        "stdZip": "1000000",
+        "stdTell": "0312345678",
+        "stdFlg4": False,
+        "stdFlg3": False,
+        "stdFlg1": False,
+    }
+    row.update(overrides)
+    return row
+
+
+def _sample_frame():
+    rows = [
+        _base_row(),
+        _base_row(stdID="A002", stdUserID="8001 0001", stdItmS="ＬＡＮ", stdSuppID="99999999", stdFlg4=True),
+        _base_row(stdID="A003", stdUserID="01234567", stdItmS="その他", stdNamCode="12A", stdSale1="ksALL1"),
+        _base_row(stdID=None, stdUserID=None, stdItmS="", stdNamCode=None, stdSale1=None, stdSaleNam1=None),
+        _base_row(stdID="A005", stdUserID="629（1）", stdItmS="レンタル", stdKaiyaku=True, stdbiko4="特別計算",
+                  stdFlg1=True, stdFlg3=True, stdReyear1="2099/01/01"),
+        _base_row(stdID="A006", stdUserID="123456789", stdSale1="004359", stdSale2="xx", stdNsyu="121",
+                  stdHassouType=2, stdKbiko="更新案内不要 別送"),
+        _base_row(stdID="A007", stdUserID="12345678abc", stdSale1="000332", stdNsyu="211", stdKainsyu="CD",
+                  stdbiko4="会員種特別計算", stdTsel=None, stdTpla=None, stdAcday=None, stdZip=" "),
+        _base_row(stdID="A008", stdUserID="8001", stdItmS="単体", stdSale1="001275", stdAdd="新潟県新潟市",
+                  stdSale2="Canon", stdName="株式会社サンプル", stdFlg4=True, stdTan1=None),
+        _base_row(stdID="A009", stdUserID="01234567", stdJifuriDM=True, stdbiko3="自振DM不要",
+                  stdKbiko="更新案内不要", stdHassouType=0, stdNamef=""),
+        _base_row(stdID="A010", stdUserID="0000", stdItmS="", stdSale1="kshh", stdSaleNam1="CUST2",
+                  stdKaiyaku=True, stdReyear1=pd.Timestamp("2099-01-01"), stdName="▲テスト"),
+        _base_row(stdID="A011", stdUserID="A0000001", stdSale1="A12345", stdJifuriDM=True, stdNsyu="122"),
+        _base_row(stdID="A012", stdUserID="00000001", stdTsel="SEL2", stdTpla="不明営業所", stdSale1="CUST3"),
+    ]
+    return pd.DataFrame(rows)
+
+
+class FrameCursor:
+    """DataFrame の行を fetchmany で返すカーソル"""
+
+    def __init__(self, df):
+        self.description = [(column,) for column in df.columns]
+        self._rows = list(df.itertuples(index=False, name=None))
+        self.batch_sizes = []
+        self.query = None
+
+    def execute(self, query):
+        self.query = query
+
+    def fetchmany(self, size):
+        self.batch_sizes.append(size)
+        rows, self._rows = self._rows[:size], self._rows[size:]
+        return rows
+
+    def fetchall(self):
+        rows, self._rows = self._rows, []
+        return rows
+
+
+class DekispartVectorizedEngineTests(unittest.TestCase):
+    def _patched_resources(self):
+        sales_master = pd.DataFrame(
+            [
+                {"salCode": "123456", "salNotifyRenewal": False, "salJifuriDM": False},
+                {"salCode": "A12345", "salNotifyRenewal": True, "salJifuriDM": True},
+            ]
+        )
+        stack = ExitStack()
+        stack.enter_context(patch("dekispart.get_sales_master_data", return_value=sales_master))
+        stack.enter_context(patch("dekispart.prepare_salKName2K_dict", return_value={"mock_code": "TPLA1"}))
+        stack.enter_context(
+            patch("dekispart.prepare_chk0060_reference_sets", return_value=({"A001", "A009"}, {"A009"}))
+        )
+        return stack
+
+    def _validate(self, df, engine, reference_data=None, as_of=None):
+        with self._patched_resources():
+            return dekispart.validate_data(
+                df,
+                progress_callback=None,
+                individual_list=["太郎"],
+                totalnet_records=pd.DataFrame({"顧客番号": ["A006", "123456"]}),
+                sales_person_records=[
+                    {"担当者コード": "SEL1", "担当者名": "山田", "部門コード": "001"},
+                    {"担当者コード": "SEL2", "担当者名": "・田中", "部門コード": "001"},
+                ],
+                customers_records=[
+                    {"得意先コード": "CUST1", "得意先名１": "×不正店", "使用区分": "", "会社敬称": ""},
+                    {"得意先コード": "123456", "得意先名１": "正規店", "使用区分": "", "会社敬称": "様"},
+                    {"得意先コード": "CUST3", "得意先名１": "正規店", "使用区分": "", "会社敬称": "殿"},
+                ],
+                engine=engine,
+                reference_data=reference_data,
+                as_of=as_of,
+            )
+
+    def test_vectorized_matches_row_engine(self):
+        df = _sample_frame()
+
+        row_result = self._validate(df, ENGINE_ROW)
+        vectorized_result = self._validate(df, ENGINE_VECTORIZED)
+
+        self.assertGreater(len(row_result), 0)
+        assert_frame_equal(vectorized_result, row_result)
+
+    def test_vectorized_matches_row_engine_with_missing_columns(self):
+        df = _sample_frame().drop(columns=["stdTsel", "stdZip", "stdKbiko"])
+
+        row_result = self._validate(df, ENGINE_ROW)
+        vectorized_result = self._validate(df, ENGINE_VECTORIZED)
+
+        self.assertTrue(row_result["チェックID"].str.startswith("COLUMN_MISSING_ERROR_").any())
+        assert_frame_equal(vectorized_result, row_result)
+
+    def test_dictionary_encoded_frame_matches_row_engine(self):
+        df = pd.concat([_sample_frame()] * 3, ignore_index=True)
+        encoded = dictionary_encode(df)
+        self.assertIsInstance(encoded["stdItmS"].dtype, pd.CategoricalDtype)
+
+        row_result = self._validate(df, ENGINE_ROW)
+
+        assert_frame_equal(self._validate(encoded, ENGINE_ROW), row_result)
+        assert_frame_equal(self._validate(encoded, ENGINE_VECTORIZED), row_result)
+
+    def test_as_of_date_matches_row_engine(self):
+        future_row = _base_row(stdID="A013", stdKaiyaku=True, stdReyear1=pd.Timestamp("2099-01-01"))
+        df = pd.concat([_sample_frame(), pd.DataFrame([future_row])], ignore_index=True)
+
+        for as_of in ("2020-02-29", "2100-01-01"):
+            row_result = self._validate(df, ENGINE_ROW, as_of=as_of)
+            assert_frame_equal(self._validate(df, ENGINE_VECTORIZED, as_of=as_of), row_result)
+
+        # 2100年を基準にすると、2099年の満了日は未来の日付ではなくなる
+        check_ids = set(self._validate(df, ENGINE_VECTORIZED, as_of="2100-01-01")["チェックID"])
+        self.assertNotIn("DEKISPART_CHK_0044", check_ids)
+        self.assertIn("DEKISPART_CHK_0044", set(self._validate(df, ENGINE_VECTORIZED)["チェックID"]))
+
+    def test_streamed_chunks_match_full_validation(self):
+        df = _sample_frame()
+        full_result = self._validate(df, ENGINE_VECTORIZED)
+
+        # ストリーミング時は stdID・stdUserID の全件から参照データを作成する
+        with self._patched_resources():
+            reference_data = dekispart.prepare_reference_data(df[["stdID", "stdUserID"]])
+        cursor = FrameCursor(df)
+        streamed_result = validate_in_chunks(
+            iter_cursor_frames(cursor, 5),
+            lambda chunk: self._validate(chunk, ENGINE_VECTORIZED, reference_data),
+            ["シリーズ", "ユーザID", "保守整理番号", "チェックID"],
+        )
+
+        self.assertEqual(cursor.batch_sizes, [5, 5, 5, 5])
+        # 重複するユーザIDがチャンクをまたいでいても CHK_0008 を検出できる
+        self.assertEqual(
+            streamed_result.loc[streamed_result["チェックID"] == "DEKISPART_CHK_0008", "保守整理番号"].tolist(),
+            ["A001", "A003", "A009"],
+        )
+        assert_frame_equal(streamed_result, full_result)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,191 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stderr, redirect_stdout
+from datetime import datetime
+from io import StringIO
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pandas as pd
+
+
+def _forbidden_connect(*args, **kwargs):  # pragma: no cover - safeguard
+    raise RuntimeError("Unexpected DB connection during tests")
+
+
+sys.modules.setdefault("pymysql", SimpleNamespace(connect=_forbidden_connect))
+sys.modules.setdefault("pyodbc", SimpleNamespace(connect=_forbidden_connect))
+
+import date_columns
+import dialogs
+import headless
+import series_registry
+
+
+def _fake_runners(results, calls=None):
+    def load_series_runner(series):
+        if isinstance(results.get(series), series_registry.SeriesLoadError):
+            raise results[series]
+
+        def run_check(progress_callback=None, aux_paths=None):
+            if calls is not None:
+                calls.append((series, aux_paths, date_columns.current_as_of()))
+            result = results[series]
+            if isinstance(result, Exception):
+                raise result
+            if callable(result):
+                return result()
+            return result
+        return run_check
+    return load_series_runner
+
+
+def _errors(series, *check_ids):
+    return pd.DataFrame(
+        [{"シリーズ": series, "ユーザID": f"U{i}", "保守整理番号": f"M{i}", "チェックID": check_id}
+         for i, check_id in enumerate(check_ids)],
+        columns=["シリーズ", "ユーザID", "保守整理番号", "チェックID"],
+    )
+
+
+class HeadlessTests(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.addCleanup(dialogs.set_headless, False)
+        root = Path(self.tmpdir.name)
+        aux_paths = {}
+        for key in headless.AUX_PATH_OPTIONS:
+            path = root / f"{key}.csv"
+            path.write_text("x", encoding="utf-8")
+            aux_paths[key] = str(path)
+        self.settings = root / "app_settings.json"
+        self.settings.write_text(json.dumps({"aux_file_paths": aux_paths}), encoding="utf-8")
+        self.definitions = root / "check_definitions.json"
+        self.definitions.write_text(json.dumps({
+            "CHK_A": {"series": "DEKISPART", "default_message": "既定のメッセージ", "user_message": ""},
+            "CHK_B": {"series": "CLOUD", "default_message": "既定", "user_message": "ユーザーのメッセージ"},
+        }, ensure_ascii=False), encoding="utf-8")
+        self.output = root / "out" / "results.ndjson"
+        self.report = root / "performance_report.json"
+        report_path = patch("profiling.REPORT_PATH", str(self.report))
+        report_path.start()
+        self.addCleanup(report_path.stop)
+
+    def _main(self, results, *args, calls=None):
+        argv = ["--headless", "--settings", str(self.settings), "--check-definitions", str(self.definitions),
+                "--output", str(self.output), *args]
+        stdout, stderr = StringIO(), StringIO()
+        with patch("headless.load_series_runner", _fake_runners(results, calls)), \
+                redirect_stdout(stdout), redirect_stderr(stderr):
+            code = headless.main(argv)
+        return code, stdout.getvalue(), stderr.getvalue()
+
+    def _read_output(self):
+        return pd.read_json(self.output, lines=True, dtype=False) if self.output.stat().st_size else pd.DataFrame()
+
+    def test_findings_are_written_in_series_order(self):
+        results = {"DEKISPART": _errors("DEKISPART", "CHK_A", "CHK_X"), "CLOUD": _errors("CLOUD", "CHK_B")}
+
+        code, stdout, _ = self._main(results, "--series", "cloud", "DEKISPART", "--profile")
+
+        self.assertEqual(code, headless.EXIT_FINDINGS)
+        output = self._read_output()
+        self.assertEqual(list(output.columns), ["シリーズ", "ユーザID", "保守整理番号", "チェックID", "エラー内容"])
+        self.assertEqual(output["シリーズ"].tolist(), ["CLOUD", "DEKISPART", "DEKISPART"])
+        self.assertEqual(output["エラー内容"].tolist(), ["ユーザーのメッセージ", "既定のメッセージ", "不明なチェックID: CHK_X"])
+        self.assertIn("CLOUD: 1件", stdout)
+        self.assertIn("DEKISPART: 2件", stdout)
+        # 結果の書き出しまでの処理時間をパフォーマンスレポートに書き出す
+        report = json.loads(self.report.read_text(encoding="utf-8"))
+        self.assertIn("export", {phase["phase"] for phase in report["phases"]})
+
+    def test_no_findings(self):
+        results = {series: pd.DataFrame() for series in headless.SERIES_RUNNERS}
+
+        code, stdout, _ = self._main(results)
+
+        self.assertEqual(code, headless.EXIT_OK)
+        self.assertTrue(self.output.exists())
+        self.assertIn("合計: 0件", stdout)
+        # --profile を指定しない場合は計測しない
+        self.assertFalse(self.report.exists())
+
+    def test_flags_override_settings_and_as_of_is_frozen(self):
+        calls = []
+        override = Path(self.tmpdir.name) / "totalnet_override.csv"
+        override.write_text("x", encoding="utf-8")
+
+        self._main({"INNOSITE": pd.DataFrame()}, "--series", "INNOSITE", "--totalnet-list", str(override),
+                   "--as-of", "2024-04-01", calls=calls)
+
+        (series, aux_paths, as_of), = calls
+        self.assertEqual(aux_paths["totalnet_list_path"], str(override))
+        self.assertEqual(as_of, datetime(2024, 4, 1))
+
+    def test_missing_aux_file_is_usage_error(self):
+        os.remove(json.loads(self.settings.read_text(encoding="utf-8"))["aux_file_paths"]["customers_list_path"])
+
+        code, _, stderr = self._main({})
+
+        self.assertEqual(code, headless.EXIT_USAGE)
+        self.assertIn("--customers-list", stderr)
+        self.assertFalse(self.output.exists())
+
+    def test_unknown_output_format_is_usage_error(self):
+        self.output = Path(self.tmpdir.name) / "results.txt"
+
+        code, _, _ = self._main({})
+
+        self.assertEqual(code, headless.EXIT_USAGE)
+
+    def test_series_failure_exits_with_failure(self):
+        def reported_error():
+            dialogs.messagebox.showerror("CLOUD エラー", "DB接続エラー")
+            return _errors("CLOUD", "処理中にエラーが発生しました")
+
+        results = {"DEKISPART": RuntimeError("boom"), "CLOUD": reported_error}
+
+        code, _, stderr = self._main(results, "--series", "DEKISPART", "CLOUD")
+
+        self.assertEqual(code, headless.EXIT_FAILED)
+        self.assertIn("DEKISPART: boom", stderr)
+        self.assertIn("CLOUD エラー: DB接続エラー", stderr)
+        self.assertEqual(self._read_output()["チェックID"].tolist(), ["処理中にエラーが発生しました", "APP_ERROR"])
+
+    def test_series_that_cannot_be_loaded_fails_alone(self):
+        results = {
+            "DEKISPART": series_registry.SeriesLoadError("外部ライブラリ 'pyodbc' が見つかりません。"),
+            "CLOUD": _errors("CLOUD", "CHK_B"),
+        }
+
+        code, _, stderr = self._main(results, "--series", "DEKISPART", "CLOUD")
+
+        self.assertEqual(code, headless.EXIT_FAILED)
+        self.assertIn("DEKISPART: 外部ライブラリ 'pyodbc' が見つかりません。", stderr)
+        self.assertEqual(self._read_output()["チェックID"].tolist(), ["CHK_B", "APP_ERROR"])
+
+    def test_headless_run_does_not_import_tkinter(self):
+        root = Path(__file__).resolve().parent.parent
+        script = (
+            "import sys, types\n"
+            "sys.modules.setdefault('pyodbc', types.SimpleNamespace(connect=None))\n"
+            "sys.modules.setdefault('pymysql', types.SimpleNamespace(connect=None))\n"
+            "import headless\n"
+            "for series in headless.SERIES_RUNNERS:\n"
+            "    headless.load_series_runner(series)\n"
+            "print(any(name.split('.')[0] in ('tkinter', '_tkinter') for name in sys.modules))\n"
+        )
+        result = subprocess.run([sys.executable, "-c", script], cwd=root, capture_output=True, text=True, timeout=120)
+
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertEqual(result.stdout.strip(), "False")
+
+
+if __name__ == "__main__":
+    unittest.main()
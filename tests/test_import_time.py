@@ -0,0 +1,53 @@
+import json
+import subprocess
+import sys
+import unittest
+from pathlib import Path
+
+
+# シリーズモジュール4つの読み込み時間の上限（秒）。pandas / numpy の読み込みは含めない。
+IMPORT_TIME_BUDGET = 0.5
+
+SERIES_MODULES = ("dekispart", "innosite", "dekispart_school", "cloud")
+
+# 読み込み時に読み込んではいけないモジュール（使用する時点で読み込む）
+LAZY_MODULES = ("tkinter", "_tkinter", "pyodbc", "pymysql", "multiprocessing")
+
+_SCRIPT = """
+import importlib, json, logging, sys, time
+import numpy, pandas
+started = time.perf_counter()
+for name in {modules!r}:
+    importlib.import_module(name)
+elapsed = time.perf_counter() - started
+print(json.dumps({{
+    "elapsed": elapsed,
+    "loaded": sorted({{name.split(".")[0] for name in sys.modules}} & set({lazy!r})),
+    "handlers": len(logging.getLogger().handlers),
+}}))
+"""
+
+
+class ImportTimeTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        # ドライバのスタブを入れない新しいプロセスで読み込む
+        root = Path(__file__).resolve().parent.parent
+        script = _SCRIPT.format(modules=SERIES_MODULES, lazy=LAZY_MODULES)
+        result = subprocess.run([sys.executable, "-c", script], cwd=root, capture_output=True, text=True, timeout=120)
+        if result.returncode != 0:
+            raise AssertionError(result.stderr)
+        cls.report = json.loads(result.stdout.strip().splitlines()[-1])
+
+    def test_import_time_is_within_budget(self):
+        self.assertLess(self.report["elapsed"], IMPORT_TIME_BUDGET)
+
+    def test_drivers_and_gui_are_not_imported(self):
+        self.assertEqual(self.report["loaded"], [])
+
+    def test_logging_is_not_configured(self):
+        self.assertEqual(self.report["handlers"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
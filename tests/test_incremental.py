@@ -0,0 +1,159 @@
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from datetime import date
+from unittest.mock import patch
+
+import pandas as pd
+from pandas.testing import assert_frame_equal
+
+import incremental
+from date_columns import as_of_run, today
+
+
+RESULT_COLUMNS = ["シリーズ", "ユーザID", "保守整理番号", "チェックID"]
+
+
+def _frame():
+    return pd.DataFrame(
+        {
+            "stdID": ["A001", "A002", "A003", "A004"],
+            "stdUserID": ["U1", "U2", "U3", "U4"],
+            "stdAdd": ["", "東京都", "", "新潟県"],
+        }
+    )
+
+
+class IncrementalValidationTests(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory, ignore_errors=True)
+        self.validated = []
+
+    def _validate(self, rows, reference=None):
+        """住所が空の行と、参照データに含まれるユーザIDをエラーにするチェック"""
+        self.validated.append(rows["stdID"].tolist())
+        reference = reference or set()
+        errors = [
+            {"シリーズ": "TEST", "ユーザID": row["stdUserID"], "保守整理番号": row["stdID"], "チェックID": "CHK_ADD"}
+            for _, row in rows.iterrows() if not row["stdAdd"]
+        ]
+        errors += [
+            {"シリーズ": "TEST", "ユーザID": row["stdUserID"], "保守整理番号": row["stdID"], "チェックID": "CHK_REF"}
+            for _, row in rows.iterrows() if row["stdUserID"] in reference
+        ]
+        # 行に対応しないテーブル単位のエラー
+        errors.append({"シリーズ": "TEST", "ユーザID": "N/A", "保守整理番号": "", "チェックID": "COLUMN_MISSING_ERROR_X"})
+        return pd.DataFrame(errors, columns=RESULT_COLUMNS)
+
+    def _run(self, df, reference=frozenset()):
+        return incremental.validate_incrementally(
+            "TEST", df, "stdID",
+            lambda rows: self._validate(rows, reference),
+            RESULT_COLUMNS, reference, state_directory=self.directory,
+        )
+
+    def _sorted(self, df):
+        return df.sort_values(RESULT_COLUMNS).reset_index(drop=True)
+
+    def test_unchanged_rows_reuse_previous_errors(self):
+        first = self._run(_frame())
+        second = self._run(_frame())
+
+        self.assertEqual(self.validated, [["A001", "A002", "A003", "A004"]])
+        assert_frame_equal(self._sorted(second), self._sorted(first))
+
+    def test_only_changed_and_new_rows_are_validated(self):
+        self._run(_frame())
+        changed = _frame()
+        changed.loc[0, "stdAdd"] = "大阪府"
+        changed = pd.concat(
+            [changed.drop(index=3), pd.DataFrame([{"stdID": "A005", "stdUserID": "U5", "stdAdd": ""}])],
+            ignore_index=True,
+        )
+
+        result = self._run(changed)
+
+        self.assertEqual(self.validated[1], ["A001", "A005"])
+        # 全行をチェックした場合と同じ結果になる
+        assert_frame_equal(self._sorted(result), self._sorted(self._validate(changed)))
+
+    def test_reference_change_revalidates_all_rows(self):
+        self._run(_frame())
+        result = self._run(_frame(), frozenset({"U2"}))
+
+        self.assertEqual(self.validated[1], ["A001", "A002", "A003", "A004"])
+        self.assertIn("A002", result.loc[result["チェックID"] == "CHK_REF", "保守整理番号"].tolist())
+
+    def test_check_module_change_revalidates_all_rows(self):
+        module_directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, module_directory, ignore_errors=True)
+        sys.path.insert(0, module_directory)
+        self.addCleanup(sys.path.remove, module_directory)
+        self.addCleanup(sys.modules.pop, "incremental_test_rules", None)
+        module_path = os.path.join(module_directory, "incremental_test_rules.py")
+        with open(module_path, "w", encoding="utf-8") as f:
+            f.write("KEYWORDS = ('至急',)\n")
+
+        with patch("incremental.CHECK_MODULES", incremental.CHECK_MODULES + ("incremental_test_rules",)):
+            self._run(_frame())
+            self._run(_frame())
+            with open(module_path, "w", encoding="utf-8") as f:
+                f.write("KEYWORDS = ('至急', '解約')\n")
+            self._run(_frame())
+
+        self.assertEqual(self.validated, [["A001", "A002", "A003", "A004"]] * 2)
+
+    def test_executable_update_revalidates_all_rows_without_sources(self):
+        executable = os.path.join(self.directory, "DataCheck.exe")
+        with open(executable, "wb") as f:
+            f.write(b"v1")
+
+        with patch("incremental.inspect.getsourcefile", return_value=None), patch("incremental.sys.executable", executable):
+            self._run(_frame())
+            self._run(_frame())
+            with open(executable, "wb") as f:
+                f.write(b"v1.1")
+            self._run(_frame())
+
+        self.assertEqual(self.validated, [["A001", "A002", "A003", "A004"]] * 2)
+
+    def test_new_day_reuses_unchanged_rows(self):
+        df = _frame().assign(stdReyear1=["2025-03-31", "2025-04-01", "2025-04-30", ""])
+        validated_dates = []
+
+        def validate_date_checks(rows):
+            """契約満了日が当日より前の行をエラーにするチェック"""
+            validated_dates.append(rows["stdID"].tolist())
+            expired = rows[(rows["stdReyear1"] != "") & (pd.to_datetime(rows["stdReyear1"]).dt.date < today())]
+            return pd.DataFrame(
+                {"シリーズ": "TEST", "ユーザID": expired["stdUserID"], "保守整理番号": expired["stdID"], "チェックID": "CHK_DATE"},
+                columns=RESULT_COLUMNS,
+            )
+
+        def run():
+            return incremental.validate_incrementally(
+                "TEST", df, "stdID", self._validate, RESULT_COLUMNS, frozenset(),
+                state_directory=self.directory, validate_date_checks=validate_date_checks,
+            )
+
+        with as_of_run(date(2025, 4, 1)):
+            first = run()
+        with as_of_run(date(2025, 5, 1)):
+            second = run()
+
+        # 当日と比較しないチェックは前回のエラーを再利用し、当日と比較するチェックだけ全行で実行する
+        self.assertEqual(self.validated, [["A001", "A002", "A003", "A004"]])
+        self.assertEqual(validated_dates, [["A001", "A002", "A003", "A004"]] * 2)
+        self.assertEqual(first.loc[first["チェックID"] == "CHK_DATE", "保守整理番号"].tolist(), ["A001"])
+        self.assertEqual(second.loc[second["チェックID"] == "CHK_DATE", "保守整理番号"].tolist(), ["A001", "A002", "A003"])
+        assert_frame_equal(
+            self._sorted(second[second["チェックID"] != "CHK_DATE"]),
+            self._sorted(first[first["チェックID"] != "CHK_DATE"]),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,72 @@
+import sys
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pandas as pd
+
+
+def _forbidden_connect(*args, **kwargs):  # pragma: no cover - safeguard
+    raise RuntimeError("Unexpected DB connection during tests")
+
+
+sys.modules.setdefault("pymysql", SimpleNamespace(connect=_forbidden_connect))
+sys.modules.setdefault("pyodbc", SimpleNamespace(connect=_forbidden_connect))
+
+import data_snapshot
+import innosite
+
+
+def _hosyu_frame():
+    return pd.DataFrame(
+        [
+            {"stdID": " A001 ", "stdAdd": "新潟県新潟市　", "stdTselNo": 12, "stdSale1": "123456 "},
+            {"stdID": "A002", "stdAdd": None, "stdTselNo": None, "stdSale1": None},
+            {"stdID": 3, "stdAdd": "東京都", "stdTselNo": 7, "stdSale1": "kshh"},
+            {"stdID": "A001", "stdAdd": "上書き", "stdTselNo": 1, "stdSale1": "000001"},
+        ]
+    )
+
+
+def _iterrows_map(df, value_column):
+    """従来の iterrows による作成方法"""
+    result = {}
+    for _, row in df.iterrows():
+        result[str(row["stdID"]).strip()] = str(row[value_column]).strip()
+    return result
+
+
+class MaintenanceIdReferenceTests(unittest.TestCase):
+    def test_maps_match_iterrows_construction(self):
+        df = _hosyu_frame()
+
+        maps = innosite.build_maintenance_id_reference_maps(df)
+
+        self.assertEqual(maps["address"], _iterrows_map(df, "stdAdd"))
+        self.assertEqual(maps["sales_representative"], _iterrows_map(df, "stdTselNo"))
+        self.assertEqual(maps["sale1"], _iterrows_map(df, "stdSale1"))
+
+    def test_getters_share_one_fetch_per_run(self):
+        with patch("innosite._fetch_maintenance_id_reference_data", return_value=_hosyu_frame()) as fetch:
+            with data_snapshot.snapshot_run():
+                address_map = innosite.get_maintenance_id_address_map()
+                sales_map = innosite.get_maintenance_id_salses_representative_map()
+                sale1_map = innosite.get_maintenance_id_sale1_map()
+
+        self.assertEqual(fetch.call_count, 1)
+        self.assertEqual(address_map["A001"], "上書き")
+        self.assertEqual(sales_map["3"], "7.0")
+        self.assertEqual(sale1_map["A002"], _iterrows_map(_hosyu_frame(), "stdSale1")["A002"])
+
+    def test_reuses_std_data_already_in_snapshot(self):
+        with patch("innosite._fetch_std_data", return_value=_hosyu_frame().assign(stdName="x")) as fetch:
+            with data_snapshot.snapshot_run():
+                innosite.fetch_hosyu_data()
+                maps = innosite.get_maintenance_id_reference_maps()
+
+        self.assertEqual(fetch.call_count, 1)
+        self.assertEqual(maps["sale1"]["A001"], "000001")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,55 @@
+import random
+import unittest
+
+import numpy as np
+import pandas as pd
+
+import keyword_matcher
+from keyword_matcher import KeywordMatcher
+
+
+class KeywordMatcherTests(unittest.TestCase):
+    def test_search_matches_substring_scan(self):
+        random.seed(0)
+        alphabet = "山田中村株式有限"
+        keywords = ["".join(random.choice(alphabet) for _ in range(random.randint(1, 4))) for _ in range(50)]
+        texts = ["".join(random.choice(alphabet) for _ in range(random.randint(0, 12))) for _ in range(500)]
+        matcher = KeywordMatcher(keywords)
+
+        for text in texts:
+            self.assertEqual(matcher.search(text), any(keyword in text for keyword in keywords), text)
+
+    def test_keyword_found_through_failure_link(self):
+        # "山田花" の途中で失敗しても "田中" を見つける
+        matcher = KeywordMatcher(["山田花子", "田中"])
+
+        self.assertTrue(matcher.search("山田中"))
+        self.assertFalse(matcher.search("山田花"))
+
+    def test_empty_keyword_matches_everything(self):
+        self.assertTrue(KeywordMatcher([""]).search("任意"))
+        self.assertFalse(KeywordMatcher([]).search("任意"))
+
+    def test_contains_over_column(self):
+        matcher = KeywordMatcher(["株式", "合同"])
+        values = pd.Series(["株式会社A", None, "個人", np.nan, "株式会社A", 123], index=[5, 6, 7, 8, 9, 10])
+
+        result = matcher.contains(values)
+
+        self.assertEqual(result.index.tolist(), [5, 6, 7, 8, 9, 10])
+        self.assertEqual(result.tolist(), [True, False, False, False, True, False])
+
+    def test_python_automaton_is_used_without_pyahocorasick(self):
+        original = keyword_matcher.ahocorasick
+        keyword_matcher.ahocorasick = None
+        try:
+            matcher = KeywordMatcher(["合資"])
+        finally:
+            keyword_matcher.ahocorasick = original
+
+        self.assertIsNone(matcher._automaton)
+        self.assertTrue(matcher.search("合資会社"))
+
+
+if __name__ == "__main__":
+    unittest.main()
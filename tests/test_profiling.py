@@ -0,0 +1,138 @@
+import json
+import os
+import tempfile
+import unittest
+from configparser import ConfigParser
+from unittest.mock import patch
+
+import pandas as pd
+
+import profiling
+from profiling import PHASE_EXPORT, PHASE_FETCH, PHASE_VALIDATE, RUN_SCOPE, PhaseTimer, check_name, profiled_check
+from rule_engine import Rule, evaluate_rules
+
+
+def check_flag(row, errors):
+    if row["flag"]:
+        errors.append({"チェックID": "CHK_FLAG"})
+
+
+def check_missing(row, errors):
+    row["missing"]
+
+
+def _failing_mask(view):
+    raise KeyError("missing")
+
+
+def _add_error(errors, user_id, check_id, maintenance_id):
+    errors.append({"ユーザID": user_id, "チェックID": check_id, "保守整理番号": maintenance_id})
+
+
+def _run_row_check(check_func, row, row_errors, user_id, maintenance_id):
+    try:
+        check_func(row, row_errors)
+    except KeyError:
+        _add_error(row_errors, user_id, f"COLUMN_MISSING_ERROR_{check_func.__name__}", maintenance_id)
+
+
+class ProfilingTests(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.report_path = os.path.join(self.tmpdir.name, "performance_report.json")
+        report_path = patch("profiling.REPORT_PATH", self.report_path)
+        report_path.start()
+        self.addCleanup(report_path.stop)
+
+    def _checks(self, profile):
+        return {(item["series"], item["check"]): item for item in profile.to_dict()["checks"]}
+
+    def test_profiling_is_disabled_by_default(self):
+        config = ConfigParser()
+        with patch("profiling.get_config", return_value=config):
+            self.assertFalse(profiling.profiling_enabled())
+            with profiling.profile_run() as profile:
+                self.assertIsNone(profile)
+            config["PROFILING"] = {"enabled": "true"}
+            self.assertTrue(profiling.profiling_enabled())
+
+    def test_checks_are_not_wrapped_without_profile(self):
+        self.assertIs(profiled_check("S", "CHK", check_flag), check_flag)
+        with profiling.profile_run(enabled=False) as profile:
+            self.assertIsNone(profile)
+            self.assertIs(profiled_check("S", "CHK", check_flag), check_flag)
+
+    def test_row_checks_record_calls_errors_and_exceptions(self):
+        rows = [{"flag": True}, {"flag": False}, {"flag": True}]
+
+        with profiling.profile_run(enabled=True) as profile:
+            flag = profiled_check("S", "CHK_FLAG", check_flag)
+            missing = profiled_check("S", "CHK_MISSING", check_missing)
+            errors = []
+            for row in rows:
+                flag(row, errors)
+                _run_row_check(missing, row, errors, "U", "M")
+
+        checks = self._checks(profile)
+        self.assertEqual((checks[("S", "CHK_FLAG")]["calls"], checks[("S", "CHK_FLAG")]["errors"]), (3, 2))
+        self.assertEqual(checks[("S", "CHK_MISSING")]["exceptions"], 3)
+        # 例外をエラー行にする際の関数名は元の関数のまま
+        self.assertEqual(errors[1]["チェックID"], "COLUMN_MISSING_ERROR_check_missing")
+
+        with open(self.report_path, encoding="utf-8") as f:
+            report = json.load(f)
+        self.assertEqual({item["check"] for item in report["checks"]}, {"CHK_FLAG", "CHK_MISSING"})
+        self.assertIsNotNone(report["wall_seconds"])
+
+    def test_check_name_of_lambda_is_called_function(self):
+        reference = {}
+        self.assertEqual(check_name(check_flag), "check_flag")
+        self.assertEqual(check_name(lambda row, errors: check_missing(row, errors, reference)), "check_missing")
+
+    def test_evaluate_rules_records_masks_and_fallbacks(self):
+        df = pd.DataFrame({"user": ["U1", "U2", "U3"], "flag": [True, False, True]})
+        rules = [
+            Rule("CHK_MASK", lambda view: view.get("flag").astype(bool), check_flag),
+            Rule("CHK_FALLBACK", _failing_mask, check_missing),
+        ]
+
+        with profiling.profile_run(enabled=True) as profile:
+            hits = evaluate_rules(df, rules, _add_error, _run_row_check, "user", "id", progress_label="S")
+
+        self.assertEqual(len(hits), 5)
+        checks = self._checks(profile)
+        self.assertEqual((checks[("S", "CHK_MASK")]["calls"], checks[("S", "CHK_MASK")]["errors"]), (1, 2))
+        # マスクの評価に失敗した1回と、行単位で評価した3行分の例外
+        self.assertEqual(checks[("S", "CHK_FALLBACK")]["calls"], 3)
+        self.assertEqual(checks[("S", "CHK_FALLBACK")]["exceptions"], 4)
+
+    def test_phases_and_export(self):
+        with profiling.profile_run(enabled=True) as profile:
+            phases = PhaseTimer("S")
+            phases.start(PHASE_FETCH)
+            phases.start(PHASE_VALIDATE)
+            phases.stop()
+            phases.stop()
+        with profiling.export_phase():
+            pass
+
+        recorded = {(item["series"], item["phase"]): item["count"] for item in profile.to_dict()["phases"]}
+        self.assertEqual(recorded, {("S", PHASE_FETCH): 1, ("S", PHASE_VALIDATE): 1, (RUN_SCOPE, PHASE_EXPORT): 1})
+        # 書き出しの時間はレポートにも追加される
+        self.assertIn(PHASE_EXPORT, {item["phase"] for item in profiling.read_report()["phases"]})
+
+    def test_merge_worker_stats(self):
+        with profiling.profile_run(enabled=True, write_report_file=False) as worker:
+            profiling.record_check("S", "CHK", 0.5, errors=2)
+        with profiling.profile_run(enabled=True, write_report_file=False) as profile:
+            profiling.record_check("S", "CHK", 0.25, errors=1)
+            profile.merge(worker.export_stats())
+
+        check = self._checks(profile)[("S", "CHK")]
+        self.assertEqual((check["seconds"], check["calls"], check["errors"]), (0.75, 2, 3))
+        self.assertFalse(os.path.exists(self.report_path))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,54 @@
+import pickle
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from reference_index import ReferenceIndex, column_index, normalized_text
+
+
+class ReferenceIndexTests(unittest.TestCase):
+    def test_membership_skips_missing_values(self):
+        index = ReferenceIndex(["A01", None, np.nan, "B02"])
+
+        self.assertIn("A01", index)
+        self.assertNotIn(None, index)
+        self.assertEqual(index, {"A01", "B02"})
+
+    def test_key_normalizes_values(self):
+        index = ReferenceIndex(pd.Series([" 123 ", 456]), key=normalized_text)
+
+        self.assertEqual(index, {"123", "456"})
+
+    def test_isin_matches_series_isin(self):
+        index = ReferenceIndex(["A01", "B02", 3])
+        values = pd.Series(["A01", "x", None, 3, "B02"], index=[10, 11, 12, 13, 14])
+
+        result = index.isin(values)
+
+        pd.testing.assert_series_equal(result, values.isin(["A01", "B02", 3]))
+        # 2回目以降は作成済みのハッシュ表を使い回す
+        self.assertIs(index._lookup_index(), index._lookup_index())
+
+    def test_empty_index_matches_nothing(self):
+        result = ReferenceIndex().isin(pd.Series(["A01"], dtype="str"))
+
+        self.assertEqual(result.tolist(), [False])
+
+    def test_column_index_handles_missing_frame_and_column(self):
+        self.assertEqual(column_index(None, "salCode"), frozenset())
+        self.assertEqual(column_index(pd.DataFrame({"other": [1]}), "salCode"), frozenset())
+        self.assertEqual(column_index(pd.DataFrame({"salCode": ["X01"]}), "salCode"), {"X01"})
+
+    def test_pickle_round_trip(self):
+        index = ReferenceIndex(["A01"])
+        index.isin(pd.Series(["A01"]))
+
+        restored = pickle.loads(pickle.dumps(index))
+
+        self.assertIsInstance(restored, ReferenceIndex)
+        self.assertEqual(restored.isin(pd.Series(["A01", "B"])).tolist(), [True, False])
+
+
+if __name__ == "__main__":
+    unittest.main()
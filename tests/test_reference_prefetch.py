@@ -0,0 +1,73 @@
+import sys
+import threading
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pandas as pd
+
+
+def _forbidden_connect(*args, **kwargs):  # pragma: no cover - safeguard
+    raise RuntimeError("Unexpected DB connection during tests")
+
+
+sys.modules.setdefault("pymysql", SimpleNamespace(connect=_forbidden_connect))
+sys.modules.setdefault("pyodbc", SimpleNamespace(connect=_forbidden_connect))
+
+import dekispart
+from reference_prefetch import start_prefetch
+
+
+class ReferencePrefetchTests(unittest.TestCase):
+    def test_queries_start_at_once(self):
+        barrier = threading.Barrier(3, timeout=5)
+
+        def query(value):
+            def run():
+                # 3つのクエリが同時に実行されていなければ Barrier がタイムアウトする
+                barrier.wait()
+                return value
+            return run
+
+        prefetch = start_prefetch({"a": query(1), "b": query(2), "c": query(3)})
+
+        self.assertEqual(prefetch.results(), {"a": 1, "b": 2, "c": 3})
+        self.assertEqual(set(prefetch.latencies()), {"a", "b", "c"})
+        self.assertIn("a ", prefetch.report())
+
+    def test_error_is_raised_on_result(self):
+        def failing():
+            raise ValueError("接続エラー")
+
+        prefetch = start_prefetch({"failing": failing, "ok": lambda: "ok"})
+
+        self.assertEqual(prefetch.result("ok"), "ok")
+        with self.assertRaises(ValueError):
+            prefetch.result("failing")
+        self.assertIn("failing", prefetch.latencies())
+
+    def test_dekispart_reference_data_from_prefetch(self):
+        sales_master = pd.DataFrame([{"salCode": "123456", "salNotifyRenewal": True, "salJifuriDM": False}])
+        id_df = pd.DataFrame({"stdID": ["A001", "A002", "A003"], "stdUserID": ["U1", "U1", "U2"]})
+
+        with patch("dekispart.get_sales_master_data", return_value=sales_master), patch(
+            "dekispart.prepare_salKName2K_dict", return_value={"123456": "TPLA1"}
+        ), patch("dekispart._fetch_site_nexus_ids", return_value={"A001", "Z999"}), patch(
+            "dekispart._fetch_3d_illust_ids", return_value={"A003"}
+        ):
+            # T_stdData の取得前に開始し、stdID で絞り込むのは取得後
+            prefetch = dekispart.start_reference_prefetch()
+            reference_data = dekispart.prepare_reference_data(id_df, prefetch)
+
+        self.assertEqual(reference_data["duplicate_user_ids"], {"U1"})
+        self.assertEqual(reference_data["chk0060_target_ids"], {"A001"})
+        self.assertEqual(reference_data["chk0060_item_ids"], {"A003"})
+        self.assertEqual(reference_data["salKName2K_dict"], {"123456": "TPLA1"})
+        self.assertEqual(reference_data["sales_master_dict"]["123456"]["salNotifyRenewal"], True)
+        self.assertEqual(
+            set(prefetch.latencies()), {"sales_master", "chk0060_reference_sets", "salKName2K"}
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
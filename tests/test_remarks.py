@@ -0,0 +1,61 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from constants import BikoKeyword
+from remarks import contains_any_keyword, contains_keyword, normalize_remarks
+from rule_engine import ColumnView
+
+
+class RemarksTests(unittest.TestCase):
+    def test_normalize_width_case_and_spaces(self):
+        self.assertEqual(normalize_remarks("ＮＰ　不 可"), "np不可")
+        self.assertEqual(normalize_remarks("ｺｳｼﾝ"), "コウシン")
+        self.assertEqual(normalize_remarks(123), "123")
+
+    def test_missing_values_are_empty(self):
+        for value in (None, np.nan, pd.NA, pd.NaT):
+            self.assertEqual(normalize_remarks(value), "")
+            self.assertFalse(contains_keyword(value, BikoKeyword.NP_NOT_ALLOWED))
+
+    def test_keyword_is_normalized_too(self):
+        self.assertTrue(contains_keyword("ｎｐ不可（2024）", BikoKeyword.NP_NOT_ALLOWED))
+        self.assertTrue(contains_keyword("自振ｄｍ 不要", BikoKeyword.JIFURI_DM_NOT_NEEDED))
+        self.assertFalse(contains_keyword("更新案内要", BikoKeyword.RENEWAL_NOT_NEEDED))
+
+    def test_contains_any_keyword(self):
+        keywords = [BikoKeyword.RENEWAL_NOT_NEEDED, BikoKeyword.SPECIAL_SHIPPING]
+
+        self.assertTrue(contains_any_keyword("特別 発送", keywords))
+        self.assertFalse(contains_any_keyword("", keywords))
+
+
+class ColumnViewKeywordTests(unittest.TestCase):
+    def test_keyword_matches_row_function(self):
+        values = ["更新案内不要", "更新 案内不要", None, np.nan, "ＮＰ不可", "", 5, "更新案内不要"]
+        view = ColumnView(pd.DataFrame({"stdKbiko": values}))
+
+        for keyword in (BikoKeyword.RENEWAL_NOT_NEEDED, BikoKeyword.NP_NOT_ALLOWED):
+            expected = [contains_keyword(value, keyword) for value in values]
+            self.assertEqual(view.keyword("stdKbiko", keyword).tolist(), expected)
+
+    def test_keyword_column_is_shared(self):
+        view = ColumnView(pd.DataFrame({"stdKbiko": ["別送", "x"]}))
+
+        first = view.keyword("stdKbiko", BikoKeyword.SEPARATE_SHIPPING)
+        second = view.keyword("stdKbiko", BikoKeyword.SEPARATE_SHIPPING)
+
+        self.assertIs(first, second)
+        self.assertEqual(first.dtype, bool)
+
+    def test_missing_column_with_default(self):
+        view = ColumnView(pd.DataFrame({"other": [1, 2]}))
+
+        self.assertEqual(view.keyword("stdbiko3", BikoKeyword.JIFURI_DM_NOT_NEEDED, default=None).tolist(), [False, False])
+        with self.assertRaises(KeyError):
+            view.keyword("stdbiko3", BikoKeyword.JIFURI_DM_NOT_NEEDED)
+
+
+if __name__ == "__main__":
+    unittest.main()
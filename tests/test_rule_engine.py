@@ -0,0 +1,67 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from data_stream import dictionary_encode
+from rule_engine import ColumnView
+
+
+class ColumnViewPerValueTests(unittest.TestCase):
+    def test_per_value_calls_function_once_per_distinct_value(self):
+        df = pd.DataFrame({"stdNsyu": pd.Series(["121", "122", "121", None, np.nan, "122"], dtype=object)})
+        calls = []
+
+        def func(value):
+            calls.append(value)
+            return str(value)
+
+        result = ColumnView(df).per_value("stdNsyu", func)
+
+        self.assertEqual(result.tolist(), ["121", "122", "121", "None", "nan", "122"])
+        self.assertEqual(len(calls), 4)  # None と NaN は別の値として扱う
+
+    def test_categorical_column_uses_its_codes(self):
+        df = pd.DataFrame({"stdSale1": pd.Series(["ksALL1", "A1", "ksALL1", None], dtype="str").astype("category")})
+        view = ColumnView(df)
+
+        codes, uniques = view.codes("stdSale1")
+
+        self.assertEqual(uniques[codes].tolist()[:3], ["ksALL1", "A1", "ksALL1"])
+        self.assertEqual(view.text("stdSale1").tolist(), ["ksALL1", "A1", "ksALL1", "nan"])
+        self.assertEqual(view.matches("stdSale1", lambda text: "ksALL" in text).tolist(), [True, False, True, False])
+
+    def test_mixed_types_are_evaluated_per_row(self):
+        df = pd.DataFrame({"stdNsyu": pd.Series([1, 1.0, True, "1"], dtype=object)})
+        view = ColumnView(df)
+
+        self.assertIsNone(view.codes("stdNsyu"))
+        self.assertEqual(view.text("stdNsyu").tolist(), ["1", "1.0", "True", "1"])
+
+    def test_missing_column_with_default(self):
+        view = ColumnView(pd.DataFrame({"other": [1, 2]}))
+
+        self.assertEqual(view.stripped("stdKbiko", default=None).tolist(), ["None", "None"])
+
+
+class DictionaryEncodeTests(unittest.TestCase):
+    def test_low_cardinality_string_columns_become_categorical(self):
+        df = pd.DataFrame({
+            "stdItmS": ["ＬＡＮ", "単体", "ＬＡＮ", "ＬＡＮ"],
+            "stdUserID": ["1", "2", "3", "4"],
+            "stdTpla": pd.Series(["A", None, "A", "A"], dtype=object),
+            "stdNsyu": [121, 121, 122, 121],
+        })
+
+        encoded = dictionary_encode(df)
+
+        self.assertIsInstance(encoded["stdItmS"].dtype, pd.CategoricalDtype)
+        self.assertNotIsInstance(encoded["stdUserID"].dtype, pd.CategoricalDtype)
+        # None を含む object 型の列は None が NaN に変わるため変換しない
+        self.assertIs(encoded["stdTpla"].dtype, df["stdTpla"].dtype)
+        self.assertEqual(encoded["stdNsyu"].dtype, df["stdNsyu"].dtype)
+        self.assertIsNot(df["stdItmS"].dtype, encoded["stdItmS"].dtype)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,86 @@
+import sys
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+import series_registry
+from series_registry import SeriesLoadError, is_loaded, load_series_runner
+
+
+class SeriesRegistryTests(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        sys.path.insert(0, self.tmpdir.name)
+        self.addCleanup(sys.path.remove, self.tmpdir.name)
+        runners = patch.dict(series_registry._runners, clear=True)
+        runners.start()
+        self.addCleanup(runners.stop)
+
+    def _module(self, name, source):
+        (Path(self.tmpdir.name) / f"{name}.py").write_text(source, encoding="utf-8")
+        self.addCleanup(sys.modules.pop, name, None)
+
+    def _register(self, **entries):
+        registry = patch.dict(series_registry.SERIES_RUNNERS, entries)
+        registry.start()
+        self.addCleanup(registry.stop)
+
+    def test_module_is_imported_on_first_load_only(self):
+        self._module("fake_series_ok", "IMPORTS = []\nIMPORTS.append(1)\n\ndef run_check():\n    return 'ok'\n")
+        self._register(FAKE=("fake_series_ok", "run_check"))
+
+        self.assertFalse(is_loaded("FAKE"))
+        self.assertNotIn("fake_series_ok", sys.modules)
+
+        runners = []
+        threads = [threading.Thread(target=lambda: runners.append(load_series_runner("FAKE"))) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertTrue(is_loaded("FAKE"))
+        self.assertEqual([runner() for runner in runners], ["ok"] * 4)
+        self.assertEqual(sys.modules["fake_series_ok"].IMPORTS, [1])
+
+    def test_missing_module(self):
+        self._register(FAKE=("fake_series_missing", "run_check"))
+
+        with self.assertRaises(SeriesLoadError) as cm:
+            load_series_runner("FAKE")
+
+        self.assertIn("fake_series_missing.py", str(cm.exception))
+        self.assertFalse(is_loaded("FAKE"))
+
+    def test_missing_dependency_affects_only_its_series(self):
+        self._module("fake_series_driver", "import fake_missing_driver\n\ndef run_check():\n    pass\n")
+        self._module("fake_series_ok", "def run_check():\n    return 'ok'\n")
+        self._register(BROKEN=("fake_series_driver", "run_check"), FAKE=("fake_series_ok", "run_check"))
+
+        with self.assertRaises(SeriesLoadError) as cm:
+            load_series_runner("BROKEN")
+
+        self.assertIn("pip install fake_missing_driver", str(cm.exception))
+        self.assertEqual(load_series_runner("FAKE")(), "ok")
+
+    def test_unknown_series_and_missing_function(self):
+        self._module("fake_series_ok", "def run_check():\n    return 'ok'\n")
+        self._register(FAKE=("fake_series_ok", "run_other_check"))
+
+        with self.assertRaises(SeriesLoadError):
+            load_series_runner("UNKNOWN")
+        with self.assertRaises(SeriesLoadError) as cm:
+            load_series_runner("FAKE")
+        self.assertIn("run_other_check", str(cm.exception))
+
+    def test_registered_series_match_modules(self):
+        for series, (module_name, function_name) in series_registry.SERIES_RUNNERS.items():
+            source = (Path(__file__).resolve().parent.parent / f"{module_name}.py").read_text(encoding="utf-8")
+            self.assertIn(f"def {function_name}(", source, series)
+
+
+if __name__ == "__main__":
+    unittest.main()
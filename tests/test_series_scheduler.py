@@ -0,0 +1,94 @@
+import threading
+import time
+import unittest
+
+from series_scheduler import run_series_concurrently
+
+
+class SeriesSchedulerTests(unittest.TestCase):
+    def test_series_run_concurrently(self):
+        barrier = threading.Barrier(3, timeout=5)
+
+        def task(name):
+            def run():
+                # 3シリーズが同時に実行されていなければ Barrier がタイムアウトする
+                barrier.wait()
+                return name
+            return run
+
+        results = run_series_concurrently([(name, task(name)) for name in ("A", "B", "C")], max_workers=3)
+
+        self.assertEqual(results, {"A": "A", "B": "B", "C": "C"})
+
+    def test_results_are_reported_in_completion_order(self):
+        reported = []
+        caller = threading.current_thread()
+
+        def on_result(series, result):
+            self.assertIs(threading.current_thread(), caller)
+            reported.append(series)
+
+        def task(name, delay):
+            def run():
+                time.sleep(delay)
+                return name
+            return run
+
+        run_series_concurrently(
+            [("SLOW", task("SLOW", 0.3)), ("FAST", task("FAST", 0.0))],
+            max_workers=2,
+            on_result=on_result,
+        )
+
+        self.assertEqual(reported, ["FAST", "SLOW"])
+
+    def test_error_in_one_series_does_not_stop_others(self):
+        errors = []
+
+        def failing():
+            raise ValueError("DB接続エラー")
+
+        results = run_series_concurrently(
+            [("A", failing), ("B", lambda: "ok")],
+            on_error=lambda series, error: errors.append((series, str(error))),
+        )
+
+        self.assertEqual(results, {"B": "ok"})
+        self.assertEqual(errors, [("A", "DB接続エラー")])
+
+    def test_error_is_raised_after_all_series_without_handler(self):
+        finished = []
+
+        def failing():
+            raise ValueError("DB接続エラー")
+
+        def slow():
+            time.sleep(0.1)
+            finished.append("B")
+
+        with self.assertRaises(ValueError):
+            run_series_concurrently([("A", failing), ("B", slow)], max_workers=2)
+        self.assertEqual(finished, ["B"])
+
+    def test_single_worker_runs_series_in_order(self):
+        running = []
+        overlaps = []
+
+        def task(name):
+            def run():
+                if running:
+                    overlaps.append(name)
+                running.append(name)
+                time.sleep(0.01)
+                running.remove(name)
+                return name
+            return run
+
+        results = run_series_concurrently([(name, task(name)) for name in ("A", "B", "C")], max_workers=1)
+
+        self.assertEqual(list(results), ["A", "B", "C"])
+        self.assertEqual(overlaps, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,135 @@
+import configparser
+import os
+import unittest
+from unittest.mock import patch
+
+import pandas as pd
+from pandas.testing import assert_frame_equal
+
+import date_columns
+import profiling
+import sharding
+
+
+RESULT_COLUMNS = ["シリーズ", "ユーザID", "保守整理番号", "チェックID"]
+
+
+def _validate(df, progress_callback, suffix="", reference_data=None):
+    """テスト用のチェック関数（ワーカープロセスに送るためモジュールの最上位に定義する）"""
+    errors = []
+    for row in df.itertuples(index=False):
+        if row.value % 3 == 0:
+            errors.append({"シリーズ": "TEST", "ユーザID": row.user_id, "保守整理番号": row.id, "チェックID": f"CHK_3{suffix}"})
+        if row.user_id in (reference_data or set()):
+            errors.append({"シリーズ": "TEST", "ユーザID": row.user_id, "保守整理番号": row.id, "チェックID": "CHK_REF"})
+        errors.append({"シリーズ": "TEST", "ユーザID": row.user_id, "保守整理番号": row.id,
+                       "チェックID": date_columns.today().isoformat()})
+    return pd.DataFrame(errors, columns=RESULT_COLUMNS)
+
+
+def _validate_with_pid(df, progress_callback):
+    return pd.DataFrame({"保守整理番号": df["id"].tolist(), "pid": os.getpid()})
+
+
+def _validate_nothing(df, progress_callback):
+    return pd.DataFrame(columns=RESULT_COLUMNS)
+
+
+def _validate_profiled(df, progress_callback):
+    profiling.record_check("TEST", "CHK_ROWS", 0.0, calls=len(df))
+    return pd.DataFrame(columns=RESULT_COLUMNS)
+
+
+def _frame(rows=20):
+    return pd.DataFrame({
+        "id": [f"A{i:03d}" for i in range(rows)],
+        "user_id": [f"U{i % 7}" for i in range(rows)],
+        "value": list(range(rows)),
+    })
+
+
+class ShardingWorkersTests(unittest.TestCase):
+    def test_small_runs_stay_single_process(self):
+        self.assertEqual(sharding.sharding_workers(99, workers=4, min_rows=100), 1)
+        self.assertEqual(sharding.sharding_workers(100, workers=4, min_rows=100), 4)
+        self.assertEqual(sharding.sharding_workers(3, workers=8, min_rows=1), 3)
+        self.assertEqual(sharding.sharding_workers(1000, workers=1, min_rows=1), 1)
+
+    def test_config_section(self):
+        with patch("sharding.get_config", return_value=_config("")):
+            self.assertEqual(sharding.sharding_workers(10 ** 6), 1)
+        with patch("sharding.get_config", return_value=_config("[SHARDING]\nenabled = true\nworkers = 3\nmin_rows = 10\n")):
+            self.assertEqual(sharding.sharding_workers(10), 3)
+            self.assertEqual(sharding.sharding_workers(9), 1)
+        with patch("sharding.get_config", return_value=_config("[SHARDING]\nenabled = false\nworkers = 3\n")):
+            self.assertEqual(sharding.sharding_workers(10 ** 6), 1)
+        with patch("sharding.get_config", return_value=_config("[SHARDING]\nenabled = true\nworkers = x\n")):
+            self.assertEqual(sharding.sharding_workers(10 ** 6), 1)
+
+    def test_split_shards_keeps_row_order(self):
+        df = _frame(10)
+
+        shards = sharding.split_shards(df, 4)
+
+        self.assertEqual([len(shard) for shard in shards], [2, 3, 2, 3])
+        assert_frame_equal(pd.concat(shards), df)
+        self.assertEqual(len(sharding.split_shards(df.head(2), 4)), 2)
+
+
+class ValidateShardedTests(unittest.TestCase):
+    def test_matches_single_process_result(self):
+        df = _frame(50)
+        kwargs = {"suffix": "_x", "reference_data": {"U3"}}
+
+        with date_columns.as_of_run("2024-04-01"):
+            expected = _validate(df, None, **kwargs)
+            result = sharding.validate_sharded(df, _validate, RESULT_COLUMNS, kwargs, workers=3, min_rows=10)
+
+        assert_frame_equal(result, expected)
+        # 基準時点はワーカープロセスにも引き継がれる
+        self.assertIn("2024-04-01", set(result["チェックID"]))
+
+    def test_runs_in_worker_processes(self):
+        df = _frame(40)
+
+        result = sharding.validate_sharded(df, _validate_with_pid, ["保守整理番号", "pid"], workers=2, min_rows=1)
+
+        self.assertEqual(result["保守整理番号"].tolist(), df["id"].tolist())
+        self.assertNotIn(os.getpid(), set(result["pid"]))
+
+    def test_below_threshold_runs_in_process_with_progress(self):
+        df = _frame(5)
+        messages = []
+
+        def validate(rows, progress_callback):
+            progress_callback("checked")
+            return _validate_with_pid(rows, progress_callback)
+
+        result = sharding.validate_sharded(df, validate, ["保守整理番号", "pid"], workers=4, min_rows=10,
+                                           progress_callback=messages.append)
+
+        self.assertEqual(set(result["pid"]), {os.getpid()})
+        self.assertEqual(messages, ["checked"])
+
+    def test_no_errors(self):
+        result = sharding.validate_sharded(_frame(12), _validate_nothing, RESULT_COLUMNS, workers=2, min_rows=1)
+
+        self.assertTrue(result.empty)
+        self.assertEqual(list(result.columns), RESULT_COLUMNS)
+
+    def test_worker_profiles_are_merged(self):
+        with profiling.profile_run(enabled=True, write_report_file=False) as profile:
+            sharding.validate_sharded(_frame(12), _validate_profiled, RESULT_COLUMNS, workers=2, min_rows=1)
+
+        (check,) = profile.to_dict()["checks"]
+        self.assertEqual((check["check"], check["calls"]), ("CHK_ROWS", 12))
+
+
+def _config(text):
+    config = configparser.ConfigParser()
+    config.read_string(text)
+    return config
+
+
+if __name__ == "__main__":
+    unittest.main()
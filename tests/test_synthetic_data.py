@@ -0,0 +1,94 @@
+import sys
+import unittest
+from types import SimpleNamespace
+
+import pandas as pd
+from pandas.testing import assert_frame_equal
+
+
+def _forbidden_connect(*args, **kwargs):  # pragma: no cover - safeguard
+    raise RuntimeError("Unexpected DB connection during tests")
+
+
+sys.modules.setdefault("pymysql", SimpleNamespace(connect=_forbidden_connect))
+sys.modules.setdefault("pyodbc", SimpleNamespace(connect=_forbidden_connect))
+
+import cloud
+import dekispart
+import dekispart_school
+import innosite
+import synthetic_data
+from rule_engine import ENGINE_ROW, ENGINE_VECTORIZED
+from synthetic_data import AS_OF, ReferenceTables, series_data
+
+ROWS = 400
+VALIDATE = {
+    "DEKISPART": dekispart.validate_data,
+    "INNOSITE": innosite.validate_data,
+    "DEKISPART_SCHOOL": dekispart_school.validate_data,
+    "CLOUD": cloud.validate_data,
+}
+
+
+class SyntheticDataTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.reference = ReferenceTables(ROWS, seed=1)
+        cls.data = {series: series_data(series, ROWS, seed=1, reference=cls.reference) for series in synthetic_data.SERIES}
+
+    def _validate(self, series, **kwargs):
+        data = self.data[series]
+        return VALIDATE[series](data.frame, None, as_of=AS_OF, **data.validate_kwargs, **kwargs)
+
+    def test_same_seed_creates_same_data(self):
+        for series in synthetic_data.SERIES:
+            with self.subTest(series=series):
+                assert_frame_equal(series_data(series, ROWS, seed=1).frame, self.data[series].frame)
+                self.assertFalse(series_data(series, ROWS, seed=2).frame.equals(self.data[series].frame))
+
+    def test_frames_have_columns_of_all_checks(self):
+        for series, module in [("DEKISPART", dekispart), ("INNOSITE", innosite),
+                               ("DEKISPART_SCHOOL", dekispart_school), ("CLOUD", cloud)]:
+            columns = set(module.BASE_COLUMNS).union(*module.CHECK_COLUMNS.values())
+            with self.subTest(series=series):
+                self.assertEqual(len(self.data[series].frame), ROWS)
+                self.assertLessEqual(columns, set(self.data[series].frame.columns))
+
+    def test_most_rows_pass_the_checks(self):
+        for series in synthetic_data.SERIES:
+            with self.subTest(series=series):
+                result = self._validate(series)
+                self.assertGreater(len(result), 0)
+                # エラーになる値は一部の行だけに混ぜる
+                self.assertLess(result["保守整理番号"].nunique(), ROWS / 2)
+                self.assertFalse(result["チェックID"].str.startswith("COLUMN_MISSING_ERROR_").any())
+
+    def test_engines_match_on_synthetic_data(self):
+        for series in ("DEKISPART", "CLOUD"):
+            with self.subTest(series=series):
+                assert_frame_equal(self._validate(series, engine=ENGINE_VECTORIZED), self._validate(series, engine=ENGINE_ROW))
+
+    def test_date_dependent_checks_split_all_checks(self):
+        # 差分チェックでは date_dependent=False の結果を再利用し、True の結果を毎回全行で作成する
+        for series in synthetic_data.SERIES:
+            with self.subTest(series=series):
+                split = pd.concat(
+                    [self._validate(series, date_dependent=True), self._validate(series, date_dependent=False)],
+                    ignore_index=True,
+                ).astype(str)
+                expected = self._validate(series).astype(str)
+                columns = list(expected.columns)
+                assert_frame_equal(
+                    split.sort_values(columns).reset_index(drop=True),
+                    expected.sort_values(columns).reset_index(drop=True),
+                )
+
+    def test_reference_matches_rows(self):
+        with self.assertRaises(ValueError):
+            series_data("CLOUD", ROWS + 1, reference=self.reference)
+        with self.assertRaises(ValueError):
+            series_data("UNKNOWN", ROWS)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,144 @@
+import os
+import shutil
+import sys
+import tempfile
+import time
+import unittest
+from configparser import ConfigParser
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pandas as pd
+from pandas.testing import assert_frame_equal
+
+
+def _forbidden_connect(*args, **kwargs):  # pragma: no cover - safeguard
+    raise RuntimeError("Unexpected DB connection during tests")
+
+
+sys.modules.setdefault("pymysql", SimpleNamespace(connect=_forbidden_connect))
+sys.modules.setdefault("pyodbc", SimpleNamespace(connect=_forbidden_connect))
+
+import table_cache
+
+
+class TableCursor:
+    """
+    SELECT は rows を返し、変更確認クエリは件数と最大値を返すカーソル
+
+    rows はクエリの条件に一致する行。WHERE 句の無い変更確認クエリには table_rows（テーブル全体の件数）を返す。
+    """
+
+    def __init__(self, columns, rows, max_value="2024-01-01", table_rows=10):
+        self.columns = columns
+        self.rows = rows
+        self.max_value = max_value
+        self.table_rows = table_rows
+        self.queries = []
+        self.description = None
+        self._result = []
+
+    def execute(self, query):
+        self.queries.append(query)
+        if query.startswith("SELECT COUNT(*)"):
+            count = len(self.rows) if " WHERE " in query else self.table_rows
+            self._result = [(count, self.max_value)]
+        else:
+            self.description = [(column,) for column in self.columns]
+            self._result = list(self.rows)
+
+    def fetchone(self):
+        return self._result[0]
+
+    def fetchall(self):
+        return self._result
+
+    def table_fetches(self):
+        return sum(not query.startswith("SELECT COUNT(*)") for query in self.queries)
+
+
+class TableCacheTests(unittest.TestCase):
+    QUERY = "SELECT salCode, salKName FROM t_salmst_k WHERE salKName LIKE '%×%';"
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory, ignore_errors=True)
+        self.config = ConfigParser()
+        self.config["TABLE_CACHE"] = {
+            "enabled": "true",
+            "directory": self.directory,
+            "ttl": "600",
+            "update_column.t_salmst_k": "salUpdate",
+        }
+        patcher = patch("table_cache.get_config", return_value=self.config)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _cursor(self, rows=(("001", "×販売店"), ("002", "・販売店")), max_value="2024-01-01"):
+        return TableCursor(["salCode", "salKName"], list(rows), max_value)
+
+    def test_second_fetch_reads_from_cache(self):
+        first = table_cache.fetch_frame("KSMAIN_MYSQL", self._cursor(), self.QUERY)
+        cursor = self._cursor()
+        second = table_cache.fetch_frame("KSMAIN_MYSQL", cursor, self.QUERY)
+
+        assert_frame_equal(second, first)
+        self.assertEqual(cursor.table_fetches(), 0)
+        # 変更確認はクエリと同じ条件で絞り込んだ件数と更新列の最大値
+        self.assertEqual(
+            cursor.queries,
+            ["SELECT COUNT(*), MAX(salUpdate) FROM t_salmst_k WHERE salKName LIKE '%×%'"],
+        )
+
+    def test_changed_filtered_rows_refetch(self):
+        table_cache.fetch_frame("KSMAIN_MYSQL", self._cursor(), self.QUERY)
+        # テーブル全体の件数・更新列の最大値は同じまま、条件に一致する行だけが増えた
+        cursor = self._cursor(rows=[("001", "×販売店"), ("002", "・販売店"), ("003", "×新規")])
+        refreshed = table_cache.fetch_frame("KSMAIN_MYSQL", cursor, self.QUERY)
+
+        self.assertEqual(cursor.table_fetches(), 1)
+        self.assertEqual(refreshed["salCode"].tolist(), ["001", "002", "003"])
+
+    def test_changed_probe_refetches(self):
+        table_cache.fetch_frame("KSMAIN_MYSQL", self._cursor(), self.QUERY)
+        cursor = self._cursor(max_value="2024-02-01")
+        table_cache.fetch_frame("KSMAIN_MYSQL", cursor, self.QUERY)
+
+        self.assertEqual(cursor.table_fetches(), 1)
+
+    def test_expired_ttl_refetches(self):
+        self.config["TABLE_CACHE"]["ttl.t_salmst_k"] = "60"
+        table_cache.fetch_frame("KSMAIN_MYSQL", self._cursor(), self.QUERY)
+        cursor = self._cursor()
+        with patch("table_cache.time.time", return_value=time.time() + 120):
+            table_cache.fetch_frame("KSMAIN_MYSQL", cursor, self.QUERY)
+
+        self.assertEqual(cursor.table_fetches(), 1)
+
+    def test_force_refresh_refetches(self):
+        table_cache.fetch_frame("KSMAIN_MYSQL", self._cursor(), self.QUERY)
+        cursor = self._cursor(rows=[("003", "×新規")])
+        with table_cache.force_refresh():
+            refreshed = table_cache.fetch_frame("KSMAIN_MYSQL", cursor, self.QUERY)
+
+        self.assertEqual(cursor.table_fetches(), 1)
+        self.assertEqual(refreshed["salCode"].tolist(), ["003"])
+
+    def test_disabled_cache_always_fetches(self):
+        self.config["TABLE_CACHE"]["enabled"] = "false"
+        for _ in range(2):
+            cursor = self._cursor()
+            table_cache.fetch_frame("KSMAIN_MYSQL", cursor, self.QUERY)
+            self.assertEqual(cursor.queries, [self.QUERY])
+        self.assertEqual(os.listdir(self.directory), [])
+
+    def test_clear_removes_cached_tables(self):
+        table_cache.fetch_frame("KSMAIN_MYSQL", self._cursor(), self.QUERY)
+        table_cache.fetch_frame("KSMAIN_MYSQL", self._cursor(), "SELECT maiCode FROM t_stdmain_h")
+
+        self.assertEqual(table_cache.clear(), 2)
+        self.assertEqual(os.listdir(self.directory), [])
+
+
+if __name__ == "__main__":
+    unittest.main()